@@ -283,6 +283,56 @@ class PyUeGearCommands(unreal.BlueprintFunctionLibrary):
 
         found_actor.set_actor_transform(ue_transform, False, False)
 
+    @unreal.ufunction(
+        params=[str, str, str, str, str],
+        static=True,
+        meta=dict(Category="ueGear Commands"),
+    )
+    def set_actors_world_transforms(actor_guids, translations, rotations, scales, world_up):
+        """
+        Sets the world transforms of the actors with given GUIDs within current opened level.
+
+        All the transforms are converted from Maya space together, see `mayaio.convert_transforms_maya_to_unreal`.
+
+        :param str actor_guids: actor guids as a string [str, ...].
+        :param str translations: actor world translations as a string [[float, float, float], ...].
+        :param str rotations: actor world rotations as a string [[float, float, float], ...].
+        :param str scales: actor world scales as a string [[float, float, float], ...].
+        :param str world_up: describes mayas world up axis.
+        """
+        actors_by_guid = {
+            actor.actor_guid.to_string(): actor
+            for actor in actors.get_all_actors_in_current_level()
+        }
+
+        found_actors = list()
+        maya_transforms = list()
+        for actor_guid, translation, rotation, scale in zip(
+            ast.literal_eval(actor_guids),
+            ast.literal_eval(translations),
+            ast.literal_eval(rotations),
+            ast.literal_eval(scales),
+        ):
+            found_actor = actors_by_guid.get(actor_guid, None)
+            if not found_actor:
+                unreal.log_warning(
+                    'No Actor found with guid: "{}"'.format(actor_guid)
+                )
+                continue
+
+            maya_transform = unreal.Transform()
+            maya_transform.rotation = unreal.Rotator(rotation[0], rotation[1], rotation[2]).quaternion()
+            maya_transform.translation = unreal.Vector(*translation)
+            maya_transform.scale3d = unreal.Vector(*scale)
+
+            found_actors.append(found_actor)
+            maya_transforms.append(maya_transform)
+
+        ue_transforms = mayaio.convert_transforms_maya_to_unreal(maya_transforms, world_up)
+
+        for found_actor, ue_transform in zip(found_actors, ue_transforms):
+            found_actor.set_actor_transform(ue_transform, False, False)
+
     # ==================================================================================================================
     # STATIC MESHES
     # ==================================================================================================================
@@ -0,0 +1,235 @@
+"""
+Headless batch builds of Control Rigs.
+
+A batch builds the Control Rigs of many mGear build files (.scd) in one editor session. The ueGear function
+library and the component classes are loaded once, before the first job, and are reused by every job. Each job
+runs in its own `BuildSession`, so a job that fails restores its blueprint and the batch continues with the next
+job.
+
+The jobs are read from a JSON manifest, either a list of jobs or an object with a "jobs" list:
+
+    {"jobs": [{"scd_path": "rigs/hero.scd",
+               "skeletal_mesh": "/Game/Characters/Hero/SKM_Hero",
+               "output_path": "/Game/Characters/Hero/CR_Hero",
+               "build_mode": "construction"}]}
+
+Relative build file paths are resolved from the folder of the manifest. The output path is the asset path of the
+Control Rig Blueprint, it is created if it does not exist. The build mode is one of `BUILD_MODES`.
+
+The batch runs without the editor UI, from the command line:
+
+    UnrealEditor-Cmd.exe Project.uproject -run=pythonscript
+        -script="<ueGear>/Content/Python/ueGear/controlrig/batch.py jobs.json report.json"
+
+The report is a JSON file with the status, duration, phase timings and controller call counts of every job.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import time
+import traceback
+
+import unreal
+
+from ueGear.controlrig import components
+from ueGear.controlrig import manager
+from ueGear.controlrig.paths import CONTROL_RIG_FUNCTION_PATH
+from ueGear.controlrig.profiling import BuildTracer
+
+BUILD_MODES = ("construction", "manual", "incremental")
+"""
+construction: Generates the controls with the construction functions.
+manual: Generates the controls with Python, they can be customised after the build.
+incremental: Only rebuilds the components that changed since the last build, with the construction functions.
+"""
+
+
+class BuildJob:
+    """A Control Rig that is built from an mGear build file"""
+
+    def __init__(self, scd_path: str, skeletal_mesh: str, output_path: str, build_mode: str = "construction"):
+        if build_mode not in BUILD_MODES:
+            raise ValueError(f"Unknown build mode '{build_mode}', expected one of {', '.join(BUILD_MODES)}")
+
+        self.scd_path = scd_path
+        """File path of the mGear build file"""
+
+        self.skeletal_mesh = skeletal_mesh
+        """Package path of the skeletal mesh the Control Rig is created for"""
+
+        self.output_path = output_path.rstrip("/")
+        """Asset path of the Control Rig Blueprint"""
+
+        self.build_mode = build_mode
+        """How the controls are generated, one of `BUILD_MODES`"""
+
+    @classmethod
+    def from_dict(cls, data: dict, root: str = None) -> "BuildJob":
+        """
+        Creates the job from a manifest entry.
+
+        :param str root: Folder that relative build file paths are resolved from.
+        """
+        scd_path = data["scd_path"]
+        if root and not os.path.isabs(scd_path):
+            scd_path = os.path.join(root, scd_path)
+
+        return cls(scd_path, data["skeletal_mesh"], data["output_path"], data.get("build_mode", "construction"))
+
+    @property
+    def rig_name(self) -> str:
+        """Name of the Control Rig Blueprint asset"""
+        return self.output_path.rsplit("/", 1)[-1]
+
+    @property
+    def package_path(self) -> str:
+        """Folder of the Control Rig Blueprint asset"""
+        return self.output_path.rsplit("/", 1)[0]
+
+    def to_dict(self) -> dict:
+        return {"scd_path": self.scd_path,
+                "skeletal_mesh": self.skeletal_mesh,
+                "output_path": self.output_path,
+                "build_mode": self.build_mode}
+
+
+def load_manifest(manifest_path: str) -> list[BuildJob]:
+    """Reads the jobs of a batch manifest file"""
+    with open(manifest_path, 'r') as file:
+        data = json.load(file)
+
+    if isinstance(data, dict):
+        data = data["jobs"]
+
+    root = os.path.dirname(os.path.abspath(manifest_path))
+    return [BuildJob.from_dict(job_data, root) for job_data in data]
+
+
+def load_shared_assets():
+    """
+    Loads what every job uses, once for the whole batch.
+
+    returns the ueGear function library class, it has to be kept referenced for the length of the batch so it is
+    not unloaded between jobs. None if the library could not be loaded.
+    """
+    components.load_all_components()
+
+    function_library = unreal.load_class(None, CONTROL_RIG_FUNCTION_PATH)
+    if function_library is None:
+        unreal.log_warning(f"Could not load the ueGear function library > {CONTROL_RIG_FUNCTION_PATH}")
+    return function_library
+
+
+def run_job(job: BuildJob, count_calls: bool = True, trace_path: str = None, save: bool = True) -> dict:
+    """
+    Builds the Control Rig of the job. Errors are caught and stored in the result, so they do not stop the batch.
+
+    :param bool count_calls: Counts the calls that are made on the controllers. Builds are slower when counted.
+    :param str trace_path: Writes a Chrome trace of the build to this file.
+    :param bool save: Saves the Control Rig Blueprint once it is built.
+    :return: The result of the job, as stored in the report.
+    """
+    result = job.to_dict()
+    result.update({"status": "failed", "duration": 0.0, "timings": {}, "operation_counts": {},
+                   "query_counts": {}, "call_counts": {}})
+
+    unreal.log(f"ueGear Batch: building {job.output_path} from {job.scd_path}")
+    start = time.perf_counter()
+
+    tracer = None
+    if count_calls or trace_path:
+        tracer = BuildTracer(trace_path, log_summary=False)
+
+    try:
+        with tracer or contextlib.nullcontext():
+            session = manager.create_control_rig(job.rig_name,
+                                                 job.skeletal_mesh,
+                                                 job.package_path,
+                                                 job.scd_path,
+                                                 constructionControls=job.build_mode != "manual",
+                                                 incremental=job.build_mode == "incremental")
+        if session is None:
+            raise RuntimeError("The Control Rig was not built, see the log for the reason")
+
+        result["timings"] = dict(session.timings)
+        result["operation_counts"] = dict(session.operation_counts)
+        result["query_counts"] = dict(session.query_counts)
+
+        if save and not unreal.EditorAssetLibrary.save_asset(job.output_path, only_if_is_dirty=False):
+            raise RuntimeError(f"Could not save {job.output_path}")
+
+        result["status"] = "succeeded"
+    except Exception as error:
+        unreal.log_error(f"ueGear Batch: {job.output_path} failed > {error}")
+        result["error"] = str(error)
+        result["traceback"] = traceback.format_exc()
+
+    if tracer is not None:
+        result["call_counts"] = tracer.call_counts
+
+    result["duration"] = time.perf_counter() - start
+    return result
+
+
+def run_batch(jobs: list[BuildJob], report_path: str = None, count_calls: bool = True, trace_dir: str = None,
+              save: bool = True) -> dict:
+    """
+    Builds the Control Rigs of all the jobs, in order.
+
+    :param str report_path: Writes the report to this JSON file.
+    :param bool count_calls: Counts the controller calls of every job.
+    :param str trace_dir: Writes a Chrome trace of every build to this folder, named after the Control Rig.
+    :param bool save: Saves every Control Rig Blueprint that is built.
+    :return: The report of the batch.
+    """
+    start = time.perf_counter()
+    function_library = load_shared_assets()
+
+    results = []
+    for job in jobs:
+        trace_path = os.path.join(trace_dir, f"{job.rig_name}_trace.json") if trace_dir else None
+        results.append(run_job(job, count_calls=count_calls, trace_path=trace_path, save=save))
+
+    failed = [result for result in results if result["status"] != "succeeded"]
+    report = {"succeeded": len(results) - len(failed),
+              "failed": len(failed),
+              "function_library_loaded": function_library is not None,
+              "duration": time.perf_counter() - start,
+              "jobs": results}
+
+    unreal.log(f"ueGear Batch: {report['succeeded']} of {len(results)} Control Rigs built in "
+               f"{report['duration']:.3f} s")
+    for result in failed:
+        unreal.log_error(f"  failed: {result['output_path']} > {result.get('error', '')}")
+
+    if report_path:
+        with open(report_path, 'w') as file:
+            json.dump(report, file, indent=2)
+        unreal.log(f"ueGear Batch: report written to {report_path}")
+
+    return report
+
+
+def main(argv: list[str] = None) -> int:
+    """Runs the batch from the command line, returns 1 if any job failed"""
+    parser = argparse.ArgumentParser(description="Builds the Control Rigs of an mGear build manifest.")
+    parser.add_argument("manifest", help="JSON file listing the build jobs.")
+    parser.add_argument("report", nargs="?", default=None, help="JSON file the report is written to.")
+    parser.add_argument("--trace-dir", default=None, help="Folder the Chrome traces of the builds are written to.")
+    parser.add_argument("--no-call-counts", action="store_true", help="Does not count the controller calls.")
+    parser.add_argument("--no-save", action="store_true", help="Does not save the Control Rig Blueprints.")
+    args = parser.parse_args(argv)
+
+    report = run_batch(load_manifest(args.manifest),
+                       report_path=args.report,
+                       count_calls=not args.no_call_counts,
+                       trace_dir=args.trace_dir,
+                       save=not args.no_save)
+    return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+    # The editor keeps running the commandlet, so the exit code is only logged
+    unreal.log(f"ueGear Batch: exit code {main()}")
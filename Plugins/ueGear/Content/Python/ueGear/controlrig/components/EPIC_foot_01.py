@@ -1,12 +1,13 @@
 import unreal
 
-from ueGear.controlrig.paths import CONTROL_RIG_FUNCTION_PATH
-from ueGear.controlrig.components import base_component, EPIC_control_01
-from ueGear.controlrig.helpers import controls
+from ueGear.controlrig.components import base_component
+from ueGear.controlrig.helpers import controls, pin_values
+from ueGear.controlrig.planners import EPIC_foot_01 as planner
 
 class Component(base_component.UEComponent):
     name = "foot_component"
     mgear_component = "EPIC_foot_01"
+    planner_class = planner.Planner
 
     def __init__(self):
         super().__init__()
@@ -33,131 +34,6 @@ class Component(base_component.UEComponent):
         self.inputs = []
         self.outputs = []
 
-    def create_functions(self, controller: unreal.RigVMController = None):
-        if controller is None:
-            return
-
-        # Calls the super method, which creates the comment block
-        super().create_functions(controller)
-
-        # Generate Function Nodes
-        for evaluation_path in self.functions.keys():
-
-            # Skip the forward function creation if no joints are needed to be driven
-            if evaluation_path == 'forward_functions' and self.metadata.joints is None:
-                continue
-
-            # loop over control rig function nodes
-            for cr_func in self.functions[evaluation_path]:
-                new_node_name = f"{self.name}_{cr_func}"
-
-                ue_cr_node = controller.get_graph().find_node_by_name(new_node_name)
-
-                # Create Component if it does not exist
-                if ue_cr_node is None:
-                    ue_cr_ref_node = controller.add_external_function_reference_node(CONTROL_RIG_FUNCTION_PATH,
-                                                                                     cr_func,
-                                                                                     unreal.Vector2D(0.0, 0.0),
-                                                                                     node_name=new_node_name)
-                    # In Unreal, Ref Node inherits from Node
-                    ue_cr_node = ue_cr_ref_node
-                    self.nodes[evaluation_path].append(ue_cr_node)
-                else:
-                    # if exists, add it to the nodes
-                    self.nodes[evaluation_path].append(ue_cr_node)
-
-                    unreal.log_error(f"  Cannot create function {new_node_name}, it already exists")
-                    continue
-
-        # Gets the Construction Function Node and sets the control name
-
-        func_name = self.name + "_" + self.functions['construction_functions'][0]
-
-        construct_func = base_component.get_construction_node(self, f"{func_name}")
-
-        if construct_func is None:
-            unreal.log_error("  Create Functions Error - Cannot find construct singleton node")
-        else:
-            # Set construction functions side
-            controller.set_pin_default_value(f'{func_name}.side', self.metadata.side, False)
-
-    def populate_bones(self, bones: list[unreal.RigBoneElement] = None, controller: unreal.RigVMController = None):
-        """
-        Populates the ball joint data on the foot nodes/functions.
-        """
-
-        if bones is None or len(bones) < 1:
-            unreal.log_error("[Bone Populate] Failed - No Bones found")
-            return
-        if controller is None:
-            unreal.log_error("[Bone Populate] Failed no Controller found")
-            return
-
-        # Ball Joint
-        ball_jnt = bones[0]
-        jnt_name = str(ball_jnt.key.name)
-
-        # Assign ball joint to the construct node
-        construction_node = self.nodes["construction_functions"][0]
-        controller.set_pin_default_value(f'{construction_node.get_name()}.ball_joint',
-                                         f'(Type=Bone, Name="{jnt_name}")',
-                                         True)
-
-        # Assign ball joint to the forward node
-        forward_node = self.nodes["forward_functions"][0]
-        controller.set_pin_default_value(f'{forward_node.get_name()}.ball_joint',
-                                         f'(Type=Bone, Name="{jnt_name}")',
-                                         True)
-
-        # Assign ball joint to the backwards node
-        forward_node = self.nodes["backwards_functions"][0]
-        controller.set_pin_default_value(f'{forward_node.get_name()}.ball_joint',
-                                         f'(Type=Bone, Name="{jnt_name}")',
-                                         True)
-
-    def _init_master_joint_node(self, controller, node_name: str, bones):
-        """Creates an array node of all the bones
-        """
-
-
-        # Creates an Item Array Node to the control rig
-        node = controller.add_unit_node_from_struct_path(
-            '/Script/ControlRig.RigUnit_ItemArray',
-            'Execute',
-            unreal.Vector2D(-54.908936, 204.649109),
-            node_name)
-
-        self.add_misc_function(node)
-
-        pin_index = 0  # stores the current pin index that is being updated
-
-        for bone in bones:
-            bone_name = str(bone.key.name)
-
-            # Populates the Item Array Node
-            controller.insert_array_pin(f'{node_name}.Items', -1, '')
-            controller.set_pin_default_value(f'{node_name}.Items.{str(pin_index)}',
-                                             f'(Type=Bone,Name="{bone_name}")',
-                                             True)
-            controller.set_pin_expansion(f'{node_name}.Items.{str(pin_index)}', True)
-            controller.set_pin_expansion(f'{node_name}.Items', True)
-
-            pin_index += 1
-
-    def init_input_data(self, controller: unreal.RigVMController):
-        pass
-
-    def _set_transform_pin(self, node_name: str, pin_name: str, transform_value: unreal.Transform, controller):
-        quat = transform_value.rotation
-        pos = transform_value.translation
-
-        controller.set_pin_default_value(f"{node_name}.{pin_name}",
-                                         f"("
-                                         f"Rotation=(X={quat.x},Y={quat.y},Z={quat.z},W={quat.w}),"
-                                         f"Translation=(X={pos.x},Y={pos.y},Z={pos.z}),"
-                                         f"Scale3D=(X=1.000000,Y=1.000000,Z=1.000000))",
-                                         True)
-
     # todo: refactor the guide population code here
     def _set_control(self, name, transform, controller: unreal.RigVMController):
         pass
@@ -166,194 +42,6 @@ class Component(base_component.UEComponent):
     def _populate_guide_transform(self):
         pass
 
-    def populate_control_transforms(self, controller: unreal.RigVMController = None):
-        """Generates the list nodes of controls names and transforms
-
-        The foot does not rely on control positions as it uses the guideTransforms to place the
-        locations where the foot will rotate around.
-        """
-
-        space_mtx = unreal.Matrix(x_plane=[1.000000, 0.000000, 0.000000, 0.000000],
-                                  y_plane=[0.000000, 0.000000, 1.000000, 0.000000],
-                                  z_plane=[0.000000, 1.000000, 0.000000, 0.000000],
-                                  w_plane=[0.000000, 0.000000, 0.000000, 1.000000])
-
-        # Gets the construction function name
-        construction_func_name = self.nodes["construction_functions"][0].get_name()
-
-        for guide_name, guide_mtx in self.metadata.guide_transforms.items():
-
-            # Space Convert between Maya and Unreal
-            guide_mtx = guide_mtx * space_mtx
-            transform = guide_mtx.transform()
-
-            # Rotates the Maya transformation data
-            corrected_quat = unreal.Quat()
-            transform.rotation = corrected_quat
-
-            pin_name = None
-
-            if guide_name == "root":
-                pin_name = "root"
-            elif guide_name == "1_loc":
-                pin_name = "tip"
-            elif guide_name == "heel":
-                pin_name = "heel"
-            elif guide_name == "0_loc":
-                pin_name = "fk0"
-            elif guide_name == "outpivot":
-                pin_name = "outer_pivot"
-            elif guide_name == "inpivot":
-                pin_name = "inner_pivot"
-
-            # Populate the pins transform data
-            if pin_name is None:
-                continue
-
-            self._set_transform_pin(construction_func_name,
-                                    pin_name,
-                                    transform,
-                                    controller)
-
-        # Setting the transform locations, in a specific order
-
-        if len(self.metadata.controls) != 6:
-            raise IOError("Please Contact developer, as only 6 controls are accounted for..")
-
-        # Creates an ordered list of control transforms
-        ordered_ctrl_trans = [None] * 6
-        ordered_bounding_box = [None] * 6
-        ordered_colours = [None] * 6
-        role_order = ["heel", "tip", "roll", "bk0", "bk1", "fk0"]
-
-        for ctrl_name in self.metadata.controls:
-            # Use the controls.Role metadata to detect the type
-            ctrl_role = self.metadata.controls_role[ctrl_name]
-            ctrl_trans = self.metadata.control_transforms[ctrl_name]
-            ctrl_bb = self.metadata.controls_aabb[ctrl_name]
-            ctrl_colour = self.metadata.controls_colour[ctrl_name]
-            # rudementary way of ordering the output list
-            if ctrl_role == role_order[0]:
-                ordered_ctrl_trans[0] = ctrl_trans
-                ordered_bounding_box[0] = ctrl_bb
-                ordered_colours[0] = ctrl_colour
-            elif ctrl_role == role_order[1]:
-                ordered_ctrl_trans[1] = ctrl_trans
-                ordered_bounding_box[1] = ctrl_bb
-                ordered_colours[1] = ctrl_colour
-            elif ctrl_role == role_order[2]:
-                ordered_ctrl_trans[2] = ctrl_trans
-                ordered_bounding_box[2] = ctrl_bb
-                ordered_colours[2] = ctrl_colour
-            elif ctrl_role == role_order[3]:
-                ordered_ctrl_trans[3] = ctrl_trans
-                ordered_bounding_box[3] = ctrl_bb
-                ordered_colours[3] = ctrl_colour
-            elif ctrl_role == role_order[4]:
-                ordered_ctrl_trans[4] = ctrl_trans
-                ordered_bounding_box[4] = ctrl_bb
-                ordered_colours[4] = ctrl_colour
-            elif ctrl_role == role_order[5]:
-                ordered_ctrl_trans[5] = ctrl_trans
-                ordered_bounding_box[5] = ctrl_bb
-                ordered_colours[5] = ctrl_colour
-
-        default_values = ""
-        # Adds a pin to the control_transforms pin on the construction node
-        for trans in ordered_ctrl_trans:
-            quat = trans.rotation
-            pos = trans.translation
-
-            string_entry = (f"(Rotation=(X={quat.x},Y={quat.y},Z={quat.z},W={quat.w}), "
-                            f"Translation=(X={pos.x},Y={pos.y},Z={pos.z}), "
-                            f"Scale3D=(X=1.000000,Y=1.000000,Z=1.000000)),")
-            default_values += string_entry
-
-        # trims off the extr ','
-        default_values = default_values[:-1]
-
-        # Populates and resizes the pin in one go
-        controller.set_pin_default_value(
-            f"{construction_func_name}.control_transforms",
-            f"({default_values})",
-            True,
-            setup_undo_redo=True,
-            merge_undo_action=True)
-
-        self.populate_control_scale(construction_func_name, ordered_bounding_box, controller)
-        self.populate_control_shape_offset(construction_func_name, ordered_bounding_box, controller)
-        self.populate_control_colour(construction_func_name, ordered_colours, controller)
-
-    def populate_control_scale(self, node_name, bounding_boxes, controller: unreal.RigVMController):
-        reduce_ratio = 4.0
-        """Magic number to try and get the maya control scale to be similar to that of unreal.
-        As the mGear uses a square and ueGear uses a cirlce.
-        """
-
-        default_values = ""
-        for aabb in bounding_boxes:
-            unreal_size = [round(element / reduce_ratio, 4) for element in aabb[1]]
-
-            # rudementary way to check if the bounding box might be flat, if it is then
-            # the first value if applied onto the axis
-            if unreal_size[0] == unreal_size[1] and unreal_size[2] < 0.2:
-                unreal_size[2] = unreal_size[0]
-            elif unreal_size[1] == unreal_size[2] and unreal_size[0] < 0.2:
-                unreal_size[0] = unreal_size[1]
-            elif unreal_size[0] == unreal_size[2] and unreal_size[1] < 0.2:
-                unreal_size[1] = unreal_size[0]
-
-            default_values += f'(X={unreal_size[0]},Y={unreal_size[1]},Z={unreal_size[2]}),'
-
-        # trims off the extr ','
-        default_values = default_values[:-1]
-
-        # Populates and resizes the pin in one go
-        controller.set_pin_default_value(
-            f'{node_name}.control_sizes',
-            f'({default_values})',
-            True,
-            setup_undo_redo=True,
-            merge_undo_action=True)
-
-    def populate_control_shape_offset(self, node_name, bounding_boxes, controller: unreal.RigVMController):
-        """
-        As some controls have there pivot at the same position as the transform, but the control is actually moved
-        away from that pivot point. We use the bounding box position as an offset for the control shape.
-        """
-
-        default_values = ""
-        for aabb in bounding_boxes:
-            bb_center = aabb[0]
-            string_entry = f'(X={bb_center[0]}, Y={bb_center[1]}, Z={bb_center[2]}),'
-            default_values += string_entry
-
-        # trims off the extr ','
-        default_values = default_values[:-1]
-
-        controller.set_pin_default_value(
-            f'{node_name}.control_offsets',
-            f'({default_values})',
-            True,
-            setup_undo_redo=True,
-            merge_undo_action=True)
-
-    def populate_control_colour(self, node_name, ordered_colours, controller: unreal.RigVMController):
-        default_values = ""
-
-        for colour in ordered_colours:
-            default_values += f"(R={colour[0]}, G={colour[1]}, B={colour[2]}, A=1.0),"
-
-        # trims off the extr ','
-        default_values = default_values[:-1]
-
-        # Populates and resizes the pin in one go
-        controller.set_pin_default_value(
-            f'{node_name}.control_colours',
-            f"({default_values})",
-            True,
-            setup_undo_redo=True,
-            merge_undo_action=True)
 
 class ManualComponent(Component):
     name = "EPIC_foot_01"
@@ -395,16 +83,8 @@ class ManualComponent(Component):
 
         # todo: HANDLE OUTPIVOT AND INNERPIVOT => They are not Controls
 
-    def create_functions(self, controller: unreal.RigVMController):
-        EPIC_control_01.ManualComponent.create_functions(self, controller)
-
-        func_name = self.name + "_" + self.functions['construction_functions'][0]
-        controller.set_pin_default_value(f'{func_name}.side', self.metadata.side, False)
-
-
-
     # todo: Create Null controls and add them to the hierarhcy_schematic
-    def generate_manual_null(self, hierarchy_controller: unreal.RigHierarchyController):
+    def describe_manual_null(self):
 
         null_names = ["foot_{side}0_fk0_inverse"]
         rolls_for_trans = ["bk1"]
@@ -430,19 +110,15 @@ class ManualComponent(Component):
             trans_name = trans_meta_name.format(**{"side": self.metadata.side})
             control_transform = self.metadata.control_transforms[trans_name]
 
-            # Generate the Null
+            # Describe the Null
             new_null = controls.CR_Control(name=null_name)
             new_null.set_control_type(unreal.RigElementType.NULL)
-            new_null.build(hierarchy_controller)
-
-            new_null.set_transform(quat_transform=control_transform)
-
-            # rig_hrc = hierarchy_controller.get_hierarchy()
+            new_null.describe(transform=control_transform)
 
             self.control_by_role[null_role] = new_null
 
-    def generate_manual_controls(self, hierarchy_controller: unreal.RigHierarchyController):
-        """Creates all the manual controls for the Spine"""
+    def describe_manual_controls(self):
+        """Describes all the manual controls for the Spine"""
         # Stores the controls by Name
         control_table = dict()
 
@@ -471,36 +147,19 @@ class ManualComponent(Component):
             else:
                 new_control.shape_name = self.control_shape[role]
 
-            # Generate the Control
-            new_control.build(hierarchy_controller)
-
-            # Sets the controls position, and offset translation and scale of the shape
-            new_control.set_transform(quat_transform=control_transform)
+            # Describes the controls position, and offset translation and scale of the shape
             # - Modified for epic arm
-            new_control.shape_transform_global(pos=control_offset,
-                                               scale=control_scale,
-                                               rotation=[90, 0, 90])
+            new_control.describe(transform=control_transform,
+                                 shape_pos=control_offset,
+                                 shape_scale=control_scale,
+                                 shape_rotation=[90, 0, 90])
 
             control_table[control_name] = new_control
 
             # Stores the control by role, for loopup purposes later
             self.control_by_role[role] = new_control
 
-        self.generate_manual_null(hierarchy_controller)
-
-        self.initialize_hierarchy(hierarchy_controller)
-
-    def initialize_hierarchy(self, hierarchy_controller: unreal.RigHierarchyController):
-        """Performs the hierarchical restructuring of the internal components controls"""
-        # Parent control hierarchy using roles
-        for parent_role in self.hierarchy_schematic_roles.keys():
-            child_roles = self.hierarchy_schematic_roles[parent_role]
-
-            parent_ctrl = self.control_by_role[parent_role]
-
-            for child_role in child_roles:
-                child_ctrl = self.control_by_role[child_role]
-                hierarchy_controller.set_parent(child_ctrl.rig_key, parent_ctrl.rig_key)
+        self.describe_manual_null()
 
     def populate_control_transforms(self, controller: unreal.RigVMController = None):
         construction_func_name = self.nodes["construction_functions"][0].get_name()
@@ -521,21 +180,9 @@ class ManualComponent(Component):
             """
             Simple helper function making the plug population reusable for ik and fk
             """
-            control_metadata = []
-            for entry in control_list:
-                if entry.rig_key.type == unreal.RigElementType.CONTROL:
-                    t = "Control"
-                if entry.rig_key.type == unreal.RigElementType.NULL:
-                    t = "Null"
-                n = entry.rig_key.name
-                entry = f'(Type={t}, Name="{n}")'
-                control_metadata.append(entry)
-
-            concatinated_controls = ",".join(control_metadata)
-
             controller.set_pin_default_value(
                 f'{construction_func_name}.{plug_name}',
-                f"({concatinated_controls})",
+                pin_values.encode_rig_keys([control.rig_key for control in control_list]),
                 True,
                 setup_undo_redo=True,
                 merge_undo_action=True)
@@ -543,7 +190,6 @@ class ManualComponent(Component):
         update_input_plug("controls", controls)
         update_input_plug("nulls", nulls)
 
-
     def forward_solve_connect(self, controller: unreal.RigVMController):
         """
         Performs any custom connections between forward solve components
@@ -1,38 +1,110 @@
+"""
+ueGear Components, the Control Rig implementation of the mGear components.
+
+Each module implements a single mGear component type. Its `Component` class generates the controls with the
+construction functions, and its `ManualComponent` class generates the controls with Python.
+
+The component modules are listed in `COMPONENT_MANIFEST`, and a module is only imported the first time its
+component type is looked up. When a component module is added, update the manifest with the output of
+`generate_component_manifest`.
+"""
+
 import importlib
-import pkgutil
 import inspect
+import pkgutil
+
+from . import base_component
+
+COMPONENT_MANIFEST = {
+    "EPIC_arm_01": ("EPIC_arm_01", "Component", "ManualComponent"),
+    "EPIC_arm_02": ("EPIC_arm_02", "Component", "ManualComponent"),
+    "EPIC_chain_01": ("EPIC_chain_01", "Component", "ManualComponent"),
+    "EPIC_control_01": ("EPIC_control_01", "Component", "ManualComponent"),
+    "EPIC_foot_01": ("EPIC_foot_01", "Component", "ManualComponent"),
+    "EPIC_leg_01": ("EPIC_leg_01", "Component", "ManualComponent"),
+    "EPIC_leg_02": ("EPIC_leg_02", "Component", "ManualComponent"),
+    "EPIC_leg_3jnt_01": ("EPIC_leg_3jnt_01", "Component", "ManualComponent"),
+    "EPIC_meta_01": ("EPIC_meta_01", "Component", "ManualComponent"),
+    "EPIC_neck_01": ("EPIC_neck_01", "Component", "ManualComponent"),
+    "EPIC_neck_02": ("EPIC_neck_02", "Component", "ManualComponent"),
+    "EPIC_shoulder_01": ("EPIC_shoulder_01", "Component", "ManualComponent"),
+    "EPIC_spine_01": ("EPIC_spine_01", "Component", "ManualComponent"),
+    "EPIC_spine_02": ("EPIC_spine_02", "Component", "ManualComponent"),
+}
+"""mGear component type, to the module that implements it, and the names of its construction and manual
+component classes"""
+
+_registered_components = {}
+"""mGear component type, to its loaded component classes"""
+
+
+def register_component(mgear_component: str, component_class: type, manual_component_class: type = None):
+    """
+    Registers the component classes of an mGear component type, replacing the classes of the manifest.
 
-from types import ModuleType
+    This allows components to be implemented outside of this package.
+    """
+    classes = [component_class]
+    if manual_component_class is not None:
+        classes.append(manual_component_class)
+    _registered_components[mgear_component] = classes
 
-# from . import *
-import ueGear.controlrig.components.base_component
 
 def lookup_mgear_component(mg_component_name: str) -> list[base_component.UEComponent]:
     """
     Looks up the class components that match the mgear_component name.
 
-    returns a list of components that relate to the mGear component
+    The module of the component type is imported the first time it is looked up.
+
+    returns a list of components that relate to the mGear component, the construction component followed by the
+    manual component. The list is empty if no component implements the mGear component.
     """
-    matching_components = []
+    classes = _registered_components.get(mg_component_name, None)
+    if classes is not None:
+        return list(classes)
+
+    manifest_entry = COMPONENT_MANIFEST.get(mg_component_name, None)
+    if manifest_entry is None:
+        return []
+
+    module_name, class_name, manual_class_name = manifest_entry
+    module = importlib.import_module(f"{__name__}.{module_name}")
+    register_component(mg_component_name,
+                       getattr(module, class_name),
+                       getattr(module, manual_class_name) if manual_class_name else None)
+
+    return list(_registered_components[mg_component_name])
+
 
-    package_name = __name__
-    for _, module_name, _ in pkgutil.iter_modules(__path__, package_name + "."):
-        module = importlib.import_module(module_name)
+def load_all_components() -> dict[str, list[base_component.UEComponent]]:
+    """Imports every component module of the manifest, and returns the component classes by mGear type"""
+    return {mgear_component: lookup_mgear_component(mgear_component) for mgear_component in COMPONENT_MANIFEST}
+
+
+def generate_component_manifest() -> dict[str, tuple]:
+    """
+    Imports every module of this package, and returns the manifest of the components they implement.
+
+    The classes of a module that set `mgear_component` are ordered by name, so the `Component` class comes
+    before the `ManualComponent` class.
+    """
+    manifest = {}
 
-        # Makes sure that the imported module is exactly that, a module
-        if type(module) == ModuleType:
+    for _, module_name, _ in pkgutil.iter_modules(__path__):
+        module = importlib.import_module(f"{__name__}.{module_name}")
 
-            # Inspects the module for the classes within it, and checks if the class contains
-            # an mgear_component attribute, and if so does it match the name being searched for.
-            for name, cls in inspect.getmembers(module, inspect.isclass):
+        for class_name, cls in inspect.getmembers(module, inspect.isclass):
+            # Only the classes that are defined in the module, not the classes that it imports
+            if cls.__module__ != module.__name__ or not getattr(cls, "mgear_component", None):
+                continue
 
-                # for cls in map(module.__dict__.get, module.__all__):
-                if not hasattr(cls, "mgear_component"):
-                    break
-                if cls.mgear_component == mg_component_name:
-                    matching_components.append(cls)
+            entry = manifest.setdefault(cls.mgear_component, [module_name, None, None])
+            if entry[1] is None:
+                entry[1] = class_name
+            elif entry[2] is None:
+                entry[2] = class_name
 
-    return matching_components
+    return {mgear_component: tuple(entry) for mgear_component, entry in manifest.items()}
 
 
 MAYA_COLOURS = {6: [0.0, 0.0, 1.0],
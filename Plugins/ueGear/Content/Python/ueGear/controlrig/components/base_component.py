@@ -2,8 +2,10 @@ __all__ = ['UEComponent']
 
 import unreal
 
+from ueGear.controlrig.helpers.component_plan import ComponentPlan
 from ueGear.controlrig.helpers.controls import CR_Control
 from ueGear.controlrig.mgear import mgComponent
+from ueGear.controlrig.planners.base_planner import ComponentPlanner
 
 
 class UEComponent(object):
@@ -13,6 +15,9 @@ class UEComponent(object):
     mgear_component: str = ""
     """The mGear Component that this ueGear component relates too"""
 
+    planner_class: type = ComponentPlanner
+    """Plans the nodes, pin values and links of the component, see `create_plan`"""
+
     cr_variables: dict = None
     """Control Rig Variables that will be generated on the control rig 
     Variable list. This is required for some part of the CR to evaluate 
@@ -66,6 +71,9 @@ class UEComponent(object):
     control_by_role: dict[str, CR_Control]
     """Stores the controls by there role name, so they can easily be looked up"""
 
+    hierarchy_schematic_roles: dict[str, list[str]] = None
+    """Parent control role as key, with the list of child control roles that are parented under it"""
+
 
 
     #==============================================
@@ -93,6 +101,7 @@ class UEComponent(object):
         self.is_manual = False
         self.root_control_children = []
         self.control_by_role = {}
+        self.hierarchy_schematic_roles = {}
 
     @property
     def pos(self):
@@ -171,33 +180,82 @@ class UEComponent(object):
         self.parent_node = None
         parent_node.remove_child(node=self)
 
-    def create_functions(self, controller: unreal.RigVMController):
-        """OVERLOAD THIS METHOD
+    def create_planner(self) -> ComponentPlanner:
+        """Returns the planner of the component, it only holds the name, functions and metadata of the component"""
+        return self.planner_class(self.name, self.functions, self.metadata, self.is_manual)
 
-        This method will be used to generate all the associated functions with the mGear component, and apply any
-        alterations specific to the component.
-        """
+    def create_plan(self) -> ComponentPlan:
+        """Runs the precompute phase of the component, see `helpers.component_plan`"""
+        return self.create_planner().create_plan()
+
+    def create_functions(self, controller: unreal.RigVMController):
+        """Creates the comment node and the function nodes of the component, without the rest of its plan"""
+        if controller is None:
+            return
 
-        self._init_comment(controller)
+        plan = ComponentPlan(self.name)
+        self.create_planner().plan_functions(plan)
+        plan.apply(controller, self)
 
-    def populate_bones(self):
+    def populate_control_transforms(self, controller: unreal.RigVMController = None):
         """OVERLOAD THIS METHOD
 
-        This method should handle the population of bones into the functions
+        This method should handle the population of control transforms and control names that can not be
+        planned. Manual components populate the controls they generated.
         """
         pass
 
-    def populate_control_transforms(self):
+    def describe_manual_controls(self):
         """OVERLOAD THIS METHOD
 
-        This method should handle the population of control transforms and control names
+        This method should describe the manual controls of the component, see `CR_Control.describe`, and store
+        them in the control_by_role. Nothing is created in the hierarchy, so the controls of all the components
+        can be created together.
         """
         pass
 
+    def describe_hierarchy(self):
+        """Parents the described controls using the hierarchy_schematic_roles, without modifying the hierarchy"""
+        for parent_role, child_roles in self.hierarchy_schematic_roles.items():
+            parent_ctrl = self.control_by_role[parent_role]
+
+            for child_role in child_roles:
+                self.control_by_role[child_role].parent_key = parent_ctrl.rig_key
+
+    def generate_manual_controls(self, hierarchy_controller: unreal.RigHierarchyController):
+        """Describes the manual controls, then creates them one at a time"""
+        self.describe_manual_controls()
+        self.build_manual_controls(hierarchy_controller)
+
+    def build_manual_controls(self, hierarchy_controller: unreal.RigHierarchyController):
+        """Creates the described controls one at a time, and parents them using the hierarchy_schematic_roles"""
+        for control in self.control_by_role.values():
+            control.build(hierarchy_controller)
+            control.apply_description()
+
+        self.initialize_hierarchy(hierarchy_controller)
+
+    def initialize_hierarchy(self, hierarchy_controller: unreal.RigHierarchyController):
+        """Performs the hierarchical restructuring of the internal components controls
+
+        Controls placed by their offset keep their identity local transform, see `CR_Control.is_placed_by_offset`.
+        """
+        # Parent control hierarchy using roles
+        for parent_role in self.hierarchy_schematic_roles.keys():
+            child_roles = self.hierarchy_schematic_roles[parent_role]
+
+            parent_ctrl = self.control_by_role[parent_role]
+
+            for child_role in child_roles:
+                child_ctrl = self.control_by_role[child_role]
+                hierarchy_controller.set_parent(child_ctrl.rig_key, parent_ctrl.rig_key,
+                                                not child_ctrl.is_placed_by_offset())
+
     def init_input_data(self, controller: unreal.RigVMController):
         """OVERLOAD THIS METHOD
 
-        This method should handle all input node data population
+        This method should handle the input node data that can not be planned, as it depends on the generated
+        controls, see `ComponentPlanner.plan_input_data`
         """
         pass
 
@@ -230,6 +288,12 @@ class UEComponent(object):
         """Gets all miscellaneous functions relating to this component"""
         return self.nodes["misc_functions"]
 
+    def get_layout_nodes(self) -> list[unreal.RigVMNode]:
+        """Gets the nodes that are grouped by the comment node, the function nodes of each evaluation path,
+        followed by the miscellaneous nodes"""
+        return (self.nodes['construction_functions'] + self.nodes['forward_functions'] +
+                self.nodes['backwards_functions'] + self.nodes['misc_functions'])
+
     def set_side_colour(self, controller: unreal.RigVMController):
         """Sets the controls default colour depending on the side"""
 
@@ -261,125 +325,8 @@ class UEComponent(object):
                 '1.000000',
                 False)
 
-    def _init_master_joint_node(self, controller, node_name: str, bones):
-        """Create the bone node, that will contain a list of all the bones that need to be
-        driven.
-
-        TODO: This could be made more generic and reusable
-        """
-
-        # Creates an Item Array Node to the control rig
-        node = controller.add_unit_node_from_struct_path(
-            '/Script/ControlRig.RigUnit_ItemArray',
-            'Execute',
-            unreal.Vector2D(-54.908936, 204.649109),
-            node_name)
-
-        default_values = ""
-        for i, bone in enumerate(bones):
-            bone_name = str(bone.key.name)
-            default_values += f'(Type=Bone,Name="{bone_name}"),'
-
-        # trims off the extr ','
-        default_values = default_values[:-1]
-        # Populates and resizes the pin in one go
-        controller.set_pin_default_value(f'{node_name}.Items',
-                                         f'({default_values})',
-                                         True,
-                                         setup_undo_redo=True,
-                                         merge_undo_action=True)
-
-        return node
-
     # DEVELOPMENT!!!!!!!
 
     def __repr__(self):
         data = f"Component Name : {self.name}"
         return data
-
-    def _init_comment(self, controller: unreal.RigVMController):
-        """Creates the comment node"""
-
-        graph = controller.get_graph()
-
-        if not graph:
-            return
-
-        comment_node_name = self.name
-        comment_text = f"ueComponent: {self.name}"
-        node = graph.find_node_by_name(comment_node_name)
-
-        if node:
-            self.comment_node = node
-            return
-
-        # Create the comment node in unreal
-        self.comment_node = controller.add_comment_node(comment_text, node_name=comment_node_name)
-
-    def _fit_comment(self, controller: unreal.RigVMController):
-        """Tries to fit the comment to the nodes that were generated"""
-
-        raise NotImplementedError
-
-        # [ ] Loop over all the nodes in the component
-        # [ ] Build a size map of all the components
-        # [ ] Move comment block outside of the size mapped
-
-        # Stores the smallest position, as that will be the top left
-        pos = None
-
-        height = 0
-        width = 0
-
-        node_count = 0
-        node_offset_x = 0
-        node_offset_y = 0
-
-        max_node_width = 0
-
-        pre_size = None
-        y_spacing = 10
-
-        for flow_name in ['construction_functions', 'forward_functions', 'backwards_functions']:
-            nodes = self.nodes[flow_name]
-
-            for node in nodes:
-                # start with the position equal to the first node
-                if pos is None:
-                    pos = node.get_position()
-
-                if pre_size:
-                    controller.set_node_position(node,
-                                                 unreal.Vector2D(pos.x, pos.y + pre_size + (y_spacing * node_count)))
-
-                # Get top left most position
-                current_pos = node.get_position()
-
-                if current_pos.x < pos.x:
-                    pos.x = current_pos.x
-                if current_pos.y < pos.y:
-                    pos.y = current_pos.y
-
-                # stores the previous size
-                pre_size = node.get_size().y + pos.y
-
-                node_count += 1
-
-        for flow_name in ['construction_functions', 'forward_functions', 'backwards_functions']:
-            nodes = self.nodes[flow_name]
-            for node in nodes:
-                current_pos = node.get_position()
-                size = node.get_size()
-
-                height = height + size.y + 10
-
-                controller.set_node_position(node, unreal.Vector2D(pos.x, pos.y + height))
-
-
-def get_construction_node(comp: UEComponent, name) -> unreal.RigVMNode:
-    """Tries to return the construction node with the specified name"""
-    nodes = comp.nodes["construction_functions"]
-
-    for node in nodes:
-        if node.get_name() == name:
-            return node
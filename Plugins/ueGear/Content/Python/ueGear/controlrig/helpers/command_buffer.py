@@ -0,0 +1,300 @@
+"""
+Recording command buffer for the RigVMController.
+
+Building a rig issues thousands of controller calls, and each one is its own transaction with undo
+bookkeeping. While a build is running, the `ControllerCommandBuffer` stands in for the controller. It records
+the writes that only change a value on an existing node (node positions, sizes and pin defaults), drops the
+ones that are overwritten later in the build, and replays the rest in order inside a single undo bracket.
+
+Every other call is forwarded to the controller straight away, as the build reads its result, e.g. the node
+that `add_unit_node_from_struct_path` creates. Before a call is forwarded, the recorded writes of the nodes it
+references are flushed, so the controller sees the same order of operations for each node. Writes to
+different nodes do not depend on each other, and stay recorded.
+
+Reads that go through node and pin objects, e.g. `node.get_pins()`, bypass the buffer. Recorded writes never
+add or remove pins or links, so only the default values and the layout of the nodes are affected by that, and
+none of the components read those back during a build. The exception is a default value written to an array
+pin, which resizes the array, so the pin writes of a node are flushed before its pins are read through the
+`query_cache`.
+
+The buffer owns the `GraphQueryCache` of the graph, see `helpers.graph_cache`. `get_graph` returns a graph whose
+node lookups go through the cache, and every forwarded call invalidates the cached nodes it references.
+"""
+
+import unreal
+
+from ueGear.controlrig.helpers.graph_cache import CachedGraph, GraphQueryCache
+
+
+_RECORDED_OPERATIONS = {
+    "set_node_position": "position",
+    "set_node_position_by_name": "position",
+    "set_node_size": "size",
+    "set_node_size_by_name": "size",
+    "set_node_color": "color",
+    "set_node_color_by_name": "color",
+    "set_pin_default_value": "default_value",
+    "set_pin_expansion": "expansion",
+}
+"""Operations that are recorded, and the property they write to. Pin properties are also keyed by the pin path"""
+
+_PIN_DEFAULT_OPERATION = "set_pin_default_value"
+
+_READ_PREFIXES = ("get_", "is_", "can_", "find_")
+"""Forwarded calls with these prefixes only read the graph, and leave the query cache valid"""
+
+_PIN_OPERATIONS = {"add_link", "break_link", "break_all_links", "insert_array_pin", "add_array_pin",
+                   "remove_array_pin", "set_array_pin_size", "open_undo_bracket", "close_undo_bracket",
+                   "cancel_undo_bracket"}
+"""Forwarded calls that can change the pins of the nodes they reference, but never add, remove or rename a node"""
+
+
+class ControllerCommandBuffer:
+    """
+    Wraps a RigVMController, recording and coalescing value writes until the buffer is flushed.
+
+    All controller methods are available on the buffer, recorded operations return True, as their result is
+    only known once they are flushed. Failed writes are logged when the buffer is flushed.
+    """
+
+    def __init__(self, controller: unreal.RigVMController, undo_title: str = "ueGear Build"):
+        self.controller = controller
+        """The controller that the operations are forwarded to"""
+
+        self.undo_title = undo_title
+        """Title of the undo bracket that the recorded operations are flushed in"""
+
+        self._query_cache = None
+        self._graph = None
+
+        self._pending = {}
+        """Recorded operations per node name, in call order. Each entry is ((property, pin path), operation, args,
+        kwargs), the pin path is None for node properties"""
+
+        self._requested = {}
+        """Number of calls per operation, that have been made on the buffer"""
+
+        self._executed = {}
+        """Number of calls per operation, that have been made on the controller"""
+
+    def __getattr__(self, name):
+        attribute = getattr(self.controller, name)
+        if not callable(attribute):
+            return attribute
+
+        def forward(*args, **kwargs):
+            self._count(self._requested, name)
+            node_names = _get_referenced_node_names(args, kwargs)
+            for node_name in node_names:
+                self.flush_node(node_name)
+
+            result = self._execute(name, args, kwargs)
+
+            if self._query_cache is not None:
+                self._invalidate_query_cache(name, node_names)
+            return result
+
+        return forward
+
+    @property
+    def query_cache(self) -> GraphQueryCache:
+        """Node lookups and pins of the graph of the controller, shared by everything that uses the buffer"""
+        if self._query_cache is None:
+            self._query_cache = GraphQueryCache(self.controller.get_graph(), before_read=self.flush_node_pins)
+        return self._query_cache
+
+    def get_graph(self) -> CachedGraph:
+        """Returns the graph of the controller, its node lookups are answered by the query cache"""
+        if self._graph is None:
+            self._graph = CachedGraph(self.controller.get_graph(), self.query_cache)
+        return self._graph
+
+    # ------ Recorded operations -------
+
+    def set_node_position(self, node, *args, **kwargs):
+        return self._record("set_node_position", str(node.get_name()), None, node, args, kwargs)
+
+    def set_node_position_by_name(self, node_name, *args, **kwargs):
+        return self._record("set_node_position_by_name", node_name, None, node_name, args, kwargs)
+
+    def set_node_size(self, node, *args, **kwargs):
+        return self._record("set_node_size", str(node.get_name()), None, node, args, kwargs)
+
+    def set_node_size_by_name(self, node_name, *args, **kwargs):
+        return self._record("set_node_size_by_name", node_name, None, node_name, args, kwargs)
+
+    def set_node_color(self, node, *args, **kwargs):
+        return self._record("set_node_color", str(node.get_name()), None, node, args, kwargs)
+
+    def set_node_color_by_name(self, node_name, *args, **kwargs):
+        return self._record("set_node_color_by_name", node_name, None, node_name, args, kwargs)
+
+    def set_pin_default_value(self, pin_path, *args, **kwargs):
+        # The default value of an array pin sets its size, so the pins of the node have to be read again
+        if self._query_cache is not None:
+            self._query_cache.invalidate_pins(_get_node_name(pin_path))
+        return self._record("set_pin_default_value", _get_node_name(pin_path), pin_path, pin_path, args, kwargs)
+
+    def set_pin_expansion(self, pin_path, *args, **kwargs):
+        return self._record("set_pin_expansion", _get_node_name(pin_path), pin_path, pin_path, args, kwargs)
+
+    # ------ Buffer management -------
+
+    @property
+    def pending_count(self) -> int:
+        """Number of recorded operations that have not been flushed yet"""
+        return sum(len(entries) for entries in self._pending.values())
+
+    def flush_node(self, node_name: str):
+        """Sends the recorded operations of a single node to the controller"""
+        entries = self._pending.pop(node_name, None)
+        if not entries:
+            return
+
+        for _, operation, args, kwargs in entries:
+            self._replay(operation, args, kwargs)
+
+    def flush_node_pins(self, node_name: str):
+        """Sends the recorded pin writes of a single node to the controller, its node layout stays recorded"""
+        entries = self._pending.get(node_name, None)
+        if not entries:
+            return
+
+        # Pin writes and node layout writes do not affect each other, so their order can be changed
+        remaining = []
+        for entry in entries:
+            (_, pin_path), operation, args, kwargs = entry
+            if pin_path is None:
+                remaining.append(entry)
+            else:
+                self._replay(operation, args, kwargs)
+
+        if remaining:
+            self._pending[node_name] = remaining
+        else:
+            del self._pending[node_name]
+
+    def flush(self):
+        """
+        Sends all recorded operations to the controller, in the order they were recorded per node.
+
+        The operations are grouped into a single undo action.
+        """
+        if not self._pending:
+            return
+
+        self.controller.open_undo_bracket(self.undo_title)
+        try:
+            for node_name in list(self._pending.keys()):
+                self.flush_node(node_name)
+        finally:
+            self.controller.close_undo_bracket()
+
+    def discard(self):
+        """Drops every recorded operation, without sending it to the controller"""
+        self._pending.clear()
+
+    def get_operation_counts(self) -> dict:
+        """
+        Returns the number of requested and executed calls per operation.
+
+        :return: Operation name, to a dictionary with the `requested` and `executed` call counts.
+        :rtype: dict[str, dict[str, int]]
+        """
+        return {operation: {"requested": requested, "executed": self._executed.get(operation, 0)}
+                for operation, requested in self._requested.items()}
+
+    def get_query_counts(self) -> dict:
+        """Returns the graph queries that were answered by the query cache (`hits`) and by the graph (`misses`),
+        empty if the query cache was not used"""
+        if self._query_cache is None:
+            return {}
+        return {"hits": self._query_cache.hits, "misses": self._query_cache.misses}
+
+    def log_operation_counts(self):
+        """Logs the call counts of every operation, most requested first"""
+        counts = self.get_operation_counts()
+        requested_total = sum(count["requested"] for count in counts.values())
+        executed_total = sum(count["executed"] for count in counts.values())
+
+        unreal.log(f"RigVMController calls: {executed_total} executed, {requested_total} requested")
+        for operation, count in sorted(counts.items(), key=lambda item: item[1]["requested"], reverse=True):
+            unreal.log(f"  {operation}: {count['executed']} executed, {count['requested']} requested")
+
+    def _record(self, operation, node_name, pin_path, target, args, kwargs):
+        self._count(self._requested, operation)
+
+        entries = self._pending.setdefault(node_name, [])
+        key = (_RECORDED_OPERATIONS[operation], pin_path)
+        entry = (key, operation, (target,) + args, kwargs)
+
+        # The previous write is only replaced when no write to an overlapping pin came after it, as the
+        # order matters when a parent pin is resized and its sub pins are then set
+        for index in range(len(entries) - 1, -1, -1):
+            existing_key = entries[index][0]
+            if existing_key == key:
+                entries[index] = entry
+                return True
+            if _is_overlapping_pin(existing_key[1], pin_path):
+                break
+
+        entries.append(entry)
+        return True
+
+    def _invalidate_query_cache(self, operation, node_names):
+        """Forgets what the forwarded operation may have changed"""
+        if operation in _PIN_OPERATIONS:
+            for node_name in node_names:
+                self._query_cache.invalidate_pins(node_name)
+        elif not operation.startswith(_READ_PREFIXES):
+            for node_name in node_names:
+                self._query_cache.invalidate_node(node_name)
+            self._query_cache.invalidate_missing_nodes()
+
+    def _replay(self, operation, args, kwargs):
+        result = self._execute(operation, args, kwargs)
+        if operation == _PIN_DEFAULT_OPERATION and result is False:
+            unreal.log_error(f"Setting Pin failed: {args[0]} << {args[1]}")
+
+    def _execute(self, operation, args, kwargs):
+        self._count(self._executed, operation)
+        return getattr(self.controller, operation)(*args, **kwargs)
+
+    @staticmethod
+    def _count(counts: dict, operation: str):
+        counts[operation] = counts.get(operation, 0) + 1
+
+
+def _get_node_name(path: str) -> str:
+    """Returns the node name of a pin path, or the name itself if it is not a pin path"""
+    return path.split(".", 1)[0]
+
+
+def _is_overlapping_pin(path_a: str, path_b: str) -> bool:
+    """Returns True if one pin path is the same as, or a sub pin of, the other pin path"""
+    if path_a is None or path_b is None:
+        return False
+    if path_a == path_b:
+        return True
+    shorter, longer = sorted((path_a, path_b), key=len)
+    return longer.startswith(shorter + ".")
+
+
+def _get_referenced_node_names(args, kwargs) -> set:
+    """Gathers the names of the nodes, that are passed to a controller method as names, pin paths or objects"""
+    node_names = set()
+
+    values = list(args) + list(kwargs.values())
+    while values:
+        value = values.pop()
+        if isinstance(value, str):
+            node_names.add(_get_node_name(value))
+        elif isinstance(value, (list, tuple)):
+            values.extend(value)
+        elif hasattr(value, "get_node"):
+            # Pins resolve to the node they belong to
+            node_names.add(value.get_node().get_name())
+        elif hasattr(value, "get_name"):
+            node_names.add(str(value.get_name()))
+
+    return node_names
@@ -0,0 +1,191 @@
+"""
+Component plans, the graph changes of a component computed before the graph is modified.
+
+A component is built in two phases. The precompute phase reads the mGear metadata of the component and records
+every node, pin default value and link that the component needs in a `ComponentPlan`: the comment node, the
+function nodes, the bone nodes and the control data. The apply phase replays the plan on the RigVM controller.
+
+The plans are computed by the planners of the components, see `ueGear.controlrig.planners`. Nothing in this
+module, or in the planners, imports the `unreal` module, the engine is only used by `ComponentPlan.apply`. The
+components can be planned in a pool of worker processes, see `plan_components`, and the plans can be cached,
+compared and benchmarked outside of the editor.
+
+Node names are derived from the component name and its function names, see
+`ComponentPlanner.get_function_node_name`, so a plan can refer to the function nodes before they exist.
+"""
+
+COMMENT_NODE = "comment_node"
+FUNCTION_NODE = "function_node"
+UNIT_NODE = "unit_node"
+TEMPLATE_NODE = "template_node"
+ARRAY_NODE = "array_node"
+
+SET_PIN_DEFAULT_VALUE = "set_pin_default_value"
+ADD_LINK = "add_link"
+LOG_WARNING = "log_warning"
+LOG_ERROR = "log_error"
+
+
+class ComponentPlan:
+    """
+    The nodes, pin default values and links of a component, in the order they are applied.
+    """
+
+    def __init__(self, component_name: str):
+        self.component_name = component_name
+        """Name of the ueGear component the plan was computed for"""
+
+        self.nodes = []
+        """The nodes of the component, as (node type, arguments) tuples. The node name is the first argument"""
+
+        self.operations = []
+        """The pin default values, links and messages, as (operation name, arguments) tuples"""
+
+    def __len__(self):
+        return len(self.nodes) + len(self.operations)
+
+    def __eq__(self, other):
+        if not isinstance(other, ComponentPlan):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return f"ComponentPlan({self.component_name}, {len(self.nodes)} nodes, {len(self.operations)} operations)"
+
+    @property
+    def array_nodes(self) -> list[str]:
+        """Names the make array nodes are created with, see `manager.create_array_node`"""
+        return [args[0] for node_type, args in self.nodes if node_type == ARRAY_NODE]
+
+    def add_comment_node(self, name: str, text: str):
+        """Adds the comment node that groups the nodes of the component"""
+        self.nodes.append((COMMENT_NODE, (name, text)))
+
+    def add_function_node(self, name: str, evaluation_path: str, function_name: str):
+        """Adds a reference node, of a function of the ueGear function library"""
+        self.nodes.append((FUNCTION_NODE, (name, evaluation_path, function_name)))
+
+    def add_unit_node(self, name: str, struct_path: str, method_name: str, x: float, y: float):
+        """Adds a rig unit node, such as an item array"""
+        self.nodes.append((UNIT_NODE, (name, struct_path, method_name, x, y)))
+
+    def add_template_node(self, name: str, notation: str, x: float, y: float):
+        """Adds a template node, such as an array get at index node"""
+        self.nodes.append((TEMPLATE_NODE, (name, notation, x, y)))
+
+    def add_array_node(self, name: str) -> str:
+        """Adds a make array node, returns the name of the node that will be created"""
+        self.nodes.append((ARRAY_NODE, (name,)))
+        return f"{name}_arrayNode"
+
+    def set_pin_default_value(self, pin_path: str, default_value: str, resize_arrays: bool = True):
+        """Sets the default value of a pin, array pins are resized to the value when resize_arrays is enabled"""
+        self.operations.append((SET_PIN_DEFAULT_VALUE, (pin_path, default_value, resize_arrays)))
+
+    def add_link(self, output_pin_path: str, input_pin_path: str):
+        """Links two pins"""
+        self.operations.append((ADD_LINK, (output_pin_path, input_pin_path)))
+
+    def log_warning(self, message: str):
+        """Logs the warning when the plan is applied"""
+        self.operations.append((LOG_WARNING, (message,)))
+
+    def log_error(self, message: str):
+        """Logs the error when the plan is applied"""
+        self.operations.append((LOG_ERROR, (message,)))
+
+    def apply(self, controller, component):
+        """
+        Creates the nodes that do not exist yet, then sets the pin default values, creates the links and logs the
+        messages, in the order they were planned.
+
+        :param controller: The unreal.RigVMController of the graph.
+        :param component: The ueGear component. The function nodes are added to its nodes by evaluation path,
+            the comment node is stored as its comment node, and every other node is added to its miscellaneous
+            nodes.
+        """
+        import unreal
+        import ueGear.controlrig.manager as ueMan
+        from ueGear.controlrig.paths import CONTROL_RIG_FUNCTION_PATH
+
+        graph = controller.get_graph()
+
+        for node_type, args in self.nodes:
+            if node_type == ARRAY_NODE:
+                array_name = ueMan.create_array_node(args[0], controller)
+                component.add_misc_function(graph.find_node_by_name(array_name))
+                continue
+
+            node_name = args[0]
+            node = graph.find_node_by_name(node_name)
+
+            if node_type == COMMENT_NODE:
+                if node is None:
+                    node = controller.add_comment_node(args[1], node_name=node_name)
+                component.comment_node = node
+
+            elif node_type == FUNCTION_NODE:
+                evaluation_path, function_name = args[1:]
+                if node is None:
+                    node = controller.add_external_function_reference_node(CONTROL_RIG_FUNCTION_PATH,
+                                                                           function_name,
+                                                                           unreal.Vector2D(0.0, 0.0),
+                                                                           node_name=node_name)
+                else:
+                    unreal.log_error(f"  Cannot create function {node_name}, it already exists")
+                component.nodes[evaluation_path].append(node)
+
+            else:
+                if node is None and node_type == UNIT_NODE:
+                    struct_path, method_name, x, y = args[1:]
+                    node = controller.add_unit_node_from_struct_path(struct_path, method_name,
+                                                                     unreal.Vector2D(x, y), node_name)
+                elif node is None:
+                    notation, x, y = args[1:]
+                    node = controller.add_template_node(notation, unreal.Vector2D(x, y), node_name)
+                component.add_misc_function(node)
+
+        for operation, args in self.operations:
+            if operation == SET_PIN_DEFAULT_VALUE:
+                # A command buffer defers the write and returns True, it logs a failure when the write is flushed
+                if not controller.set_pin_default_value(*args, setup_undo_redo=True, merge_undo_action=True):
+                    unreal.log_error(f"[{self.component_name}] Setting Pin failed: {args[0]}")
+            elif operation == ADD_LINK:
+                controller.add_link(*args)
+            elif operation == LOG_WARNING:
+                unreal.log_warning(*args)
+            else:
+                unreal.log_error(*args)
+
+    def to_dict(self) -> dict:
+        """Returns the plan as JSON serialisable data, so it can be cached"""
+        return {"component_name": self.component_name,
+                "nodes": [[node_type, list(args)] for node_type, args in self.nodes],
+                "operations": [[operation, list(args)] for operation, args in self.operations]}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ComponentPlan":
+        plan = cls(data["component_name"])
+        plan.nodes = [(node_type, tuple(args)) for node_type, args in data["nodes"]]
+        plan.operations = [(operation, tuple(args)) for operation, args in data["operations"]]
+        return plan
+
+
+def plan_components(planners: list, executor=None) -> dict[str, ComponentPlan]:
+    """
+    Runs the precompute phase of the components.
+
+    :param list planners: The planners of the ueGear components, see `UEComponent.create_planner`.
+    :param executor: A `concurrent.futures.Executor` the components are planned with, they are planned one after
+        the other if None. Detached copies of the planners are sent to the executor, so it can be a process pool
+        whose workers do not have the `unreal` module.
+    :return: The plans by component name.
+    """
+    if executor is None:
+        plans = [planner.create_plan() for planner in planners]
+    else:
+        from ... import mgear_worker
+
+        plans = list(executor.map(mgear_worker.plan_component, [planner.detached_copy() for planner in planners]))
+
+    return {plan.component_name: plan for plan in plans}
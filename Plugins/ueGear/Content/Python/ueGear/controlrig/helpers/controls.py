@@ -1,5 +1,7 @@
 import unreal
 
+from ueGear import transforms
+
 
 class CR_Control:
     """
@@ -22,10 +24,70 @@ class CR_Control:
 
         self.settings = unreal.RigControlSettings()
 
+        # -- Description, used when the control is created with the rest of the hierarchy --
+
+        self.parent_key: unreal.RigElementKey = None
+        """Key of the element the control is parented under"""
+
+        self.initial_transform: unreal.Transform = None
+        """Global initial transform of the control"""
+
+        self.shape_pos = None
+        self.shape_rotation = None
+        self.shape_scale = None
+
     def set_control_type(self, cr_type:unreal.RigElementType):
         self.ctrl_type = cr_type
         self.rig_key = unreal.RigElementKey(type=self.ctrl_type, name=self.name)
 
+    def describe(self, transform: unreal.Transform, shape_pos=None, shape_rotation=None, shape_scale=None):
+        """
+        Stores the transform and the shape transform of the control, without creating it. The control is
+        created from its description, either on its own with `build` and `apply_description`, or with the rest
+        of the hierarchy using `build_control_hierarchy`.
+        """
+        self.initial_transform = transform
+        self.shape_pos = shape_pos
+        self.shape_rotation = shape_rotation
+        self.shape_scale = shape_scale
+
+    def is_placed_by_offset(self) -> bool:
+        """
+        Returns True if the control is placed by its offset transform. Such a control has an identity local
+        transform, so it is parented without keeping its global transform and only its offset is written.
+        Nulls and controls without a described transform keep their global transform instead.
+        """
+        return self.ctrl_type != unreal.RigElementType.NULL and self.initial_transform is not None
+
+    def apply_description(self):
+        """Sets the described transform and shape transform on the built control"""
+        if self.initial_transform is not None:
+            self.set_transform(quat_transform=self.initial_transform)
+
+        if self.ctrl_type == unreal.RigElementType.NULL:
+            return
+
+        if self.shape_pos or self.shape_rotation or self.shape_scale:
+            self.shape_transform_global(pos=self.shape_pos, rotation=self.shape_rotation, scale=self.shape_scale)
+
+    def get_shape_transform(self) -> unreal.Transform:
+        """Returns the described shape transform, unset attributes keep the values of a new control"""
+        shape_trans = unreal.Transform()
+
+        if self.shape_pos:
+            shape_trans.translation = unreal.Vector(self.shape_pos[0], self.shape_pos[1], self.shape_pos[2])
+
+        if self.shape_rotation:
+            temp_quat = unreal.Quat()
+            temp_quat.set_from_euler(
+                unreal.Vector(self.shape_rotation[0], self.shape_rotation[1], self.shape_rotation[2]))
+            shape_trans.rotation = temp_quat
+
+        if self.shape_scale:
+            shape_trans.scale3d = unreal.Vector(self.shape_scale[0], self.shape_scale[1], self.shape_scale[2])
+
+        return shape_trans
+
     def build(self, hierarchy_controller):
         self.hierarchy_ctrlr = hierarchy_controller
 
@@ -272,3 +334,156 @@ class CR_Control:
 
         # updated hierarchy
         rig_hrc.set_parent(parent_rekey, child_rekey, True)
+
+
+def _element_id(rig_key: unreal.RigElementKey) -> tuple:
+    """Returns a hashable identifier of the rig element"""
+    return str(rig_key.type), str(rig_key.name)
+
+
+def sort_parents_first(control_list: list[CR_Control]) -> list[CR_Control]:
+    """Orders the controls so that every control comes after the control it is parented under, the order of
+    the list is kept otherwise"""
+    control_by_id = {_element_id(control.rig_key): control for control in control_list}
+
+    ordered = []
+    visited = set()
+    for control in control_list:
+        # Walks up to the first parent that is already ordered, then adds the branch from the top down
+        branch = []
+        current = control
+        while current is not None and id(current) not in visited:
+            visited.add(id(current))
+            branch.append(current)
+            if current.parent_key is None:
+                break
+            current = control_by_id.get(_element_id(current.parent_key), None)
+
+        ordered.extend(reversed(branch))
+
+    return ordered
+
+
+def solve_offset_transforms(control_list: list[CR_Control], rig_hierarchy: unreal.RigHierarchy = None) -> list:
+    """
+    Solves the offset transform of every control, its initial transform relative to the initial transform of
+    its parent. Controls without a parent are offset by their initial transform. Controls without an initial
+    transform are not solved, they keep the transform they already have.
+
+    Controls have an identity local transform, so the global transform of every described parent is its initial
+    transform, and the offsets are solved together in one vectorized pass, see
+    `ueGear.transforms.relative_transforms`. The transforms of parents that are not in the list, or that have no
+    initial transform, are read from the hierarchy once each.
+
+    :param list[CR_Control] control_list: Controls ordered so that parents come before their children, see
+        `sort_parents_first`.
+    :param unreal.RigHierarchy rig_hierarchy: Hierarchy the transforms of the other parents are read from.
+    :return: The offset transform of each control, in the order of the list, or None for the controls without
+        an initial transform.
+    :rtype: list[unreal.Transform or None]
+    """
+    global_transforms = {}
+    for control in control_list:
+        if control.initial_transform is not None:
+            global_transforms[_element_id(control.rig_key)] = control.initial_transform
+
+    solved_controls = [control for control in control_list if control.initial_transform is not None]
+
+    child_transforms = []
+    parent_transforms = []
+    for control in solved_controls:
+        child_transforms.append(control.initial_transform)
+
+        if control.parent_key is None:
+            parent_transforms.append(unreal.Transform())
+            continue
+
+        parent_id = _element_id(control.parent_key)
+        if parent_id not in global_transforms:
+            global_transforms[parent_id] = rig_hierarchy.get_global_transform(control.parent_key, True)
+        parent_transforms.append(global_transforms[parent_id])
+
+    if not child_transforms:
+        offsets = []
+    elif not transforms.NUMPY_AVAILABLE:
+        offsets = [child.make_relative(parent) for child, parent in zip(child_transforms, parent_transforms)]
+    else:
+        offsets = transforms.to_unreal_transforms(*transforms.relative_transforms(
+            *transforms.from_unreal_transforms(child_transforms),
+            *transforms.from_unreal_transforms(parent_transforms)))
+
+    solved_offsets = iter(offsets)
+    return [next(solved_offsets) if control.initial_transform is not None else None for control in control_list]
+
+
+def build_control_hierarchy(hierarchy_controller: unreal.RigHierarchyController,
+                            control_list: list[CR_Control]) -> int:
+    """
+    Creates the described controls and nulls in bulk, see `CR_Control.describe`.
+
+    Everything is computed before the hierarchy is modified. The controls are ordered so that parents are
+    created before their children, and the offsets of all the controls are solved together, see
+    `solve_offset_transforms`. Every element is then added directly under its parent, and each control
+    has its offset and shape transforms written once. Nothing is read back from the hierarchy, apart from the
+    existing keys and the transforms of parents that are not in the list.
+
+    Elements that already exist are moved under their parent and have their transforms reset, instead of being
+    added again. Controls without an initial transform keep the offset they are created with.
+
+    :return: The number of elements that were added.
+    :rtype: int
+    """
+    rig_hrc = hierarchy_controller.get_hierarchy()
+    existing_ids = {_element_id(rig_key) for rig_key in rig_hrc.get_all_keys()}
+
+    ordered_controls = sort_parents_first(control_list)
+    offset_transforms = solve_offset_transforms(ordered_controls, rig_hrc)
+
+    identity_value = unreal.RigHierarchy.make_control_value_from_euler_transform(
+        unreal.EulerTransform(
+            location=[0.000000, 0.000000, 0.000000],
+            rotation=[0.000000, -0.000000, 0.000000],
+            scale=[1.000000, 1.000000, 1.000000]
+        )
+    )
+
+    added_count = 0
+
+    for control, offset_transform in zip(ordered_controls, offset_transforms):
+        control.hierarchy_ctrlr = hierarchy_controller
+        element_id = _element_id(control.rig_key)
+        transform = control.initial_transform if control.initial_transform is not None else unreal.Transform()
+        parent_key = control.parent_key
+
+        is_null = control.ctrl_type == unreal.RigElementType.NULL
+
+        if element_id in existing_ids:
+            if parent_key is not None:
+                hierarchy_controller.set_parent(control.rig_key, parent_key, False)
+
+            if is_null:
+                rig_hrc.set_global_transform(control.rig_key, transform, initial=True, affect_children=False)
+                continue
+
+            rig_hrc.set_local_transform(control.rig_key, unreal.Transform(), initial=True, affect_children=False)
+
+        else:
+            parent = parent_key if parent_key is not None else control.parent
+
+            if is_null:
+                control.rig_key = hierarchy_controller.add_null(control.name, parent, transform, True)
+                control.name = control.rig_key.name
+                added_count += 1
+                continue
+
+            control._setup_default_control_configuration()
+            control.rig_key = hierarchy_controller.add_control(control.name, parent, control.settings, identity_value)
+            control.name = control.rig_key.name
+            added_count += 1
+
+        if offset_transform is not None:
+            rig_hrc.set_control_offset_transform(control.rig_key, offset_transform, initial=True,
+                                                 affect_children=False)
+        rig_hrc.set_control_shape_transform(control.rig_key, control.get_shape_transform(), True)
+
+    return added_count
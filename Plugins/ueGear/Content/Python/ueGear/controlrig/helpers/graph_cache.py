@@ -0,0 +1,167 @@
+"""
+Query cache for the RigVM graph that is being built.
+
+Every call on a node or pin crosses from Python into the engine, and the build asks the same nodes for their
+pins many times: to check that a pin exists, to count the elements of an array pin and to measure the node.
+The `GraphQueryCache` reads the pins of each node once, and keeps the result as plain Python values. It also
+remembers the result of every `find_node_by_name`.
+
+The cache is owned by the `ControllerCommandBuffer`, which invalidates it whenever it forwards a call that can
+add, remove or change nodes. Changes made to the graph without the buffer are not seen by the cache.
+"""
+
+import unreal
+
+
+class PinInfo:
+    """Snapshot of a top level pin of a node"""
+
+    __slots__ = ("name", "display_name", "direction", "sub_pin_count")
+
+    def __init__(self, name: str, display_name: str, direction, sub_pin_count: int):
+        self.name = name
+        """Name of the pin, as used in the pin path"""
+
+        self.display_name = display_name
+        """Name of the pin, as displayed on the node"""
+
+        self.direction = direction
+        """The `unreal.RigVMPinDirection` of the pin"""
+
+        self.sub_pin_count = sub_pin_count
+        """Number of sub pins, the elements of an array pin or the members of a struct pin"""
+
+    def __repr__(self):
+        return f"PinInfo({self.name}, {self.direction}, sub_pins={self.sub_pin_count})"
+
+
+def snapshot_pins(node: unreal.RigVMNode) -> list[PinInfo]:
+    """Reads the top level pins of the node"""
+    return [PinInfo(str(pin.get_name()),
+                    str(pin.get_display_name()),
+                    pin.get_direction(),
+                    len(pin.get_sub_pins()))
+            for pin in node.get_pins()]
+
+
+class GraphQueryCache:
+    """
+    Caches the node lookups of a graph, and the pins of its nodes, by node name.
+    """
+
+    def __init__(self, graph: unreal.RigVMGraph, before_read=None):
+        self.graph = graph
+        """The graph that is queried"""
+
+        self.before_read = before_read
+        """Called with the node name before the pins of a node are read, so pending writes can be applied"""
+
+        self.hits = 0
+        """Number of queries that were answered from the cache"""
+
+        self.misses = 0
+        """Number of queries that were sent to the graph"""
+
+        self._nodes = {}
+        self._missing_nodes = set()
+        self._pins = {}
+
+    def find_node(self, node_name: str) -> unreal.RigVMNode:
+        """Returns the node with the name, or None if the graph has no such node"""
+        node = self._nodes.get(node_name, None)
+        if node is not None or node_name in self._missing_nodes:
+            self.hits += 1
+            return node
+
+        self.misses += 1
+        node = self.graph.find_node_by_name(node_name)
+        if node is None:
+            self._missing_nodes.add(node_name)
+        else:
+            self._nodes[node_name] = node
+        return node
+
+    def get_pins(self, node: unreal.RigVMNode) -> list[PinInfo]:
+        """Returns the snapshot of the top level pins of the node"""
+        node_name = str(node.get_name())
+        pins = self._pins.get(node_name, None)
+        if pins is not None:
+            self.hits += 1
+            return pins
+
+        self.misses += 1
+        if self.before_read is not None:
+            self.before_read(node_name)
+        pins = self._pins[node_name] = snapshot_pins(node)
+        return pins
+
+    def invalidate_node(self, node_name: str):
+        """Forgets the lookup and the pins of the node"""
+        self._nodes.pop(node_name, None)
+        self._pins.pop(node_name, None)
+
+    def invalidate_pins(self, node_name: str):
+        """Forgets the pins of the node"""
+        self._pins.pop(node_name, None)
+
+    def invalidate_missing_nodes(self):
+        """Forgets the lookups that found no node, as nodes may have been added to the graph"""
+        self._missing_nodes.clear()
+
+    def clear(self):
+        self._nodes.clear()
+        self._missing_nodes.clear()
+        self._pins.clear()
+
+
+class CachedGraph:
+    """
+    Stands in for a RigVMGraph, its node lookups are answered by the query cache. All other calls are
+    forwarded to the graph.
+    """
+
+    __slots__ = ("graph", "query_cache")
+
+    def __init__(self, graph: unreal.RigVMGraph, query_cache: GraphQueryCache):
+        self.graph = graph
+        self.query_cache = query_cache
+
+    def find_node_by_name(self, node_name: str) -> unreal.RigVMNode:
+        return self.query_cache.find_node(node_name)
+
+    def __getattr__(self, name):
+        return getattr(self.graph, name)
+
+    def __eq__(self, other):
+        if isinstance(other, CachedGraph):
+            other = other.graph
+        return self.graph == other
+
+    def __hash__(self):
+        return hash(self.graph)
+
+
+def get_query_cache(controller) -> GraphQueryCache:
+    """Returns the query cache of a command buffer, or None for a controller that is not recording"""
+    query_cache = getattr(controller, "query_cache", None)
+    return query_cache if isinstance(query_cache, GraphQueryCache) else None
+
+
+def get_pins(node: unreal.RigVMNode, query_cache: GraphQueryCache = None) -> list[PinInfo]:
+    """Returns the top level pins of the node, from the query cache when one is given"""
+    if query_cache is None:
+        return snapshot_pins(node)
+    return query_cache.get_pins(node)
+
+
+def find_pin(node: unreal.RigVMNode, pin_name: str, query_cache: GraphQueryCache = None,
+             display_name: bool = False) -> PinInfo:
+    """
+    Returns the top level pin of the node with the name, or None.
+
+    :param bool display_name: Matches the name displayed on the node, instead of the pin name.
+    """
+    for pin in get_pins(node, query_cache):
+        if (pin.display_name if display_name else pin.name) == pin_name:
+            return pin
+    return None
@@ -0,0 +1,219 @@
+"""
+Graph layout of the generated Control Rig components.
+
+Every component is laid out as a block: its function nodes are stacked in a column, inside the comment node
+that groups them. The blocks are then placed in layers that follow the component hierarchy, each depth of the
+hierarchy is a column, and the children of a component are stacked to the right of it.
+
+The layout only reads the nodes, the positions are returned so they can be applied to the graph in one pass.
+Each node is measured once from its pins, as the size of a RigVM node is only known to the graph editor.
+"""
+
+import unreal
+
+from ueGear.controlrig.helpers import graph_cache
+
+NODE_TITLE_HEIGHT = 40.0
+"""Height of the node title bar"""
+
+PIN_ROW_HEIGHT = 24.0
+"""Height of a single pin row of a node"""
+
+CHAR_WIDTH = 7.0
+"""Approximate width of a character of a pin or node title"""
+
+PIN_WIDTH = 40.0
+"""Width of the pin icon and its padding, on each side of the node"""
+
+MIN_NODE_WIDTH = 160.0
+"""Smallest width of a node"""
+
+NODE_SPACING = 40.0
+"""Vertical space between the nodes of a component"""
+
+COMMENT_PADDING = 40.0
+"""Space between the comment box and the nodes it contains"""
+
+COMMENT_HEADER = 60.0
+"""Height of the comment title, above the nodes"""
+
+COLUMN_SPACING = 160.0
+"""Horizontal space between the components of two hierarchy depths"""
+
+ROW_SPACING = 80.0
+"""Vertical space between sibling components"""
+
+
+class ComponentBlock:
+    """
+    Layout of a single component, the comment box and the nodes inside it.
+
+    The position of the block is the top left corner of the comment box.
+    """
+
+    __slots__ = ("name", "parent", "nodes", "offsets", "width", "height", "x", "y")
+
+    def __init__(self, name: str, parent: str = None):
+        self.name = name
+        """Name of the component"""
+
+        self.parent = parent
+        """Name of the parent component, None if the block is a root of the layout"""
+
+        self.nodes = []
+        """Nodes of the component, in the order they are stacked"""
+
+        self.offsets = []
+        """Position of each node, relative to the top left corner of the block"""
+
+        self.width = 0.0
+        self.height = 0.0
+        self.x = 0.0
+        self.y = 0.0
+
+    def get_node_positions(self) -> list[tuple]:
+        """Returns the nodes, with their position in the graph"""
+        return [(node, (self.x + x, self.y + y)) for node, (x, y) in zip(self.nodes, self.offsets)]
+
+
+def measure_node(node: unreal.RigVMNode, pins: list[graph_cache.PinInfo] = None) -> tuple[float, float]:
+    """
+    Estimates the size of the node in the graph editor, from its title and the names of its pins.
+
+    Input and output pins are drawn on their own rows, execution pins share the title row.
+
+    :param list pins: Pins of the node, e.g. from the `GraphQueryCache`. They are read from the node if not given.
+    :return: The width and height of the node.
+    :rtype: tuple[float, float]
+    """
+    if pins is None:
+        pins = graph_cache.snapshot_pins(node)
+
+    input_rows = 0
+    output_rows = 0
+    longest_input = 0
+    longest_output = 0
+
+    for pin in pins:
+        direction = pin.direction
+        name_length = len(pin.display_name)
+
+        if direction == unreal.RigVMPinDirection.INPUT:
+            input_rows += 1
+            longest_input = max(longest_input, name_length)
+        elif direction == unreal.RigVMPinDirection.OUTPUT:
+            output_rows += 1
+            longest_output = max(longest_output, name_length)
+
+    title_width = len(str(node.get_node_title())) * CHAR_WIDTH + PIN_WIDTH * 2
+    pins_width = (longest_input + longest_output) * CHAR_WIDTH + PIN_WIDTH * 2
+
+    width = max(MIN_NODE_WIDTH, title_width, pins_width)
+    height = NODE_TITLE_HEIGHT + (input_rows + output_rows) * PIN_ROW_HEIGHT
+    return width, height
+
+
+def stack_nodes(block: ComponentBlock, nodes: list, measure=measure_node):
+    """
+    Stacks the nodes of the component in a column, and sizes the block to fit them.
+
+    :param ComponentBlock block: Block of the component.
+    :param list nodes: The nodes, from top to bottom.
+    :param measure: Returns the width and height of a node.
+    """
+    block.nodes = list(nodes)
+    block.offsets = []
+
+    y = COMMENT_HEADER
+    width = 0.0
+    for node in block.nodes:
+        node_width, node_height = measure(node)
+        block.offsets.append((COMMENT_PADDING, y))
+        y += node_height + NODE_SPACING
+        width = max(width, node_width)
+
+    if block.nodes:
+        y -= NODE_SPACING
+
+    block.width = width + COMMENT_PADDING * 2
+    block.height = y + COMMENT_PADDING
+
+
+def layout_blocks(blocks: list[ComponentBlock], origin: tuple = (0.0, 0.0)):
+    """
+    Places the blocks so every component is to the right of its parent, in the column of its depth.
+
+    Children are stacked from the top of their parent, in the order of the list. A block whose parent is not in
+    the list is placed as a root, roots are stacked below each other.
+
+    :param list blocks: Blocks of all components.
+    :param tuple origin: Position of the first root block.
+    """
+    by_name = {block.name: block for block in blocks}
+
+    roots = []
+    children = {}
+    for block in blocks:
+        if block.parent in by_name:
+            children.setdefault(block.parent, []).append(block)
+        else:
+            roots.append(block)
+
+    # Orders the blocks parents first. Blocks that are parented in a cycle can not be reached from a root,
+    # the first of them is laid out as a root.
+    depths = {}
+    order = []
+    tree_children = {}
+    root_names = {block.name for block in roots}
+    for block in roots + blocks:
+        if block.name in depths:
+            continue
+        if block.name not in root_names:
+            root_names.add(block.name)
+            roots.append(block)
+
+        depths[block.name] = 0
+        index = len(order)
+        order.append(block)
+        while index < len(order):
+            parent = order[index]
+            index += 1
+            for child in children.get(parent.name, ()):
+                if child.name not in depths:
+                    depths[child.name] = depths[parent.name] + 1
+                    tree_children.setdefault(parent.name, []).append(child)
+                    order.append(child)
+
+    # Every depth is a column, as wide as its widest block
+    column_widths = {}
+    for block in order:
+        depth = depths[block.name]
+        column_widths[depth] = max(column_widths.get(depth, 0.0), block.width)
+
+    column_x = [origin[0]]
+    for depth in range(1, len(column_widths)):
+        column_x.append(column_x[-1] + column_widths[depth - 1] + COLUMN_SPACING)
+
+    # The height of a subtree is the larger of its block, and its stacked children. Walking the blocks
+    # backwards visits the children before their parent.
+    subtree_heights = {}
+    for block in reversed(order):
+        block_children = tree_children.get(block.name, ())
+        children_height = sum(subtree_heights[child.name] for child in block_children)
+        children_height += ROW_SPACING * max(len(block_children) - 1, 0)
+        subtree_heights[block.name] = max(block.height, children_height)
+
+    y = origin[1]
+    for root in roots:
+        pending = [(root, y)]
+        while pending:
+            block, block_y = pending.pop()
+            block.x = column_x[depths[block.name]]
+            block.y = block_y
+
+            child_y = block_y
+            for child in tree_children.get(block.name, ()):
+                pending.append((child, child_y))
+                child_y += subtree_heights[child.name] + ROW_SPACING
+
+        y += subtree_heights[root.name] + ROW_SPACING
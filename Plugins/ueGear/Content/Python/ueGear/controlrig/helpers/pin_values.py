@@ -0,0 +1,253 @@
+"""
+Text values of RigVM pins.
+
+`RigVMController.set_pin_default_value` takes the value of a pin as Unreal struct text, the format that
+`ImportText` reads. A struct is written as its fields in brackets, `(X=1.0,Y=0.0,Z=0.0)`, and an array as its
+elements in brackets, `((X=1.0,Y=0.0,Z=0.0),(X=0.0,Y=1.0,Z=0.0))`. Setting a whole array in one call, with
+`resize_arrays` enabled, is much faster than inserting and setting its elements one at a time.
+
+The encoders write every element once and join them, so the cost is linear in the length of the array. The
+decoders read the text back, they are used to validate the values that are written.
+
+The `unreal` module is only imported to read Unreal rig element types, so the values can be encoded in the worker
+processes that plan the components, see `component_plan`.
+"""
+
+UNIT_SCALE = "(X=1.0,Y=1.0,Z=1.0)"
+"""Scale3D of the transforms, the controls are created unscaled"""
+
+_QUOTED_CHARACTERS = frozenset(' ,()="\\')
+"""Names that contain any of these characters are written in quotes"""
+
+
+# ---------------------------------------------------------------------------------------------------------------
+# Encoders
+
+def _xyz(value):
+    """Returns the components of a vector, either an unreal.Vector or a sequence of 3 values"""
+    if hasattr(value, "x"):
+        return value.x, value.y, value.z
+    return value[0], value[1], value[2]
+
+
+def _quote(text: str) -> str:
+    escaped = text.replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+def encode_name(name) -> str:
+    """Returns the text of an FName, quoted if it contains separators"""
+    name = str(name)
+    if not name or _QUOTED_CHARACTERS.intersection(name):
+        return _quote(name)
+    return name
+
+
+def encode_names(names) -> str:
+    """Returns the text of an array of FNames"""
+    return f"({','.join([encode_name(name) for name in names])})"
+
+
+def encode_vector(value) -> str:
+    """Returns the text of an FVector, from an unreal.Vector or a sequence of 3 values"""
+    x, y, z = _xyz(value)
+    return f"(X={x},Y={y},Z={z})"
+
+
+def encode_vectors(values) -> str:
+    """Returns the text of an array of FVectors"""
+    return f"({','.join([encode_vector(value) for value in values])})"
+
+
+def encode_colour(colour) -> str:
+    """Returns the text of an FLinearColor, from a sequence of RGB or RGBA values. The alpha defaults to 1.0"""
+    alpha = colour[3] if len(colour) > 3 else 1.0
+    return f"(R={colour[0]},G={colour[1]},B={colour[2]},A={alpha})"
+
+
+def encode_colours(colours) -> str:
+    """Returns the text of an array of FLinearColors"""
+    return f"({','.join([encode_colour(colour) for colour in colours])})"
+
+
+def encode_transform(transform) -> str:
+    """
+    Returns the text of an FTransform, the rotation and translation of the transform with a unit scale.
+
+    :param transform: An unreal.Transform, or flat transform values, see `ControlTable.transforms`.
+    """
+    if hasattr(transform, "rotation"):
+        quat = transform.rotation
+        pos = transform.translation
+        qx, qy, qz, qw = quat.x, quat.y, quat.z, quat.w
+        x, y, z = pos.x, pos.y, pos.z
+    else:
+        x, y, z, qx, qy, qz, qw = transform[:7]
+    return (f"(Rotation=(X={qx},Y={qy},Z={qz},W={qw}),"
+            f"Translation=(X={x},Y={y},Z={z}),"
+            f"Scale3D={UNIT_SCALE})")
+
+
+def encode_transforms(transforms) -> str:
+    """Returns the text of an array of FTransforms"""
+    return f"({','.join([encode_transform(transform) for transform in transforms])})"
+
+
+def encode_element_key(name, element_type: str = "Bone") -> str:
+    """
+    Returns the text of an FRigElementKey.
+
+    :param str element_type: Name of the element type, Bone, Control, Null or Curve.
+    """
+    return f"(Type={element_type},Name={_quote(str(name))})"
+
+
+def encode_element_keys(names, element_type: str = "Bone") -> str:
+    """Returns the text of an array of FRigElementKeys, of elements that are all of the same type"""
+    return f"({','.join([encode_element_key(name, element_type) for name in names])})"
+
+
+def get_element_type_name(element_type: "unreal.RigElementType") -> str:
+    """Returns the name an unreal.RigElementType is written with"""
+    import unreal
+
+    for name in ("Bone", "Control", "Null", "Curve"):
+        if element_type == getattr(unreal.RigElementType, name.upper()):
+            return name
+    raise ValueError(f"Unsupported rig element type: {element_type}")
+
+
+def encode_rig_key(rig_key: "unreal.RigElementKey") -> str:
+    """Returns the text of an FRigElementKey, from an unreal.RigElementKey"""
+    return encode_element_key(rig_key.name, get_element_type_name(rig_key.type))
+
+
+def encode_rig_keys(rig_keys) -> str:
+    """Returns the text of an array of FRigElementKeys, from unreal.RigElementKeys"""
+    return f"({','.join([encode_rig_key(rig_key) for rig_key in rig_keys])})"
+
+
+# ---------------------------------------------------------------------------------------------------------------
+# Decoders
+
+class PinValueError(ValueError):
+    """Raised when the text of a pin value can not be read"""
+
+
+def _skip_space(text: str, index: int) -> int:
+    while index < len(text) and text[index].isspace():
+        index += 1
+    return index
+
+
+def _read_quoted(text: str, index: int):
+    characters = []
+    index += 1
+    while index < len(text):
+        character = text[index]
+        if character == "\\" and index + 1 < len(text):
+            characters.append(text[index + 1])
+            index += 2
+            continue
+        if character == '"':
+            return "".join(characters), index + 1
+        characters.append(character)
+        index += 1
+    raise PinValueError(f"Unterminated quote in: {text}")
+
+
+def _read_token(text: str, index: int):
+    start = index
+    while index < len(text) and text[index] not in ',()="':
+        index += 1
+    return text[start:index].strip(), index
+
+
+def _read_value(text: str, index: int):
+    index = _skip_space(text, index)
+    if index >= len(text):
+        raise PinValueError(f"Unexpected end of value: {text}")
+    if text[index] == "(":
+        return _read_group(text, index)
+    if text[index] == '"':
+        return _read_quoted(text, index)
+    return _read_token(text, index)
+
+
+def _read_group(text: str, index: int):
+    """Reads a bracketed group, a struct if its entries are fields, otherwise an array"""
+    entries = []
+    fields = {}
+    index = _skip_space(text, index + 1)
+
+    if index < len(text) and text[index] == ")":
+        return [], index + 1
+
+    while index < len(text):
+        start = index
+        value, index = _read_value(text, index)
+        index = _skip_space(text, index)
+
+        if index < len(text) and text[index] == "=":
+            if entries or not isinstance(value, str) or text[start] in '("':
+                raise PinValueError(f"Unexpected field at {start}: {text}")
+            fields[value], index = _read_value(text, index + 1)
+            index = _skip_space(text, index)
+        elif fields:
+            raise PinValueError(f"Expected a field at {start}: {text}")
+        else:
+            entries.append(value)
+
+        if index < len(text) and text[index] == ",":
+            index = _skip_space(text, index + 1)
+        elif index < len(text) and text[index] == ")":
+            return (fields if fields else entries), index + 1
+        else:
+            break
+
+    raise PinValueError(f"Unterminated bracket in: {text}")
+
+
+def decode(text: str):
+    """
+    Reads the text of a pin value. Structs are returned as dictionaries of their fields, arrays as lists and
+    values as strings.
+    """
+    value, index = _read_value(text, 0)
+    if _skip_space(text, index) != len(text):
+        raise PinValueError(f"Unexpected text at {index}: {text}")
+    return value
+
+
+def decode_names(text: str) -> list[str]:
+    return decode(text)
+
+
+def _as_xyz(fields: dict) -> tuple:
+    return float(fields["X"]), float(fields["Y"]), float(fields["Z"])
+
+
+def decode_vectors(text: str) -> list[tuple]:
+    return [_as_xyz(fields) for fields in decode(text)]
+
+
+def decode_colours(text: str) -> list[tuple]:
+    return [(float(fields["R"]), float(fields["G"]), float(fields["B"]), float(fields["A"]))
+            for fields in decode(text)]
+
+
+def decode_transforms(text: str) -> list[tuple]:
+    """Returns the (rotation XYZW, translation XYZ, scale XYZ) of each transform"""
+    transforms = []
+    for fields in decode(text):
+        rotation = fields["Rotation"]
+        transforms.append(((float(rotation["X"]), float(rotation["Y"]), float(rotation["Z"]),
+                            float(rotation["W"])),
+                           _as_xyz(fields["Translation"]),
+                           _as_xyz(fields["Scale3D"])))
+    return transforms
+
+
+def decode_element_keys(text: str) -> list[tuple]:
+    """Returns the (type, name) of each element key"""
+    return [(fields["Type"], fields["Name"]) for fields in decode(text)]
@@ -1,3 +1,9 @@
+import concurrent.futures
+import contextlib
+import json
+import multiprocessing
+import os
+import sys
 from typing import Optional
 
 import unreal
@@ -6,6 +12,21 @@ from ueGear import assets as ue_assets
 from ueGear.controlrig import mgear
 from ueGear.controlrig import components
 from ueGear.controlrig.components import EPIC_control_01
+from ueGear.controlrig.helpers import controls as manual_controls
+from ueGear.controlrig.helpers import graph_cache
+from ueGear.controlrig.helpers import layout as graph_layout
+from ueGear.controlrig.helpers.command_buffer import ControllerCommandBuffer
+from ueGear.controlrig.helpers import component_plan
+from ueGear.controlrig.helpers.component_plan import ComponentPlan
+from ueGear.controlrig.mgear import diff as mgear_diff
+from ueGear.controlrig.mgear.registry import ComponentRegistry
+from ueGear.controlrig.session import BuildSession, build_phase
+
+BUILD_HASHES_TAG = "ueGear.BuildHashes"
+"""Metadata tag of the Control Rig Blueprint, that stores the component hashes of the last build"""
+
+BUILD_HASHES_VERSION = 1
+"""Version of the stored build hashes. Stored hashes with a different version cause a full rebuild"""
 
 
 class UEGearManager:
@@ -23,9 +44,13 @@ class UEGearManager:
     mg_rig: mgear.mgRig = None
     """The mGear rig description, that is used to generate the ueGear 'Control Rig'"""
 
-    uegear_components: list[components.base_component.UEComponent] = []
+    build_plan: mgear.BuildPlan = None
+    """The order the mGear components are built in, parents first. Created when the rig is loaded"""
+
+    uegear_components: ComponentRegistry = None
     """Keeps track of all the created components that relate the the mGear Rig being created. There
-    are the components that were deserialised fomr the `.gnx` file"""
+    are the components that were deserialised fomr the `.gnx` file, stored by name and indexed by the type, side
+    and parent of their mGear metadata"""
 
     _buildConstructionControlFunctions = True
     """If True, When building the Control Rig all controls will be generated by the construction node(Function). The 
@@ -35,6 +60,25 @@ class UEGearManager:
     Build with this set to False if you wish to modify your rig post build.
     """
 
+    _buildManualControlsInBulk = True
+    """If True, the manual components only describe their controls when they are built, and the controls of all
+    the components are created together when the components are parented, see `build_manual_controls`. If False,
+    every control is created and positioned on its own, and the transforms are corrected after parenting.
+    """
+
+    _command_buffer: ControllerCommandBuffer = None
+    """Records the controller operations while a build is running, see `begin_command_buffer`"""
+
+    component_plans: dict[str, ComponentPlan] = None
+    """Precomputed control data of the components that have not been built yet, by component name. See
+    `plan_components`"""
+
+    _ancestor_function_table: dict = None
+    """Nearest ancestor function node per component and solve function, see `build_ancestor_function_table`"""
+
+    build_session: BuildSession = None
+    """The build that is running on the active blueprint, and records the duration of its phases"""
+
     # Thought: We could create a wrapper object that encompasses both mgear and ueGear rigs. keeping them more coupled, for easier data manipulation. but this will add to complexity.
 
     @property
@@ -65,8 +109,14 @@ class UEGearManager:
         self._active_blueprint = None
         self._ue_gear_standard_library = None
         self.mg_rig = None
-        self.uegear_components = []
+        self.build_plan = None
+        self.uegear_components = ComponentRegistry(get_component_data=_get_component_metadata)
         self._buildConstructionControlFunctions = True
+        self._buildManualControlsInBulk = True
+        self._command_buffer = None
+        self.component_plans = {}
+        self._ancestor_function_table = None
+        self.build_session = None
 
     def get_open_controlrig_blueprints(self):
         """Gets all open Control Rig Blueprints
@@ -119,6 +169,7 @@ class UEGearManager:
         self._active_blueprint.suspend_notifications(suspend)
 
     # todo: Add "manual" build for world control
+    @build_phase("world control")
     def build_world_control(self, force_build=False):
         """
         Generates the world contol. The control will come in at world origin
@@ -143,34 +194,23 @@ class UEGearManager:
 
         # Create Automatic built world control
         if self._buildConstructionControlFunctions:
-            # As the world control is not a specific component in mGear, we create a psudo
-            # component for it.
-            placeholder_component = mgear.mgComponent()
-            placeholder_component.name = "world"
-            placeholder_component.controls = [name]
-            placeholder_component.joints = None
-            placeholder_component.comp_type = "world_ctl"
-            # populating the boundin box
-            placeholder_component.controls_aabb = dict()
-            placeholder_component.controls_aabb[name] = [[0, 0, 0], [120.0, 120.0, 120.0]]
-
-            ueg_comp = EPIC_control_01.Component()
-            ueg_comp.metadata = placeholder_component
-            ueg_comp.name = name
+            ueg_comp = self._create_world_component(name)
 
-            self.uegear_components.append(ueg_comp)
+            self.uegear_components[ueg_comp.name] = ueg_comp
 
             ueg_comp.create_functions(controller)
 
             # Orients the control shape
-            ueg_comp.populate_control_shape_orientation(controller)
-            ueg_comp.populate_control_scale(controller)
+            planner = ueg_comp.create_planner()
+            plan = ComponentPlan(ueg_comp.name)
+            planner.plan_control_shape_orientation(plan)
+            planner.plan_control_scale(plan)
 
-            cr_func = ueg_comp.functions["construction_functions"][0]
-            construction_node = f"{ueg_comp.name}_{cr_func}"
-            controller.set_pin_default_value(f'{construction_node}.control_orientation.X',
-                                             '0.0',
-                                             False)
+            construction_node = planner.get_function_node_name()
+            plan.set_pin_default_value(f'{construction_node}.control_orientation.X',
+                                       '0.0',
+                                       False)
+            plan.apply(controller, ueg_comp)
 
         else:
             placeholder_component = mgear.mgComponent()
@@ -198,14 +238,59 @@ class UEGearManager:
             ueg_comp.metadata = placeholder_component
             ueg_comp.name = name
 
-            self.uegear_components.append(ueg_comp)
+            self.uegear_components[ueg_comp.name] = ueg_comp
 
             ueg_comp.create_functions(controller)
-            ueg_comp.generate_manual_controls(self._active_blueprint.get_hierarchy_controller())
+
+            if self._buildManualControlsInBulk:
+                ueg_comp.describe_manual_controls()
+
+                # Sets the world control's shape rotation to 0
+                ueg_comp.control_by_role["root"].shape_rotation = [0, 0, 0]
+                return
+
+            ueg_comp.generate_manual_controls(self.get_hierarchy_controller())
 
             # Sets the world control's shape rotation to 0
             ueg_comp.control_by_role["root"].shape_transform_global(rotation=[0, 0, 0])
 
+    @build_phase("world control")
+    def attach_world_control(self):
+        """
+        Registers the world control that a previous build generated, using its existing nodes.
+
+        Builds the world control if its nodes can not be found. Only automatically built world controls can be
+        attached.
+        """
+        if not self.mg_rig.settings["worldCtl"]:
+            return
+
+        ueg_comp = self._create_world_component(self.mg_rig.settings["world_ctl_name"])
+
+        if not self._attach_component_nodes(ueg_comp):
+            self.build_world_control()
+            return
+
+        self.uegear_components[ueg_comp.name] = ueg_comp
+
+    def _create_world_component(self, name: str) -> components.base_component.UEComponent:
+        """Creates the ueGear component of the automatically built world control"""
+        # As the world control is not a specific component in mGear, we create a psudo
+        # component for it.
+        placeholder_component = mgear.mgComponent()
+        placeholder_component.name = "world"
+        placeholder_component.controls = [name]
+        placeholder_component.joints = None
+        placeholder_component.comp_type = "world_ctl"
+        # populating the boundin box
+        placeholder_component.controls_aabb = dict()
+        placeholder_component.controls_aabb[name] = [[0, 0, 0], [120.0, 120.0, 120.0]]
+
+        ueg_comp = EPIC_control_01.Component()
+        ueg_comp.metadata = placeholder_component
+        ueg_comp.name = name
+        return ueg_comp
+
     def build_component(self, name, manual_component=False):
         """Create an individual component from the mgear scene desciptor file.
 
@@ -227,22 +312,51 @@ class UEGearManager:
             unreal.log_warning(f"Unable to find component, {name}")
             return None
 
-        guide_type = guide_component.comp_type
-        guide_name = guide_component.fullname
-
-        # Finds the ueGear Component class that matches the guide data class type.
-        ue_comp_classes = components.lookup_mgear_component(guide_type)
+        ueg_comp = self._instantiate_component(guide_component, manual_component)
 
         # If component not found, report error and exit early
-        if ue_comp_classes is None or not ue_comp_classes:
-            unreal.log_warning(f"Component not found : {guide_type}")
+        if ueg_comp is None:
+            unreal.log_warning(f"Component not found : {guide_component.comp_type}")
             return
 
+        self.uegear_components[ueg_comp.name] = ueg_comp
+
+        bp_controller = self.get_active_controller()
+
+        # Creates the function nodes, bone nodes and links, and populates the control data from the precomputed
+        # plan if the component was planned
+        plan = self.component_plans.pop(ueg_comp.name, None)
+        if plan is None:
+            plan = ueg_comp.create_plan()
+        plan.apply(bp_controller, ueg_comp)
+
+        # Only evaluates manual building on manual controls. In bulk, the controls are only described here and
+        # created once all the components are parented
+        if ueg_comp.is_manual and self._buildManualControlsInBulk:
+            ueg_comp.describe_manual_controls()
+        elif ueg_comp.is_manual:
+            ueg_comp.generate_manual_controls(self.get_hierarchy_controller())
+
+        # Reports the driven joints that can not be found on the skeleton
+        get_driven_joints(self, ueg_comp)
+
+        ueg_comp.populate_control_transforms(bp_controller)
+
+        ueg_comp.init_input_data(bp_controller)
+
+    def _instantiate_component(self, guide_component: mgear.mgComponent,
+                               manual_component: bool = False) -> Optional[components.base_component.UEComponent]:
+        """Creates the ueGear component of the mGear component, None if no ueGear component implements it"""
+        # Finds the ueGear Component class that matches the guide data class type.
+        ue_comp_classes = components.lookup_mgear_component(guide_component.comp_type)
+
+        if not ue_comp_classes:
+            return None
+
         ueg_comp_class = ue_comp_classes[0]
 
         # Instantiates the component
         if manual_component:
-            # self.set_compile_mode(True)
             # If manual component is enabled then it will try and instanciate the
             # second class in the component file, which should be the manual component
             ueg_comp_class = ue_comp_classes[1]
@@ -250,81 +364,186 @@ class UEGearManager:
         ueg_comp = ueg_comp_class()
         ueg_comp.metadata = guide_component  # Could be moved into the init of the ueGear component class
         ueg_comp.name = guide_component.fullname
+        return ueg_comp
 
-        # self.set_compile_mode(False)
+    @build_phase("precompute")
+    def plan_components(self, manual_components: bool = False, parallel: bool = False,
+                        max_workers: int = None) -> dict[str, ComponentPlan]:
+        """Runs the precompute phase of all components in the build plan, see `helpers.component_plan`.
 
-        self.uegear_components.append(ueg_comp)
+        The plans only read the mGear metadata, so no graph is needed. They are applied when the components are
+        built with `build_component`.
 
-        bp_controller = self.get_active_controller()
+        manual_components: Plans the manual components, see `build_component`.
+        parallel: Plans the components in worker processes, which do not need the `unreal` module.
+        max_workers: Amount of worker processes to use in parallel mode, defaults to the CPU count.
+        """
+        planners = []
+        for name in self.get_build_plan():
+            guide_component = self.mg_rig.components.get(name, None)
+            ueg_comp = self._instantiate_component(guide_component, manual_components) if guide_component else None
+            if ueg_comp is not None:
+                planners.append(ueg_comp.create_planner())
+
+        if not parallel or not planners:
+            self.component_plans = component_plan.plan_components(planners)
+            return self.component_plans
+
+        mp_context = multiprocessing.get_context("spawn")
+        python_executable = mgear._get_python_executable()
+        if python_executable != sys.executable:
+            mp_context.set_executable(python_executable)
+
+        with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers or os.cpu_count() or 1,
+                                                    mp_context=mp_context) as executor:
+            self.component_plans = component_plan.plan_components(planners, executor)
+        return self.component_plans
+
+    @build_phase("layout")
+    def group_components(self, component_names: set[str] = None):
+        """Lays out the nodes of all components that have been created, and fits a comment box around the nodes
+        of each component.
+
+        The components are placed following their hierarchy, children to the right of their parent, see
+        `helpers.layout`. Every node is measured and positioned once.
+
+        component_names: Only lays out these components, at the position they have in the full layout.
+        """
+        controller = self.get_active_controller()
+        query_cache = self.get_query_cache()
 
-        # Create Function Nodes
-        ueg_comp.create_functions(bp_controller)
+        def measure(node):
+            return graph_layout.measure_node(node, graph_cache.get_pins(node, query_cache))
 
-        # Only evaluates manual building on manual controls
-        # This is required to be placed here as we need to pass in the hierarchy controller.
-        if ueg_comp.is_manual:
-            ueg_comp.generate_manual_controls(self._active_blueprint.get_hierarchy_controller())
+        blocks = []
+        for ue_comp in self.uegear_components.values():
+            parent_name = ue_comp.parent_node.name if ue_comp.parent_node else None
+            block = graph_layout.ComponentBlock(ue_comp.name, parent_name)
+            graph_layout.stack_nodes(block, ue_comp.get_layout_nodes(), measure)
+            blocks.append(block)
 
-        # Setup Driven Joint
-        bones = get_driven_joints(self, ueg_comp)
-        ueg_comp.populate_bones(bones, bp_controller)
+        graph_layout.layout_blocks(blocks)
 
-        # populate control positions
-        ueg_comp.populate_control_transforms(bp_controller)
+        for block in blocks:
+            if component_names is not None and block.name not in component_names:
+                continue
 
-        ueg_comp.init_input_data(bp_controller)
+            for node, (x, y) in block.get_node_positions():
+                controller.set_node_position(node, unreal.Vector2D(x, y))
+
+            comment_node = self.uegear_components[block.name].comment_node
+            if comment_node:
+                controller.set_node_position(comment_node, unreal.Vector2D(block.x, block.y))
+                controller.set_node_size(comment_node, unreal.Vector2D(block.width, block.height))
 
-    def group_components(self):
-        """Loops over all components that have been created and generates a comment box and positions them in a
-        more human readilbe layout.
+    @build_phase("component build")
+    def build_components(self, manual_components: bool = False):
+        """Builds all components, in the order of the build plan.
+
+        As parents are built before their children, all the later build phases that loop over the created
+        components, process the hierarchy top down.
         """
-        controller = self.get_active_controller()
+        for name in self.get_build_plan():
+            self.build_component(name, manual_components)
 
-        for i, ue_comp in enumerate(self.uegear_components):
+    @build_phase("component build")
+    def attach_component(self, name: str) -> Optional[components.base_component.UEComponent]:
+        """Registers a component that a previous build generated, using its existing nodes.
 
-            pos = unreal.Vector2D(i * 512, 0)
+        Nothing is created or modified in the graph. The component can then be parented and connected to
+        newly built components.
 
-            node_count = 0
-            comment_size = 0
+        :param str name: name of the component, in the mgear rig.
+        :return: The attached component, or None if its construction node does not exist.
+        :rtype: components.base_component.UEComponent or None
+        """
+        guide_component = self.mg_rig.components.get(name, None)
 
-            for flow_name in ['construction_functions', 'forward_functions', 'backwards_functions']:
-                nodes = ue_comp.nodes[flow_name]
+        if guide_component is None:
+            unreal.log_warning(f"Unable to find component, {name}")
+            return None
 
-                for n in nodes:
-                    # Calculates the size of the node, via examination method
-                    # todo: utilise calculation
-                    (w, h) = calculate_node_size(n)
-                    controller.set_node_position(n, pos + unreal.Vector2D(40, node_count * 300))
-                    controller.set_node_position(ue_comp.comment_node, pos - unreal.Vector2D(5, 50))
-                    node_count += 1
+        ue_comp_classes = components.lookup_mgear_component(guide_component.comp_type)
+
+        if not ue_comp_classes:
+            return None
 
-            comment_size = unreal.Vector2D(500, node_count * 300)
-            controller.set_node_size(ue_comp.comment_node, comment_size)
+        ueg_comp = ue_comp_classes[0]()
+        ueg_comp.metadata = guide_component
+        ueg_comp.name = guide_component.fullname
 
-            # TODO: Rezise comment to encapsulate the entirety of control rig functions
-            # TODO: Query the nodes pins and pin names to try and estimate the possible size of the node, then use that to drive the layout.
+        if not self._attach_component_nodes(ueg_comp):
+            return None
 
-            for node in ue_comp.get_misc_functions():
-                (w, h) = calculate_node_size(node)
-                controller.set_node_position(node, pos + unreal.Vector2D(40, 450))
+        self.uegear_components[ueg_comp.name] = ueg_comp
+        return ueg_comp
 
+    def _attach_component_nodes(self, ueg_comp: components.base_component.UEComponent) -> bool:
+        """Finds the existing function and comment nodes of the component, returns False if the construction
+        node does not exist"""
+        graph = self.get_graph()
 
-    def build_components(self, manual_components: bool = False):
-        """Builds all components
+        ueg_comp.comment_node = graph.find_node_by_name(ueg_comp.name)
+
+        for evaluation_path, function_names in ueg_comp.functions.items():
+            for cr_func in function_names:
+                node = graph.find_node_by_name(f"{ueg_comp.name}_{cr_func}")
+                if node:
+                    ueg_comp.nodes[evaluation_path].append(node)
+
+        return len(ueg_comp.nodes['construction_functions']) > 0
+
+    @build_phase("node removal")
+    def remove_component_nodes(self, names: list[str]) -> int:
+        """Removes every node of the components from the graph.
+
+        Nodes belong to the component whose name is the longest prefix of the node name, which covers the
+        function, comment, array and sequence nodes that the components generate. The pins of the Sequence
+        nodes of other components, that only drove the removed nodes, are removed as well, so rebuilding the
+        components does not leave unconnected pins behind.
+
+        :param list[str] names: Names of the components to remove the nodes of.
+        :return: The number of nodes that were removed.
+        :rtype: int
         """
+        names = set(names)
+        if not names:
+            return 0
+
+        # Other components are included, so a node is never assigned to a component with a shorter name
+        known_names = names.union(self.mg_rig.components.keys())
 
-        for comp in self.mg_rig.components.values():
-            self.build_component(comp.fullname, manual_components)
+        controller = self.get_active_controller()
 
+        removed_nodes = []
+        for node in self.get_graph().get_nodes():
+            node_name = str(node.get_name())
+            if _get_node_owner(node_name, known_names) in names:
+                removed_nodes.append(node_name)
+                continue
+
+            # The pins are removed while they are still linked to the nodes, later pins first
+            for pin_path in reversed(_get_dead_sequence_pins(node, names, known_names)):
+                controller.remove_aggregate_pin(pin_path)
+
+        for node_name in removed_nodes:
+            controller.remove_node_by_name(node_name)
+
+        return len(removed_nodes)
+
+    @build_phase("parenting")
     def populate_parents(self):
         """
         Assigns all the ueGear components parent child relationships.
         It does this by searching for the associated component by name.
         """
+        # The parents are about to change, so the resolved ancestor functions are no longer valid
+        self._ancestor_function_table = None
+
         # Find the world component if it exists
         world_component = self.get_uegear_world_component()
 
-        for comp in self.uegear_components:
+        for comp in self.uegear_components.values():
             # Ignore world control
             if comp.metadata.comp_type == "world_ctl":
                 continue
@@ -350,10 +569,34 @@ class UEGearManager:
         self.populate_manual_parents()
 
     def populate_manual_parents(self):
+        """Parents the root controls of the manual components under the controls of their parent components.
+
+        When the manual controls are built in bulk this creates all the described controls, see
+        `build_manual_controls`.
+        """
         # todo: once world control is generating a manual control then this can be updated to handle it. Currently cannot mix manual and procedural
-        hrc_controller = self._active_blueprint.get_hierarchy_controller()
+        if self._buildManualControlsInBulk:
+            self.build_manual_controls()
+            return
+
+        hrc_controller = self.get_hierarchy_controller()
+
+        # Controls placed by their offset keep their identity local transform, so only the offset is written
+        for child_ctrl, parent_key in self.get_manual_root_parents():
+            hrc_controller.set_parent(child_ctrl.rig_key, parent_key, not child_ctrl.is_placed_by_offset())
+
+        self.update_all_manual_control_transforms()
+
+    def get_manual_root_parents(self) -> list[tuple]:
+        """Returns the root controls of the manual components, with the key of the control of the parent
+        component that they are parented under.
+
+        :return: (control, parent rig element key) of each root control.
+        :rtype: list[tuple[CR_Control, unreal.RigElementKey]]
+        """
+        root_parents = []
 
-        for component in self.uegear_components:
+        for component in self.uegear_components.values():
 
             # skips any manual component building, if component is not manual.
             if not component.is_manual:
@@ -378,6 +621,7 @@ class UEGearManager:
 
             # finds the parent name by looking up the parent_localname
             parent_control_name = parent_control_relatives[component.metadata.parent_localname]
+            parent_key = unreal.RigElementKey(type=unreal.RigElementType.CONTROL, name=parent_control_name)
 
             for child_ctrl_role in component.root_control_children:
 
@@ -386,104 +630,116 @@ class UEGearManager:
                     continue
 
                 # gets the control from the role name, using the lookup table
-                child_ctrl = component.control_by_role[child_ctrl_role]
+                root_parents.append((component.control_by_role[child_ctrl_role], parent_key))
 
-                hrc_controller.set_parent(
-                    child_ctrl.rig_key,
-                    unreal.RigElementKey(type=unreal.RigElementType.CONTROL, name=parent_control_name),
-                    True)
+        return root_parents
 
-        self.update_all_manual_control_transforms()
+    def build_manual_controls(self) -> int:
+        """Creates the described controls of all the manual components in bulk, see
+        `helpers.controls.build_control_hierarchy`.
 
-    # NOTE: This was removed as the order of applying transforms and there offsets was figured out and this post process
-    # is no longer required
-    def update_all_manual_control_transforms(self):
+        The parent of every control is set on its description first, inside each component using its
+        hierarchy_schematic_roles, and for the root controls of each component the control of its parent
+        component. The hierarchy is then created in one pass, with the offsets computed from the described
+        transforms, so no transforms have to be corrected afterwards.
+
+        :return: The number of controls and nulls that were added.
+        :rtype: int
         """
-        Manually generated controls rely on parent controls to exist to calculate the local offset.
-        As the parent only exists after all the components have been generated and parented we run this .
+        control_list = self.describe_manual_parents()
+        if not control_list:
+            return 0
+
+        return manual_controls.build_control_hierarchy(self.get_hierarchy_controller(), control_list)
+
+    def describe_manual_parents(self) -> list[manual_controls.CR_Control]:
+        """Sets the parent of every manual control on its description, inside each component using its
+        hierarchy_schematic_roles, and for the root controls of each component the control of its parent
+        component.
+
+        :return: The controls of all the manual components, ordered so that parents come before their children.
+        :rtype: list[CR_Control]
         """
-        hrc_controller = self._active_blueprint.get_hierarchy_controller()
-        rig_hrc = hrc_controller.get_hierarchy()
+        manual_components = [component for component in self.uegear_components.values() if component.is_manual]
 
-        # Positions all controls in the correct World Position, and remove all the offset transform data
-        for component in self.uegear_components:
-            for role in component.control_by_role.keys():
-                m_control = component.control_by_role[role]
+        for component in manual_components:
+            component.describe_hierarchy()
 
-                if (m_control.ctrl_type == unreal.RigElementType.NULL):
-                    continue
+        for child_ctrl, parent_key in self.get_manual_root_parents():
+            child_ctrl.parent_key = parent_key
 
-                # Skip World Control as that is always at origin
-                if m_control.name == "world_ctl":
-                    continue
+        control_list = [control for component in manual_components
+                        for control in component.control_by_role.values()]
+        return manual_controls.sort_parents_first(control_list)
 
-                manual_control_name = m_control.name
-                control_transform_names = component.metadata.control_transforms.keys()
+    def update_all_manual_control_transforms(self):
+        """
+        Manually generated controls rely on parent controls to exist to calculate the local offset.
+        As the parent only exists after all the components have been generated and parented we run this .
 
-                transform = None
+        The offsets are solved in Python from the described transforms and parents of the controls, see
+        `helpers.controls.solve_offset_transforms`, so nothing is read back from the hierarchy. The controls were
+        parented without keeping their global transform, so their local transform is still identity and each
+        control is written once, with its offset.
+        Nulls and controls without a transform keep the global transform they were created with.
+        """
+        rig_hrc = self.get_hierarchy_controller().get_hierarchy()
 
-                for name in control_transform_names:
-                    if name == manual_control_name:
-                        transform = component.metadata.control_transforms[name]
+        control_list = self.describe_manual_parents()
+        offset_transforms = manual_controls.solve_offset_transforms(control_list, rig_hrc)
 
-                if transform is None:
-                    continue
+        for m_control, offset_transform in zip(control_list, offset_transforms):
+            if not m_control.is_placed_by_offset():
+                continue
 
-                # Reset the offset values
-                rig_hrc.set_control_offset_transform(
-                    m_control.rig_key,
-                    unreal.Transform(),
-                    initial=True,
-                    affect_children=False
-                )
-
-                rig_hrc.set_global_transform(
-                    m_control.rig_key,
-                    transform,
-                    initial=True,
-                    affect_children=False)
-
-        # Reads the local position of the control and applies it as the offset then
-        # removes the initial transform values.
-        for component in self.uegear_components:
-            for role in component.control_by_role.keys():
-                m_control = component.control_by_role[role]
-
-                if (m_control.ctrl_type == unreal.RigElementType.NULL):
-                    continue
+            rig_hrc.set_control_offset_transform(
+                m_control.rig_key,
+                offset_transform,
+                initial=True,
+                affect_children=False
+            )
 
-                initial_local_trans = rig_hrc.get_local_transform(
-                    m_control.rig_key,
-                    True)
+    @build_phase("execution links")
+    def connect_execution(self, component_names: set[str] = None):
+        """Connects the individual functions Execution port, in order of parent hierarchy
 
-                rig_hrc.set_control_offset_transform(
-                    m_control.rig_key,
-                    initial_local_trans,
-                    initial=True,
-                    affect_children=True
-                )
+        The functions that each parent function drives are gathered first, so every parent is connected once.
+        A parent that drives a single function is linked to it directly, a parent that drives more functions
+        is linked to a Sequence node, that is created with a pin for each of them.
+
+        component_names: Only connects these components, components whose execution is already connected
+            are skipped.
+        """
+        bp_controller = self.get_active_controller()
 
-                rig_hrc.set_local_transform(
-                    m_control.rig_key,
-                    unreal.Transform(),
-                    initial=True,
-                    affect_children=True)
+        for parent_node, child_nodes in self.get_execution_fan_out(component_names):
+            self._connect_execution_fan_out(bp_controller, parent_node, child_nodes)
 
+    def get_execution_fan_out(self, component_names: set[str] = None) -> list[tuple]:
+        """Gathers the function nodes that each parent function drives, for all evaluation paths.
 
-    def connect_execution(self):
-        """Connects the individual functions Execution port, in order of parent hierarchy"""
+        component_names: Only gathers these components, components whose execution is already connected
+            are skipped.
 
+        :return: Pairs of the parent node and the nodes it drives, in build order.
+        :rtype: list[tuple[unreal.RigVMNode, list[unreal.RigVMNode]]]
+        """
         keys = ['construction_functions',
                 'forward_functions',
                 'backwards_functions']
 
-        bp_controller = self.get_active_controller()
+        # The parent relationships do not change while connecting, so they are resolved once
+        ancestor_functions = self.build_ancestor_function_table()
 
+        fan_out = {}
         for func_key in keys:
 
-            for comp in self.uegear_components:
+            for comp in self.uegear_components.values():
 
-                parent_nodes = self._find_parent_node_function(comp, func_key)
+                if component_names is not None and comp.name not in component_names:
+                    continue
+
+                parent_nodes = ancestor_functions[comp][func_key]
                 comp_nodes = comp.nodes[func_key]
 
                 if len(comp_nodes) == 0:
@@ -491,6 +747,10 @@ class UEGearManager:
                     # No connection is required
                     continue
 
+                # Components that kept their nodes, are still connected if their parent did as well
+                if component_names is not None and _has_linked_input(comp_nodes[0], "ExecuteContext"):
+                    continue
+
                 # check parent node and comp node should always only be one node
                 if len(comp_nodes) > 1:
                     unreal.log_error(f"There should not be more then one node per a function > {comp.name}")
@@ -499,109 +759,153 @@ class UEGearManager:
                     unreal.log_error(f"No parent nodes found for {comp}")
                     continue
 
-                p_func = parent_nodes.get_name()
-                c_func = comp_nodes[0].get_name()
+                parent_name = str(parent_nodes.get_name())
+                if parent_name not in fan_out:
+                    fan_out[parent_name] = (parent_nodes, [])
+                fan_out[parent_name][1].append(comp_nodes[0])
 
-                # Check if parent node, has already been connected, else branch off
+        return list(fan_out.values())
 
-                execute_pin = parent_nodes.find_pin("ExecuteContext")
-                target_pins = execute_pin.get_linked_target_pins()
+    def _connect_execution_fan_out(self, bp_controller: unreal.RigVMController, parent_node: unreal.RigVMNode,
+                                   child_nodes: list[unreal.RigVMNode]):
+        """Links the execution of the parent node to all the child nodes, through a Sequence node if needed"""
+        p_func = parent_node.get_name()
+        c_funcs = [node.get_name() for node in child_nodes]
 
-                if len(target_pins) == 0:
-                    bp_controller.add_link(f'{p_func}.ExecuteContext',
-                                           f'{c_func}.ExecuteContext')
-                else:
-                    # Checks if the pin belongs to a branch node, if not creates a branch node.
+        # The parent can already drive a node, from a previous build or if it is a solve event
+        target_pins = parent_node.find_pin("ExecuteContext").get_linked_target_pins()
 
-                    first_driven_node = target_pins[0].get_node()
-                    is_sequence_node = str(first_driven_node.get_node_title()) == "Sequence"
+        if len(target_pins) == 0:
+            if len(c_funcs) == 1:
+                bp_controller.add_link(f'{p_func}.ExecuteContext',
+                                       f'{c_funcs[0]}.ExecuteContext')
+                return
 
-                    if is_sequence_node:
-                        source_node_name = p_func
-                        new_connection_node_name = c_func
-                        seq_node_name = f'{source_node_name}_RigVMFunction_Sequence'
+            sequence_pins = self._add_sequence_node(bp_controller, p_func, len(c_funcs))
 
-                        # Generate next available plug on the Sequence Node
-                        new_pin = bp_controller.add_aggregate_pin(seq_node_name, '', '')
+        else:
+            first_driven_node = target_pins[0].get_node()
+            is_sequence_node = str(first_driven_node.get_node_title()) == "Sequence"
 
-                        try:
-                            bp_controller.add_link(new_pin,
-                                                   f'{new_connection_node_name}.ExecuteContext')
-                        except:
-                            unreal.log(f"FAILED: to connect {new_pin} > {new_connection_node_name}.ExecuteContext")
+            if is_sequence_node:
+                # Generate next available plugs on the Sequence Node
+                seq_node_name = first_driven_node.get_name()
+                sequence_pins = [bp_controller.add_aggregate_pin(seq_node_name, '', '') for _ in c_funcs]
 
-                    else:
-                        source_node_name = p_func
-                        connected_node_name = first_driven_node.get_name()
-                        new_connection_node_name = c_func
-                        seq_node_name = f'{source_node_name}_RigVMFunction_Sequence'
+            else:
+                # The Sequence node takes over the node that the parent was connected to, on its first pin
+                sequence_pins = self._add_sequence_node(bp_controller, p_func, len(c_funcs) + 1)
+                bp_controller.add_link(sequence_pins.pop(0),
+                                       f'{first_driven_node.get_name()}.ExecuteContext')
 
-                        # Create Sequence Node
+        for sequence_pin, c_func in zip(sequence_pins, c_funcs):
+            bp_controller.add_link(sequence_pin,
+                                   f'{c_func}.ExecuteContext')
 
-                        bp_controller.add_unit_node_from_struct_path(
-                            '/Script/RigVM.RigVMFunction_Sequence',
-                            'Execute',
-                            unreal.Vector2D(0.0, 1000.0),
-                            seq_node_name)
+    def _add_sequence_node(self, bp_controller: unreal.RigVMController, source_node_name: str,
+                           pin_count: int) -> list[str]:
+        """Creates the Sequence node of the source node with the number of execution pins, and connects the source
+        node to it. Returns the paths of the execution pins"""
+        seq_node_name = f'{source_node_name}_RigVMFunction_Sequence'
 
-                        # Connect Parent/Source node to the sequence node
+        bp_controller.add_unit_node_from_struct_path(
+            '/Script/RigVM.RigVMFunction_Sequence',
+            'Execute',
+            unreal.Vector2D(0.0, 1000.0),
+            seq_node_name)
 
-                        bp_controller.add_link(f'{source_node_name}.ExecuteContext',
-                                               f'{seq_node_name}.ExecuteContext')
+        # The Sequence node is created with two pins
+        sequence_pins = [f'{seq_node_name}.A', f'{seq_node_name}.B']
+        for _ in range(pin_count - len(sequence_pins)):
+            sequence_pins.append(bp_controller.add_aggregate_pin(seq_node_name, '', ''))
 
-                        # Connect Sequence node to the nodes that were connected to the Parent node, and the new
-                        # node that will be connected.
-                        bp_controller.add_link(f'{seq_node_name}.A',
-                                               f'{connected_node_name}.ExecuteContext')
-                        bp_controller.add_link(f'{seq_node_name}.B',
-                                               f'{new_connection_node_name}.ExecuteContext')
+        bp_controller.add_link(f'{source_node_name}.ExecuteContext',
+                               f'{seq_node_name}.ExecuteContext')
 
-    def _find_parent_node_function(self, component, function_name: str):
-        """Recursively looks at the function, then if one does not exist looks for
-        the next one in the parent/child hierarchy
+        return sequence_pins
 
-        function_name : is the name of the evaluation function, forward, backwards, construction.
-        """
+    def build_ancestor_function_table(self) -> dict:
+        """Resolves the nearest ancestor function node of every component, for each of the solve functions.
 
+        Each component is resolved once, after its parent, so the table is built in a single pass over the
+        hierarchy. Components without a parent resolve to the solve event nodes.
+
+        :return: ueGear component, to a dictionary of the function name and the ancestor function node.
+        :rtype: dict[components.base_component.UEComponent, dict[str, unreal.RigVMNode]]
+        """
         solve = {'construction_functions': self.get_construction_node(),
                  'forward_functions': self.get_forward_node(),
                  'backwards_functions': self.get_backwards_node()
                  }
 
-        parent_comp = component.parent_node
+        table = {}
+
+        for component in self.uegear_components.values():
+            # Walks up the hierarchy until a resolved component is found, then resolves the components top down
+            unresolved = []
+            comp = component
+            while comp is not None and comp not in table:
+                unresolved.append(comp)
+                comp = comp.parent_node
+
+            for comp in reversed(unresolved):
+                parent_comp = comp.parent_node
+
+                if parent_comp is None:
+                    table[comp] = solve
+                    continue
+
+                ancestor_functions = {}
+                for function_name in solve:
+                    comp_nodes = parent_comp.nodes[function_name]
+
+                    if len(comp_nodes) > 1:
+                        unreal.log_error(f"There should not be more then one node per a function > {parent_comp.name}")
+
+                    if len(comp_nodes) == 0:
+                        ancestor_functions[function_name] = table[parent_comp][function_name]
+                    else:
+                        ancestor_functions[function_name] = comp_nodes[0]
+
+                table[comp] = ancestor_functions
 
-        if parent_comp is None:
-            return solve[function_name]
+        self._ancestor_function_table = table
+        return table
 
-        comp_nodes = parent_comp.nodes[function_name]
+    def get_ancestor_function_node(self, component, function_name: str) -> unreal.RigVMNode:
+        """Finds the function node of the nearest parent component that has one, else the solve event node.
 
-        if len(comp_nodes) > 1:
-            unreal.log_error(f"There should not be more then one node per a function > {parent_comp.name}")
+        Uses the table from `build_ancestor_function_table`, which is built when it does not exist yet.
 
-        if len(comp_nodes) == 0:
-            return self._find_parent_node_function(parent_comp, function_name)
+        function_name : is the name of the evaluation function, forward, backwards, construction.
+        """
+        table = self._ancestor_function_table
+        if table is None or component not in table:
+            table = self.build_ancestor_function_table()
 
-        return comp_nodes[0]
+        return table[component][function_name]
 
     def pin_exists(self, function: unreal.RigVMNode, pin_name: str, input_pin: bool = True) -> bool:
         """Checks if a pin exists as in input our output
         function
         """
-        for pin in function.get_pins():
-            name = pin.get_display_name()
-
-            if name != pin_name:
+        for pin in graph_cache.get_pins(function, self.get_query_cache()):
+            if pin.display_name != pin_name:
                 continue
 
-            pin_direction = pin.get_direction()
-            if pin_direction == unreal.RigVMPinDirection.INPUT and input_pin:
+            if pin.direction == unreal.RigVMPinDirection.INPUT and input_pin:
                 return True
-            elif pin_direction == unreal.RigVMPinDirection.OUTPUT and not input_pin:
+            elif pin.direction == unreal.RigVMPinDirection.OUTPUT and not input_pin:
                 return True
         return False
 
-    def connect_construction_functions(self):
-        """Connects all the construction functions in control rig"""
+    @build_phase("construction links")
+    def connect_construction_functions(self, component_names: set[str] = None):
+        """Connects all the construction functions in control rig
+
+        component_names: Only connects these components, components whose parent pin is already connected
+            are skipped.
+        """
         construction_key = 'construction_functions'
 
         bp_controller = self.get_active_controller()
@@ -609,7 +913,7 @@ class UEGearManager:
         # Find the world component if it exists
         root_comp = self.get_uegear_world_component()
 
-        for comp in self.uegear_components:
+        for comp in self.uegear_components.values():
 
             # Ignore world control
             if comp.metadata.comp_type == "world_ctl":
@@ -621,10 +925,17 @@ class UEGearManager:
             parent_comp_name = comp.metadata.parent_fullname
             parent_pin_name = comp.metadata.parent_localname
 
+            if component_names is not None and comp.name not in component_names:
+                continue
+
             if comp.parent_node is None:
                 unreal.log_warning(f"  Parent Node does not exist in graph: {parent_comp_name}")
                 continue
 
+            comp_functions = comp.nodes[construction_key]
+            if component_names is not None and comp_functions and _has_linked_input(comp_functions[0], "parent"):
+                continue
+
             # component is an 'locator' port, which is made up of an array.
             # This plug needs to get converted from an array out plug to the correct plug index
             if parent_pin_name is not None:
@@ -635,11 +946,15 @@ class UEGearManager:
                     # Creates an At Node, Sets its Index and connects it to the output locator
 
                     at_node_name = parent_node_name + "_output_loc_" + str(loc_index)
-                    at_node = bp_controller.add_template_node(
-                        'DISPATCH_RigVMDispatch_ArrayGetAtIndex(in Array,in Index,out Element)',
-                        unreal.Vector2D(3500, 800),
-                        at_node_name
-                    )
+
+                    # The At Node is shared with other components that attach to the same locator
+                    at_node = self.get_graph().find_node_by_name(at_node_name)
+                    if at_node is None:
+                        at_node = bp_controller.add_template_node(
+                            'DISPATCH_RigVMDispatch_ArrayGetAtIndex(in Array,in Index,out Element)',
+                            unreal.Vector2D(3500, 800),
+                            at_node_name
+                        )
 
                     comp.parent_node.add_misc_function(at_node)
 
@@ -701,9 +1016,9 @@ class UEGearManager:
                 c_func_name = comp_function.get_name()
 
                 # Checks parent node has output pin with the specified name
-                found_pin = parent_function.find_pin(parent_pin_name)
+                found_pin = graph_cache.find_pin(parent_function, parent_pin_name, self.get_query_cache())
                 if found_pin:
-                    if found_pin.get_direction() == unreal.RigVMPinDirection.OUTPUT:
+                    if found_pin.direction == unreal.RigVMPinDirection.OUTPUT:
                         bp_controller.add_link(f"{p_func_name}.{parent_pin_name}",
                                                f"{c_func_name}.parent")
                         continue
@@ -722,24 +1037,36 @@ class UEGearManager:
             else:
                 unreal.log_error(f"Invalid relationship data found: {comp.name}")
 
-    def connect_forward_functions(self):
+    @build_phase("forward links")
+    def connect_forward_functions(self, component_names: set[str] = None):
         """Triggers the forward function connections if the component
-        contains the specific method."""
+        contains the specific method.
+
+        component_names: Only connects these components. Links to inputs that are already connected are
+            skipped, so components that kept their nodes only get the links that they lost.
+        """
+        bp_controller = self.get_active_controller()
+        if component_names is not None:
+            bp_controller = _MissingLinkController(bp_controller, self.get_graph())
 
-        for comp in self.uegear_components:
-            comp.forward_solve_connect(self.get_active_controller())
+        for comp in self.uegear_components.values():
+            if component_names is not None and comp.name not in component_names:
+                continue
+            comp.forward_solve_connect(bp_controller)
+
+    def connect_components(self, component_names: set[str] = None):
+        """Connects all the built components
 
-    def connect_components(self):
-        """Connects all the built components"""
+        component_names: Only connects these components to their parents. Components that are already
+            connected are skipped.
+        """
 
-        self.connect_execution()
-        self.connect_construction_functions()
-        self.connect_forward_functions()
+        self.connect_execution(component_names)
+        self.connect_construction_functions(component_names)
+        self.connect_forward_functions(component_names)
 
     def get_uegear_world_component(self) -> components.base_component.UEComponent:
-        for comp in self.uegear_components:
-            if comp.metadata.comp_type == "world_ctl":
-                return comp
+        return self.uegear_components.get_first_of_type("world_ctl")
 
     def get_uegear_component(self, name) -> components.base_component.UEComponent:
         """Find the ueGear component that has been created.
@@ -749,10 +1076,23 @@ class UEGearManager:
         :return: The UEComponent that exists with the matching name.
         :rtype: components.base_component.UEComponent or None
         """
-        for ue_component in self.uegear_components:
-            if ue_component.name == name:
-                return ue_component
-        return None
+        return self.uegear_components.get(name, None)
+
+    def get_uegear_components_by_type(self, comp_type: str) -> list[components.base_component.UEComponent]:
+        """Finds the created ueGear components, that were generated from the mGear component type.
+
+        :param str comp_type: The mGear component type, e.g. "EPIC_control_01".
+        :rtype: list[components.base_component.UEComponent]
+        """
+        return self.uegear_components.get_by_type(comp_type)
+
+    def get_uegear_component_children(self, name: str) -> list[components.base_component.UEComponent]:
+        """Finds the created ueGear components, that the mGear data parents to the component.
+
+        :param str name: The name of the parent ueGear component.
+        :rtype: list[components.base_component.UEComponent]
+        """
+        return self.uegear_components.get_children(name)
 
     # SUB MODULE - Control Rig Interface. -------------
     #   This may be abstracting away to much
@@ -887,8 +1227,142 @@ class UEGearManager:
     def load_rig(self, mgear_rig: mgear.mgRig):
         """
         Loads the mgear rig object into the manager, so the manager can generate the control rig and its components.
+
+        The build plan of the rig is created, use `validate_build_plan` to check it before building.
         """
         self.mg_rig = mgear_rig
+        self.build_plan = mgear.create_build_plan(mgear_rig)
+
+    def get_build_plan(self) -> mgear.BuildPlan:
+        """Returns the build plan of the loaded rig, creating it if the rig was assigned directly"""
+        if self.build_plan is None:
+            self.build_plan = mgear.create_build_plan(self.mg_rig)
+        return self.build_plan
+
+    def validate_build_plan(self) -> bool:
+        """
+        Reports the problems found in the component hierarchy of the loaded rig.
+
+        Missing parents are reported as warnings, those components are still built. Parenting cycles are
+        reported as errors, as the components in them can not be built.
+
+        :return: True if the rig can be built.
+        :rtype: bool
+        """
+        build_plan = self.get_build_plan()
+
+        for name, parent_name in build_plan.missing_parents.items():
+            unreal.log_warning(f"ueGear Manager > Unable to find parent component {parent_name}, of {name}")
+
+        for cycle in build_plan.cycles:
+            unreal.log_error(f"ueGear Manager > Components are parented in a cycle: {' > '.join(cycle)}")
+
+        if build_plan.blocked:
+            unreal.log_error(f"ueGear Manager > Components are parented under a cycle: {build_plan.blocked}")
+
+        return build_plan.is_valid
+
+    def load_build_hashes(self) -> Optional[dict]:
+        """Reads the component hashes, that the last build stored with the active blueprint.
+
+        :return: The stored build hashes, or None if none are stored, or they were stored by another version.
+        :rtype: dict or None
+        """
+        text = unreal.EditorAssetLibrary.get_metadata_tag(self._active_blueprint, BUILD_HASHES_TAG)
+        if not text:
+            return None
+
+        try:
+            build_hashes = json.loads(text)
+        except ValueError:
+            unreal.log_warning("ueGear Manager > Stored build hashes are invalid, a full build is required")
+            return None
+
+        if build_hashes.get("version", None) != BUILD_HASHES_VERSION:
+            return None
+        return build_hashes
+
+    def store_build_hashes(self):
+        """Stores the component hashes of the loaded rig with the active blueprint, for the next incremental
+        build. The blueprint has to be saved to keep them."""
+        build_hashes = {"version": BUILD_HASHES_VERSION,
+                        "settings": mgear_diff.get_settings_hash(self.mg_rig),
+                        "construction_controls": self._buildConstructionControlFunctions,
+                        "components": mgear_diff.get_component_hashes(self.mg_rig)}
+
+        unreal.EditorAssetLibrary.set_metadata_tag(self._active_blueprint, BUILD_HASHES_TAG,
+                                                   json.dumps(build_hashes))
+
+    def diff_build(self) -> Optional[mgear_diff.RigDiff]:
+        """Compares the loaded rig with the last build of the active blueprint.
+
+        Incremental builds are only supported when the controls are built by the construction functions.
+
+        :return: The components that changed, or None if the whole rig has to be built. That is the case when
+            no hashes are stored, or the main settings or the build mode changed.
+        :rtype: mgear_diff.RigDiff or None
+        """
+        if not self._buildConstructionControlFunctions:
+            return None
+
+        build_hashes = self.load_build_hashes()
+        if build_hashes is None:
+            return None
+
+        if (build_hashes["settings"] != mgear_diff.get_settings_hash(self.mg_rig) or
+                not build_hashes["construction_controls"]):
+            return None
+
+        return mgear_diff.diff_component_hashes(build_hashes["components"],
+                                                mgear_diff.get_component_hashes(self.mg_rig))
+
+    def build_incremental(self, build_diff: mgear_diff.RigDiff) -> set[str]:
+        """Rebuilds the changed components of the rig, all other components keep their nodes.
+
+        The nodes of the changed and removed components are deleted, and the changed components are built
+        again. The unchanged components are attached to their existing nodes, so the rebuilt components can be
+        connected to them. Only the connections of the rebuilt components, and the connections that the
+        components below them lost, are made again.
+
+        :param mgear_diff.RigDiff build_diff: The result of `diff_build`.
+        :return: Names of the components that were built.
+        :rtype: set[str]
+        """
+        build_plan = self.get_build_plan()
+        rebuilt = set(build_diff.rebuilt)
+
+        self.remove_component_nodes(build_diff.changed + build_diff.removed)
+
+        self.attach_world_control()
+
+        for name in build_plan:
+            if name not in rebuilt:
+                if self.attach_component(name) is not None:
+                    continue
+
+                # The nodes of the previous build are incomplete, so the component is built again
+                self.remove_component_nodes([name])
+                rebuilt.add(name)
+
+            self.build_component(name)
+
+        self.populate_parents()
+
+        connected = set(rebuilt)
+        for name in rebuilt:
+            connected.update(build_plan.get_descendants(name))
+
+        # Components parented to a removed component lost their connections with it
+        removed = set(build_diff.removed)
+        for name, parent_name in build_plan.missing_parents.items():
+            if parent_name in removed:
+                connected.add(name)
+                connected.update(build_plan.get_descendants(name))
+
+        self.connect_components(connected)
+        self.group_components(rebuilt)
+
+        return rebuilt
 
     def get_graph(self) -> unreal.RigVMGraph:
         """
@@ -903,6 +1377,10 @@ class UEGearManager:
             # If Controller cannot be found, create a new controller
             rig_vm_controller = self._active_blueprint.get_or_create_controller()
 
+        # While a build is running, the node lookups are answered by the query cache of the command buffer
+        if self._command_buffer is not None and self._command_buffer.controller == rig_vm_controller:
+            return self._command_buffer.get_graph()
+
         active_cr_graph = rig_vm_controller.get_graph()
         return active_cr_graph
 
@@ -918,8 +1396,58 @@ class UEGearManager:
         if rig_vm_controller is None:
             rig_vm_controller = self._active_blueprint.get_or_create_controller()
 
+        # While a build is running, the operations are recorded by the command buffer
+        if self._command_buffer is not None and self._command_buffer.controller == rig_vm_controller:
+            return self._command_buffer
+
         return rig_vm_controller
 
+    def get_hierarchy_controller(self) -> unreal.RigHierarchyController:
+        """Returns the hierarchy controller of the active control rig blue print."""
+        return self._active_blueprint.get_hierarchy_controller()
+
+    def get_query_cache(self) -> Optional[graph_cache.GraphQueryCache]:
+        """Returns the graph query cache of the running build, or None if no build is running"""
+        if self._command_buffer is None:
+            return None
+        return self._command_buffer.query_cache
+
+    def begin_command_buffer(self) -> ControllerCommandBuffer:
+        """
+        Starts recording the operations on the active controller.
+
+        Until `end_command_buffer` is called, `get_active_controller` returns a command buffer that drops
+        redundant node layout and pin default writes, and sends the remaining ones to the controller in order.
+        """
+        if self._command_buffer is None:
+            self._command_buffer = ControllerCommandBuffer(self.get_active_controller())
+        return self._command_buffer
+
+    def end_command_buffer(self, log_counts: bool = True, discard: bool = False) -> dict:
+        """
+        Flushes the recorded operations into the active controller, and stops recording.
+
+        :param bool log_counts: Logs the requested and executed call count of every controller operation.
+        :param bool discard: Drops the recorded operations instead of flushing them, used when a build fails.
+        :return: The call counts per operation, see `ControllerCommandBuffer.get_operation_counts`.
+        :rtype: dict
+        """
+        command_buffer = self._command_buffer
+        if command_buffer is None:
+            return {}
+
+        try:
+            if discard:
+                command_buffer.discard()
+            else:
+                command_buffer.flush()
+        finally:
+            self._command_buffer = None
+
+        if log_counts:
+            command_buffer.log_operation_counts()
+        return command_buffer.get_operation_counts()
+
     def get_selected_nodes(self) -> list[str]:
         if self._active_blueprint is None:
             unreal.log_error("Error, please set the active Control Rig blueprint.")
@@ -1052,62 +1580,106 @@ def array_node_has_pins(node_name: str,
     found_node = controller.get_graph().find_node_by_name(node_name)
 
     # Do pins already exist on the node, if not then we will have to create them. Else we dont
-    existing_pins = found_node.get_pins()[0].get_sub_pins()
+    existing_pin_count = graph_cache.get_pins(found_node, graph_cache.get_query_cache(controller))[0].sub_pin_count
 
-    if len(existing_pins) > minimum_pins:
+    if existing_pin_count > minimum_pins:
         return True
 
     return False
 
 
-def calculate_node_size(node: unreal.RigVMUnitNode):
+def calculate_node_size(node: unreal.RigVMUnitNode, query_cache: graph_cache.GraphQueryCache = None):
     """
     Calculates the node size by checking the amount of input and output pins,
     as well as the names of the pins.
     """
-    # todo: calculate the size of  node by the amount of pins and size of the name
-    input_pins = []
-    outpu_pins = []
-    longest_input_name = ""
-    longest_output_name = ""
-    node_name = node.get_name()
+    return graph_layout.measure_node(node, graph_cache.get_pins(node, query_cache))
+
 
+def _get_node_owner(node_name: str, component_names: set[str]) -> Optional[str]:
+    """Returns the longest component name, that the node name equals or starts with followed by an underscore"""
+    candidate = node_name
+    while candidate not in component_names:
+        index = candidate.rfind("_")
+        if index <= 0:
+            return None
+        candidate = candidate[:index]
+    return candidate
+
+
+def _has_linked_input(node: unreal.RigVMNode, pin_name: str) -> bool:
+    """Returns True if the input pin of the node is connected"""
+    pin = node.find_pin(pin_name)
+    return pin is not None and len(pin.get_linked_source_pins()) > 0
+
+
+def _get_dead_sequence_pins(node: unreal.RigVMNode, component_names: set[str], known_names: set[str]) -> list[str]:
+    """Returns the paths of the execution pins of a Sequence node, that only drive nodes of the components"""
+    if str(node.get_node_title()) != "Sequence":
+        return []
+
+    dead_pins = []
     for pin in node.get_pins():
+        target_pins = pin.get_linked_target_pins()
+        if target_pins and all(_get_node_owner(str(target_pin.get_node().get_name()), known_names) in component_names
+                               for target_pin in target_pins):
+            dead_pins.append(str(pin.get_pin_path()))
+    return dead_pins
 
-        pin_name = str(pin.get_display_name())
 
-        if pin.get_direction() == unreal.RigVMPinDirection.INPUT:
-            input_pins.append(pin)
-            if len(pin_name) > len(longest_input_name):
-                longest_input_name = pin_name
+class _MissingLinkController:
+    """
+    Forwards every call to the controller, but only adds the links to input pins that are not connected yet.
+    """
 
-        if pin.get_direction() == unreal.RigVMPinDirection.OUTPUT:
-            outpu_pins.append(pin)
-            if len(pin_name) > len(longest_output_name):
-                longest_output_name = pin_name
+    def __init__(self, controller: unreal.RigVMController, graph: unreal.RigVMGraph):
+        self.controller = controller
+        self.graph = graph
 
-    offset = 11
-    char_width = 3
-    char_height = 8
+    def __getattr__(self, name):
+        return getattr(self.controller, name)
 
-    width = len(longest_input_name) * char_width + offset + \
-            len(node_name) * char_width + offset + \
-            len(longest_output_name) * char_width
+    def add_link(self, output_pin_path: str, input_pin_path: str, *args, **kwargs):
+        node_name, pin_name = input_pin_path.split(".", 1)
+        node = self.graph.find_node_by_name(node_name)
+        if node is not None and _has_linked_input(node, pin_name):
+            return True
+        return self.controller.add_link(output_pin_path, input_pin_path, *args, **kwargs)
 
-    height = (len(input_pins) + 1) * char_height + \
-             1 * char_height + \
-             (len(outpu_pins) + 1) * char_height
 
-    return (width, height)
+def _get_component_metadata(ueg_component):
+    """Returns the mGear component data that the ueGear component registry is indexed with"""
+    return ueg_component.metadata
 
 
-def create_control_rig(rig_name: str, skeleton_package: str, output_path: str, gnx_path: str, constructionControls: bool):
+def create_control_rig(rig_name: str, skeleton_package: str, output_path: str, gnx_path: str, constructionControls: bool,
+                       use_cache: bool = True, incremental: bool = False, trace_path: str = None,
+                       parallel: bool = False):
     """
     Generates the control rig from the available components
 
     constructionControls: bool
         Generate all Control Rig controls using the Construction Node, this allows the rig to automatically be build
         every compile, but doesn't allow for post build customisation.
+
+    use_cache: bool
+        Reuses the parsed build file data from the on-disk cache, if the build file has not changed since it
+        was last parsed.
+
+    incremental: bool
+        Only rebuilds the components that changed since the last build of the Control Rig, the nodes of all other
+        components are kept. Falls back to a full build when the Control Rig has no stored build, the main
+        settings changed, or constructionControls is disabled.
+
+    trace_path: str
+        Profiles the build, and writes a Chrome trace of it to this file. A summary of the slowest build steps
+        is logged. Nothing is profiled if no path is given.
+
+    parallel: bool
+        Plans the components in worker processes, see `UEGearManager.plan_components`.
+
+    returns the BuildSession of the build, with its timings and controller call counts. None if the Control Rig
+    could not be built.
     """
     TEST_BUILD_JSON = gnx_path
     TEST_CONTROLRIG_PATH = output_path
@@ -1115,12 +1687,16 @@ def create_control_rig(rig_name: str, skeleton_package: str, output_path: str, g
     TEST_CONTROLRIG_SKM = skeleton_package
 
     # Converts teh json data into a class based structure, filters out non-required metadata.
-    mgear_rig = mgear.convert_json_to_mg_rig(TEST_BUILD_JSON)
+    mgear_rig = mgear.convert_json_to_mg_rig(TEST_BUILD_JSON, use_cache=use_cache)
 
     gear_manager = UEGearManager()
     gear_manager.load_rig(mgear_rig)
     gear_manager._buildConstructionControlFunctions = constructionControls
 
+    # Exits before the blueprint is touched, if the component hierarchy can not be built
+    if not gear_manager.validate_build_plan():
+        return None
+
     # Creates an asset path
     cr_path = TEST_CONTROLRIG_PATH + "/" + TEST_CONTROLRIG_NAME
     # Control Rig Blueprint
@@ -1132,7 +1708,7 @@ def create_control_rig(rig_name: str, skeleton_package: str, output_path: str, g
         cr_bp = gear_manager.create_control_rig(TEST_CONTROLRIG_PATH, TEST_CONTROLRIG_NAME, TEST_CONTROLRIG_SKM)
         if cr_bp is None:
             unreal.log_error("No Control Rig Graph found..")
-            return
+            return None
 
     # ------ Causes Unreal to Crash -------
     # aes = unreal.AssetEditorSubsystem()
@@ -1141,26 +1717,39 @@ def create_control_rig(rig_name: str, skeleton_package: str, output_path: str, g
 
     gear_manager.set_active_blueprint(cr_bp)
 
-    import time
-    start = time.perf_counter()
-
-    # Deactivate Autocompile, to speed up builds
-    compile_status = gear_manager.get_compile_mode()
-    gear_manager.suspend_notification()
-    # gear_manager.set_compile_mode(False)
-
-    # - At this point we now have The Manager, with an empty Control Rig BP
-    # - Builds the world control if it has been enabled in the Main Settings
-    gear_manager.build_world_control()
-    gear_manager.build_components(manual_components=not constructionControls)
-
-    # - At this point there are many components created, but not connected to one another
-    gear_manager.populate_parents()
-    gear_manager.connect_components()
-    gear_manager.group_components()
-
-    # Sets the auto-compiler back to how it was before building
-    gear_manager.set_compile_mode(compile_status)
-
-    duration = time.perf_counter() - start
-    unreal.log(f"Duration: {duration} s")
+    # The session suspends the notifications and the auto compile, and records the controller operations, so
+    # redundant writes are dropped. The blueprint is restored and compiled once when the build ends.
+    tracer = contextlib.nullcontext()
+    if trace_path:
+        # Imported here, as the profiler wraps the methods of the manager
+        from ueGear.controlrig.profiling import BuildTracer
+        tracer = BuildTracer(trace_path)
+
+    with tracer, BuildSession(gear_manager) as session:
+        build_diff = gear_manager.diff_build() if incremental else None
+
+        if build_diff is not None:
+            unreal.log(f"Incremental build: {build_diff}")
+            if build_diff.has_changes:
+                gear_manager.build_incremental(build_diff)
+        else:
+            if incremental:
+                # Clears the nodes of any previous build, as they can not be matched to the rig
+                world_ctl_name = gear_manager.mg_rig.settings["world_ctl_name"]
+                gear_manager.remove_component_nodes(list(gear_manager.mg_rig.components.keys()) + [world_ctl_name])
+
+            # - At this point we now have The Manager, with an empty Control Rig BP
+            # - Builds the world control if it has been enabled in the Main Settings
+            gear_manager.build_world_control()
+            gear_manager.plan_components(manual_components=not constructionControls, parallel=parallel)
+            gear_manager.build_components(manual_components=not constructionControls)
+
+            # - At this point there are many components created, but not connected to one another
+            gear_manager.populate_parents()
+            gear_manager.connect_components()
+            gear_manager.group_components()
+
+    # Stores what was built, for the next incremental build
+    gear_manager.store_build_hashes()
+
+    return session
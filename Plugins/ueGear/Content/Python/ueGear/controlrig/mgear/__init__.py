@@ -1,9 +1,22 @@
+import concurrent.futures
 import json
+import multiprocessing
+import os
+import sys
 
 import unreal
 from .component import mgComponent
 from .rig import mgRig
-from .colour import MAYA_LOOKUP
+from .plan import BuildPlan, BuildPlanError, create_build_plan
+from .table import ControlTable, transform_to_values
+from . import stream
+from . import aabb
+from . import binary
+from . import extract
+from . import cache
+from . import diff
+from .aabb import calculate_bb as _calculate_bb
+from ... import transforms
 
 """
 This container handles all the mGear component data that will be used to deserialise the `*.scd` file.
@@ -19,12 +32,53 @@ def load_json_file(file_path: str):
     return data
 
 
-def convert_json_to_mg_rig(build_json_path: str) -> mgRig:
+def convert_json_to_mg_rig(build_json_path: str, streaming: bool = False, use_cache: bool = False,
+                           cache_dir: str = None, parallel: bool = False, max_workers: int = None,
+                           use_sidecar: bool = False) -> mgRig:
     """
     Converts the mGear build json file into a mgRig object.
 
     This process filters out all none required data.
+
+    :param str build_json_path: Path to the mGear build file. Binary build data files, see `binary`, are
+        detected and loaded as well.
+    :param bool streaming: If enabled, the build file is read incrementally, one component at a time. This
+        keeps the memory footprint down on very large build files, as the raw shape data is discarded once
+        each component has been converted.
+    :param bool use_cache: If enabled, the parsed rig is stored in the on-disk cache, and parsing is skipped
+        when the same build file has already been parsed.
+    :param str cache_dir: Folder that the cache entries are stored in, defaults to `cache.get_cache_dir()`.
+    :param bool parallel: If enabled, the components are decoded and extracted in a pool of worker processes.
+        The rig is identical to the one that is parsed serially. Requires NumPy.
+    :param int max_workers: Amount of worker processes to use in parallel mode, defaults to the CPU count.
+    :param bool use_sidecar: If enabled, the binary build data file that is stored next to the build file is
+        loaded instead, as long as it was converted from the current version of the build file.
     """
+    if use_sidecar:
+        sidecar_path = binary.get_sidecar_path(build_json_path)
+        if binary.is_sidecar_current(sidecar_path, build_json_path):
+            build_json_path = sidecar_path
+
+    if binary.is_build_data_file(build_json_path):
+        return _convert_binary_to_mg_rig(build_json_path)
+
+    if use_cache:
+        cache_key = cache.get_cache_key(build_json_path)
+        rig = cache.load(cache_key, cache_dir)
+        if rig is None:
+            rig = convert_json_to_mg_rig(build_json_path, streaming=streaming, parallel=parallel,
+                                         max_workers=max_workers)
+            cache.save(cache_key, rig, cache_dir)
+        return rig
+
+    if parallel:
+        if transforms.NUMPY_AVAILABLE and aabb.NUMPY_AVAILABLE:
+            return _convert_parallel_json_to_mg_rig(build_json_path, max_workers)
+        unreal.log_warning("Parallel parsing of the mGear build file requires NumPy, parsing it serially")
+
+    if streaming:
+        return _convert_streamed_json_to_mg_rig(build_json_path)
+
     data = load_json_file(build_json_path)
 
     rig = mgRig()
@@ -33,116 +87,270 @@ def convert_json_to_mg_rig(build_json_path: str) -> mgRig:
     rig.settings = data["MainSettings"]
 
     for data_component in data["Components"]:
+        mgear_component = _convert_component(data_component, control_table=rig.control_table)
+        rig.add_component(new_component=mgear_component)
 
-        component_type = data_component["Type"]
-        component_side = data_component["Side"]
-        component_name = data_component["Name"]
-        component_fullname = data_component["FullName"]
-        data_contrat = data_component["DataContracts"]
-        joints = data_component["Joints"]
-        controls = data_component["Controls"]
-        guide_transforms = data_component.get("guideTransforms", None)
-
-        mgear_component = mgComponent()
-        mgear_component.name = component_name
-        mgear_component.side = component_side
-        mgear_component.comp_type = component_type
-        mgear_component.fullname = component_fullname
-        mgear_component.parent_fullname = data_component['parent_fullName']
-        mgear_component.parent_localname = data_component['parent_localName']
-        mgear_component.data_contracts = {}
-        mgear_component.joint_relatives = data_component['jointRelatives']
-        mgear_component.control_relatives = data_component['controlRelatives']
-        mgear_component.alias_relatives = data_component['aliasRelatives']
-        mgear_component.settings = data_component['Settings']
-
-        # checks if guide transforms exists, as not all components have this attribute.
-        if guide_transforms:
-            # Converts the numeric list matrix into an Unreal Matrix
-            for key, val in guide_transforms.items():
-                mtx = unreal.Matrix()
-
-                mtx.x_plane = unreal.Plane(val[0][0], val[0][1], val[0][2], val[0][3])
-                mtx.y_plane = unreal.Plane(val[1][0], val[1][1], val[1][2], val[1][3])
-                mtx.z_plane = unreal.Plane(val[2][0], val[2][1], val[2][2], val[2][3])
-                mtx.w_plane = unreal.Plane(val[3][0], val[3][1], val[3][2], val[3][3])
-
-                guide_transforms[key] = mtx
-
-            mgear_component.guide_transforms = guide_transforms
-
-        # Stores all the controls associated with this component
-        for ctrl in controls:
-            if mgear_component.controls is None:
-                mgear_component.controls = []
-                mgear_component.controls_role = {}
-                mgear_component.controls_aabb = {}
-                mgear_component.controls_colour = {}
-
-            mgear_component.controls.append(ctrl["Name"])
-            mgear_component.controls_role[ctrl["Name"]] = ctrl["Role"]
-
-            # Store the RGB Color
-            # ::ASSUMPTION:: A control will all have the  same colour
-            shape_category = ctrl["Shape"]
-            for crv_name in shape_category["curves_names"]:
-                crv_color = shape_category[crv_name]["crv_color"]
-
-            if crv_color is None or crv_color == "null":
-                # There is an edge case where the colour is null
-                mgear_component.controls_colour[ctrl["Name"]] = None
-            elif type(crv_color) == type([]):
-                # There is an edge case where the colour is stored as an RGB value
-                mgear_component.controls_colour[ctrl["Name"]] = crv_color
-            else:
-                mgear_component.controls_colour[ctrl["Name"]] = MAYA_LOOKUP[crv_color]
-
-            # Calculate control size
-            bounding_box_data = _calculate_bounding_box(ctrl)
-            mgear_component.controls_aabb[ctrl["Name"]] = bounding_box_data
-
-            # Checks the controls transform data and records it as a Unreal.Transform
-            world_pos = ctrl["WorldPosition"]
-            world_rot = ctrl["QuaternionWorldRotation"]
-            world_pos = [world_pos['x'], world_pos['y'], world_pos['z']]
-            ue_quaternion = unreal.Quat(world_rot[0], world_rot[1], world_rot[2], world_rot[3])
-
-            # Setting the transform with a euler instead of quaternion, due to slight difference in how
-            # unreal handles them
-            world_euler = ctrl["WorldRotation"]
-            euler = unreal.Vector(x=world_euler['x'],
-                                  y=world_euler['y'],
-                                  z=world_euler['z'])
-            # ue_quaternion.set_from_euler(euler)
-
-            ue_trans = unreal.Transform()
-            ue_trans.set_editor_property("translation", world_pos)
-            ue_trans.set_editor_property("rotation", ue_quaternion)
-
-            # Converts from Maya space into Unreal Space
-            ue_trans = _convert_maya_matrix(ue_trans.to_matrix())
-
-            if mgear_component.control_transforms is None:
-                mgear_component.control_transforms = {}
-
-            mgear_component.control_transforms[ctrl["Name"]] = ue_trans
-
-        # Stores all the joints associated with this component
-        for jnt in joints:
-            if mgear_component.joints is None:
-                mgear_component.joints = []
-            mgear_component.joints.append(jnt["Name"])
-
-        # Stores all the contracts and their related joints
-        for contract_name in data_contrat:
-            related_joints = data_component[contract_name]
-            mgear_component.data_contracts[contract_name] = related_joints
+    return rig
+
+
+def _convert_streamed_json_to_mg_rig(build_json_path: str) -> mgRig:
+    """
+    Converts the mGear build json file into a mgRig object, reading the `Components` array incrementally.
+
+    Only a single raw component exists in memory at any time.
+    """
+    rig = mgRig()
+
+    for key, value in stream.iter_build_data(build_json_path, stream_keys=("Components",)):
+        if key == "MainSettings":
+            # Dumps the entire MainSettings dictionary into the rig.settings
+            rig.settings = value
+        elif key == "Components":
+            mgear_component = _convert_component(value, drop_shapes=True, control_table=rig.control_table)
+            rig.add_component(new_component=mgear_component)
+
+    return rig
+
+
+def _convert_parallel_json_to_mg_rig(build_json_path: str, max_workers: int = None) -> mgRig:
+    """
+    Converts the mGear build json file into a mgRig object, extracting the components in worker processes.
+
+    The file is streamed, and the JSON text of each component is sent to the worker pool as soon as it has
+    been read, so decoding, bounding box and transform calculations all happen in the workers. The components
+    are added to the rig in the order they are stored in the file.
+    """
+    from ... import mgear_worker
+
+    rig = mgRig()
+    worker_count = max_workers or os.cpu_count() or 1
+
+    mp_context = multiprocessing.get_context("spawn")
+    python_executable = _get_python_executable()
+    if python_executable != sys.executable:
+        mp_context.set_executable(python_executable)
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=worker_count, mp_context=mp_context) as executor:
+        futures = []
+        for key, value in stream.iter_build_data(build_json_path, stream_keys=("Components",), raw=True):
+            if key == "MainSettings":
+                # Dumps the entire MainSettings dictionary into the rig.settings
+                rig.settings = value
+            elif key == "Components":
+                futures.append(executor.submit(mgear_worker.extract_raw_component, value))
+
+        for future in futures:
+            mgear_component = _build_component(future.result(), rig.control_table)
+            rig.add_component(new_component=mgear_component)
+
+    return rig
 
+
+def _convert_binary_to_mg_rig(build_data_path: str) -> mgRig:
+    """
+    Converts the binary build data file into a mgRig object.
+
+    The numeric blocks are memory-mapped, the bounding boxes of every control are calculated from the shape
+    point block in one pass, and the transforms are read straight from their blocks.
+    """
+    with binary.BuildDataFile(build_data_path) as build_data:
+        return _build_binary_rig(build_data)
+
+
+def _build_binary_rig(build_data: binary.BuildDataFile) -> mgRig:
+    """
+    Creates the mgRig from the memory-mapped build data. The block views only live as long as this function.
+    """
+    header = build_data.header
+
+    rig = mgRig()
+
+    # Dumps the entire MainSettings dictionary into the rig.settings
+    rig.settings = header["MainSettings"]
+
+    point_counts = build_data.get_block(binary.SHAPE_POINT_COUNTS_BLOCK).tolist()
+    bounding_boxes = _calculate_stacked_bounding_boxes(build_data.get_block(binary.SHAPE_POINTS_BLOCK),
+                                                       point_counts)
+    maya_transforms = build_data.get_block(binary.CONTROL_TRANSFORMS_BLOCK).tolist()
+    guide_matrices = build_data.get_block(binary.GUIDE_MATRICES_BLOCK).tolist()
+
+    control_start = 0
+    guide_start = 0
+    for data_component in header["Components"]:
+        extracted = extract.extract_component_metadata(data_component)
+
+        guide_names = data_component[binary.GUIDE_NAMES_KEY]
+        if guide_names:
+            guide_stop = guide_start + len(guide_names)
+            extracted["guide_transforms"] = dict(zip(guide_names, guide_matrices[guide_start:guide_stop]))
+            guide_start = guide_stop
+
+        controls = data_component["Controls"]
+        control_stop = control_start + len(controls)
+        extracted["controls"] = [[ctrl["Name"], ctrl["Role"], extract.convert_curve_colour(ctrl["crv_color"])]
+                                 for ctrl in controls]
+        extracted["aabbs"] = bounding_boxes[control_start:control_stop]
+        extracted["maya_transforms"] = maya_transforms[control_start:control_stop]
+        extracted["transforms"] = None
+        control_start = control_stop
+
+        mgear_component = _build_component(extracted, rig.control_table)
         rig.add_component(new_component=mgear_component)
 
     return rig
 
 
+def _get_python_executable() -> str:
+    """
+    Returns the Python interpreter that worker processes are started with.
+
+    Inside the editor `sys.executable` is the editor itself, so the interpreter that ships with the engine
+    is used instead.
+    """
+    get_interpreter_path = getattr(unreal, "get_interpreter_executable_path", None)
+    if get_interpreter_path is not None:
+        interpreter_path = get_interpreter_path()
+        if isinstance(interpreter_path, str) and os.path.isfile(interpreter_path):
+            return interpreter_path
+    return sys.executable
+
+
+def _convert_component(data_component: dict, drop_shapes: bool = False,
+                       control_table: ControlTable = None) -> mgComponent:
+    """
+    Converts a single component entry of the mGear build file into a mgComponent.
+
+    :param dict data_component: The raw component data, from the `Components` list.
+    :param bool drop_shapes: Removes the raw shape data from each control once the colour and bounding box
+        have been extracted, so the point data can be released as early as possible.
+    :param ControlTable control_table: Table that the controls are added to, usually the rigs control table.
+        If not specified the component gets a table of its own.
+    """
+    # The world transforms are stored in Maya space, and converted into Unreal space when they are first requested
+    extracted = extract.extract_component(data_component,
+                                          calculate_bounding_boxes=_calculate_bounding_boxes,
+                                          drop_shapes=drop_shapes)
+    return _build_component(extracted, control_table)
+
+
+def _build_component(extracted: dict, control_table: ControlTable = None) -> mgComponent:
+    """
+    Creates the mgComponent from the extracted component data, see `extract.extract_component`.
+
+    :param dict extracted: The extracted component data.
+    :param ControlTable control_table: Table that the controls are added to, usually the rigs control table.
+        If not specified the component gets a table of its own.
+    """
+    mgear_component = mgComponent()
+    mgear_component.name = extracted["name"]
+    mgear_component.side = extracted["side"]
+    mgear_component.comp_type = extracted["comp_type"]
+    mgear_component.fullname = extracted["fullname"]
+    mgear_component.parent_fullname = extracted["parent_fullname"]
+    mgear_component.parent_localname = extracted["parent_localname"]
+    mgear_component.data_contracts = extracted["data_contracts"]
+    mgear_component.joint_relatives = extracted["joint_relatives"]
+    mgear_component.control_relatives = extracted["control_relatives"]
+    mgear_component.alias_relatives = extracted["alias_relatives"]
+    mgear_component.settings = extracted["settings"]
+    mgear_component.joints = extracted["joints"]
+
+    # The numeric list matrices are only converted into Unreal Matrices when they are first requested
+    if extracted["guide_transforms"]:
+        mgear_component.set_guide_transform_data(extracted["guide_transforms"])
+
+    if control_table is None:
+        control_table = ControlTable()
+    control_start = len(control_table)
+
+    controls = extracted["controls"]
+    controls_transform = extracted["transforms"] or [None] * len(controls)
+
+    # Stores all the controls associated with this component
+    for (name, role, colour), bounding_box_data, maya_transform, transform in zip(controls,
+                                                                                 extracted["aabbs"],
+                                                                                 extracted["maya_transforms"],
+                                                                                 controls_transform):
+        control_table.add_control(name, role, transform=transform, aabb=bounding_box_data, colour=colour,
+                                  maya_transform=maya_transform)
+
+    # Components without controls keep the control attributes as None
+    if controls:
+        mgear_component.bind_controls(control_table, control_start, len(control_table))
+
+    return mgear_component
+
+
+def convert_maya_transform_values(maya_values: list[list[float]]) -> list[list[float]]:
+    """
+    Converts flat Maya world transform values from Maya space into Unreal space.
+
+    If NumPy is available all the transforms are converted in a single vectorised pass, else each
+    transform is converted with Unreal matrices.
+
+    :param list maya_values: Maya position and quaternion per transform, see `ControlTable.maya_transforms`.
+    :return: Flat transform values per transform, in the `ControlTable` layout.
+    """
+    if not transforms.NUMPY_AVAILABLE:
+        return [transform_to_values(_convert_maya_transform_value(values)) for values in maya_values]
+
+    return extract.convert_transform_values(maya_values)
+
+
+def _convert_maya_transform_value(maya_value: list[float]) -> unreal.Transform:
+    """Converts a single flat Maya world transform from Maya space into Unreal space"""
+    # Checks the controls transform data and records it as a Unreal.Transform
+    world_pos = maya_value[:3]
+    world_rot = maya_value[3:]
+    ue_quaternion = unreal.Quat(world_rot[0], world_rot[1], world_rot[2], world_rot[3])
+
+    # NOTE: The quaternion is used instead of the "WorldRotation" euler, due to slight difference in how
+    # unreal handles them
+
+    ue_trans = unreal.Transform()
+    ue_trans.set_editor_property("translation", world_pos)
+    ue_trans.set_editor_property("rotation", ue_quaternion)
+
+    # Converts from Maya space into Unreal Space
+    return _convert_maya_matrix(ue_trans.to_matrix())
+
+
+def _calculate_bounding_boxes(controls: list[dict]) -> list[tuple[list, list]]:
+    """
+    Calculates the bounding box of every control in the list.
+
+    If NumPy is available all the shape points are evaluated in a single vectorised pass, else each
+    control is evaluated point by point.
+    """
+    if aabb.NUMPY_AVAILABLE:
+        return aabb.calculate_controls_aabb(controls)
+
+    return [_calculate_bounding_box(ctrl) for ctrl in controls]
+
+
+def _calculate_stacked_bounding_boxes(points, counts: list[int]) -> list[tuple[list, list]]:
+    """
+    Calculates the bounding boxes for consecutive runs of points, see `aabb.calculate_stacked_aabb`.
+
+    :param points: (N, 3) array or memoryview of Maya space shape points.
+    :param list[int] counts: Amount of points that belong to each control.
+    """
+    if aabb.NUMPY_AVAILABLE:
+        return aabb.calculate_stacked_aabb(points, counts)
+
+    # Wraps each run of points in the control data layout, that the point by point implementation reads
+    points = points.tolist()
+    bounding_boxes = []
+    start = 0
+    for count in counts:
+        shape_category = {"curves_names": ["curve"],
+                          "curve": {"shapes": {"shape": {"points": points[start:start + count]}}}}
+        bounding_boxes.append(_calculate_bounding_box({"Shape": shape_category}))
+        start += count
+
+    return bounding_boxes
+
+
 def _calculate_bounding_box(control_data: dict) -> tuple[list, list]:
     """
     Calculates a bounding box around the control, by evaluating the control points.
@@ -237,33 +445,6 @@ def _calculate_min_max_points(control_data: dict):
     return bb_min, bb_max
 
 
-def _calculate_bb(min, max):
-    """
-    Calculates the center point of the bounding box, and the distance to the corners
-
-    :param min: smallest value for each axis that exists in the bounding box
-    :param max: largest value for each axis that exists in the bounding box
-    :return: The center of the bounding box, the length to the corner
-    """
-    bb_offset = []
-    bb_center = []
-
-    for i, ii in zip(min, max):
-        center = round((i + ii) / 2, 4)
-        offset = ii - center
-
-        bb_offset.append(offset)
-        bb_center.append(center)
-
-    # Checks no axis is 0 as unreal 5.3 has an issue that is a shape
-    # has an axis of 0 then shape updating does not work.
-    for idx, value in enumerate(bb_offset):
-        if value < 0.001:
-            bb_offset[idx] = 0.01
-
-    return bb_center, bb_offset
-
-
 def _convert_maya_matrix(maya_mtx: unreal.Matrix) -> unreal.Transform:
     # Reorient Matrix
     # This matrix is used to turn left hand rule into right hand rule
@@ -0,0 +1,145 @@
+"""
+NumPy backed Axis Aligned Bounding Box (AABB) calculations for the mGear control shapes.
+
+All the shape points of a control (or of many controls) are stacked into a single array, converted from Maya
+into Unreal space with one matrix multiply and reduced in one pass. The results match the per point
+implementation in `ueGear.controlrig.mgear`, including the rounding and the minimum offset clamp.
+
+NumPy is optional, when it is not available `NUMPY_AVAILABLE` is False and the mGear parser falls back to
+the per point implementation.
+"""
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+from ... import transforms
+
+ROUND_DIGITS = 4
+"""Precision that the bounding box values are rounded to"""
+
+
+def calculate_bb(min, max):
+    """
+    Calculates the center point of the bounding box, and the distance to the corners
+
+    :param min: smallest value for each axis that exists in the bounding box
+    :param max: largest value for each axis that exists in the bounding box
+    :return: The center of the bounding box, the length to the corner
+    """
+    bb_offset = []
+    bb_center = []
+
+    for i, ii in zip(min, max):
+        center = round((i + ii) / 2, ROUND_DIGITS)
+        offset = ii - center
+
+        bb_offset.append(offset)
+        bb_center.append(center)
+
+    # Checks no axis is 0 as unreal 5.3 has an issue that is a shape
+    # has an axis of 0 then shape updating does not work.
+    for idx, value in enumerate(bb_offset):
+        if value < 0.001:
+            bb_offset[idx] = 0.01
+
+    return bb_center, bb_offset
+
+
+def gather_control_points(control_data: dict) -> list:
+    """
+    Collects every shape point of the control into one flat list, in the same order that the points are
+    stored in the build file.
+    """
+    points = []
+
+    shape_category = control_data["Shape"]
+    for crv_name in shape_category["curves_names"]:
+        for shape_data in shape_category[crv_name]["shapes"].values():
+            points.extend(shape_data["points"])
+
+    return points
+
+
+def calculate_control_aabb(control_data: dict) -> tuple[list, list]:
+    """
+    Calculates the bounding box of a single control.
+
+    :return: The bounding box center in Maya space, and the offset from the center to the corners in Unreal space.
+    """
+    return calculate_controls_aabb([control_data])[0]
+
+
+def calculate_controls_aabb(controls: list[dict]) -> list[tuple[list, list]]:
+    """
+    Calculates the bounding boxes of many controls at once. The points of all the controls are stacked into a
+    single array and reduced per control.
+
+    :param list[dict] controls: Raw control data, as stored in the `Controls` list of the build file.
+    :return: A (center, offset) tuple per control, in the same order as the controls.
+    """
+    counts = []
+    points = []
+
+    for control_data in controls:
+        control_points = gather_control_points(control_data)
+        counts.append(len(control_points))
+        points.extend(control_points)
+
+    return calculate_stacked_aabb(np.asarray(points, dtype=np.float64).reshape(-1, 3), counts)
+
+
+def calculate_stacked_aabb(points, counts: list[int]) -> list[tuple[list, list]]:
+    """
+    Calculates the bounding boxes for consecutive runs of points in a stacked point array.
+
+    :param points: (N, 3) array of Maya space shape points, of all the controls one after the other.
+    :param list[int] counts: Amount of points that belong to each control.
+    :return: A (center, offset) tuple per control.
+    """
+    counts = np.asarray(counts, dtype=np.int64)
+    results = [None] * len(counts)
+
+    # Converts every point from Maya space into Unreal space in one go, else the bounding box
+    # will not align correctly to the object in Unreal
+    ue_points = points @ np.asarray(transforms.MAYA_TO_UNREAL_SHAPE_AXES)[:3, :3]
+
+    filled = np.flatnonzero(counts)
+    if len(filled):
+        starts = (np.cumsum(counts) - counts)[filled]
+        maya_min = np.minimum.reduceat(points, starts, axis=0).tolist()
+        maya_max = np.maximum.reduceat(points, starts, axis=0).tolist()
+        ue_min = np.minimum.reduceat(ue_points, starts, axis=0).tolist()
+        ue_max = np.maximum.reduceat(ue_points, starts, axis=0).tolist()
+
+        for i, index in enumerate(filled.tolist()):
+            results[index] = _bounds_to_aabb(maya_min[i], maya_max[i], ue_min[i], ue_max[i])
+
+    # Controls without any shape points end up with an infinite bounding box, like the per point implementation
+    empty_min = [float('inf')] * 3
+    empty_max = [float('-inf')] * 3
+    for index in np.flatnonzero(counts == 0).tolist():
+        results[index] = _bounds_to_aabb(empty_min, empty_max, empty_min, empty_max)
+
+    return results
+
+
+def _bounds_to_aabb(maya_min: list, maya_max: list, ue_min: list, ue_max: list) -> tuple[list, list]:
+    """
+    Converts the raw bounds into the bounding box center and offset.
+
+    Rounding is monotonic, so rounding the bounds is identical to rounding every point before comparing them.
+    """
+    ue_min = [round(value, ROUND_DIGITS) for value in ue_min]
+    ue_max = [round(value, ROUND_DIGITS) for value in ue_max]
+    _, bb_offset = calculate_bb(ue_min, ue_max)
+
+    # The center of the bounding box is required to be in Maya space
+    bb_center = [round((round(i, ROUND_DIGITS) + round(ii, ROUND_DIGITS)) / 2, ROUND_DIGITS)
+                 for i, ii in zip(maya_min, maya_max)]
+
+    return bb_center, bb_offset
@@ -0,0 +1,314 @@
+"""
+Binary companion format for the mGear build file.
+
+The `.scd` build file is JSON, and stores every shape point as a nested list. Decoding those lists is most of
+the time it takes to parse a build file, even though the parser only reduces them to bounding boxes. This
+format stores the component data as a small JSON header, and the numeric data as contiguous little endian
+blocks that are memory-mapped when the file is read:
+
+- `shape_points`: float64 (N, 3), the shape points of every control, in build file order.
+- `shape_point_counts`: int64 (C,), the amount of shape points per control.
+- `control_transforms`: float64 (C, 7), the Maya world position and quaternion per control.
+- `guide_matrices`: float64 (G, 4, 4), the guide transforms of every component, in build file order.
+
+The shape points are stored as float64, so the bounding boxes match the ones calculated from the JSON.
+
+Layout of the file:
+
+- Preamble: magic, format version, flags and the header size, see `_PREAMBLE`.
+- Header: UTF-8 JSON, with the `MainSettings`, the `Components` without their numeric data, and the offset,
+  dtype and shape of each block. Block offsets are relative to the start of the data section.
+- Data section: starts at the first `BLOCK_ALIGNMENT` boundary after the header, each block is aligned too.
+
+This module only uses the standard library, and NumPy when it is available, so it can be run outside of
+Unreal to write the file next to the build file on export:
+
+    python binary.py rig.scd [rig.scdb]
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+FILE_MAGIC = b"UEGMGBD\x00"
+"""First bytes of every binary build data file"""
+
+FORMAT_VERSION = 1
+"""Version of the file layout. Files with a different version are rejected"""
+
+SIDECAR_EXT = ".scdb"
+"""Extension of the binary file, that is written next to the build file"""
+
+BLOCK_ALIGNMENT = 16
+"""Byte alignment of the data section, and of each block in it"""
+
+SHAPE_POINTS_BLOCK = "shape_points"
+SHAPE_POINT_COUNTS_BLOCK = "shape_point_counts"
+CONTROL_TRANSFORMS_BLOCK = "control_transforms"
+GUIDE_MATRICES_BLOCK = "guide_matrices"
+
+GUIDE_NAMES_KEY = "guideTransformNames"
+"""Component header key that stores the guide names, the matrices are stored in `GUIDE_MATRICES_BLOCK`"""
+
+_PREAMBLE = struct.Struct("<8sIIQ")
+"""Magic, format version, flags, header size in bytes"""
+
+_CONTROL_BLOCK_KEYS = ("Shape", "WorldPosition", "QuaternionWorldRotation")
+"""Control keys that are stored in the blocks, instead of the header"""
+
+_TYPECODES = {"<f8": 'd', "<i8": 'q'}
+"""Block dtypes, and the matching array typecodes"""
+
+
+class BuildDataFile:
+    """
+    Memory-mapped binary build data file.
+
+    The blocks are views into the mapped file, so they are only read from disk when they are accessed. The
+    views must be released before the file is closed, or the mapping stays open until they are.
+    """
+
+    __slots__ = ("header", "_file", "_mmap", "_data_offset")
+
+    def __init__(self, file_path: str) -> None:
+        self._file = open(file_path, 'rb')
+        self._mmap = None
+
+        try:
+            preamble = self._file.read(_PREAMBLE.size)
+            if len(preamble) < _PREAMBLE.size or not preamble.startswith(FILE_MAGIC):
+                raise ValueError(f"Not a mGear build data file: {file_path}")
+
+            _, version, _, header_size = _PREAMBLE.unpack(preamble)
+            if version != FORMAT_VERSION:
+                raise ValueError(f"Unsupported mGear build data version {version}, expected {FORMAT_VERSION}")
+
+            self.header = json.loads(self._file.read(header_size).decode("utf-8"))
+            """Component data and block layout"""
+
+            self._data_offset = _align(_PREAMBLE.size + header_size)
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Closes the mapping and the file"""
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # A block view is still alive, the mapping is closed once it has been released
+                pass
+            self._mmap = None
+        self._file.close()
+
+    def get_block(self, name: str):
+        """
+        Returns the block as a view into the mapped file.
+
+        :return: A read only NumPy array if NumPy is available, else a memoryview. Both have the blocks shape,
+            and `tolist()` returns the nested values.
+        """
+        block = self.header["blocks"][name]
+        shape = block["shape"]
+        start = self._data_offset + block["offset"]
+        count = _product(shape)
+
+        typecode = _TYPECODES[block["dtype"]]
+
+        # Empty blocks at the end of the file start past the end of the mapping
+        if not count:
+            return np.empty(shape, dtype=block["dtype"]) if NUMPY_AVAILABLE else memoryview(array(typecode))
+
+        if NUMPY_AVAILABLE:
+            return np.frombuffer(self._mmap, dtype=block["dtype"], count=count, offset=start).reshape(shape)
+
+        view = memoryview(self._mmap)[start:start + count * array(typecode).itemsize]
+        if sys.byteorder != "little":
+            values = array(typecode, view.tobytes())
+            values.byteswap()
+            view = memoryview(values).cast('B')
+        return view.cast(typecode, shape)
+
+
+def is_build_data_file(file_path: str) -> bool:
+    """Returns True if the file is a binary build data file, by checking the magic"""
+    try:
+        with open(file_path, 'rb') as file:
+            return file.read(len(FILE_MAGIC)) == FILE_MAGIC
+    except OSError:
+        return False
+
+
+def get_sidecar_path(build_file_path: str) -> str:
+    """Returns the path of the binary file, that is stored next to the build file"""
+    return os.path.splitext(build_file_path)[0] + SIDECAR_EXT
+
+
+def is_sidecar_current(sidecar_path: str, build_file_path: str) -> bool:
+    """
+    Returns True if the binary file was written from the current version of the build file.
+
+    The size and modification time of the build file are stored in the header when it is converted.
+    """
+    if not os.path.isfile(sidecar_path) or not os.path.isfile(build_file_path):
+        return False
+
+    try:
+        with BuildDataFile(sidecar_path) as build_data:
+            source = build_data.header.get("source", None)
+    except (ValueError, OSError):
+        return False
+
+    return source == _get_source_info(build_file_path)
+
+
+def convert_build_file(build_file_path: str, output_path: str = None) -> str:
+    """
+    Converts the JSON build file into the binary format.
+
+    :param str build_file_path: Path to the mGear build file.
+    :param str output_path: Path of the binary file, defaults to the sidecar path next to the build file.
+    :return: The path of the binary file.
+    :rtype: str
+    """
+    output_path = output_path or get_sidecar_path(build_file_path)
+    with open(build_file_path, 'r') as file:
+        data = json.load(file)
+
+    write_build_data(data, output_path, source_info=_get_source_info(build_file_path))
+    return output_path
+
+
+def write_build_data(data: dict, file_path: str, source_info: dict = None):
+    """
+    Writes the build data into a binary build data file.
+
+    The file is written to a temporary file first, so an interrupted write never leaves a broken file behind.
+
+    :param dict data: The build data, as stored in the build file.
+    :param str file_path: Path of the binary file.
+    :param dict source_info: Size and modification time of the build file, see `is_sidecar_current`.
+    """
+    points = array('d')
+    point_counts = array('q')
+    control_transforms = array('d')
+    guide_matrices = array('d')
+
+    components = []
+    for data_component in data["Components"]:
+        component = {key: value for key, value in data_component.items()
+                     if key not in ("Controls", "guideTransforms")}
+
+        controls = []
+        for ctrl in data_component["Controls"]:
+            control = {key: value for key, value in ctrl.items() if key not in _CONTROL_BLOCK_KEYS}
+
+            # The colour of the last curve is used, matching `extract.get_control_colour`
+            control["crv_color"] = None
+            point_count = 0
+
+            shape_category = ctrl["Shape"]
+            for crv_name in shape_category["curves_names"]:
+                control["crv_color"] = shape_category[crv_name]["crv_color"]
+                for shape_data in shape_category[crv_name]["shapes"].values():
+                    for point in shape_data["points"]:
+                        points.extend(point)
+                    point_count += len(shape_data["points"])
+            point_counts.append(point_count)
+
+            world_pos = ctrl["WorldPosition"]
+            control_transforms.extend([world_pos['x'], world_pos['y'], world_pos['z'],
+                                       *ctrl["QuaternionWorldRotation"]])
+            controls.append(control)
+
+        component["Controls"] = controls
+
+        guide_transforms = data_component.get("guideTransforms", None) or {}
+        component[GUIDE_NAMES_KEY] = list(guide_transforms.keys())
+        for mtx in guide_transforms.values():
+            for row in mtx:
+                guide_matrices.extend(row)
+
+        components.append(component)
+
+    blocks = [(SHAPE_POINTS_BLOCK, points, [len(points) // 3, 3]),
+              (SHAPE_POINT_COUNTS_BLOCK, point_counts, [len(point_counts)]),
+              (CONTROL_TRANSFORMS_BLOCK, control_transforms, [len(control_transforms) // 7, 7]),
+              (GUIDE_MATRICES_BLOCK, guide_matrices, [len(guide_matrices) // 16, 4, 4])]
+
+    block_layout = {}
+    offset = 0
+    for name, values, shape in blocks:
+        block_layout[name] = {"offset": offset,
+                              "dtype": "<f8" if values.typecode == 'd' else "<i8",
+                              "shape": shape}
+        offset = _align(offset + len(values) * values.itemsize)
+
+    header = json.dumps({"MainSettings": data["MainSettings"],
+                         "Components": components,
+                         "blocks": block_layout,
+                         "source": source_info}).encode("utf-8")
+
+    output_dir = os.path.dirname(os.path.abspath(file_path))
+    file_handle, temp_path = tempfile.mkstemp(suffix=".tmp", dir=output_dir)
+    try:
+        with os.fdopen(file_handle, 'wb') as file:
+            file.write(_PREAMBLE.pack(FILE_MAGIC, FORMAT_VERSION, 0, len(header)))
+            file.write(header)
+            data_offset = _align(_PREAMBLE.size + len(header))
+            file.write(b"\x00" * (data_offset - _PREAMBLE.size - len(header)))
+
+            for name, values, _ in blocks:
+                file.seek(data_offset + block_layout[name]["offset"])
+                if sys.byteorder != "little":
+                    values = array(values.typecode, values)
+                    values.byteswap()
+                values.tofile(file)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def _get_source_info(build_file_path: str) -> dict:
+    stat = os.stat(build_file_path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _align(offset: int) -> int:
+    return (offset + BLOCK_ALIGNMENT - 1) // BLOCK_ALIGNMENT * BLOCK_ALIGNMENT
+
+
+def _product(shape: list) -> int:
+    count = 1
+    for size in shape:
+        count *= size
+    return count
+
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (2, 3):
+        print("Usage: python binary.py <build_file.scd> [output.scdb]")
+        sys.exit(1)
+    print(convert_build_file(*sys.argv[1:]))
@@ -0,0 +1,245 @@
+"""
+On-disk cache of parsed mGear rigs.
+
+Parsing a large build file is the slowest part of starting a build, and the file rarely changes between
+builds while iterating on the Unreal side. The parsed rig is stored as plain JSON data, with the Unreal
+transforms and matrices flattened into lists, so the cache does not depend on the engine version.
+
+Entries are keyed by the SHA-256 of the build file contents and the `PARSER_VERSION`, so editing the build
+file, or changing what the parser outputs, never returns stale data. The cache folder is kept under
+`max_size` bytes by removing the least recently used entries.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+
+import unreal
+
+from .component import mgComponent
+from .rig import mgRig
+
+PARSER_VERSION = 3
+"""Version of the parsed rig data. Increase it whenever the parser output changes, to invalidate old entries"""
+
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+"""Largest size in bytes that the cache folder is allowed to grow to"""
+
+CACHE_DIR_ENV = "UEGEAR_MGEAR_CACHE_DIR"
+"""Environment variable that overrides the default cache folder"""
+
+CACHE_FILE_EXT = ".json"
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+_COMPONENT_FIELDS = ["fullname", "name", "side", "comp_type", "data_contracts", "joints", "parent_fullname",
+                     "parent_localname", "outputs", "joint_relatives", "control_relatives", "alias_relatives",
+                     "settings"]
+"""Component attributes that are already JSON serialisable"""
+
+_TABLE_COLUMNS = ["names", "roles", "transforms", "maya_transforms", "aabbs", "colours", "transform_state",
+                  "has_aabb", "has_colour"]
+"""Control table columns, the float and flag arrays are stored as lists"""
+
+
+def get_cache_dir() -> str:
+    """
+    Returns the folder that the cache entries are stored in.
+
+    Defaults to the projects Intermediate folder, as the cache can always be regenerated.
+    """
+    cache_dir = os.environ.get(CACHE_DIR_ENV, None)
+    if cache_dir:
+        return cache_dir
+
+    try:
+        intermediate_dir = unreal.Paths.project_intermediate_dir()
+    except AttributeError:
+        intermediate_dir = None
+
+    if not isinstance(intermediate_dir, str) or not intermediate_dir:
+        intermediate_dir = tempfile.gettempdir()
+
+    return os.path.join(intermediate_dir, "ueGear", "mgear_cache")
+
+
+def hash_file(file_path: str) -> str:
+    """Calculates the SHA-256 of the files contents, reading it in chunks"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def get_cache_key(file_path: str) -> str:
+    """Cache key of the build file, the content hash combined with the parser version"""
+    return f"{hash_file(file_path)}.v{PARSER_VERSION}"
+
+
+def load(key: str, cache_dir: str = None):
+    """
+    Loads the rig that is stored under the key.
+
+    :return: The cached rig, or None if there is no valid entry for the key.
+    :rtype: mgRig or None
+    """
+    cache_path = _get_entry_path(key, cache_dir)
+    if not os.path.exists(cache_path):
+        return None
+
+    try:
+        with open(cache_path, 'r') as file:
+            data = json.load(file)
+        rig = rig_from_data(data)
+    except (OSError, ValueError, KeyError, TypeError, IndexError) as err:
+        unreal.log_warning(f"mGear cache entry is invalid, and will be removed: {cache_path}\n{err}")
+        _remove_file(cache_path)
+        return None
+
+    # Marks the entry as recently used, so it is the last to be evicted
+    try:
+        os.utime(cache_path, None)
+    except OSError:
+        pass
+
+    return rig
+
+
+def save(key: str, rig: mgRig, cache_dir: str = None, max_size: int = DEFAULT_MAX_SIZE):
+    """
+    Stores the rig under the key, then evicts the least recently used entries if the cache is too large.
+
+    Failing to write the cache is not an error, the build continues without it.
+    """
+    cache_dir = cache_dir or get_cache_dir()
+    cache_path = _get_entry_path(key, cache_dir)
+
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+
+        # Writes to a temporary file first, so an interrupted write never leaves a broken entry behind
+        file_handle, temp_path = tempfile.mkstemp(suffix=".tmp", dir=cache_dir)
+        try:
+            with os.fdopen(file_handle, 'w') as file:
+                json.dump(rig_to_data(rig), file)
+            os.replace(temp_path, cache_path)
+        except BaseException:
+            # The temporary files are not cache entries, so they would never be evicted
+            _remove_file(temp_path)
+            raise
+    except (OSError, TypeError, ValueError) as err:
+        unreal.log_warning(f"Failed to write the mGear cache entry: {cache_path}\n{err}")
+        return
+
+    evict(cache_dir, max_size)
+
+
+def evict(cache_dir: str = None, max_size: int = DEFAULT_MAX_SIZE):
+    """
+    Removes the least recently used entries until the cache folder is no larger than `max_size` bytes.
+
+    :return: The amount of entries removed.
+    :rtype: int
+    """
+    cache_dir = cache_dir or get_cache_dir()
+    if not os.path.isdir(cache_dir):
+        return 0
+
+    entries = []
+    for file_name in os.listdir(cache_dir):
+        if not file_name.endswith(CACHE_FILE_EXT):
+            continue
+        entry_path = os.path.join(cache_dir, file_name)
+        try:
+            stat = os.stat(entry_path)
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, entry_path))
+
+    total_size = sum(entry[1] for entry in entries)
+    removed = 0
+    for _, size, entry_path in sorted(entries):
+        if total_size <= max_size:
+            break
+        if _remove_file(entry_path):
+            total_size -= size
+            removed += 1
+
+    return removed
+
+
+def clear(cache_dir: str = None):
+    """Removes every entry from the cache"""
+    return evict(cache_dir, max_size=-1)
+
+
+def rig_to_data(rig: mgRig) -> dict:
+    """
+    Converts the rig into JSON serialisable data.
+
+    The control table is stored column by column, and each component stores the range of rows it owns.
+    """
+    components = []
+    for name, component in rig.components.items():
+        component_data = {field: getattr(component, field) for field in _COMPONENT_FIELDS}
+
+        component_data["control_range"] = list(component.control_range) if component.control_table is not None else None
+        component_data["guide_transforms"] = component.get_guide_transform_data()
+
+        components.append([name, component_data])
+
+    control_table = {column: list(getattr(rig.control_table, column)) for column in _TABLE_COLUMNS}
+
+    return {"parser_version": PARSER_VERSION,
+            "settings": rig.settings,
+            "control_table": control_table,
+            "components": components}
+
+
+def rig_from_data(data: dict) -> mgRig:
+    """
+    Converts the serialised data back into a rig.
+
+    Like a parsed rig, the control transforms and guide matrices are only created when they are first requested.
+    """
+    if data["parser_version"] != PARSER_VERSION:
+        raise ValueError(f"Parser version mismatch: {data['parser_version']} != {PARSER_VERSION}")
+
+    rig = mgRig()
+    rig.settings = data["settings"]
+
+    control_table = rig.control_table
+    for column in _TABLE_COLUMNS:
+        getattr(control_table, column).extend(data["control_table"][column])
+    control_table.rebuild_index()
+
+    for name, component_data in data["components"]:
+        component = mgComponent()
+        for field in _COMPONENT_FIELDS:
+            setattr(component, field, component_data[field])
+
+        control_range = component_data["control_range"]
+        if control_range is not None:
+            component.bind_controls(control_table, control_range[0], control_range[1])
+
+        guide_transforms = component_data["guide_transforms"]
+        if guide_transforms is not None:
+            component.set_guide_transform_data(guide_transforms)
+
+        rig.add_component(name=name, new_component=component)
+
+    return rig
+
+
+def _get_entry_path(key: str, cache_dir: str = None) -> str:
+    return os.path.join(cache_dir or get_cache_dir(), key + CACHE_FILE_EXT)
+
+
+def _remove_file(file_path: str) -> bool:
+    try:
+        os.remove(file_path)
+        return True
+    except OSError:
+        return False
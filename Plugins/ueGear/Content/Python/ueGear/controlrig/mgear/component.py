@@ -1,70 +1,235 @@
+from ueGear.controlrig.mgear.table import (ControlTable, ControlNamesView, ControlRolesView,
+                                           ControlTransformsView, ControlTransformValuesView, ControlAabbsView,
+                                           ControlColoursView, matrix_to_values, transform_to_values,
+                                           values_to_matrix)
+
+
 class mgComponent:
     """
     Simple Component object that wraps the MGear Maya component data, for easy access
+
+    The control data is stored in a rig wide `ControlTable`, and the control attributes are views into the
+    components rows. Assigning a list or dictionary to a control attribute replaces the view for that component.
     """
 
-    fullname: str = ""
+    __slots__ = ("fullname", "name", "side", "comp_type", "data_contracts", "joints", "parent_fullname",
+                 "parent_localname", "outputs", "joint_relatives", "control_relatives", "alias_relatives",
+                 "settings", "_guide_transforms", "_guide_transform_data", "_control_table", "_control_start",
+                 "_control_stop", "_control_overrides")
+
+    fullname: str
     """Components Fullname, this is usually used as the default name"""
 
-    name: str = ""
+    name: str
     """Name of the Component."""
 
-    side: str = ""
+    side: str
     """The side that the component exists on. L(left), R(right) C(center)."""
 
-    comp_type: str = ""
+    comp_type: str
     """The mGear Component Type, that was used in Maya to generate it."""
 
-    data_contracts: dict = None
+    data_contracts: dict
 
-    joints: list = None
+    joints: list
     """The joints that this component will drive"""
 
-    controls: list = None
-    """Controls that will be generated by this component"""
-
-    control_transforms: dict = None
-    """Each control could have a transform if that transform contains translation and rotation data"""
-
-    controls_role: dict = None
-    """Each control has a specific role, this stores the roll"""
-
-    controls_aabb: dict = None
-    """Axis Aligned Bounding Box for the controls"""
-
-    controls_colour: dict = None
-    """Colour to be assigned to the controls"""
-
     # NOTE: it would be great to have input/output plugs stipulated. That way we know exactly what object in another component drives the object in this component
 
-    parent_fullname: str = None
+    parent_fullname: str
     """Name of the guide component that is the parent of this guide component"""
 
-    parent_localname: str = None
+    parent_localname: str
     """Name of the guide control that drives this guide component"""
 
-    outputs: list = None
+    outputs: list
     """List of attachpoints that another component can be parented by, or in the case of
     ueGear driven by"""
 
-    joint_relatives: dict = None
+    joint_relatives: dict
     """List of integers that associate the output joint that should drive the output"""
 
-    guide_transforms: dict = None
-    """Some components contain guide transforms, these transforms are used to place
-    underlying articulation positions."""
-
-    control_relatives: dict = None
+    control_relatives: dict
     """Lookup table that stores the relationship between the name and the control"""
 
-    alias_relatives: dict = None
+    alias_relatives: dict
     """mGear keys in the relative dictionary can have multiple alias"""
 
-    settings: dict = None
+    settings: dict
     """mGear component settings"""
 
     def __init__(self) -> None:
-        pass
+        self.fullname = ""
+        self.name = ""
+        self.side = ""
+        self.comp_type = ""
+        self.data_contracts = None
+        self.joints = None
+        self.parent_fullname = None
+        self.parent_localname = None
+        self.outputs = None
+        self.joint_relatives = None
+        self._guide_transforms = None
+        self._guide_transform_data = None
+        self.control_relatives = None
+        self.alias_relatives = None
+        self.settings = None
+
+        self._control_table = None
+        self._control_start = 0
+        self._control_stop = 0
+        self._control_overrides = None
+
+    def bind_controls(self, control_table: ControlTable, start: int, stop: int):
+        """
+        Assigns the rows of the control table that store this components controls.
+
+        Any control attributes that were assigned directly are discarded.
+        """
+        self._control_table = control_table
+        self._control_start = start
+        self._control_stop = stop
+        self._control_overrides = None
+
+    @property
+    def guide_transforms(self) -> dict:
+        """Some components contain guide transforms, these transforms are used to place
+        underlying articulation positions."""
+        if self._guide_transforms is None and self._guide_transform_data is not None:
+            self._guide_transforms = {name: values_to_matrix(values)
+                                      for name, values in self._guide_transform_data.items()}
+            self._guide_transform_data = None
+        return self._guide_transforms
+
+    @guide_transforms.setter
+    def guide_transforms(self, value: dict):
+        self._guide_transforms = value
+        self._guide_transform_data = None
+
+    def set_guide_transform_data(self, data: dict):
+        """
+        Stores the guide transforms as lists of matrix rows. They are converted into Unreal Matrices the
+        first time `guide_transforms` is requested.
+        """
+        self._guide_transforms = None
+        self._guide_transform_data = data
+
+    def get_guide_transform_data(self) -> dict:
+        """Returns the guide transforms as lists of matrix rows, without creating any Unreal Matrices"""
+        if self._guide_transform_data is not None:
+            return self._guide_transform_data
+        if self._guide_transforms is None:
+            return None
+        return {name: matrix_to_values(mtx) for name, mtx in self._guide_transforms.items()}
+
+    @property
+    def control_table(self) -> ControlTable:
+        """Control table that stores this components controls"""
+        return self._control_table
+
+    @property
+    def control_range(self) -> tuple[int, int]:
+        """Start and stop rows of this components controls, in the control table"""
+        return self._control_start, self._control_stop
+
+    def _get_control_field(self, field: str, view_class: type):
+        if self._control_overrides and field in self._control_overrides:
+            return self._control_overrides[field]
+        if self._control_table is None:
+            return None
+        return view_class(self._control_table, self._control_start, self._control_stop)
+
+    def _set_control_field(self, field: str, value):
+        if self._control_overrides is None:
+            self._control_overrides = {}
+        self._control_overrides[field] = value
+
+    @property
+    def controls(self) -> list:
+        """Controls that will be generated by this component"""
+        return self._get_control_field("controls", ControlNamesView)
+
+    @controls.setter
+    def controls(self, value: list):
+        self._set_control_field("controls", value)
+
+    @property
+    def control_transforms(self) -> dict:
+        """Each control could have a transform if that transform contains translation and rotation data"""
+        return self._get_control_field("control_transforms", ControlTransformsView)
+
+    @control_transforms.setter
+    def control_transforms(self, value: dict):
+        self._set_control_field("control_transforms", value)
+
+    @property
+    def control_transform_values(self) -> dict:
+        """The control transforms as flat values, see `table.TRANSFORM_WIDTH`, without creating any Unreal
+        Transforms"""
+        if self._control_overrides and "control_transforms" in self._control_overrides:
+            return {name: transform_to_values(transform)
+                    for name, transform in self._control_overrides["control_transforms"].items()}
+        return self._get_control_field("control_transform_values", ControlTransformValuesView)
+
+    @property
+    def controls_role(self) -> dict:
+        """Each control has a specific role, this stores the roll"""
+        return self._get_control_field("controls_role", ControlRolesView)
+
+    @controls_role.setter
+    def controls_role(self, value: dict):
+        self._set_control_field("controls_role", value)
+
+    @property
+    def controls_aabb(self) -> dict:
+        """Axis Aligned Bounding Box for the controls"""
+        return self._get_control_field("controls_aabb", ControlAabbsView)
+
+    @controls_aabb.setter
+    def controls_aabb(self, value: dict):
+        self._set_control_field("controls_aabb", value)
+
+    @property
+    def controls_colour(self) -> dict:
+        """Colour to be assigned to the controls"""
+        return self._get_control_field("controls_colour", ControlColoursView)
+
+    @controls_colour.setter
+    def controls_colour(self, value: dict):
+        self._set_control_field("controls_colour", value)
+
+    def detached_copy(self) -> "mgComponent":
+        """
+        Returns a copy of the component, with its controls in a control table of its own.
+
+        The control transforms are converted into Unreal space, and the guide transforms are stored as lists of
+        matrix rows, so the copy holds no Unreal objects and can be sent to a process that does not have the
+        `unreal` module.
+        """
+        component = mgComponent()
+        for attribute in ("fullname", "name", "side", "comp_type", "data_contracts", "joints", "parent_fullname",
+                          "parent_localname", "outputs", "joint_relatives", "control_relatives",
+                          "alias_relatives", "settings"):
+            setattr(component, attribute, getattr(self, attribute))
+
+        guide_transform_data = self.get_guide_transform_data()
+        if guide_transform_data is not None:
+            component.set_guide_transform_data(guide_transform_data)
+
+        if not self.controls:
+            return component
+
+        roles = self.controls_role or {}
+        transforms = self.control_transform_values or {}
+        aabbs = self.controls_aabb or {}
+        colours = self.controls_colour or {}
+
+        control_table = ControlTable()
+        for name in self.controls:
+            control_table.add_control(name, roles.get(name), transform=transforms.get(name),
+                                      aabb=aabbs.get(name), colour=colours.get(name))
+        component.bind_controls(control_table, 0, len(control_table))
+        return component
 
     def __repr__(self) -> str:
         msg = "\n"
@@ -0,0 +1,135 @@
+"""
+Content hashes of the mGear components, used to find what changed between two builds of a rig.
+
+Every component is hashed from the data the build reads from it: its settings and relationships, and the name,
+role, transform, bounding box and colour of each of its controls. Hashing the same build file always gives the
+same hashes, so the hashes of the last build can be stored with the generated Control Rig, and compared to a
+newly parsed rig to find the components that need to be rebuilt.
+"""
+
+import hashlib
+import json
+
+from .component import mgComponent
+from .rig import mgRig
+from .table import transform_to_values
+
+HASH_PRECISION = 6
+"""Decimals the float values are rounded to before hashing, so float noise is not reported as a change"""
+
+_HASHED_FIELDS = ("fullname", "name", "side", "comp_type", "data_contracts", "joints", "parent_fullname",
+                  "parent_localname", "joint_relatives", "control_relatives", "alias_relatives", "settings")
+"""Component attributes that are part of the hash"""
+
+
+class RigDiff:
+    """
+    Difference between the stored component hashes of a build, and the components of a rig.
+    """
+
+    __slots__ = ("added", "removed", "changed", "unchanged")
+
+    def __init__(self) -> None:
+        self.added = []
+        """Fullnames of the components that did not exist in the previous build"""
+
+        self.removed = []
+        """Fullnames of the components that no longer exist"""
+
+        self.changed = []
+        """Fullnames of the components whose content has changed"""
+
+        self.unchanged = []
+        """Fullnames of the components that are the same as in the previous build"""
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+    @property
+    def rebuilt(self) -> list[str]:
+        """Fullnames of the components that have to be built, the changed and added components"""
+        return self.changed + self.added
+
+    def __repr__(self):
+        return (f"RigDiff(added={len(self.added)}, removed={len(self.removed)}, changed={len(self.changed)}, "
+                f"unchanged={len(self.unchanged)})")
+
+
+def hash_component(component: mgComponent) -> str:
+    """
+    Returns the content hash of the component.
+
+    :rtype: str
+    """
+    data = {field: getattr(component, field) for field in _HASHED_FIELDS}
+
+    controls = []
+    if component.controls:
+        transforms = component.control_transforms or {}
+        aabbs = component.controls_aabb or {}
+        colours = component.controls_colour or {}
+        roles = component.controls_role or {}
+
+        for name in component.controls:
+            transform = transforms.get(name, None)
+            controls.append([name,
+                             roles.get(name, None),
+                             _round(transform_to_values(transform)) if transform is not None else None,
+                             _round(aabbs.get(name, None)),
+                             _round(colours.get(name, None))])
+    data["controls"] = controls
+
+    guide_transforms = component.get_guide_transform_data()
+    data["guide_transforms"] = _round(guide_transforms) if guide_transforms else None
+
+    return _hash_data(data)
+
+
+def get_component_hashes(rig: mgRig) -> dict[str, str]:
+    """Returns the content hash of every component in the rig, by component name"""
+    return {name: hash_component(component) for name, component in rig.components.items()}
+
+
+def get_settings_hash(rig: mgRig) -> str:
+    """Returns the hash of the rig wide `MainSettings`, a change in them affects every component"""
+    return _hash_data(rig.settings)
+
+
+def diff_component_hashes(previous_hashes: dict[str, str], hashes: dict[str, str]) -> RigDiff:
+    """
+    Compares the component hashes of two builds.
+
+    :param dict previous_hashes: Component hashes of the previous build.
+    :param dict hashes: Component hashes of the rig that is being built, the order of the lists follows it.
+    :rtype: RigDiff
+    """
+    diff = RigDiff()
+    for name, component_hash in hashes.items():
+        previous_hash = previous_hashes.get(name, None)
+        if previous_hash is None:
+            diff.added.append(name)
+        elif previous_hash != component_hash:
+            diff.changed.append(name)
+        else:
+            diff.unchanged.append(name)
+
+    diff.removed = [name for name in previous_hashes if name not in hashes]
+    return diff
+
+
+def _round(value):
+    """Rounds the floats in nested lists and dictionaries"""
+    if isinstance(value, float):
+        # Adding 0.0 turns -0.0 into 0.0
+        return round(value, HASH_PRECISION) + 0.0
+    if isinstance(value, (list, tuple)):
+        return [_round(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _round(item) for key, item in value.items()}
+    return value
+
+
+def _hash_data(data) -> str:
+    text = json.dumps(data, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
@@ -0,0 +1,128 @@
+"""
+Engine independent extraction of the mGear build file component data.
+
+Reduces a raw component entry of the build file to the plain data that `mgComponent` stores: names, roles,
+colours, bounding boxes and transforms. Nothing in this module uses the `unreal` module, so it can run in the
+worker processes of the parallel parser, as well as in the editor.
+"""
+
+from .aabb import calculate_controls_aabb
+from .colour import MAYA_LOOKUP
+from ... import transforms
+
+
+def get_control_colour(control_data: dict):
+    """
+    Returns the RGB colour of the control.
+
+    ::ASSUMPTION:: A control will all have the  same colour
+
+    :rtype: list[float] or None
+    """
+    shape_category = control_data["Shape"]
+    for crv_name in shape_category["curves_names"]:
+        crv_color = shape_category[crv_name]["crv_color"]
+
+    return convert_curve_colour(crv_color)
+
+
+def convert_curve_colour(crv_color):
+    """
+    Converts the `crv_color` value of a curve into an RGB colour.
+
+    :param crv_color: Maya colour index, an RGB value, or None.
+    :rtype: list[float] or None
+    """
+    if crv_color is None or crv_color == "null":
+        # There is an edge case where the colour is null
+        return None
+    elif type(crv_color) == type([]):
+        # There is an edge case where the colour is stored as an RGB value
+        return crv_color
+    return MAYA_LOOKUP[crv_color]
+
+
+def get_maya_transform_values(controls: list[dict]) -> list[list[float]]:
+    """
+    Gathers the Maya world transform of every control in the list.
+
+    :return: Flat Maya transform values per control, in the `ControlTable.maya_transforms` layout.
+    """
+    values = []
+    for ctrl in controls:
+        world_pos = ctrl["WorldPosition"]
+        values.append([world_pos['x'], world_pos['y'], world_pos['z'], *ctrl["QuaternionWorldRotation"]])
+    return values
+
+
+def convert_transform_values(maya_values: list[list[float]]) -> list[list[float]]:
+    """
+    Converts flat Maya world transform values into Unreal space, with the NumPy transform kernel.
+
+    :return: Flat transform values per transform, in the `ControlTable.transforms` layout.
+    """
+    if not maya_values:
+        return []
+
+    positions = [values[:3] for values in maya_values]
+    quaternions = [values[3:] for values in maya_values]
+
+    translations, quaternions, scales = transforms.convert_maya_control_transforms(positions, quaternions)
+    return [pos + quat + scale for pos, quat, scale in zip(translations.tolist(),
+                                                          quaternions.tolist(),
+                                                          scales.tolist())]
+
+
+def extract_component(data_component: dict, calculate_bounding_boxes=calculate_controls_aabb,
+                      convert_transforms: bool = False, drop_shapes: bool = False) -> dict:
+    """
+    Extracts the data that the mgComponent stores, from a raw component entry.
+
+    :param dict data_component: The raw component data, from the `Components` list.
+    :param calculate_bounding_boxes: Function that calculates the bounding boxes of a list of controls.
+    :param bool convert_transforms: Converts the control transforms into Unreal space, requires NumPy. If
+        disabled, only the Maya space transforms are returned.
+    :param bool drop_shapes: Removes the raw shape data from each control once the colour and bounding box
+        have been extracted, so the point data can be released as early as possible.
+    :return: Plain data, that only contains lists, dictionaries, strings and numbers.
+    :rtype: dict
+    """
+    controls = data_component["Controls"]
+
+    extracted = extract_component_metadata(data_component)
+    extracted["controls"] = [[ctrl["Name"], ctrl["Role"], get_control_colour(ctrl)] for ctrl in controls]
+    extracted["aabbs"] = calculate_bounding_boxes(controls)
+    extracted["maya_transforms"] = get_maya_transform_values(controls)
+    extracted["transforms"] = convert_transform_values(extracted["maya_transforms"]) if convert_transforms else None
+
+    # The shape data is no longer required, releasing it keeps the memory footprint down
+    if drop_shapes:
+        for ctrl in controls:
+            del ctrl["Shape"]
+
+    return extracted
+
+
+def extract_component_metadata(data_component: dict) -> dict:
+    """
+    Extracts the names, hierarchy, settings and guide transforms of a raw component entry, everything that
+    `extract_component` returns apart from the control data.
+
+    :rtype: dict
+    """
+    return {"fullname": data_component["FullName"],
+            "name": data_component["Name"],
+            "side": data_component["Side"],
+            "comp_type": data_component["Type"],
+            "parent_fullname": data_component['parent_fullName'],
+            "parent_localname": data_component['parent_localName'],
+            "joint_relatives": data_component['jointRelatives'],
+            "control_relatives": data_component['controlRelatives'],
+            "alias_relatives": data_component['aliasRelatives'],
+            "settings": data_component['Settings'],
+            "joints": [jnt["Name"] for jnt in data_component["Joints"]] or None,
+            # Stores all the contracts and their related joints
+            "data_contracts": {contract_name: data_component[contract_name]
+                               for contract_name in data_component["DataContracts"]},
+            # not all components have guide transforms
+            "guide_transforms": data_component.get("guideTransforms", None) or None}
@@ -0,0 +1,187 @@
+"""
+Build planning for the components of a mGear rig.
+
+The components of a build file reference their parent by `parent_fullname`, and the guide control they are
+attached to by `parent_localname`. The `BuildPlan` turns those references into a hierarchy before anything is
+built: it orders the components so every parent comes before its children, and reports the components that
+reference a parent that does not exist, or that are part of a parenting cycle.
+
+The plan does not use the `unreal` module, so a build file can be validated without an open blueprint.
+"""
+
+import heapq
+
+from ueGear.controlrig.mgear.rig import mgRig
+
+
+class BuildPlanError(ValueError):
+    """Raised when a rig can not be built, as the component hierarchy contains a cycle"""
+
+
+class BuildPlan:
+    """
+    Ordered build plan of the components of a rig.
+
+    Components are stored by their fullname. Components with a missing parent are planned as root components.
+    Components in a cycle, and the components below them, are left out of the build order.
+    """
+
+    __slots__ = ("order", "parents", "parent_outputs", "children", "depths", "missing_parents", "cycles",
+                 "blocked")
+
+    def __init__(self) -> None:
+        self.order = []
+        """Fullnames of the components to build, every parent comes before its children"""
+
+        self.parents = {}
+        """Component fullname to the fullname of its parent, None for root components"""
+
+        self.parent_outputs = {}
+        """Component fullname to the `parent_localname`, the output of the parent that it is attached to"""
+
+        self.children = {}
+        """Component fullname to the fullnames of its children, in build order. None stores the roots"""
+
+        self.depths = {}
+        """Component fullname to its depth in the hierarchy, root components have a depth of 0"""
+
+        self.missing_parents = {}
+        """Component fullname to the parent fullname it references, that does not exist in the rig"""
+
+        self.cycles = []
+        """Fullnames of the components of each parenting cycle, in parent order"""
+
+        self.blocked = []
+        """Fullnames of the components that are not in a cycle, but have a parent in a cycle"""
+
+    @property
+    def is_valid(self) -> bool:
+        """True if every component of the rig is in the build order"""
+        return not self.cycles
+
+    def __len__(self):
+        return len(self.order)
+
+    def __iter__(self):
+        return iter(self.order)
+
+    def __contains__(self, name):
+        return name in self.depths
+
+    def get_parent(self, name: str):
+        """Returns the fullname of the parent that the component is built under, or None for root components"""
+        return self.parents.get(name, None)
+
+    def get_children(self, name: str = None) -> list[str]:
+        """Returns the fullnames of the children of the component, or the root components if no name is given"""
+        return list(self.children.get(name, ()))
+
+    def get_descendants(self, name: str) -> list[str]:
+        """Returns the fullnames of every component below the component, in build order"""
+        descendants = []
+        pending = [name]
+        while pending:
+            children = self.children.get(pending.pop(), ())
+            descendants.extend(children)
+            pending.extend(children)
+
+        build_index = {name: index for index, name in enumerate(self.order)}
+        return sorted(descendants, key=build_index.__getitem__)
+
+    def get_issues(self) -> list[str]:
+        """Describes every problem that was found while planning, one message per problem"""
+        issues = []
+        for name, parent_name in self.missing_parents.items():
+            issues.append(f"Parent component '{parent_name}' of '{name}' does not exist, it is built as a root")
+        for cycle in self.cycles:
+            issues.append(f"Components are parented in a cycle: {' > '.join(cycle + cycle[:1])}")
+        if self.blocked:
+            issues.append(f"Components are parented under a cycle: {', '.join(self.blocked)}")
+        return issues
+
+    def validate(self):
+        """
+        Raises an error if the rig can not be built.
+
+        :raises BuildPlanError: If the component hierarchy contains a cycle.
+        """
+        if not self.is_valid:
+            raise BuildPlanError("\n".join(self.get_issues()))
+
+
+def create_build_plan(rig: mgRig) -> BuildPlan:
+    """
+    Plans the build order of the components of the rig.
+
+    Components are ordered parents first. Between components that are ready to be built, the order of the
+    build file is kept, so a build file that already lists parents first keeps its order.
+
+    :param mgRig rig: The rig to plan.
+    :rtype: BuildPlan
+    """
+    plan = BuildPlan()
+
+    file_index = {}
+    child_names = {}
+    for index, (name, component) in enumerate(rig.components.items()):
+        file_index[name] = index
+
+        parent_name = component.parent_fullname
+        if parent_name is not None and parent_name not in rig.components:
+            plan.missing_parents[name] = parent_name
+            parent_name = None
+
+        plan.parents[name] = parent_name
+        plan.parent_outputs[name] = component.parent_localname
+        child_names.setdefault(parent_name, []).append(name)
+
+    # Every component has at most one parent, so a component is ready to be built once its parent is
+    ready = [file_index[name] for name in child_names.get(None, ())]
+    heapq.heapify(ready)
+    names = list(file_index)
+
+    while ready:
+        name = names[heapq.heappop(ready)]
+        parent_name = plan.parents[name]
+
+        plan.order.append(name)
+        plan.depths[name] = 0 if parent_name is None else plan.depths[parent_name] + 1
+        plan.children.setdefault(parent_name, []).append(name)
+
+        for child_name in child_names.get(name, ()):
+            heapq.heappush(ready, file_index[child_name])
+
+    if len(plan.order) < len(names):
+        _find_cycles(plan, names, file_index)
+
+    return plan
+
+
+def _find_cycles(plan: BuildPlan, names: list[str], file_index: dict[str, int]):
+    """Sorts the components that could not be planned into cycles, and the components below them"""
+    in_cycle = set()
+    visited = set(plan.depths)
+
+    for name in names:
+        if name in visited:
+            continue
+
+        # Following the parents of an unplanned component always ends in a cycle
+        path = []
+        path_index = {}
+        current = name
+        while current not in visited:
+            visited.add(current)
+            path_index[current] = len(path)
+            path.append(current)
+            current = plan.parents[current]
+
+        if current in path_index:
+            cycle = path[path_index[current]:]
+            # Stored in parent order, starting from the component that comes first in the build file
+            cycle.reverse()
+            start = min(range(len(cycle)), key=lambda i: file_index[cycle[i]])
+            plan.cycles.append(cycle[start:] + cycle[:start])
+            in_cycle.update(cycle)
+
+    plan.blocked = [name for name in names if name not in plan.depths and name not in in_cycle]
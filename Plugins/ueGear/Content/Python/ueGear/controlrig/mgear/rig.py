@@ -1,19 +1,27 @@
 from ueGear.controlrig.mgear.component import mgComponent
+from ueGear.controlrig.mgear.registry import ComponentRegistry
+from ueGear.controlrig.mgear.table import ControlTable
 
 class mgRig():
     """
     Simple Component object that wraps the mGear Maya Rig
     """
 
-    settings = None
+    __slots__ = ("settings", "components", "control_table")
+
+    settings: dict
     """Dictionary that stores all the 'Main Settings' """
 
-    components: dict[str, mgComponent] = {}
-    """Dictionary of all the components with the key being the component name"""
+    components: ComponentRegistry
+    """All the components with the key being the component name, indexed by type, side and parent"""
+
+    control_table: ControlTable
+    """Columnar storage of every control in the rig, the components store which rows belong to them"""
 
     def __init__(self) -> None:
-        self.components = dict()
+        self.components = ComponentRegistry()
         self.settings = None
+        self.control_table = ControlTable()
 
     def add_component(self, name: str = None, new_component: mgComponent = None):
         """
@@ -32,12 +40,19 @@ class mgRig():
         """
         Gets all components that match the type specified.
         """
-        found_components = []
-        for comp in self.components.values():
-            if comp.comp_type == type_name:
-                found_components.append(comp)
+        return self.components.get_by_type(type_name)
 
-        return found_components
+    def get_component_by_side(self, side: str) -> list[mgComponent]:
+        """
+        Gets all components that exist on the side specified.
+        """
+        return self.components.get_by_side(side)
+
+    def get_component_children(self, name: str) -> list[mgComponent]:
+        """
+        Gets all components that are parented to the component.
+        """
+        return self.components.get_children(name)
 
     def __repr__(self) -> str:
         msg = ""
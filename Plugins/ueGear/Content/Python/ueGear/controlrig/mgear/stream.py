@@ -0,0 +1,199 @@
+"""
+Incremental reader for the mGear build (`*.scd`) file.
+
+The build file can be hundreds of MB, most of which is control shape point data. Instead of decoding
+the entire document in one go, the reader walks the top level object and decodes the `Components`
+array one entry at a time, so only a single component is ever held in memory.
+"""
+
+import json
+import re
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+"""Amount of characters read from the file every time the buffer runs dry"""
+
+_WHITESPACE = " \t\n\r"
+
+_OBJECT_PATTERN = re.compile(r'["{}]')
+"""Finds the next character that changes the nesting of a JSON object"""
+
+_ARRAY_PATTERN = re.compile(r'["\[\]]')
+"""Finds the next character that changes the nesting of a JSON array"""
+
+_STRING_END_PATTERN = re.compile(r'(?:[^"\\]|\\.)*"', re.DOTALL)
+"""Matches the rest of a JSON string, including the closing quote"""
+
+
+class _JsonStreamReader:
+    """
+    Minimal pull reader over a JSON text file, that can step through containers and decode
+    individual values with the standard library decoder.
+    """
+
+    def __init__(self, file_obj, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self._file = file_obj
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _read_more(self, size: int = None) -> bool:
+        """Appends the next chunk of the file to the buffer, discarding the consumed characters"""
+        if self._eof:
+            return False
+
+        chunk = self._file.read(size or self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Returns the next none whitespace character, without consuming it. Empty string at the end of the file"""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+                self._pos += 1
+
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+
+            if not self._read_more():
+                return ""
+
+    def expect(self, char: str):
+        """Consumes the next none whitespace character, which has to match the character specified"""
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Invalid mGear build file, expected '{char}' but found '{found}'")
+        self._pos += 1
+
+    def read_value(self):
+        """Decodes the next JSON value in the file"""
+        self.peek()
+
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                # The value is not fully loaded yet, grow the buffer. The read size grows with the
+                # buffer, so very large values are not decoded over and over again.
+                if not self._read_more(max(self._chunk_size, len(self._buffer))):
+                    raise
+                continue
+
+            # A number could be cut off by the end of the buffer, make sure it is complete.
+            if end == len(self._buffer) and self._read_more():
+                continue
+
+            self._pos = end
+            return value
+
+    def read_raw_value(self) -> str:
+        """
+        Returns the JSON text of the next value in the file, without decoding it.
+
+        Objects and arrays are found by tracking the nesting, which is far cheaper than decoding them. This
+        allows the decoding to happen somewhere else, like a worker process. Only the brackets of the outer
+        container type are tracked, as the nested point arrays would otherwise dominate the scan.
+        """
+        container = self.peek()
+        if container not in "{[":
+            return json.dumps(self.read_value())
+        pattern = _OBJECT_PATTERN if container == "{" else _ARRAY_PATTERN
+
+        depth = 0
+        index = self._pos
+        while True:
+            match = pattern.search(self._buffer, index)
+            if match is None:
+                index = len(self._buffer)
+            elif match.group() == '"':
+                string_end = _STRING_END_PATTERN.match(self._buffer, match.end())
+                if string_end is not None:
+                    index = string_end.end()
+                    continue
+                # The string is cut off by the end of the buffer, it is scanned again from the opening quote
+                index = match.start()
+            else:
+                depth += 1 if match.group() in "{[" else -1
+                index = match.end()
+                if depth == 0:
+                    raw_value = self._buffer[self._pos:index]
+                    self._pos = index
+                    return raw_value
+                continue
+
+            # The value is not fully loaded yet, grow the buffer. The scan continues where it stopped.
+            offset = index - self._pos
+            if not self._read_more(max(self._chunk_size, len(self._buffer))):
+                raise ValueError("Invalid mGear build file, unexpected end of the file")
+            index = self._pos + offset
+
+    def iter_object_keys(self):
+        """Steps through the object at the current position, yielding each key. The caller
+        is required to consume the value of each key before requesting the next key."""
+        self.expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+
+        while True:
+            key = self.read_value()
+            self.expect(":")
+            yield key
+
+            if self.peek() == ",":
+                self._pos += 1
+                continue
+
+            self.expect("}")
+            return
+
+    def iter_array(self, raw: bool = False):
+        """
+        Steps through the array at the current position, decoding and yielding each element
+
+        :param bool raw: Yields the JSON text of each element, instead of the decoded element.
+        """
+        self.expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+
+        while True:
+            yield self.read_raw_value() if raw else self.read_value()
+
+            if self.peek() == ",":
+                self._pos += 1
+                continue
+
+            self.expect("]")
+            return
+
+
+def iter_build_data(file_path: str, stream_keys=("Components",), chunk_size: int = DEFAULT_CHUNK_SIZE,
+                    raw: bool = False):
+    """
+    Iterates over the top level entries of the mGear build file, yielding `(key, value)` pairs.
+
+    Keys that are listed in `stream_keys` are expected to be arrays, and will yield one
+    `(key, element)` pair per array element, instead of the entire array.
+
+    :param str file_path: Path to the mGear build file.
+    :param tuple stream_keys: Top level keys whose arrays are read one element at a time.
+    :param int chunk_size: Amount of characters read from disk at a time.
+    :param bool raw: The elements of the streamed arrays are yielded as JSON text, instead of being decoded.
+    """
+    with open(file_path, 'r') as file:
+        reader = _JsonStreamReader(file, chunk_size)
+
+        for key in reader.iter_object_keys():
+            if key in stream_keys and reader.peek() == "[":
+                for element in reader.iter_array(raw=raw):
+                    yield key, element
+            else:
+                yield key, reader.read_value()
@@ -0,0 +1,388 @@
+"""
+Columnar storage for the control data of a mGear rig.
+
+Every control of the rig is a row in a single `ControlTable`. The names and roles are stored in lists, and
+the transforms, bounding boxes and colours are stored in flat float arrays, instead of thousands of small
+dictionaries, lists and Unreal objects.
+
+The world transforms are stored in Maya space when the build file is parsed, and are only converted into
+Unreal space when a component first requests them, so reading names, roles and the hierarchy stays cheap.
+
+A component owns a contiguous range of rows. The views in this module expose that range through the same
+list and dictionary API that `mgComponent` has always had, so `component.controls_aabb[name]` keeps working.
+
+The `unreal` module is only imported when an Unreal object is requested, so a table can be sent to the worker
+processes that plan the components, see `mgComponent.detached_copy`.
+"""
+
+import math
+from array import array
+from collections.abc import Mapping, Sequence
+
+TRANSFORM_WIDTH = 10
+"""Floats stored per transform: translation (3), quaternion X, Y, Z, W (4), scale (3)"""
+
+MAYA_TRANSFORM_WIDTH = 7
+"""Floats stored per Maya world transform: position (3), quaternion X, Y, Z, W (4)"""
+
+AABB_WIDTH = 6
+"""Floats stored per bounding box: center (3), offset (3)"""
+
+COLOUR_WIDTH = 3
+"""Floats stored per colour: R, G, B"""
+
+TRANSFORM_NONE = 0
+"""The control has no transform"""
+
+TRANSFORM_RESOLVED = 1
+"""The Unreal space transform is stored in `ControlTable.transforms`"""
+
+TRANSFORM_PENDING = 2
+"""Only the Maya space transform is stored, it is converted when first requested"""
+
+_IDENTITY_TRANSFORM = (0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 1.0, 1.0, 1.0, 1.0)
+_IDENTITY_MAYA_TRANSFORM = (0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 1.0)
+
+
+class ControlTable:
+    """
+    Rig wide table of controls, with one row per control.
+    """
+
+    __slots__ = ("names", "roles", "transforms", "maya_transforms", "aabbs", "colours", "transform_state",
+                 "has_aabb", "has_colour", "_rows", "_transform_objects")
+
+    def __init__(self) -> None:
+        self.names = []
+        """Name of each control"""
+
+        self.roles = []
+        """mGear role of each control"""
+
+        self.transforms = array('d')
+        """Unreal space world transform of each control, `TRANSFORM_WIDTH` floats per row"""
+
+        self.maya_transforms = array('d')
+        """Maya space world transform of each control, `MAYA_TRANSFORM_WIDTH` floats per row"""
+
+        self.aabbs = array('d')
+        """Axis Aligned Bounding Box of each control, `AABB_WIDTH` floats per row"""
+
+        self.colours = array('d')
+        """Colour of each control, `COLOUR_WIDTH` floats per row"""
+
+        self.transform_state = bytearray()
+        """`TRANSFORM_NONE`, `TRANSFORM_RESOLVED` or `TRANSFORM_PENDING` per row"""
+
+        self.has_aabb = bytearray()
+        self.has_colour = bytearray()
+
+        self._rows = {}
+        """Lookup of the row index by control name"""
+
+        self._transform_objects = {}
+        """Unreal transforms that have been requested, by row index"""
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def add_control(self, name: str, role: str = None, transform: list = None, aabb: tuple = None,
+                    colour: list = None, maya_transform: list = None) -> int:
+        """
+        Adds a control as a new row.
+
+        :param str name: Name of the control.
+        :param str role: mGear role of the control.
+        :param list[float] transform: Flat transform values, see `TRANSFORM_WIDTH`.
+        :param list[float] maya_transform: Flat Maya world transform values, see `MAYA_TRANSFORM_WIDTH`. Only
+            used if no transform is given, it is converted into Unreal space when first requested.
+        :param tuple aabb: Bounding box center and offset.
+        :param list[float] colour: RGB colour.
+        :return: The row index of the control.
+        :rtype: int
+        """
+        row = len(self.names)
+
+        self.names.append(name)
+        self.roles.append(role)
+
+        if transform is not None:
+            self.transform_state.append(TRANSFORM_RESOLVED)
+        elif maya_transform is not None:
+            self.transform_state.append(TRANSFORM_PENDING)
+        else:
+            self.transform_state.append(TRANSFORM_NONE)
+        self.transforms.extend(_IDENTITY_TRANSFORM if transform is None else transform)
+        self.maya_transforms.extend(_IDENTITY_MAYA_TRANSFORM if maya_transform is None else maya_transform)
+
+        self.has_aabb.append(aabb is not None)
+        self.aabbs.extend((math.nan,) * AABB_WIDTH if aabb is None else (*aabb[0], *aabb[1]))
+
+        self.has_colour.append(colour is not None)
+        self.colours.extend((math.nan,) * COLOUR_WIDTH if colour is None else colour)
+
+        self._rows[name] = row
+        return row
+
+    def rebuild_index(self):
+        """Rebuilds the name lookup, required after the columns have been filled directly"""
+        self._rows = {name: row for row, name in enumerate(self.names)}
+        self._transform_objects = {}
+
+    def find_row(self, name: str, start: int = 0, stop: int = None) -> int:
+        """
+        Finds the row of the control, between the start and stop rows.
+
+        :return: The row index, or -1 if the control does not exist in the range.
+        :rtype: int
+        """
+        stop = len(self.names) if stop is None else stop
+
+        row = self._rows.get(name, -1)
+        if start <= row < stop:
+            return row
+
+        # Control names are expected to be unique in a rig, this only runs if they are not
+        for row in range(stop - 1, start - 1, -1):
+            if self.names[row] == name:
+                return row
+        return -1
+
+    def get_transform(self, row: int):
+        """
+        Returns the controls transform as an unreal.Transform.
+
+        The transform is created on the first request, and the same object is returned from then on. This keeps
+        changes made to the returned transform, as happens with a plain dictionary of transforms.
+
+        :rtype: unreal.Transform or None
+        """
+        state = self.transform_state[row]
+        if state == TRANSFORM_NONE:
+            return None
+
+        transform = self._transform_objects.get(row, None)
+        if transform is None:
+            if state == TRANSFORM_PENDING:
+                self.resolve_transforms(row, row + 1)
+            transform = values_to_transform(self.get_transform_values(row))
+            self._transform_objects[row] = transform
+        return transform
+
+    def resolve_transforms(self, start: int = 0, stop: int = None):
+        """
+        Converts the pending Maya space transforms between the start and stop rows into Unreal space, in
+        one batch.
+        """
+        from ueGear.controlrig.mgear import convert_maya_transform_values
+
+        stop = len(self.names) if stop is None else stop
+        rows = [row for row in range(start, stop) if self.transform_state[row] == TRANSFORM_PENDING]
+        if not rows:
+            return
+
+        maya_values = [self.maya_transforms[row * MAYA_TRANSFORM_WIDTH: (row + 1) * MAYA_TRANSFORM_WIDTH].tolist()
+                       for row in rows]
+
+        for row, values in zip(rows, convert_maya_transform_values(maya_values)):
+            self.transforms[row * TRANSFORM_WIDTH: (row + 1) * TRANSFORM_WIDTH] = array('d', values)
+            self.transform_state[row] = TRANSFORM_RESOLVED
+
+    def get_transform_values(self, row: int) -> list:
+        """Returns the flat transform values of the row, see `TRANSFORM_WIDTH`. A row without a transform
+        returns the identity transform"""
+        if self.transform_state[row] == TRANSFORM_PENDING:
+            self.resolve_transforms(row, row + 1)
+        return self.transforms[row * TRANSFORM_WIDTH: (row + 1) * TRANSFORM_WIDTH].tolist()
+
+    def get_aabb(self, row: int):
+        """
+        Returns the bounding box center and offset of the row.
+
+        :rtype: tuple[list[float], list[float]] or None
+        """
+        if not self.has_aabb[row]:
+            return None
+        values = self.aabbs[row * AABB_WIDTH: (row + 1) * AABB_WIDTH].tolist()
+        return values[:3], values[3:]
+
+    def get_colour(self, row: int):
+        """
+        Returns the RGB colour of the row.
+
+        :rtype: list[float] or None
+        """
+        if not self.has_colour[row]:
+            return None
+        return self.colours[row * COLOUR_WIDTH: (row + 1) * COLOUR_WIDTH].tolist()
+
+
+def transform_to_values(transform: "unreal.Transform") -> list:
+    """Converts the unreal.Transform into flat transform values, see `TRANSFORM_WIDTH`"""
+    pos = transform.translation
+    quat = transform.rotation
+    scale = transform.scale3d
+    return [pos.x, pos.y, pos.z, quat.x, quat.y, quat.z, quat.w, scale.x, scale.y, scale.z]
+
+
+def values_to_transform(values: list) -> "unreal.Transform":
+    """Converts flat transform values into an unreal.Transform"""
+    import unreal
+
+    transform = unreal.Transform()
+    transform.translation = unreal.Vector(values[0], values[1], values[2])
+    transform.rotation = unreal.Quat(values[3], values[4], values[5], values[6])
+    transform.scale3d = unreal.Vector(values[7], values[8], values[9])
+    return transform
+
+
+def position_to_values(position) -> list:
+    """Returns the flat transform values of a transform at the position, that is not rotated or scaled"""
+    return [position[0], position[1], position[2], *_IDENTITY_TRANSFORM[3:]]
+
+
+def matrix_to_values(mtx: "unreal.Matrix") -> list:
+    """Converts the unreal.Matrix into a list of rows"""
+    planes = [mtx.x_plane, mtx.y_plane, mtx.z_plane, mtx.w_plane]
+    return [[plane.x, plane.y, plane.z, plane.w] for plane in planes]
+
+
+def values_to_matrix(values: list) -> "unreal.Matrix":
+    """Converts a list of rows into an unreal.Matrix"""
+    import unreal
+
+    mtx = unreal.Matrix()
+    mtx.x_plane = unreal.Plane(values[0][0], values[0][1], values[0][2], values[0][3])
+    mtx.y_plane = unreal.Plane(values[1][0], values[1][1], values[1][2], values[1][3])
+    mtx.z_plane = unreal.Plane(values[2][0], values[2][1], values[2][2], values[2][3])
+    mtx.w_plane = unreal.Plane(values[3][0], values[3][1], values[3][2], values[3][3])
+    return mtx
+
+
+class ControlNamesView(Sequence):
+    """
+    Read only list of the control names, in a range of the control table.
+    """
+
+    __slots__ = ("_table", "_start", "_stop")
+
+    def __init__(self, table: ControlTable, start: int, stop: int) -> None:
+        self._table = table
+        self._start = start
+        self._stop = stop
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._table.names[self._start:self._stop][index]
+
+        # Only the requested row is read, so indexing every name stays linear
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("control index out of range")
+        return self._table.names[self._start + index]
+
+    def __iter__(self):
+        names = self._table.names
+        for row in range(self._start, self._stop):
+            yield names[row]
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (list, tuple, Sequence)) and not isinstance(other, str):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
+class _ControlColumnView(Mapping):
+    """
+    Read only dictionary of a column, in a range of the control table, with the control names as keys.
+    """
+
+    __slots__ = ("_table", "_start", "_stop")
+
+    def __init__(self, table: ControlTable, start: int, stop: int) -> None:
+        self._table = table
+        self._start = start
+        self._stop = stop
+
+    def _get(self, row: int):
+        raise NotImplementedError
+
+    def __getitem__(self, name: str):
+        row = self._table.find_row(name, self._start, self._stop)
+        if row < 0:
+            raise KeyError(name)
+        return self._get(row)
+
+    def __contains__(self, name) -> bool:
+        return self._table.find_row(name, self._start, self._stop) >= 0
+
+    def __iter__(self):
+        # Matches a dictionary, a repeated name is only returned once
+        return iter(dict.fromkeys(self._table.names[self._start:self._stop]))
+
+    def __len__(self) -> int:
+        return len(set(self._table.names[self._start:self._stop]))
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
+
+class ControlRolesView(_ControlColumnView):
+    """Roles of the controls, by control name"""
+
+    __slots__ = ()
+
+    def _get(self, row: int):
+        return self._table.roles[row]
+
+
+class ControlTransformsView(_ControlColumnView):
+    """Unreal space world transforms of the controls, by control name"""
+
+    __slots__ = ()
+
+    def _get(self, row: int):
+        # Converts every pending transform of the component together, the first time one is requested
+        if self._table.transform_state[row] == TRANSFORM_PENDING:
+            self._table.resolve_transforms(self._start, self._stop)
+        return self._table.get_transform(row)
+
+
+class ControlTransformValuesView(_ControlColumnView):
+    """Unreal space world transforms of the controls as flat values, see `TRANSFORM_WIDTH`, by control name. No
+    Unreal Transforms are created"""
+
+    __slots__ = ()
+
+    def _get(self, row: int):
+        state = self._table.transform_state[row]
+        if state == TRANSFORM_NONE:
+            return None
+        if state == TRANSFORM_PENDING:
+            self._table.resolve_transforms(self._start, self._stop)
+        return self._table.get_transform_values(row)
+
+
+class ControlAabbsView(_ControlColumnView):
+    """Bounding box center and offset of the controls, by control name"""
+
+    __slots__ = ()
+
+    def _get(self, row: int):
+        return self._table.get_aabb(row)
+
+
+class ControlColoursView(_ControlColumnView):
+    """RGB colours of the controls, by control name"""
+
+    __slots__ = ()
+
+    def _get(self, row: int):
+        return self._table.get_colour(row)
@@ -0,0 +1,228 @@
+from ueGear.controlrig.helpers import component_plan, pin_values
+from ueGear.controlrig.planners import base_planner
+
+
+class Planner(base_planner.ComponentPlanner):
+
+    minimum_bone_count = 3
+    """Number of bones the IK functions drive"""
+
+    reduce_ratio = 4.0
+    """Magic number to try and get the maya control scale to be similar to that of unreal.
+    As the mGear uses a square and ueGear uses a cirlce.
+    """
+
+    def get_index_node_names(self) -> list[tuple]:
+        """Names of the nodes that return a single bone of the bone array, with the bone index they return"""
+        # We have to create another At function for the construction node, as nodes cannot be connected on both
+        # construction and forward streams
+        return [(f"{self.metadata.fullname}_upper_RigUnit_ItemArray", 0),
+                (f"{self.metadata.fullname}_mid_RigUnit_ItemArray", 1),
+                (f"{self.metadata.fullname}_forward_lower_RigUnit_ItemArray", 2),
+                (f"{self.metadata.fullname}_construction_lower_RigUnit_ItemArray", 2)]
+
+    def get_forward_bone_pins(self) -> list[str]:
+        """Pins of the forward function, that the forward index nodes are connected to"""
+        return ["top_bone", "mid_bone", "end_bone"]
+
+    def plan_bones(self, plan: component_plan.ComponentPlan):
+        """
+        Generates the Bone array node that will be utilised by control rig to drive the component
+        """
+        bone_names = self.metadata.joints or []
+
+        if len(bone_names) < self.minimum_bone_count:
+            plan.log_error(f"[Bone Populate] Failed - Less then {self.minimum_bone_count} Bones found")
+            return
+
+        # Ignore Twist bones as we have not implemented them yet in the Control Rig Node
+        filtered_bones = [bone_name for bone_name in bone_names if "twist" not in bone_name]
+
+        # Unique name for this skeleton node array
+        array_node_name = f"{self.metadata.fullname}_bones_RigUnit_ItemArray"
+        self.plan_item_array(plan, array_node_name, filtered_bones)
+
+        index_node_names = []
+        for individual_index_node, bone_index in self.get_index_node_names():
+            plan.add_template_node(individual_index_node, base_planner.ARRAY_GET_AT_INDEX_NOTATION, 3500, 800)
+
+            plan.add_link(f'{array_node_name}.Items',
+                          f'{individual_index_node}.Array')
+
+            plan.set_pin_default_value(f'{individual_index_node}.Index',
+                                       str(bone_index),
+                                       False)
+            index_node_names.append(individual_index_node)
+
+        forward_index_nodes = index_node_names[:-1]
+        con_lower_bone_node_name = index_node_names[-1]
+
+        # Connects the joint node to the Construction function
+        for function_node_name in self.get_function_node_names("construction_functions"):
+            plan.add_link(f'{array_node_name}.Items',
+                          f'{function_node_name}.fk_joints')
+
+            plan.add_link(f'{con_lower_bone_node_name}.Element',
+                          f'{function_node_name}.effector_joint')
+
+        # Connects the joint node to the Forward function
+        for function_node_name in self.get_function_node_names("forward_functions"):
+            for index_node_name, pin_name in zip(forward_index_nodes, self.get_forward_bone_pins()):
+                plan.add_link(f'{index_node_name}.Element',
+                              f'{function_node_name}.{pin_name}')
+
+        # Connects the joint node to the Backwards function
+        for function_node_name in self.get_function_node_names("backwards_functions"):
+            plan.add_link(f'{array_node_name}.Items',
+                          f'{function_node_name}.fk_joints')
+
+    def plan_input_data(self, plan: component_plan.ComponentPlan):
+        self.plan_mirrored_ik_upvector(plan)
+
+    def plan_mirrored_ik_upvector(self, plan: component_plan.ComponentPlan):
+        """
+        The Arms can be mirrored, if a right side is being built then we need to setup the
+        up axis to align with the upvector and joints
+        """
+        if self.metadata.side != "R":
+            return
+
+        for func_name in self.get_function_node_names("forward_functions")[:1]:
+            plan.set_pin_default_value(f'{func_name}.ik_PrimaryAxis',
+                                       '(X=-1.000000, Y=0.000000, Z=0.000000)',
+                                       True)
+            plan.set_pin_default_value(f'{func_name}.ik_SecondaryAxis',
+                                       '(X=0.000000, Y=1.000000, Z=0.000000)',
+                                       True)
+
+    def get_control_names(self) -> tuple:
+        """Returns the fk control names, the ik up vector control name and the ik effector control name"""
+        fk_control_names = []
+        ik_upv_name = ""
+        ik_eff_name = ""
+
+        # Filter our required names and transforms
+        for ctrl_name in self.metadata.controls:
+            # Use the controls.Role metadata to detect the type
+            ctrl_role = self.metadata.controls_role[ctrl_name]
+            if "fk" in ctrl_role:
+                fk_control_names.append(ctrl_name)
+            elif "upv" in ctrl_role:
+                ik_upv_name = ctrl_name
+            elif "ik" == ctrl_role:
+                ik_eff_name = ctrl_name
+
+        return fk_control_names, ik_upv_name, ik_eff_name
+
+    def get_effector_transform(self, ik_eff_name: str) -> list:
+        """Returns the transform values of the ik effector"""
+        return self.metadata.control_transform_values[ik_eff_name]
+
+    def plan_control_data(self, plan: component_plan.ComponentPlan):
+        """Plans the pin values of the controls names and transforms
+        """
+        fk_control_names, ik_upv_name, ik_eff_name = self.get_control_names()
+        control_transforms = self.metadata.control_transform_values
+
+        # Gets the construction function name
+        construction_func_name = self.get_function_node_name()
+
+        # SETUP IK DATA
+
+        # Gets the names of the ik controls and their transforms, and applies it directly to the node
+        plan.set_pin_default_value(f'{construction_func_name}.effector_name',
+                                   ik_eff_name, False)
+        plan.set_pin_default_value(f'{construction_func_name}.upVector_name',
+                                   ik_upv_name, False)
+
+        plan.set_pin_default_value(f"{construction_func_name}.effector",
+                                   pin_values.encode_transform(self.get_effector_transform(ik_eff_name)),
+                                   True)
+
+        plan.set_pin_default_value(f"{construction_func_name}.upVector",
+                                   pin_values.encode_transform(control_transforms[ik_upv_name]),
+                                   True)
+
+        # SETUP FK DATA
+        plan.set_pin_default_value(
+            f"{construction_func_name}.fk_control_transforms",
+            pin_values.encode_transforms([control_transforms[control_name] for control_name in fk_control_names]),
+            True)
+
+        plan.set_pin_default_value(
+            f'{construction_func_name}.fk_control_names',
+            pin_values.encode_names(fk_control_names),
+            True)
+
+        self.plan_control_scale(
+            fk_control_names,
+            ik_upv_name,
+            ik_eff_name,
+            plan)
+
+        self.plan_control_shape_offset(fk_control_names,
+                                       ik_upv_name,
+                                       ik_eff_name,
+                                       plan)
+
+        self.plan_control_colour(fk_control_names,
+                                 ik_upv_name,
+                                 ik_eff_name,
+                                 plan)
+
+    def plan_control_scale(self, fk_names: list[str], ik_upv: str, ik_eff: str, plan: component_plan.ComponentPlan):
+        """
+        Generates a scale value per a control
+        """
+        construction_func_name = self.get_function_node_name()
+
+        control_sizes = []
+        # Calculates the unreal scale for the control and populates it into the array node.
+        for control_name in fk_names + [ik_upv, ik_eff]:
+            aabb = self.metadata.controls_aabb[control_name]
+            unreal_size = [round(element / self.reduce_ratio, 4) for element in aabb[1]]
+
+            # rudementary way to check if the bounding box might be flat, if it is then
+            # the first value if applied onto the axis
+            if unreal_size[0] == unreal_size[1] and unreal_size[2] < 0.2:
+                unreal_size[2] = unreal_size[0]
+            elif unreal_size[1] == unreal_size[2] and unreal_size[0] < 0.2:
+                unreal_size[0] = unreal_size[1]
+            elif unreal_size[0] == unreal_size[2] and unreal_size[1] < 0.2:
+                unreal_size[1] = unreal_size[0]
+
+            control_sizes.append(unreal_size)
+
+        # Populates and resizes the pin in one go
+        plan.set_pin_default_value(
+            f'{construction_func_name}.control_sizes',
+            pin_values.encode_vectors(control_sizes),
+            True)
+
+    def plan_control_shape_offset(self, fk_names: list[str], ik_upv: str, ik_eff: str,
+                                  plan: component_plan.ComponentPlan):
+        """
+        As some controls have there pivot at the same position as the transform, but the control is actually moved
+        away from that pivot point. We use the bounding box position as an offset for the control shape.
+        """
+        construction_func_name = self.get_function_node_name()
+
+        control_offsets = [self.metadata.controls_aabb[control_name][0] for control_name in fk_names + [ik_upv, ik_eff]]
+
+        plan.set_pin_default_value(
+            f'{construction_func_name}.control_offsets',
+            pin_values.encode_vectors(control_offsets),
+            True)
+
+    def plan_control_colour(self, fk_names: list[str], ik_upv: str, ik_eff: str,
+                            plan: component_plan.ComponentPlan):
+
+        construction_node = self.get_function_node_name()
+
+        control_colours = [self.metadata.controls_colour[control_name] for control_name in fk_names + [ik_upv, ik_eff]]
+
+        # Populates and resizes the pin in one go
+        plan.set_pin_default_value(
+            f'{construction_node}.control_colours',
+            pin_values.encode_colours(control_colours),
+            True)
@@ -0,0 +1,120 @@
+from ueGear.controlrig.helpers import component_plan, pin_values
+from ueGear.controlrig.planners import base_planner
+
+
+class Planner(base_planner.ComponentPlanner):
+
+    def plan_bones(self, plan: component_plan.ComponentPlan):
+        """
+        Generates the Bone array node, and connects it to the function nodes
+        """
+        bone_names = self.metadata.joints or []
+
+        if len(bone_names) < 3:
+            plan.log_error(f"[Bone Populate] Failed no Bones found: Found {len(bone_names)} bones")
+            return
+
+        # Unique name for this skeleton node array
+        bone_node_name = f"{self.metadata.fullname}_RigUnit_ItemArray"
+        self.plan_item_array(plan, bone_node_name, bone_names)
+
+        for construction_node_name in self.get_function_node_names("construction_functions")[:1]:
+            plan.add_link(f'{bone_node_name}.Items',
+                          f'{construction_node_name}.fk_bones')
+
+        for forward_node_name in self.get_function_node_names("forward_functions")[:1]:
+            plan.add_link(f'{bone_node_name}.Items',
+                          f'{forward_node_name}.Array')
+
+        for backwards_node_name in self.get_function_node_names("backwards_functions")[:1]:
+            plan.add_link(f'{bone_node_name}.Items',
+                          f'{backwards_node_name}.chain_joints')
+
+    def plan_control_names(self, plan: component_plan.ComponentPlan):
+        construction_func_name = self.get_function_node_name()
+
+        # Populates and resizes the pin in one go
+        plan.set_pin_default_value(f'{construction_func_name}.control_names',
+                                   pin_values.encode_names(self.metadata.controls),
+                                   True)
+
+    # TODO: setup an init_controls method and move this method and the populate controls method into it
+    def plan_control_data(self, plan: component_plan.ComponentPlan):
+        """Plans the transform data for the controls generated, with the data from the mgear json
+        file.
+        """
+        construction_func_name = self.get_function_node_name()
+
+        control_transforms = [self.metadata.control_transform_values[control_name]
+                              for control_name in self.metadata.controls]
+
+        # Populates and resizes the pin in one go
+        plan.set_pin_default_value(
+            f"{construction_func_name}.control_transforms",
+            pin_values.encode_transforms(control_transforms),
+            True)
+
+        self.plan_control_names(plan)
+        self.plan_control_scale(plan)
+        self.plan_control_shape_offset(plan)
+        self.plan_control_colour(plan)
+
+    def plan_control_shape_offset(self, plan: component_plan.ComponentPlan):
+        """
+        As some controls have there pivot at the same position as the transform, but the control is actually moved
+        away from that pivot point. We use the bounding box position as an offset for the control shape.
+        """
+        construction_func_name = self.get_function_node_name()
+
+        control_offsets = [self.metadata.controls_aabb[control_name][0] for control_name in self.metadata.controls]
+
+        plan.set_pin_default_value(
+            f'{construction_func_name}.control_offsets',
+            pin_values.encode_vectors(control_offsets),
+            True)
+
+    def plan_control_scale(self, plan: component_plan.ComponentPlan):
+        """
+        Generates a scale value per a control
+        """
+        construction_func_name = self.get_function_node_name()
+
+        reduce_ratio = 4.0
+        """Magic number to try and get the maya control scale to be similar to that of unreal.
+        As the mGear uses a square and ueGear uses a cirlce.
+        """
+
+        control_sizes = []
+        # Calculates the unreal scale for the control and populates it into the array node.
+        for i, control_name in enumerate(self.metadata.controls):
+            aabb = self.metadata.controls_aabb[control_name]
+            unreal_size = [round(element/reduce_ratio, 4) for element in aabb[1]]
+
+            # todo: this is a test implementation, for a more robust validation, each axis should be checked.
+            # rudementary way to check if the bounding box might be flat, if it is then
+            # the first value if applied onto the axis
+            if unreal_size[0] == unreal_size[1] and unreal_size[2] < 0.2:
+                unreal_size[2] = unreal_size[0]
+            elif unreal_size[1] == unreal_size[2] and unreal_size[0] < 0.2:
+                unreal_size[0] = unreal_size[1]
+            elif unreal_size[0] == unreal_size[2] and unreal_size[1] < 0.2:
+                unreal_size[1] = unreal_size[0]
+
+            control_sizes.append(unreal_size)
+
+        # Populates and resizes the pin in one go
+        plan.set_pin_default_value(
+            f'{construction_func_name}.control_scale',
+            pin_values.encode_vectors(control_sizes),
+            True)
+
+    def plan_control_colour(self, plan: component_plan.ComponentPlan):
+        construction_node = self.get_function_node_name()
+
+        control_colours = [self.metadata.controls_colour[control_name] for control_name in self.metadata.controls]
+
+        # Populates and resizes the pin in one go
+        plan.set_pin_default_value(
+            f'{construction_node}.control_colours',
+            pin_values.encode_colours(control_colours),
+            True)
@@ -0,0 +1,102 @@
+from ueGear.controlrig.helpers import component_plan, pin_values
+from ueGear.controlrig.planners import base_planner
+
+
+class Planner(base_planner.ComponentPlanner):
+    backwards_requires_joints = True
+
+    def plan_functions(self, plan: component_plan.ComponentPlan):
+        super().plan_functions(plan)
+
+        if self.is_manual:
+            return
+
+        # Sets the control name of the construction function
+        plan.set_pin_default_value(f"{self.get_function_node_name()}.control_name",
+                                   self.metadata.controls[0],
+                                   False)
+
+    def plan_bones(self, plan: component_plan.ComponentPlan):
+        """
+        Populates the joint pin of the function nodes
+        """
+        bone_names = self.metadata.joints
+
+        if not bone_names or len(bone_names) > 1:
+            plan.log_warning(f"[populate_bones] {self.name}: No bone provided")
+            return
+
+        bone_name = bone_names[0]
+
+        if bone_name == "":
+            plan.log_error(f"[populate_bones] Bone name cannot be empty:{bone_names}")
+            return
+
+        for evaluation_path in self.functions.keys():
+            for function_node_name in self.get_function_node_names(evaluation_path):
+                plan.set_pin_default_value(f'{function_node_name}.joint',
+                                           pin_values.encode_element_key(bone_name),
+                                           True)
+
+    def plan_control_data(self, plan: component_plan.ComponentPlan):
+        """Plans the transform data for the controls generated, with the data from the mgear json
+        file.
+        """
+
+        control_name = self.metadata.controls[0]
+        control_transform = self.metadata.control_transform_values[control_name]
+
+        const_func = self.get_function_node_name()
+
+        plan.set_pin_default_value(f"{const_func}.control_world_transform",
+                                   pin_values.encode_transform(control_transform),
+                                   True)
+
+        self.plan_control_shape_orientation(plan)
+        self.plan_control_scale(plan)
+        self.plan_control_colour(plan)
+
+    def plan_control_shape_orientation(self, plan: component_plan.ComponentPlan):
+        """Plans the control's shapes orientation"""
+
+        for cr_func in self.functions["construction_functions"]:
+            construction_node = f"{self.name}_{cr_func}"
+
+            plan.set_pin_default_value(f'{construction_node}.control_orientation.X',
+                                       '90.000000',
+                                       False)
+
+    def plan_control_scale(self, plan: component_plan.ComponentPlan):
+        """Calculates the size of the control from the Bounding Box"""
+
+        for cr_func in self.functions["construction_functions"]:
+            construction_node = f"{self.name}_{cr_func}"
+
+            control_name = self.metadata.controls[0]
+            aabb = self.metadata.controls_aabb[control_name]
+            reduce_ratio = 6.0
+            unreal_size = [round(element / reduce_ratio, 4) for element in aabb[1]]
+
+            for axis, value in zip(["X", "Y", "Z", ], unreal_size):
+
+                # an ugly way to ensure that the bounding box is not 100% flat,
+                # causing the control to be scaled flat on Z
+                if axis == "Z" and value <= 1.0:
+                    value = unreal_size[0]
+
+                plan.set_pin_default_value(
+                    f'{construction_node}.control_size.{axis}',
+                    str(value),
+                    False)
+
+    def plan_control_colour(self, plan: component_plan.ComponentPlan):
+        construction_node = self.get_function_node_name()
+
+        control_name = self.metadata.controls[0]
+        colour = self.metadata.controls_colour[control_name]
+
+        # Populates and resizes the pin in one go
+        plan.set_pin_default_value(
+            f'{construction_node}.control_colour',
+            pin_values.encode_colour(colour),
+            True)
@@ -0,0 +1,144 @@
+from ueGear.controlrig.helpers import component_plan, pin_values
+from ueGear.controlrig.mgear import table
+from ueGear.controlrig.planners import base_planner
+
+GUIDE_PINS = {"root": "root",
+              "1_loc": "tip",
+              "heel": "heel",
+              "0_loc": "fk0",
+              "outpivot": "outer_pivot",
+              "inpivot": "inner_pivot"}
+"""Guide transform name, to the pin of the construction function it populates"""
+
+
+class Planner(base_planner.ComponentPlanner):
+
+    def plan_functions(self, plan: component_plan.ComponentPlan):
+        super().plan_functions(plan)
+
+        # Set construction functions side
+        plan.set_pin_default_value(f'{self.get_function_node_name()}.side', self.metadata.side, False)
+
+    def plan_bones(self, plan: component_plan.ComponentPlan):
+        """
+        Populates the ball joint data on the foot nodes/functions.
+        """
+        bone_names = self.metadata.joints or []
+
+        if len(bone_names) < 1:
+            plan.log_error("[Bone Populate] Failed - No Bones found")
+            return
+
+        # Ball Joint
+        jnt_name = str(bone_names[0])
+
+        # Assign ball joint to the construct, forward and backwards nodes
+        for evaluation_path in ["construction_functions", "forward_functions", "backwards_functions"]:
+            for function_node_name in self.get_function_node_names(evaluation_path)[:1]:
+                plan.set_pin_default_value(f'{function_node_name}.ball_joint',
+                                           pin_values.encode_element_key(jnt_name),
+                                           True)
+
+    def plan_control_data(self, plan: component_plan.ComponentPlan):
+        """Plans the pin values of the controls names and transforms
+
+        The foot does not rely on control positions as it uses the guideTransforms to place the
+        locations where the foot will rotate around.
+        """
+        # Gets the construction function name
+        construction_func_name = self.get_function_node_name()
+
+        for guide_name, guide_rows in (self.metadata.get_guide_transform_data() or {}).items():
+            pin_name = GUIDE_PINS.get(guide_name, None)
+
+            # Populate the pins transform data
+            if pin_name is None:
+                continue
+
+            # Space Convert between Maya and Unreal, by swapping the Y and Z axis of the guide position. The
+            # rotation of the Maya transformation data is not used.
+            position = guide_rows[3]
+            transform = table.position_to_values([position[0], position[2], position[1]])
+
+            plan.set_pin_default_value(f"{construction_func_name}.{pin_name}",
+                                       pin_values.encode_transform(transform),
+                                       True)
+
+        # Setting the transform locations, in a specific order
+
+        if len(self.metadata.controls) != 6:
+            raise IOError("Please Contact developer, as only 6 controls are accounted for..")
+
+        # Creates an ordered list of control transforms
+        role_order = ["heel", "tip", "roll", "bk0", "bk1", "fk0"]
+        ordered_ctrl_trans = [None] * 6
+        ordered_bounding_box = [None] * 6
+        ordered_colours = [None] * 6
+
+        for ctrl_name in self.metadata.controls:
+            # Use the controls.Role metadata to detect the type
+            ctrl_role = self.metadata.controls_role[ctrl_name]
+            if ctrl_role not in role_order:
+                continue
+
+            index = role_order.index(ctrl_role)
+            ordered_ctrl_trans[index] = self.metadata.control_transform_values[ctrl_name]
+            ordered_bounding_box[index] = self.metadata.controls_aabb[ctrl_name]
+            ordered_colours[index] = self.metadata.controls_colour[ctrl_name]
+
+        # Populates and resizes the pin in one go
+        plan.set_pin_default_value(
+            f"{construction_func_name}.control_transforms",
+            pin_values.encode_transforms(ordered_ctrl_trans),
+            True)
+
+        self.plan_control_scale(construction_func_name, ordered_bounding_box, plan)
+        self.plan_control_shape_offset(construction_func_name, ordered_bounding_box, plan)
+        self.plan_control_colour(construction_func_name, ordered_colours, plan)
+
+    def plan_control_scale(self, node_name, bounding_boxes, plan: component_plan.ComponentPlan):
+        reduce_ratio = 4.0
+        """Magic number to try and get the maya control scale to be similar to that of unreal.
+        As the mGear uses a square and ueGear uses a cirlce.
+        """
+
+        control_sizes = []
+        for aabb in bounding_boxes:
+            unreal_size = [round(element / reduce_ratio, 4) for element in aabb[1]]
+
+            # rudementary way to check if the bounding box might be flat, if it is then
+            # the first value if applied onto the axis
+            if unreal_size[0] == unreal_size[1] and unreal_size[2] < 0.2:
+                unreal_size[2] = unreal_size[0]
+            elif unreal_size[1] == unreal_size[2] and unreal_size[0] < 0.2:
+                unreal_size[0] = unreal_size[1]
+            elif unreal_size[0] == unreal_size[2] and unreal_size[1] < 0.2:
+                unreal_size[1] = unreal_size[0]
+
+            control_sizes.append(unreal_size)
+
+        # Populates and resizes the pin in one go
+        plan.set_pin_default_value(
+            f'{node_name}.control_sizes',
+            pin_values.encode_vectors(control_sizes),
+            True)
+
+    def plan_control_shape_offset(self, node_name, bounding_boxes, plan: component_plan.ComponentPlan):
+        """
+        As some controls have there pivot at the same position as the transform, but the control is actually moved
+        away from that pivot point. We use the bounding box position as an offset for the control shape.
+        """
+
+        control_offsets = [aabb[0] for aabb in bounding_boxes]
+
+        plan.set_pin_default_value(
+            f'{node_name}.control_offsets',
+            pin_values.encode_vectors(control_offsets),
+            True)
+
+    def plan_control_colour(self, node_name, ordered_colours, plan: component_plan.ComponentPlan):
+        # Populates and resizes the pin in one go
+        plan.set_pin_default_value(
+            f'{node_name}.control_colours',
+            pin_values.encode_colours(ordered_colours),
+            True)
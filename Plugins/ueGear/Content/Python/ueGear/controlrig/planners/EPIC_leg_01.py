@@ -0,0 +1,16 @@
+from ueGear.controlrig.mgear import table
+from ueGear.controlrig.planners import EPIC_arm_01
+
+
+class Planner(EPIC_arm_01.Planner):
+    """
+    Plans the leg, the bones and the controls are planned like the arm.
+
+    Design Decision: All feet IK Controls are built in World Space, oriented to World Space
+    """
+
+    reduce_ratio = 5.0
+
+    def get_effector_transform(self, ik_eff_name: str) -> list:
+        """Orient the ik effector into unreal world space, by only using the position of the control"""
+        return table.position_to_values(self.metadata.control_transform_values[ik_eff_name][:3])
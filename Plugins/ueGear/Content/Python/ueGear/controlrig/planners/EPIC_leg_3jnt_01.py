@@ -0,0 +1,18 @@
+from ueGear.controlrig.planners import EPIC_leg_01
+
+
+class Planner(EPIC_leg_01.Planner):
+
+    minimum_bone_count = 4
+
+    def get_index_node_names(self) -> list[tuple]:
+        # fixme: This entry could be seperated into a construction list and a forward list.
+        # The last element is the lower bone, which needs to point to bone index 2
+        return [(f"{self.metadata.fullname}_upper_RigUnit_ItemArray", 0),
+                (f"{self.metadata.fullname}_mid_RigUnit_ItemArray", 1),
+                (f"{self.metadata.fullname}_forward_lower_RigUnit_ItemArray", 2),
+                (f"{self.metadata.fullname}_forward_foot_RigUnit_ItemArray", 3),
+                (f"{self.metadata.fullname}_construction_lower_RigUnit_ItemArray", 2)]
+
+    def get_forward_bone_pins(self) -> list[str]:
+        return ["femur_bone", "tibia_bone", "cannon_bone", "foot_bone"]
@@ -0,0 +1,156 @@
+from ueGear.controlrig.helpers import component_plan, pin_values
+from ueGear.controlrig.planners import base_planner
+
+
+class Planner(base_planner.ComponentPlanner):
+
+    def plan_functions(self, plan: component_plan.ComponentPlan):
+        super().plan_functions(plan)
+
+        if self.is_manual:
+            return
+
+        # Sets the control name of the construction function
+        plan.set_pin_default_value(f"{self.get_function_node_name()}.control_name",
+                                   self.metadata.fullname,
+                                   False)
+
+    def plan_bones(self, plan: component_plan.ComponentPlan):
+        """
+        Generates the Bone array node that will be utilised by control rig to drive the component
+        """
+        bone_names = self.metadata.joints or []
+
+        if len(bone_names) < 3:
+            plan.log_error("[Bone Populate] Failed no Bones found")
+            return
+
+        # Unique name for this skeleton node array
+        array_node_name = f"{self.metadata.fullname}_RigUnit_ItemArray"
+        self.plan_item_array(plan, array_node_name, bone_names)
+
+        # Connects the Item Array Node to the functions.
+        for evaluation_path in self.functions.keys():
+            for function_node_name in self.get_function_node_names(evaluation_path):
+                plan.add_link(f'{array_node_name}.Items',
+                              f'{function_node_name}.Joints')
+
+        output_joint_node_name = self.plan_output_joints(plan)
+
+        for construction_func_name in self.get_function_node_names("construction_functions")[:1]:
+            plan.add_link(f'{output_joint_node_name}.Items',
+                          f'{construction_func_name}.joint_outputs')
+
+    def plan_output_joints(self, plan: component_plan.ComponentPlan) -> str:
+        """Plans an array of joints that will be fed into the node and then drive the output pins
+
+        TODO: Refactor this, as it is no longer needed due to relatives now existsing in the json file.
+        """
+        # Unique name for this skeleton output array
+        array_node_name = f"{self.metadata.fullname}_OutputSkeleton_RigUnit_ItemArray"
+
+        # Loops over all the joint relatives to setup the array
+        output_bone_names = [self.metadata.joints[jnt_index] for jnt_index in self.metadata.joint_relatives.values()]
+
+        self.plan_item_array(plan, array_node_name, output_bone_names, 500.0, 500.0)
+
+        return array_node_name
+
+    def plan_control_data(self, plan: component_plan.ComponentPlan):
+        """Plans the transform data for the controls generated, with the data from the mgear json
+        file.
+        """
+        construction_func_name = self.get_function_node_name()
+
+        control_transforms = [self.metadata.control_transform_values[control_name]
+                              for control_name in self.metadata.controls]
+
+        plan.set_pin_default_value(
+            f"{construction_func_name}.fk_world_transforms",
+            pin_values.encode_transforms(control_transforms),
+            True)
+
+        # Populate control names
+        plan.set_pin_default_value(
+            f'{construction_func_name}.fk_world_keys',
+            pin_values.encode_names(self.metadata.controls),
+            True)
+
+        self.plan_control_scale(plan)
+        self.plan_control_shape_offset(plan)
+        self.plan_control_colour(plan)
+
+    def plan_control_scale(self, plan: component_plan.ComponentPlan):
+        """
+        Generates a scale value per a control
+        """
+
+        # Generates the array node
+        array_name = plan.add_array_node(f"{self.metadata.fullname}_control_scales")
+
+        # connects the node of scales to the construction node
+        construction_func_name = self.get_function_node_name()
+        plan.add_link(f'{array_name}.Array',
+                      f'{construction_func_name}.control_sizes')
+
+        aabb_divisor = 4.0
+        """Magic number to try and get the maya control scale to be similar to that of unreal.
+        As the mGear uses a square and ueGear uses a cirlce.
+        """
+
+        control_sizes = []
+        # populate array
+        for i, control_name in enumerate(self.metadata.controls):
+            aabb = self.metadata.controls_aabb[control_name]
+            unreal_size = [round(element / aabb_divisor, 4) for element in aabb[1]]
+
+            # rudementary way to check if the bounding box might be flat, if it is then
+            # the first value if applied onto the axis
+            if unreal_size[0] == unreal_size[1] and unreal_size[2] < 0.02:
+                unreal_size[2] = unreal_size[0]
+            elif unreal_size[1] == unreal_size[2] and unreal_size[0] < 0.02:
+                unreal_size[0] = unreal_size[1]
+            elif unreal_size[0] == unreal_size[2] and unreal_size[1] < 0.02:
+                unreal_size[1] = unreal_size[0]
+
+            control_sizes.append(unreal_size)
+
+        # Populates and resizes the pin in one go
+        plan.set_pin_default_value(
+            f'{array_name}.Values',
+            pin_values.encode_vectors(control_sizes),
+            True)
+
+    def plan_control_shape_offset(self, plan: component_plan.ComponentPlan):
+        """
+        As some controls have there pivot at the same position as the transform, but the control is actually moved
+        away from that pivot point. We use the bounding box position as an offset for the control shape.
+        """
+
+        # Generates the array node
+        array_name = plan.add_array_node(f"{self.metadata.fullname}_control_offset")
+
+        # connects the node of scales to the construction node
+        construction_func_name = self.get_function_node_name()
+        plan.add_link(f'{array_name}.Array',
+                      f'{construction_func_name}.control_offsets')
+
+        control_offsets = [self.metadata.controls_aabb[control_name][0] for control_name in self.metadata.controls]
+
+        plan.set_pin_default_value(
+            f'{array_name}.Values',
+            pin_values.encode_vectors(control_offsets),
+            True)
+
+    def plan_control_colour(self, plan: component_plan.ComponentPlan):
+        construction_node = self.get_function_node_name()
+
+        control_colours = [self.metadata.controls_colour[control_name] for control_name in self.metadata.controls]
+
+        # Populates and resizes the pin in one go
+        plan.set_pin_default_value(
+            f'{construction_node}.control_colours',
+            pin_values.encode_colours(control_colours),
+            True)
+
+
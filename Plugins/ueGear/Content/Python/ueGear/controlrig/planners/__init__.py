@@ -0,0 +1,10 @@
+"""
+ueGear Planners, the precompute phase of the ueGear components.
+
+Each module plans a single mGear component type, see `helpers.component_plan`. A planner reads the mGear metadata
+of a component and records its comment node, function nodes, bone nodes, pin default values and links in a
+`ComponentPlan`, which the component applies on the RigVM controller.
+
+The planners do not import the `unreal` module, so the components can be planned in worker processes that run
+a plain Python interpreter, see `mgear_worker.plan_component`.
+"""
@@ -0,0 +1,121 @@
+__all__ = ['ComponentPlanner']
+
+from ueGear.controlrig.helpers import pin_values
+from ueGear.controlrig.helpers.component_plan import ComponentPlan
+
+ITEM_ARRAY_STRUCT_PATH = '/Script/ControlRig.RigUnit_ItemArray'
+"""Struct of the item array nodes, that store the bones of a component"""
+
+ARRAY_GET_AT_INDEX_NOTATION = 'DISPATCH_RigVMDispatch_ArrayGetAtIndex(in Array,in Index,out Element)'
+"""Notation of the template node, that returns a single element of an array"""
+
+
+class ComponentPlanner(object):
+    """
+    Plans the graph changes of a ueGear component, from its mGear metadata.
+
+    The planner only holds plain Python data, so it can be pickled and planned in another process, see
+    `detached_copy`.
+    """
+
+    backwards_requires_joints: bool = False
+    """The backwards function is only created when the component drives joints, or has a backwards reference
+    joint"""
+
+    def __init__(self, name: str, functions: dict, metadata, is_manual: bool = False):
+        self.name = name
+        """Name of the ueGear Component"""
+
+        self.functions = functions
+        """Control Rig functions of the component, by evaluation path"""
+
+        self.metadata = metadata
+        """The mGear metadata component"""
+
+        self.is_manual = is_manual
+        """Manual components generate their controls with Python, so their control data is not planned"""
+
+    def detached_copy(self) -> "ComponentPlanner":
+        """Returns a copy of the planner that holds no Unreal objects, see `mgComponent.detached_copy`"""
+        return self.__class__(self.name, self.functions, self.metadata.detached_copy(), self.is_manual)
+
+    def create_plan(self) -> ComponentPlan:
+        """Runs the precompute phase of the component"""
+        plan = ComponentPlan(self.name)
+        self.plan_functions(plan)
+        self.plan_bones(plan)
+        if not self.is_manual:
+            self.plan_control_data(plan)
+        self.plan_input_data(plan)
+        return plan
+
+    def skip_evaluation_path(self, evaluation_path: str) -> bool:
+        """Returns True if the functions of the evaluation path are not created, as no joints need to be driven"""
+        if self.metadata.joints is not None:
+            return False
+
+        if evaluation_path == 'forward_functions':
+            return True
+
+        if evaluation_path == 'backwards_functions' and (self.is_manual or self.backwards_requires_joints):
+            # A backwards reference joint is not driven by the component, the backwards solve uses it so the
+            # control follows a specific bone
+            settings = self.metadata.settings or {}
+            return not settings.get("backwards_ref_jnt")
+
+        return False
+
+    def get_function_node_name(self, evaluation_path: str = 'construction_functions', index: int = 0) -> str:
+        """Returns the name of a function node of the component, the node does not need to exist yet"""
+        return f"{self.name}_{self.functions[evaluation_path][index]}"
+
+    def get_function_node_names(self, evaluation_path: str) -> list[str]:
+        """Returns the names of the function nodes of the evaluation path, empty if the path is skipped"""
+        if self.skip_evaluation_path(evaluation_path):
+            return []
+        return [f"{self.name}_{cr_func}" for cr_func in self.functions[evaluation_path]]
+
+    def plan_functions(self, plan: ComponentPlan):
+        """Plans the comment node and the function nodes of the component"""
+        plan.add_comment_node(self.name, f"ueComponent: {self.name}")
+
+        for evaluation_path, function_names in self.functions.items():
+            if self.skip_evaluation_path(evaluation_path):
+                continue
+
+            for cr_func in function_names:
+                plan.add_function_node(f"{self.name}_{cr_func}", evaluation_path, cr_func)
+
+    def plan_bones(self, plan: ComponentPlan):
+        """OVERLOAD THIS METHOD
+
+        This method should plan the bone nodes, and the bone pins of the function nodes
+        """
+        pass
+
+    def plan_control_data(self, plan: ComponentPlan):
+        """OVERLOAD THIS METHOD
+
+        This method should record the control transforms, names, sizes, offsets and colours into the plan.
+        """
+        pass
+
+    def plan_input_data(self, plan: ComponentPlan):
+        """OVERLOAD THIS METHOD
+
+        This method should plan any other input data of the function nodes
+        """
+        pass
+
+    def plan_item_array(self, plan: ComponentPlan, node_name: str, bone_names: list[str],
+                        x: float = -54.908936, y: float = 204.649109):
+        """Plans an item array node, that contains all the bones that need to be driven"""
+        plan.add_unit_node(node_name, ITEM_ARRAY_STRUCT_PATH, 'Execute', x, y)
+
+        # Populates and resizes the pin in one go
+        plan.set_pin_default_value(f'{node_name}.Items',
+                                   pin_values.encode_element_keys(bone_names),
+                                   True)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.name})"
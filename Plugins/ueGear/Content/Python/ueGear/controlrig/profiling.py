@@ -0,0 +1,309 @@
+"""
+Opt-in profiling of Control Rig builds.
+
+While a `BuildTracer` is active, the build methods of the ueGear Manager and of every ueGear Component are
+timed as nested spans, and the calls made on the RigVM controller and the hierarchy controller are counted.
+The methods are only wrapped while the tracer is active, so a build that is not traced runs the original
+methods.
+
+    with BuildTracer("C:/temp/build_trace.json"):
+        create_control_rig(...)
+
+The trace file uses the Chrome trace event format, it can be opened in Perfetto (ui.perfetto.dev) or in
+chrome://tracing. A summary table of the spans and controller calls is logged when the tracer exits.
+"""
+
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+
+import unreal
+
+from ueGear.controlrig import components
+from ueGear.controlrig.components.base_component import UEComponent
+from ueGear.controlrig.helpers.command_buffer import ControllerCommandBuffer
+from ueGear.controlrig.manager import UEGearManager
+
+MANAGER_METHODS = ("build_world_control", "attach_world_control", "plan_components", "build_component",
+                   "attach_component", "remove_component_nodes", "populate_parents", "build_manual_controls",
+                   "connect_execution", "connect_construction_functions", "connect_forward_functions",
+                   "group_components")
+"""Methods of the ueGear Manager that are traced"""
+
+COMPONENT_METHODS = ("create_plan", "create_functions", "populate_control_transforms", "init_input_data",
+                     "describe_manual_controls", "generate_manual_controls", "forward_solve_connect")
+"""Methods of the ueGear Components that are traced"""
+
+CONTROLLER_CATEGORY = "controller"
+HIERARCHY_CONTROLLER_CATEGORY = "hierarchy_controller"
+HIERARCHY_CATEGORY = "hierarchy"
+
+
+class BuildTracer:
+    """
+    Context manager that records a build as nested spans, one per traced method call, with the number of
+    controller and hierarchy calls that were made inside each span.
+
+    Enter the tracer before the `BuildSession` of the build, so the command buffer records its operations on a
+    counted controller. The controller calls are then the calls that reached the controller, after the
+    command buffer dropped the redundant ones.
+    """
+
+    def __init__(self, trace_path: str = None, log_summary: bool = True):
+        self.trace_path = trace_path
+        """File the Chrome trace is written to when the tracer exits, nothing is written if None"""
+
+        self.log_summary = log_summary
+        """Logs the summary table when the tracer exits"""
+
+        self.events = []
+        """Completed spans, as Chrome trace events"""
+
+        self.call_counts = {}
+        """Number of calls per category, and per method name"""
+
+        self._call_total = {}
+        self._stack = []
+        self._patches = []
+        self._start = None
+
+    def __enter__(self):
+        self._start = time.perf_counter_ns()
+        self._install()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._uninstall()
+
+        if self.trace_path:
+            self.write_trace(self.trace_path)
+        if self.log_summary:
+            for line in self.format_summary().splitlines():
+                unreal.log(line)
+        return False
+
+    # ------ Spans -------
+
+    @contextlib.contextmanager
+    def span(self, name: str, category: str = "build", **args):
+        """
+        Records the code run inside the context as a span. Spans opened inside another span are nested in it.
+
+        :param str name: Name of the span.
+        :param str category: Category of the span, used to filter spans in the trace viewer.
+        :param args: Values that are stored with the span.
+        """
+        frame = {"child_duration": 0, "calls": dict(self._call_total)}
+        self._stack.append(frame)
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter_ns() - start
+            self._stack.pop()
+            if self._stack:
+                self._stack[-1]["child_duration"] += duration
+
+            calls = {category_name: count - frame["calls"].get(category_name, 0)
+                     for category_name, count in self._call_total.items()}
+            args.update({f"{category_name}_calls": count for category_name, count in calls.items() if count})
+
+            self.events.append({"name": name,
+                                "cat": category,
+                                "ph": "X",
+                                "ts": (start - self._start) / 1000.0,
+                                "dur": duration / 1000.0,
+                                "pid": os.getpid(),
+                                "tid": threading.get_ident(),
+                                "args": args,
+                                # Used by the summary, removed when the trace is written
+                                "self_dur": (duration - frame["child_duration"]) / 1000.0})
+
+    def count_call(self, category: str, method_name: str):
+        """Counts a call on a controller"""
+        methods = self.call_counts.setdefault(category, {})
+        methods[method_name] = methods.get(method_name, 0) + 1
+        self._call_total[category] = self._call_total.get(category, 0) + 1
+
+    # ------ Output -------
+
+    def get_trace(self) -> dict:
+        """Returns the recorded spans in the Chrome trace event format"""
+        events = []
+        for event in self.events:
+            event = dict(event)
+            del event["self_dur"]
+            events.append(event)
+
+        events.sort(key=lambda event: event["ts"])
+        return {"traceEvents": events,
+                "displayTimeUnit": "ms",
+                "otherData": {"call_counts": self.call_counts}}
+
+    def write_trace(self, path: str):
+        """Writes the Chrome trace file"""
+        with open(path, 'w') as file:
+            json.dump(self.get_trace(), file)
+        unreal.log(f"ueGear Build trace written to {path}")
+
+    def get_summary(self) -> list[dict]:
+        """
+        Returns the spans aggregated by name, slowest first.
+
+        Each row has the `name`, `count`, `total` and `self` time in milliseconds, and the controller calls that
+        were made inside the spans.
+        """
+        rows = {}
+        for event in self.events:
+            row = rows.get(event["name"], None)
+            if row is None:
+                row = rows[event["name"]] = {"name": event["name"], "count": 0, "total": 0.0, "self": 0.0,
+                                             "calls": 0}
+            row["count"] += 1
+            row["total"] += event["dur"] / 1000.0
+            row["self"] += event["self_dur"] / 1000.0
+            row["calls"] += sum(count for key, count in event["args"].items() if key.endswith("_calls"))
+
+        return sorted(rows.values(), key=lambda row: row["total"], reverse=True)
+
+    def format_summary(self, limit: int = 25) -> str:
+        """Formats the span summary, and the most made controller calls, as a text table"""
+        lines = [f"{'Span':<48} {'Count':>7} {'Total ms':>10} {'Self ms':>10} {'Calls':>8}"]
+        for row in self.get_summary()[:limit]:
+            lines.append(f"{row['name'][:48]:<48} {row['count']:>7} {row['total']:>10.2f} {row['self']:>10.2f} "
+                         f"{row['calls']:>8}")
+
+        calls = [(count, category, method_name)
+                 for category, methods in self.call_counts.items()
+                 for method_name, count in methods.items()]
+        calls.sort(reverse=True)
+
+        if calls:
+            lines.append("")
+            lines.append(f"{'Call':<58} {'Count':>8}")
+            for count, category, method_name in calls[:limit]:
+                lines.append(f"{(category + '.' + method_name)[:58]:<58} {count:>8}")
+
+        return "\n".join(lines)
+
+    # ------ Instrumentation -------
+
+    def _install(self):
+        """Wraps the traced methods of the manager and of every component class"""
+        for method_name in MANAGER_METHODS:
+            self._patch(UEGearManager, method_name, self._trace_manager_method)
+
+        self._patch(UEGearManager, "get_active_controller", self._count_controller)
+        self._patch(UEGearManager, "get_hierarchy_controller", self._count_hierarchy_controller)
+
+        for component_class in _get_component_classes():
+            for method_name in COMPONENT_METHODS:
+                # Inherited methods are wrapped on the class that defines them
+                if method_name in component_class.__dict__:
+                    self._patch(component_class, method_name, self._trace_component_method)
+
+    def _uninstall(self):
+        for owner, method_name, method in reversed(self._patches):
+            setattr(owner, method_name, method)
+        self._patches = []
+
+    def _patch(self, owner, method_name: str, wrap):
+        method = owner.__dict__.get(method_name, None)
+        if method is None:
+            return
+        self._patches.append((owner, method_name, method))
+        setattr(owner, method_name, wrap(method))
+
+    def _trace_manager_method(self, method):
+        if method.__name__ == "build_component":
+            # The build of each component is its own span, that contains the component methods
+            @functools.wraps(method)
+            def wrapper(manager, name, *args, **kwargs):
+                with self.span(name, "component", method=method.__name__):
+                    return method(manager, name, *args, **kwargs)
+        else:
+            @functools.wraps(method)
+            def wrapper(manager, *args, **kwargs):
+                with self.span(method.__name__, "manager"):
+                    return method(manager, *args, **kwargs)
+        return wrapper
+
+    def _trace_component_method(self, method):
+        @functools.wraps(method)
+        def wrapper(component, *args, **kwargs):
+            with self.span(f"{type(component).__name__}.{method.__name__}", "component_method",
+                           component=component.name):
+                return method(component, *args, **kwargs)
+        return wrapper
+
+    def _count_controller(self, method):
+        @functools.wraps(method)
+        def wrapper(manager, *args, **kwargs):
+            controller = method(manager, *args, **kwargs)
+            # The command buffer sends its operations to the controller it was created with, which is counted
+            if controller is None or isinstance(controller, (ControllerCommandBuffer, CallCounter)):
+                return controller
+            return CallCounter(controller, self, CONTROLLER_CATEGORY)
+        return wrapper
+
+    def _count_hierarchy_controller(self, method):
+        @functools.wraps(method)
+        def wrapper(manager, *args, **kwargs):
+            controller = method(manager, *args, **kwargs)
+            if controller is None:
+                return controller
+            return CallCounter(controller, self, HIERARCHY_CONTROLLER_CATEGORY)
+        return wrapper
+
+
+class CallCounter:
+    """
+    Forwards every call to the wrapped controller, and counts it on the tracer. The hierarchy returned by a
+    hierarchy controller is counted as well.
+    """
+
+    __slots__ = ("target", "tracer", "category")
+
+    def __init__(self, target, tracer: BuildTracer, category: str):
+        self.target = target
+        self.tracer = tracer
+        self.category = category
+
+    def __getattr__(self, name):
+        attribute = getattr(self.target, name)
+        if not callable(attribute):
+            return attribute
+
+        def call(*args, **kwargs):
+            self.tracer.count_call(self.category, name)
+            result = attribute(*args, **kwargs)
+            if name == "get_hierarchy" and result is not None:
+                return CallCounter(result, self.tracer, HIERARCHY_CATEGORY)
+            return result
+
+        return call
+
+    def __eq__(self, other):
+        if isinstance(other, CallCounter):
+            other = other.target
+        return self.target == other
+
+    def __hash__(self):
+        return hash(self.target)
+
+
+def _get_component_classes() -> list[type]:
+    """Imports every ueGear Component module, and returns all the component classes"""
+    components.load_all_components()
+
+    classes = [UEComponent]
+    index = 0
+    while index < len(classes):
+        for subclass in classes[index].__subclasses__():
+            if subclass not in classes:
+                classes.append(subclass)
+        index += 1
+    return classes
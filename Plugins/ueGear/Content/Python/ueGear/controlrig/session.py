@@ -0,0 +1,189 @@
+"""
+Build session of the ueGear Manager.
+
+A build changes the state of the Control Rig Blueprint to speed itself up: the VM notifications are suspended,
+the auto compile is disabled and the controller operations are recorded by the command buffer. The
+`BuildSession` owns those changes, and restores the blueprint when the build finishes, or when it fails.
+
+    with BuildSession(gear_manager) as session:
+        gear_manager.build_world_control()
+        gear_manager.build_components()
+
+While a session is active, the manager methods decorated with `build_phase` record their wall time in the
+session, so the cost of each build phase is logged at the end of the build.
+"""
+
+import contextlib
+import functools
+import time
+
+import unreal
+
+
+class BuildSession:
+    """
+    Context manager that prepares the active blueprint of the manager for a build, and restores it afterwards.
+
+    All graph changes are made inside a single undo bracket. If the build raises, the recorded operations are
+    dropped and the undo bracket is cancelled, which reverts the graph changes of the build. Changes made with
+    the hierarchy controller are not part of the bracket.
+    """
+
+    def __init__(self, manager, undo_title: str = "ueGear Build", compile_on_exit: bool = True,
+                 log_timings: bool = True):
+        self.manager = manager
+        """The ueGear Manager, whose active blueprint is built"""
+
+        self.undo_title = undo_title
+        """Title of the undo action that contains the build"""
+
+        self.compile_on_exit = compile_on_exit
+        """Compiles the blueprint once, when the build succeeds"""
+
+        self.log_timings = log_timings
+        """Logs the phase timings and controller call counts when the session ends"""
+
+        self.timings = {}
+        """Wall time in seconds per build phase, in the order the phases first ran"""
+
+        self.operation_counts = {}
+        """Controller calls per operation, see `ControllerCommandBuffer.get_operation_counts`"""
+
+        self.query_counts = {}
+        """Graph queries that were answered by the query cache (`hits`) and by the graph (`misses`)"""
+
+        self.duration = 0.0
+        """Wall time in seconds of the whole session"""
+
+        self.succeeded = False
+        """True once the session has ended without an error"""
+
+        self._blueprint = None
+        self._controller = None
+        self._command_buffer = None
+        self._compile_status = None
+        self._start = None
+        self._active_phase = None
+
+    def __enter__(self):
+        if self.manager.build_session is not None:
+            raise RuntimeError("A build session is already active on the ueGear Manager")
+
+        self._start = time.perf_counter()
+        self._blueprint = self.manager.active_control_rig
+        self._controller = self.manager.get_active_controller()
+
+        self._compile_status = self.manager.get_compile_mode()
+        self.manager.set_compile_mode(False)
+        self.manager.suspend_notification(True)
+
+        try:
+            self._controller.open_undo_bracket(self.undo_title)
+            self._command_buffer = self.manager.begin_command_buffer()
+        except BaseException:
+            self._restore_blueprint()
+            raise
+
+        self.manager.build_session = self
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.manager.build_session = None
+
+        try:
+            self.query_counts = self._command_buffer.get_query_counts()
+
+            if exc_type is None:
+                self._end_build()
+            else:
+                self._revert_build(exc_value)
+        finally:
+            self._restore_blueprint()
+
+        if exc_type is None and self.compile_on_exit:
+            with self.phase("compile"):
+                self._blueprint.recompile_vm()
+
+        self.succeeded = exc_type is None
+        self.duration = time.perf_counter() - self._start
+
+        if self.log_timings:
+            self.log()
+
+        # Exceptions are never suppressed
+        return False
+
+    def _end_build(self):
+        """Flushes the recorded operations and closes the undo bracket, the build is reverted if the flush fails"""
+        try:
+            self.operation_counts = self.manager.end_command_buffer(log_counts=False)
+        except BaseException as error:
+            unreal.log_error(f"ueGear Build failed, reverting the build: {error}")
+            self._controller.cancel_undo_bracket()
+            raise
+
+        self._controller.close_undo_bracket()
+
+    def _revert_build(self, error: BaseException):
+        """Drops the recorded operations and cancels the undo bracket"""
+        unreal.log_error(f"ueGear Build failed, reverting the build: {error}")
+        try:
+            self.manager.end_command_buffer(log_counts=False, discard=True)
+        finally:
+            self._controller.cancel_undo_bracket()
+
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        """
+        Records the wall time of the phase. Time spent in a phase that runs again is added to it, and phases
+        that run inside another phase are only recorded by the outer phase.
+        """
+        if self._active_phase is not None:
+            yield
+            return
+
+        self._active_phase = name
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - start
+            self._active_phase = None
+
+    def log(self):
+        """Logs the duration of every phase, and the controller calls of the build"""
+        unreal.log(f"ueGear Build {'finished' if self.succeeded else 'failed'}: {self.duration:.3f} s")
+        for name, duration in self.timings.items():
+            unreal.log(f"  {name}: {duration:.3f} s")
+
+        if self.operation_counts:
+            requested = sum(count["requested"] for count in self.operation_counts.values())
+            executed = sum(count["executed"] for count in self.operation_counts.values())
+            unreal.log(f"  RigVMController calls: {executed} executed, {requested} requested")
+
+        if self.query_counts:
+            unreal.log(f"  Graph queries: {self.query_counts['hits']} cached, {self.query_counts['misses']} read")
+
+    def _restore_blueprint(self):
+        """Restores the notifications and auto compile of the blueprint, to how they were before the build"""
+        self.manager.suspend_notification(False)
+        self.manager.set_compile_mode(self._compile_status)
+
+
+def build_phase(name: str):
+    """
+    Decorates a ueGear Manager method, so its wall time is recorded as the build phase while a
+    `BuildSession` is active.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(manager, *args, **kwargs):
+            session = manager.build_session
+            if session is None:
+                return method(manager, *args, **kwargs)
+            with session.phase(name):
+                return method(manager, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -17,6 +17,8 @@ from collections import OrderedDict
 
 import unreal
 
+from . import transforms
+
 if sys.version_info[0] == 2:
     string_types = (basestring,)
     text_type = unicode
@@ -369,6 +371,54 @@ def convert_maya_transforms_into_unreal_transforms(
     return unreal_translation, unreal_rotation, unreal_scale
 
 
+def convert_maya_transforms_into_unreal_transforms_batch(
+    translations, rotations, scales
+):
+    """
+    Converts given lists of Maya transforms into Unreal transforms.
+
+    If NumPy is available, all the transforms are converted in one vectorized pass.
+
+    :param list(list(float, float, float)) translations:
+    :param list(list(float, float, float)) rotations:
+    :param list(list(float, float, float)) scales:
+    :return: Unreal transforms, one tuple per given transform.
+    :rtype: list(tuple(unreal.Vector, unreal.Vector, unreal.Vector))
+    """
+
+    if not transforms.NUMPY_AVAILABLE:
+        return [
+            convert_maya_transforms_into_unreal_transforms(
+                translation, rotation, scale
+            )
+            for translation, rotation, scale in zip(
+                translations, rotations, scales
+            )
+        ]
+
+    if not translations:
+        return list()
+
+    (
+        unreal_translations,
+        unreal_rotations,
+        unreal_scales,
+    ) = transforms.convert_maya_layout_transforms(
+        [translation or [0.0, 0.0, 0.0] for translation in translations],
+        [rotation or [0.0, 0.0, 0.0] for rotation in rotations],
+        [scale or [1.0, 1.0, 1.0] for scale in scales],
+    )
+
+    return [
+        (unreal.Vector(*translation), unreal.Rotator(*rotation), unreal.Vector(*scale))
+        for translation, rotation, scale in zip(
+            unreal_translations.tolist(),
+            unreal_rotations.tolist(),
+            unreal_scales.tolist(),
+        )
+    ]
+
+
 def clear_level_selection():
     """
     Clears the selection of the current opened level.
@@ -13,7 +13,7 @@ from tkinter import filedialog
 
 import unreal
 
-from . import helpers, structs, tag, actors, assets, sequencer
+from . import helpers, structs, tag, actors, assets, sequencer, transforms
 
 
 # ======================================================================================================================
@@ -213,6 +213,29 @@ def import_layout_from_file(layout_file_path=""):
         )
         return False
 
+    # Converts all the layout transforms in one pass
+    transform_names = list()
+    transform_values = list()
+    for layout_asset_name, layout_asset_data in layout_data.items():
+        translation_value = layout_asset_data.get("translation", None)
+        rotation_value = layout_asset_data.get("rotation", None)
+        scale_value = layout_asset_data.get("scale", None)
+        if translation_value and rotation_value and scale_value:
+            transform_names.append(layout_asset_name)
+            transform_values.append(
+                (translation_value, rotation_value, scale_value)
+            )
+    converted_transforms = dict(
+        zip(
+            transform_names,
+            helpers.convert_maya_transforms_into_unreal_transforms_batch(
+                [value[0] for value in transform_values],
+                [value[1] for value in transform_values],
+                [value[2] for value in transform_values],
+            ),
+        )
+    )
+
     for layout_asset_name, layout_asset_data in layout_data.items():
         actor_in_level_name = layout_asset_data.get("actorName", "")
         if not actor_in_level_name:
@@ -251,9 +274,7 @@ def import_layout_from_file(layout_file_path=""):
             current_position,
             current_rotation,
             current_scale,
-        ) = helpers.convert_maya_transforms_into_unreal_transforms(
-            translation_value, rotation_value, scale_value
-        )
+        ) = converted_transforms[layout_asset_name]
 
         source_asset_path = ""
 
@@ -492,4 +513,35 @@ def convert_transform_maya_to_unreal(maya_transform, world_up):
         pos.z = pos_y
         trans.translation = pos
 
-    return trans
\ No newline at end of file
+    return trans
+
+
+def convert_transforms_maya_to_unreal(maya_transforms, world_up):
+    """
+    Converts a list of unreal.Transform(), that store Maya data, into transforms that work in Unreal.
+
+    If NumPy is available, all the transforms are converted in one vectorized pass.
+
+    :param list(unreal.Transform()) maya_transforms: Transforms with Maya transformation data.
+    :param str world_up: Mayas world up setting.
+
+    :return: Maya transformations now in Unreal transform space.
+    :rtype: list(unreal.Transform())
+    """
+    if not transforms.NUMPY_AVAILABLE:
+        return [
+            convert_transform_maya_to_unreal(maya_transform, world_up)
+            for maya_transform in maya_transforms
+        ]
+
+    if not maya_transforms:
+        return list()
+
+    translations, quaternions, scales = transforms.from_unreal_transforms(
+        maya_transforms
+    )
+    return transforms.to_unreal_transforms(
+        *transforms.convert_maya_transforms_to_unreal(
+            translations, quaternions, scales, world_up
+        )
+    )
@@ -0,0 +1,57 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Worker process entry points for the parallel mGear build file parser, and the parallel component planning.
+
+The workers run a plain Python interpreter, where the `unreal` module does not exist. The `ueGear.controlrig`
+packages import Unreal when they are initialised, so they are registered here without running their
+`__init__`, which gives the workers access to the engine independent `ueGear.controlrig.mgear.extract`,
+`ueGear.controlrig.mgear.component` and `ueGear.controlrig.planners` modules.
+Inside the editor the packages are already imported, and are left untouched.
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import os
+import sys
+import json
+import types
+
+
+def _register_package(name, path):
+    """Registers an empty package for the folder, unless the package has already been imported"""
+    if name in sys.modules:
+        return
+    package = types.ModuleType(name)
+    package.__path__ = [path]
+    sys.modules[name] = package
+
+
+_CONTROLRIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "controlrig")
+_register_package("ueGear.controlrig", _CONTROLRIG_PATH)
+_register_package("ueGear.controlrig.mgear", os.path.join(_CONTROLRIG_PATH, "mgear"))
+
+from ueGear.controlrig.mgear import extract  # noqa: E402
+
+
+def extract_raw_component(raw_component):
+    """
+    Decodes the JSON text of a component entry, and extracts the component data from it.
+
+    :param str raw_component: JSON text of a single entry of the build files `Components` list.
+    :return: The extracted component data, with the control transforms already in Unreal space.
+    :rtype: dict
+    """
+    return extract.extract_component(json.loads(raw_component), convert_transforms=True)
+
+
+def plan_component(planner):
+    """
+    Runs the precompute phase of a component.
+
+    :param planner: Detached copy of the components planner, see `ComponentPlanner.detached_copy`.
+    :return: The plan of the component.
+    :rtype: ueGear.controlrig.helpers.component_plan.ComponentPlan
+    """
+    return planner.create_plan()
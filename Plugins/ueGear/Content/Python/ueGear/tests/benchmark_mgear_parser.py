@@ -0,0 +1,261 @@
+"""
+Benchmark suite for the mGear build file parser, comparing the default (json.load) mode against the streaming
+and parallel modes, and against loading the binary build data file.
+
+Synthetic build files are generated for a set of scenarios, see `SCENARIOS` and `synthetic_build`. Each parse
+mode records its wall time and the peak resident set size (RSS) increase of the process while parsing. The
+memory of the parallel modes worker processes is not included. Python allocation tracing can be enabled as
+well, but it slows the parse down considerably so the wall times are no longer representative.
+
+The memory that the parsed rig keeps alive afterwards is recorded separately, as it is held for the whole build.
+
+Outside of the editor the `unreal` module is replaced with `unreal_standin`, so the suite runs on a plain
+Python install, and the results can be written to a JSON file to track the parser performance over time:
+
+    python -m ueGear.tests.benchmark_mgear_parser --scenario rig --scenario dense_shapes --output results.json
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+from ueGear.tests import unreal_standin
+
+USING_UNREAL_STANDIN = unreal_standin.install()
+"""True when the benchmarks run against the stand-in `unreal` module, instead of inside the editor"""
+
+from ueGear.controlrig import mgear  # noqa: E402
+from ueGear.controlrig.mgear import aabb  # noqa: E402
+from ueGear.controlrig.mgear import binary  # noqa: E402
+from ueGear.tests import synthetic_build  # noqa: E402
+
+SCENARIOS = {
+    "rig": {"component_count": 60},
+    "many_components": {"component_count": 1000},
+    "dense_shapes": {"component_count": 60, "controls_per_component": 8, "curves_per_control": 2,
+                     "points_per_shape": 1000},
+    "huge": {"component_count": 500, "curves_per_control": 2, "points_per_shape": 500},
+}
+"""Arguments of `synthetic_build.write_build_file` for each benchmark scenario"""
+
+DEFAULT_SCENARIOS = ["rig", "many_components", "dense_shapes"]
+"""Scenarios that run when none are specified, the huge scenario takes minutes"""
+
+
+def _current_rss() -> int:
+    """Returns the current resident set size of the process in bytes, or 0 if it cannot be queried"""
+    if sys.platform.startswith("linux"):
+        with open("/proc/self/statm", 'r') as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD),
+                        ("PageFaultCount", wintypes.DWORD),
+                        ("PeakWorkingSetSize", ctypes.c_size_t),
+                        ("WorkingSetSize", ctypes.c_size_t),
+                        ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                        ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                        ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                        ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                        ("PagefileUsage", ctypes.c_size_t),
+                        ("PeakPagefileUsage", ctypes.c_size_t)]
+
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        ctypes.windll.psapi.GetProcessMemoryInfo(ctypes.windll.kernel32.GetCurrentProcess(),
+                                                 ctypes.byref(counters),
+                                                 counters.cb)
+        return counters.WorkingSetSize
+
+    return 0
+
+
+class _RSSSampler:
+    """Polls the process RSS on a background thread, recording the largest value seen"""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.peak = 0
+        self._running = False
+        self._thread = None
+
+    def __enter__(self):
+        self.peak = _current_rss()
+        self._running = True
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self._running = False
+        self._thread.join()
+        self.peak = max(self.peak, _current_rss())
+
+    def _sample(self):
+        while self._running:
+            self.peak = max(self.peak, _current_rss())
+            time.sleep(self.interval)
+
+
+def benchmark_parse(build_file: str, streaming: bool, trace_allocations: bool = False,
+                    parallel: bool = False) -> dict:
+    """
+    Parses the build file and records the wall time and the peak RSS increase while parsing.
+
+    :param bool parallel: Parses the build file in a pool of worker processes, `streaming` is ignored.
+    :param bool trace_allocations: Also records the peak traced Python allocations, using tracemalloc.
+    """
+    gc.collect()
+    baseline_rss = _current_rss()
+    peak_traced = None
+
+    with _RSSSampler() as sampler:
+        if trace_allocations:
+            tracemalloc.start()
+        start = time.perf_counter()
+
+        rig = mgear.convert_json_to_mg_rig(build_file, streaming=streaming, parallel=parallel)
+
+        duration = time.perf_counter() - start
+        if trace_allocations:
+            _, peak_traced = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+    if binary.is_build_data_file(build_file):
+        mode = "binary"
+    elif parallel:
+        mode = "parallel"
+    else:
+        mode = "streaming" if streaming else "json.load"
+
+    result = {"mode": mode,
+              "components": len(rig.components),
+              "wall_time_s": round(duration, 3),
+              "peak_rss_increase_mb": round(max(0, sampler.peak - baseline_rss) / (1024 * 1024), 2)}
+
+    if peak_traced is not None:
+        result["peak_traced_mb"] = round(peak_traced / (1024 * 1024), 2)
+
+    del rig
+    gc.collect()
+
+    return result
+
+
+def benchmark_rig_memory(build_file: str) -> dict:
+    """
+    Records the Python memory that the parsed rig keeps alive, once parsing has finished and the raw build
+    data has been released.
+    """
+    gc.collect()
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+
+    rig = mgear.convert_json_to_mg_rig(build_file)
+    gc.collect()
+
+    resident, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    control_count = sum(len(comp.controls or []) for comp in rig.components.values())
+    resident = resident - baseline
+
+    return {"components": len(rig.components),
+            "controls": control_count,
+            "rig_resident_mb": round(resident / (1024 * 1024), 3),
+            "bytes_per_control": round(resident / max(1, control_count))}
+
+
+def run_benchmark(component_count: int = 60, controls_per_component: int = None, curves_per_control: int = 1,
+                  points_per_shape: int = 16, trace_allocations: bool = False) -> dict:
+    """
+    Generates a synthetic build file, and benchmarks every parse mode against it.
+
+    See `synthetic_build.generate_build_data` for the build file arguments.
+    """
+    build_file = os.path.join(tempfile.mkdtemp(prefix="ueGear_bench_"), "synthetic_build.scd")
+    synthetic_build.write_build_file(build_file, component_count, controls_per_component, curves_per_control,
+                                     points_per_shape)
+
+    size_mb = os.path.getsize(build_file) / (1024 * 1024)
+    print(f"Synthetic build file: {build_file} ({size_mb:.1f} MB)")
+
+    results = []
+    # Streaming runs first, so the default mode does not leave a raised high water mark behind
+    for streaming, parallel in [(True, False), (False, True), (False, False)]:
+        results.append(benchmark_parse(build_file, streaming, trace_allocations, parallel))
+
+    # The binary file is converted once on export, only loading it is part of the build
+    build_data_file = binary.convert_build_file(build_file)
+    results.append(benchmark_parse(build_data_file, False, trace_allocations))
+
+    for result in results:
+        msg = f"  {result['mode']:>10} : {result['wall_time_s']:>8} s | peak RSS +{result['peak_rss_increase_mb']} MB"
+        if trace_allocations:
+            msg += f" | peak traced {result['peak_traced_mb']} MB"
+        print(msg)
+
+    memory = benchmark_rig_memory(build_file)
+    print(f"  Parsed rig : {memory['rig_resident_mb']} MB resident | {memory['bytes_per_control']} bytes per control")
+
+    os.remove(build_file)
+    os.remove(build_data_file)
+    os.rmdir(os.path.dirname(build_file))
+
+    return {"file_size_mb": round(size_mb, 2),
+            "parse": results,
+            "rig_memory": memory}
+
+
+def run_suite(scenario_names: list = None, output_path: str = None, trace_allocations: bool = False) -> dict:
+    """
+    Runs the benchmark for each scenario.
+
+    :param list[str] scenario_names: Names of the `SCENARIOS` to run, defaults to `DEFAULT_SCENARIOS`.
+    :param str output_path: Writes the results to this JSON file, together with the environment they were
+        recorded in.
+    :param bool trace_allocations: Also records the peak traced Python allocations, using tracemalloc.
+    :return: The environment, and the results of each scenario.
+    :rtype: dict
+    """
+    results = {"environment": {"python": platform.python_version(),
+                               "platform": platform.platform(),
+                               "cpu_count": os.cpu_count(),
+                               "numpy": aabb.NUMPY_AVAILABLE,
+                               "unreal_standin": USING_UNREAL_STANDIN},
+               "scenarios": {}}
+
+    for name in scenario_names or DEFAULT_SCENARIOS:
+        print(f"Scenario: {name} {SCENARIOS[name]}")
+        scenario_results = run_benchmark(trace_allocations=trace_allocations, **SCENARIOS[name])
+        results["scenarios"][name] = dict(SCENARIOS[name], **scenario_results)
+
+    if output_path:
+        with open(output_path, 'w') as file:
+            json.dump(results, file, indent=4)
+        print(f"Results written to: {output_path}")
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks the mGear build file parser.")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS.keys()),
+                        help="Scenario to run, can be repeated. Defaults to: " + ", ".join(DEFAULT_SCENARIOS))
+    parser.add_argument("--output", help="JSON file that the results are written to.")
+    parser.add_argument("--trace-allocations", action="store_true",
+                        help="Records the peak traced Python allocations, slows the parse down.")
+    args = parser.parse_args()
+
+    run_suite(args.scenario, args.output, args.trace_allocations)
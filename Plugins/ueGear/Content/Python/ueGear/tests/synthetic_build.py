@@ -0,0 +1,348 @@
+"""
+Generates synthetic mGear build files, for testing and benchmarking the parser outside of the editor.
+
+The components follow the layout that the mGear data collector exports for the `EPIC_*` modules: control
+roles, guide names, joints, data contracts and relatives are taken from production rigs. Control shapes are
+made up of circles, with a configurable amount of curves per control and points per shape, which is where
+the size of production `.scd` files comes from.
+
+Generation is seeded, so the same arguments always produce the same file.
+"""
+
+import json
+import math
+import random
+
+COMPONENT_TEMPLATES = {
+    "EPIC_control_01": {"name": "control",
+                        "sides": "C",
+                        "roles": ["ctl"],
+                        "guides": ["root", "sizeRef"],
+                        "joints": ["0"],
+                        "contracts": {}},
+    "EPIC_spine_01": {"name": "spine",
+                      "sides": "C",
+                      "roles": ["ik0", "pelvis", "spinePosition", "ik1", "tan0", "tan1", "tan", "fk0", "fk1",
+                                "fk2", "fk3", "chest"],
+                      "guides": ["root", "spineBase", "tan0", "tan1", "spineTop", "chest"],
+                      "joints": ["pelvis", "01", "02", "03", "04", "05"],
+                      "contracts": {"Twist": [1, 2, 3, 4, 5], "Squash": [1, 2, 3, 4, 5]}},
+    "EPIC_spine_02": {"name": "spine",
+                      "sides": "C",
+                      "roles": ["ik0", "pelvis", "spinePosition", "ik1", "tan0", "tan1", "tan", "fk0", "fk1",
+                                "fk2", "fk3", "chest"],
+                      "guides": ["root", "spineBase", "tan0", "tan1", "spineTop", "chest"],
+                      "joints": ["pelvis", "01", "02", "03", "04", "05"],
+                      "contracts": {"Twist": [1, 2, 3, 4, 5], "Squash": [1, 2, 3, 4, 5]}},
+    "EPIC_neck_01": {"name": "neck",
+                     "sides": "C",
+                     "roles": ["ik", "fk0", "fk1", "head"],
+                     "guides": ["root", "tan0", "tan1", "neck", "head", "eff"],
+                     "joints": ["01", "02", "head"],
+                     "contracts": {"Twist": [0, 1], "Squash": [0, 1]}},
+    "EPIC_neck_02": {"name": "neck",
+                     "sides": "C",
+                     "roles": ["ik", "fk0", "fk1", "head"],
+                     "guides": ["root", "tan0", "tan1", "neck", "head", "eff"],
+                     "joints": ["01", "02", "head"],
+                     "contracts": {"Twist": [0, 1], "Squash": [0, 1]}},
+    "EPIC_shoulder_01": {"name": "shoulder",
+                         "sides": "LR",
+                         "roles": ["ctl", "orbit"],
+                         "guides": ["root", "tip"],
+                         "joints": ["0"],
+                         "contracts": {}},
+    "EPIC_arm_01": {"name": "arm",
+                    "sides": "LR",
+                    "roles": ["fk0", "fk1", "fk2", "roll", "upv", "ikcns", "ik", "ikRot", "mid", "tweak0",
+                              "tweak1", "tweak2", "tweak3", "tweak4", "tweak5"],
+                    "guides": ["root", "elbow", "wrist", "eff"],
+                    "joints": ["upperarm", "upperarm_twist_01", "upperarm_twist_02", "lowerarm",
+                               "lowerarm_twist_02", "lowerarm_twist_01", "hand"],
+                    "contracts": {"Ik": [0, 3, 6], "Twist": [1, 2, 4, 5], "Squash": [1, 2, 4, 5]}},
+    "EPIC_arm_02": {"name": "arm",
+                    "sides": "LR",
+                    "roles": ["fk0", "fk1", "fk2", "roll", "upv", "ikcns", "ik", "ikRot", "mid", "tweak0",
+                              "tweak1", "tweak2", "tweak3", "tweak4", "tweak5", "armBendyA", "armBendyB",
+                              "forearmBendyA", "forearmBendyB", "elbowBendy"],
+                    "guides": ["root", "elbow", "wrist", "eff"],
+                    "joints": ["upperarm", "upperarm_twist_01", "upperarm_twist_02", "lowerarm",
+                               "lowerarm_twist_02", "lowerarm_twist_01", "hand"],
+                    "contracts": {"Ik": [0, 3, 6], "Twist": [1, 2, 4, 5], "Squash": [1, 2, 4, 5]}},
+    "EPIC_chain_01": {"name": "finger",
+                      "sides": "LR",
+                      "roles": ["fk0", "fk1", "fk2"],
+                      "guides": ["root", "0_loc", "1_loc", "2_loc"],
+                      "joints": ["0", "1", "2"],
+                      "contracts": {}},
+    "EPIC_meta_01": {"name": "meta",
+                     "sides": "LR",
+                     "roles": ["meta0", "meta1", "meta2", "meta3", "ctl"],
+                     "guides": ["root", "0_loc", "1_loc", "2_loc"],
+                     "joints": ["0", "1", "2", "3"],
+                     "contracts": {}},
+    "EPIC_leg_01": {"name": "leg",
+                    "sides": "LR",
+                    "roles": ["root", "fk0", "fk1", "fk2", "roll", "upv", "ikcns", "ik", "mid", "tweak0",
+                              "tweak1", "tweak2", "tweak3", "tweak4", "tweak5", "tweakEnd"],
+                    "guides": ["root", "knee", "ankle", "eff"],
+                    "joints": ["thigh", "thigh_twist_01", "thigh_twist_02", "calf", "calf_twist_02",
+                               "calf_twist_01", "foot"],
+                    "contracts": {"Ik": [0, 3, 6], "Twist": [1, 2, 4, 5], "Squash": [1, 2, 4, 5]}},
+    "EPIC_leg_02": {"name": "leg",
+                    "sides": "LR",
+                    "roles": ["root", "fk0", "fk1", "fk2", "roll", "upv", "ikcns", "ik", "mid", "tweak0",
+                              "tweak1", "tweak2", "tweak3", "tweak4", "tweak5", "tweakEnd", "uplegBendyA",
+                              "uplegBendyB", "lowlegBendyA", "lowlegBendyB", "kneeBendy"],
+                    "guides": ["root", "knee", "ankle", "eff"],
+                    "joints": ["thigh", "thigh_twist_01", "thigh_twist_02", "calf", "calf_twist_02",
+                               "calf_twist_01", "foot"],
+                    "contracts": {"Ik": [0, 3, 6], "Twist": [1, 2, 4, 5], "Squash": [1, 2, 4, 5]}},
+    "EPIC_leg_3jnt_01": {"name": "leg",
+                         "sides": "LR",
+                         "roles": ["root", "fk0", "fk1", "fk2", "fk3", "roll", "upv", "ikcns", "ik", "mid",
+                                   "knee", "ankle", "tweak0", "tweak1", "tweak2", "tweak3"],
+                         "guides": ["root", "knee", "ankle", "foot", "eff"],
+                         "joints": ["thigh", "calf", "calf2", "foot"],
+                         "contracts": {"Ik": [0, 1, 2, 3]}},
+    "EPIC_foot_01": {"name": "foot",
+                     "sides": "LR",
+                     "roles": ["heel", "tip", "roll", "bk0", "bk1", "fk0"],
+                     "guides": ["root", "0_loc", "1_loc", "heel", "outpivot", "inpivot"],
+                     "joints": ["ball"],
+                     "contracts": {}},
+}
+"""Control roles, guide names, joint descriptions, data contract joint indices and sides of each EPIC module"""
+
+MAIN_SETTINGS = {"rig_name": "rig",
+                 "mode": 0,
+                 "step": 0,
+                 "ismodel": True,
+                 "worldCtl": True,
+                 "world_ctl_name": "world_ctl",
+                 "joint_rig": True,
+                 "data_collector": True,
+                 "L_color_fk": 6,
+                 "L_color_ik": 18,
+                 "R_color_fk": 23,
+                 "R_color_ik": 14,
+                 "C_color_fk": 13,
+                 "C_color_ik": 17,
+                 "Use_RGB_Color": False,
+                 "ctl_name_rule": "{component}_{side}{index}_{description}_{extension}",
+                 "joint_name_rule": "{component}_{side}{index}_{description}_{extension}",
+                 "ctl_name_ext": "ctl",
+                 "joint_name_ext": "jnt"}
+"""The rig settings that the synthetic build files contain"""
+
+_SIDE_COLOURS = {"L": (6, 18), "R": (23, 14), "C": (13, 17)}
+"""Maya colour index of the fk and ik controls, per side"""
+
+
+def generate_build_data(component_count: int = 60, controls_per_component: int = None,
+                        curves_per_control: int = 1, points_per_shape: int = 16, component_types: list = None,
+                        seed: int = 0) -> dict:
+    """
+    Generates the data of a synthetic build file.
+
+    :param int component_count: Amount of components, the first one is always the global control.
+    :param int controls_per_component: Amount of controls of every component. By default each component has
+        the controls of its EPIC module, else the module roles are cut short or extended with fk controls.
+    :param int curves_per_control: Amount of curves in each control shape.
+    :param int points_per_shape: Amount of points in each curve shape.
+    :param list[str] component_types: EPIC module types to cycle through, defaults to all `COMPONENT_TEMPLATES`.
+    :param int seed: Seed of the random transforms and shape sizes.
+    :return: The build data, as it is stored in the build file.
+    :rtype: dict
+    """
+    return {"MainSettings": dict(MAIN_SETTINGS),
+            "Components": list(iter_components(component_count, controls_per_component, curves_per_control,
+                                               points_per_shape, component_types, seed))}
+
+
+def write_build_file(file_path: str, component_count: int = 60, controls_per_component: int = None,
+                     curves_per_control: int = 1, points_per_shape: int = 16, component_types: list = None,
+                     seed: int = 0):
+    """
+    Writes a synthetic build file, see `generate_build_data` for the arguments.
+
+    The components are written one at a time, so very large files can be generated without holding
+    them in memory.
+    """
+    with open(file_path, 'w') as file:
+        file.write('{"MainSettings": ')
+        json.dump(MAIN_SETTINGS, file)
+        file.write(', "Components": [')
+
+        for index, component in enumerate(iter_components(component_count, controls_per_component,
+                                                          curves_per_control, points_per_shape,
+                                                          component_types, seed)):
+            if index:
+                file.write(', ')
+            json.dump(component, file)
+
+        file.write(']}')
+
+
+def iter_components(component_count: int = 60, controls_per_component: int = None, curves_per_control: int = 1,
+                    points_per_shape: int = 16, component_types: list = None, seed: int = 0):
+    """
+    Generates the components of a synthetic build file one at a time, see `generate_build_data` for the arguments.
+
+    Every component is parented to the guide of a random earlier component, so the hierarchy is valid.
+    """
+    rand = random.Random(seed)
+    component_types = list(component_types or COMPONENT_TEMPLATES.keys())
+    # Index of the next component of each name and side, so the full names are unique
+    name_indices = {}
+    # Full name and guide names of every generated component, the possible parents
+    parents = []
+
+    for comp_index in range(component_count):
+        if comp_index == 0:
+            comp_type = "EPIC_control_01"
+            name = "global"
+        else:
+            comp_type = component_types[(comp_index - 1) % len(component_types)]
+            name = COMPONENT_TEMPLATES[comp_type]["name"]
+
+        template = COMPONENT_TEMPLATES[comp_type]
+        side = template["sides"][comp_index % len(template["sides"])]
+        index = name_indices.get((name, side), 0)
+        name_indices[(name, side)] = index + 1
+
+        parent = rand.choice(parents) if parents else None
+        component = _generate_component(rand, comp_type, name, side, index, parent, controls_per_component,
+                                        curves_per_control, points_per_shape)
+        parents.append((component["FullName"], template["guides"]))
+
+        yield component
+
+
+def _generate_component(rand: random.Random, comp_type: str, name: str, side: str, index: int, parent: tuple,
+                        controls_per_component: int, curves_per_control: int, points_per_shape: int) -> dict:
+    template = COMPONENT_TEMPLATES[comp_type]
+    fullname = f"{name}_{side}{index}"
+
+    roles = list(template["roles"])
+    if controls_per_component is not None:
+        roles = roles[:controls_per_component]
+        roles += [f"fk{i}" for i in range(len(roles), controls_per_component)]
+
+    color_fk, color_ik = _SIDE_COLOURS[side]
+    controls = []
+    for role in roles:
+        colour = color_ik if "ik" in role or "upv" in role else color_fk
+        controls.append(_generate_control(rand, f"{fullname}_{role}_ctl", role, colour, curves_per_control,
+                                          points_per_shape))
+
+    joint_names = [f"{fullname}_{description}_jnt" for description in template["joints"]]
+    joints = [dict(Name=joint_name, **_generate_world_transform(rand)) for joint_name in joint_names]
+
+    guides = template["guides"]
+    control_names = [ctrl["Name"] for ctrl in controls]
+
+    component = {"FullName": fullname,
+                 "Name": name,
+                 "Type": comp_type,
+                 "Side": side,
+                 "Index": index,
+                 "guideTransforms": {guide: _generate_matrix(rand) for guide in guides},
+                 "DataContracts": list(template["contracts"].keys()),
+                 "Joints": joints,
+                 "Controls": controls,
+                 "Settings": {"comp_type": comp_type,
+                              "comp_name": name,
+                              "comp_side": side,
+                              "comp_index": index,
+                              "connector": "standard",
+                              "ui_host": "",
+                              "ctlGrp": "",
+                              "joint_names": "",
+                              "Override_Color": False,
+                              "Use_RGB_Color": False,
+                              "color_fk": color_fk,
+                              "color_ik": color_ik},
+                 "relatives": {guide: f"{fullname}_{guide}" for guide in guides},
+                 "jointRelatives": ({guide: min(i, len(joints) - 1) for i, guide in enumerate(guides)}
+                                    if joints else {}),
+                 "controlRelatives": ({guide: control_names[min(i, len(control_names) - 1)]
+                                       for i, guide in enumerate(guides)} if control_names else {}),
+                 "aliasRelatives": {},
+                 "parent_fullName": parent[0] if parent else None,
+                 "parent_localName": rand.choice(parent[1]) if parent else None}
+
+    for contract_name, joint_indices in template["contracts"].items():
+        component[contract_name] = [joint_names[i] for i in joint_indices]
+
+    return component
+
+
+def _generate_control(rand: random.Random, ctrl_name: str, role: str, colour: int, curves_per_control: int,
+                      points_per_shape: int) -> dict:
+    # A few controls use an RGB colour, or have no colour, like the production build files
+    if rand.random() < 0.03:
+        colour = [round(rand.random(), 3), round(rand.random(), 3), round(rand.random(), 3)]
+    elif rand.random() < 0.005:
+        colour = None
+
+    shape_category = {"curves_names": []}
+    size = rand.uniform(1.0, 40.0)
+    for curve_index in range(curves_per_control):
+        crv_name = ctrl_name if curve_index == 0 else f"{ctrl_name}{curve_index}"
+        shape_name = f"{crv_name}|{crv_name}Shape"
+
+        shape_category["curves_names"].append(crv_name)
+        shape_category[crv_name] = {"shapes_names": [shape_name],
+                                    "crv_parent": f"{ctrl_name}_npo",
+                                    "crv_transform": _generate_matrix(rand),
+                                    "crv_color": colour,
+                                    "shapes": {shape_name: {"points": _generate_circle(size, points_per_shape,
+                                                                                       curve_index)}}}
+
+    return dict(Name=ctrl_name, Role=role, Shape=shape_category, **_generate_world_transform(rand))
+
+
+def _generate_circle(radius: float, point_count: int, axis: int) -> list:
+    """Points of a circle around one of the axes, the default mGear control shape"""
+    points = []
+    for i in range(point_count):
+        angle = 2.0 * math.pi * i / max(1, point_count)
+        x, y = radius * math.cos(angle), radius * math.sin(angle)
+        point = [x, y, 0.0] if axis % 3 == 0 else [x, 0.0, y] if axis % 3 == 1 else [0.0, x, y]
+        points.append(point)
+    return points
+
+
+def _generate_world_transform(rand: random.Random) -> dict:
+    quat = _random_quaternion(rand)
+    return {"WorldPosition": {"x": rand.uniform(-100.0, 100.0),
+                              "y": rand.uniform(0.0, 200.0),
+                              "z": rand.uniform(-50.0, 50.0)},
+            "WorldRotation": {"x": rand.uniform(-180.0, 180.0),
+                              "y": rand.uniform(-90.0, 90.0),
+                              "z": rand.uniform(-180.0, 180.0)},
+            "QuaternionWorldRotation": quat,
+            "RotationOrder": 0}
+
+
+def _generate_matrix(rand: random.Random) -> list:
+    """Row major world matrix, with a random rotation, uniform scale and translation"""
+    x, y, z, w = _random_quaternion(rand)
+    scale = rand.uniform(0.5, 20.0)
+    rows = [[1.0 - 2.0 * (y * y + z * z), 2.0 * (x * y + w * z), 2.0 * (x * z - w * y)],
+            [2.0 * (x * y - w * z), 1.0 - 2.0 * (x * x + z * z), 2.0 * (y * z + w * x)],
+            [2.0 * (x * z + w * y), 2.0 * (y * z - w * x), 1.0 - 2.0 * (x * x + y * y)]]
+    mtx = [[value * scale for value in row] + [0.0] for row in rows]
+    mtx.append([rand.uniform(-100.0, 100.0), rand.uniform(0.0, 200.0), rand.uniform(-50.0, 50.0), 1.0])
+    return mtx
+
+
+def _random_quaternion(rand: random.Random) -> list:
+    """Uniformly distributed unit quaternion, X, Y, Z, W"""
+    u1, u2, u3 = rand.random(), rand.random(), rand.random()
+    a, b = math.sqrt(1.0 - u1), math.sqrt(u1)
+    return [a * math.sin(2.0 * math.pi * u2),
+            a * math.cos(2.0 * math.pi * u2),
+            b * math.sin(2.0 * math.pi * u3),
+            b * math.cos(2.0 * math.pi * u3)]
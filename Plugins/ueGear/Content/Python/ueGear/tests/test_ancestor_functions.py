@@ -0,0 +1,103 @@
+"""
+Tests the ancestor function resolution of the ueGear manager, this runs outside of the editor as well.
+"""
+
+from ueGear.tests import unreal_standin
+
+unreal_standin.install()
+
+from ueGear.controlrig.components.base_component import UEComponent  # noqa: E402
+from ueGear.controlrig.manager import UEGearManager  # noqa: E402
+from ueGear.controlrig.mgear import mgComponent  # noqa: E402
+
+SOLVE_NODES = {'construction_functions': "PrepareForExecution",
+               'forward_functions': "BeginExecution",
+               'backwards_functions': "InverseExecution"}
+
+
+class StandinManager(UEGearManager):
+    """Manager without a Control Rig Blueprint, the solve event nodes are their names"""
+
+    def __init__(self):
+        self.reset()
+
+    def get_construction_node(self):
+        return SOLVE_NODES['construction_functions']
+
+    def get_forward_node(self):
+        return SOLVE_NODES['forward_functions']
+
+    def get_backwards_node(self):
+        return SOLVE_NODES['backwards_functions']
+
+
+def _add_component(manager, name, parent=None, functions=()):
+    component = UEComponent()
+    component.name = name
+    component.metadata = mgComponent()
+    component.metadata.fullname = name
+
+    for function_name in functions:
+        component.nodes[function_name].append(f"{name}_{function_name}")
+
+    if parent is not None:
+        component.set_parent(parent)
+
+    manager.uegear_components[name] = component
+    return component
+
+
+def _find_parent_node_function(component, function_name):
+    """The recursive lookup, that the table replaces"""
+    parent_comp = component.parent_node
+    if parent_comp is None:
+        return SOLVE_NODES[function_name]
+    if len(parent_comp.nodes[function_name]) == 0:
+        return _find_parent_node_function(parent_comp, function_name)
+    return parent_comp.nodes[function_name][0]
+
+
+def test_table_matches_recursive_lookup():
+    manager = StandinManager()
+
+    world = _add_component(manager, "world_ctl", functions=['construction_functions'])
+    spine = _add_component(manager, "spine_C0", world, SOLVE_NODES)
+    neck = _add_component(manager, "neck_C0", spine, ['construction_functions'])
+    head = _add_component(manager, "head_C0", neck, ['construction_functions', 'forward_functions'])
+
+    # Components that are added before their parent, and a deep chain without functions
+    tip = _add_component(manager, "tail_tip_C0")
+    parent = head
+    for i in range(200):
+        parent = _add_component(manager, f"tail_C{i}", parent)
+    tip.set_parent(parent)
+
+    table = manager.build_ancestor_function_table()
+    assert len(table) == len(manager.uegear_components)
+
+    for component in manager.uegear_components.values():
+        for function_name in SOLVE_NODES:
+            expected = _find_parent_node_function(component, function_name)
+            assert table[component][function_name] == expected
+            assert manager.get_ancestor_function_node(component, function_name) == expected
+
+    assert table[tip]['forward_functions'] == "head_C0_forward_functions"
+    assert table[tip]['backwards_functions'] == "spine_C0_backwards_functions"
+    assert table[world] == SOLVE_NODES
+
+
+def test_table_is_rebuilt_for_new_components():
+    manager = StandinManager()
+
+    root = _add_component(manager, "root_C0", functions=SOLVE_NODES)
+    assert manager.get_ancestor_function_node(root, 'forward_functions') == "BeginExecution"
+
+    child = _add_component(manager, "arm_L0", root)
+    assert manager.get_ancestor_function_node(child, 'forward_functions') == "root_C0_forward_functions"
+
+
+if __name__ == "__main__":
+    for test in [test_table_matches_recursive_lookup,
+                 test_table_is_rebuilt_for_new_components]:
+        test()
+        print(f"Test: {test.__name__}: Successful")
@@ -0,0 +1,116 @@
+"""
+Tests the batch builder, against a build function that records its jobs. This runs outside of the editor as well.
+"""
+
+from ueGear.tests import unreal_standin
+
+unreal_standin.install()
+
+import json  # noqa: E402
+import os  # noqa: E402
+import tempfile  # noqa: E402
+
+from ueGear.controlrig import batch  # noqa: E402
+
+
+class StandinSession:
+    def __init__(self, rig_name):
+        self.timings = {"component build": 0.5, "layout": 0.1}
+        self.operation_counts = {"add_link": {"requested": 4, "executed": 3}}
+        self.query_counts = {"hits": 10, "misses": 2}
+
+
+class StandinBuilder:
+    """Replaces the Control Rig build of the manager, a build file named 'broken' fails"""
+
+    def __init__(self):
+        self.builds = []
+
+    def __call__(self, rig_name, skeleton_package, output_path, gnx_path, constructionControls, incremental=False):
+        self.builds.append((rig_name, output_path, constructionControls, incremental))
+        if "broken" in gnx_path:
+            raise ValueError("Could not read the build file")
+        if "invalid" in gnx_path:
+            return None
+        return StandinSession(rig_name)
+
+
+def _run_batch(jobs, **kwargs):
+    builder = StandinBuilder()
+    create_control_rig = batch.manager.create_control_rig
+    load_shared_assets = batch.load_shared_assets
+    batch.manager.create_control_rig = builder
+    batch.load_shared_assets = lambda: None
+    try:
+        return builder, batch.run_batch(jobs, save=False, **kwargs)
+    finally:
+        batch.manager.create_control_rig = create_control_rig
+        batch.load_shared_assets = load_shared_assets
+
+
+def test_load_manifest():
+    with tempfile.TemporaryDirectory() as folder:
+        manifest_path = os.path.join(folder, "jobs.json")
+        with open(manifest_path, 'w') as file:
+            json.dump({"jobs": [{"scd_path": "hero.scd",
+                                 "skeletal_mesh": "/Game/Hero/SKM_Hero",
+                                 "output_path": "/Game/Hero/CR_Hero/",
+                                 "build_mode": "manual"},
+                                {"scd_path": "/rigs/villain.scd",
+                                 "skeletal_mesh": "/Game/Villain/SKM_Villain",
+                                 "output_path": "/Game/Villain/CR_Villain"}]}, file)
+
+        jobs = batch.load_manifest(manifest_path)
+
+    assert jobs[0].scd_path == os.path.join(folder, "hero.scd")
+    assert jobs[0].rig_name == "CR_Hero"
+    assert jobs[0].package_path == "/Game/Hero"
+    assert jobs[0].build_mode == "manual"
+    assert jobs[1].scd_path == "/rigs/villain.scd"
+    assert jobs[1].build_mode == "construction"
+
+
+def test_unknown_build_mode():
+    try:
+        batch.BuildJob("hero.scd", "/Game/SKM_Hero", "/Game/CR_Hero", "fast")
+    except ValueError:
+        return
+    assert False, "The build mode was accepted"
+
+
+def test_failures_are_isolated():
+    jobs = [batch.BuildJob("broken.scd", "/Game/SKM_A", "/Game/Rigs/CR_A"),
+            batch.BuildJob("b.scd", "/Game/SKM_B", "/Game/Rigs/CR_B", "manual"),
+            batch.BuildJob("invalid.scd", "/Game/SKM_C", "/Game/Rigs/CR_C"),
+            batch.BuildJob("d.scd", "/Game/SKM_D", "/Game/Rigs/CR_D", "incremental")]
+
+    with tempfile.TemporaryDirectory() as folder:
+        report_path = os.path.join(folder, "report.json")
+        builder, report = _run_batch(jobs, report_path=report_path)
+        with open(report_path, 'r') as file:
+            assert json.load(file) == json.loads(json.dumps(report))
+
+    # Every job is built, after the first one failed
+    assert builder.builds == [("CR_A", "/Game/Rigs", True, False),
+                              ("CR_B", "/Game/Rigs", False, False),
+                              ("CR_C", "/Game/Rigs", True, False),
+                              ("CR_D", "/Game/Rigs", True, True)]
+
+    assert report["succeeded"] == 2 and report["failed"] == 2
+    assert [result["status"] for result in report["jobs"]] == ["failed", "succeeded", "failed", "succeeded"]
+    assert report["jobs"][0]["error"] == "Could not read the build file"
+    assert "ValueError" in report["jobs"][0]["traceback"]
+
+    result = report["jobs"][1]
+    assert result["timings"] == {"component build": 0.5, "layout": 0.1}
+    assert result["operation_counts"] == {"add_link": {"requested": 4, "executed": 3}}
+    assert result["query_counts"] == {"hits": 10, "misses": 2}
+    assert result["duration"] >= 0.0
+
+
+if __name__ == "__main__":
+    for test in [test_load_manifest,
+                 test_unknown_build_mode,
+                 test_failures_are_isolated]:
+        test()
+        print(f"Test: {test.__name__}: Successful")
@@ -0,0 +1,88 @@
+"""
+Tests the build planner of the mGear components, this runs outside of the editor as well.
+"""
+
+import random
+
+from ueGear.tests import unreal_standin
+
+unreal_standin.install()
+
+from ueGear.controlrig import mgear  # noqa: E402
+from ueGear.tests import synthetic_build  # noqa: E402
+
+
+def _create_rig(parents: list):
+    """Creates a rig from (fullname, parent fullname) pairs, in build file order"""
+    rig = mgear.mgRig()
+    for fullname, parent_fullname in parents:
+        component = mgear.mgComponent()
+        component.fullname = fullname
+        component.parent_fullname = parent_fullname
+        component.parent_localname = None if parent_fullname is None else "root"
+        rig.add_component(new_component=component)
+    return rig
+
+
+def test_sorted_file_keeps_its_order():
+    rig = mgear.mgRig()
+    for data_component in synthetic_build.iter_components(component_count=80, seed=2):
+        rig.add_component(new_component=mgear._convert_component(data_component, control_table=rig.control_table))
+
+    plan = mgear.create_build_plan(rig)
+    assert plan.is_valid
+    assert plan.order == list(rig.components.keys())
+    assert plan.get_issues() == []
+
+
+def test_parents_are_planned_first():
+    parents = [("root_C0", None)] + [(f"comp_{i}", "root_C0") for i in range(30)]
+    parents += [(f"comp_{i}_{j}", f"comp_{i}") for i in range(30) for j in range(3)]
+    random.Random(4).shuffle(parents)
+
+    plan = mgear.create_build_plan(_create_rig(parents))
+    assert plan.is_valid
+    assert len(plan) == len(parents)
+
+    position = {name: index for index, name in enumerate(plan.order)}
+    for name, parent_name in parents:
+        if parent_name is not None:
+            assert position[parent_name] < position[name]
+            assert plan.depths[name] == plan.depths[parent_name] + 1
+            assert name in plan.get_children(parent_name)
+
+    assert plan.get_children() == ["root_C0"]
+    assert len(plan.get_descendants("root_C0")) == len(parents) - 1
+    assert plan.get_descendants("comp_3") == [name for name in plan.order if name.startswith("comp_3_")]
+
+
+def test_missing_parents_and_cycles():
+    plan = mgear.create_build_plan(_create_rig([("leg_L0", "hip_C0"),
+                                                ("root_C0", None),
+                                                ("arm_L0", "hand_L0"),
+                                                ("hand_L0", "arm_L0"),
+                                                ("finger_L0", "hand_L0"),
+                                                ("loop_C0", "loop_C0")]))
+
+    assert plan.order == ["leg_L0", "root_C0"]
+    assert plan.missing_parents == {"leg_L0": "hip_C0"}
+    assert plan.get_parent("leg_L0") is None
+    assert plan.cycles == [["arm_L0", "hand_L0"], ["loop_C0"]]
+    assert plan.blocked == ["finger_L0"]
+    assert not plan.is_valid
+    assert len(plan.get_issues()) == 4
+
+    try:
+        plan.validate()
+    except mgear.BuildPlanError as error:
+        assert "arm_L0 > hand_L0 > arm_L0" in str(error)
+    else:
+        raise AssertionError("Expected a BuildPlanError")
+
+
+if __name__ == "__main__":
+    for test in [test_sorted_file_keeps_its_order,
+                 test_parents_are_planned_first,
+                 test_missing_parents_and_cycles]:
+        test()
+        print(f"Test: {test.__name__}: Successful")
@@ -0,0 +1,217 @@
+"""
+Tests that the build session restores the Control Rig Blueprint, and records the build phases. This runs outside
+of the editor as well.
+"""
+
+from ueGear.tests import unreal_standin
+
+unreal_standin.install()
+
+from ueGear.controlrig.manager import UEGearManager  # noqa: E402
+from ueGear.controlrig.session import BuildSession, build_phase  # noqa: E402
+
+
+class RecordingNode:
+    def __init__(self, name):
+        self.name = name
+
+    def get_name(self):
+        return self.name
+
+
+class RecordingController:
+    """Stores every call, in the order they are made"""
+
+    def __init__(self, calls):
+        self.calls = calls
+
+    def __getattr__(self, name):
+        def call(*args, **kwargs):
+            self.calls.append((name,) + args)
+            return True
+
+        return call
+
+
+class FailingController(RecordingController):
+    """Raises when a node is moved, which only happens when the command buffer is flushed"""
+
+    def set_node_position(self, node, position):
+        self.calls.append(("set_node_position", node, position))
+        raise RuntimeError("Flush failed")
+
+
+class RecordingBlueprint:
+    """Control Rig Blueprint that stores its state changes, in the same list as its controller"""
+
+    def __init__(self, auto_recompile=True):
+        self.calls = []
+        self.auto_recompile = auto_recompile
+        self.suspended = False
+        self.controller = RecordingController(self.calls)
+
+    def get_controller_by_name(self, name):
+        return self.controller
+
+    def get_auto_vm_recompile(self):
+        return self.auto_recompile
+
+    def set_auto_vm_recompile(self, active):
+        self.calls.append(("set_auto_vm_recompile", active))
+        self.auto_recompile = active
+
+    def suspend_notifications(self, suspend):
+        self.calls.append(("suspend_notifications", suspend))
+        self.suspended = suspend
+
+    def recompile_vm(self):
+        self.calls.append(("recompile_vm",))
+
+
+class StandinManager(UEGearManager):
+    """Manager with a recording blueprint, and build phases that only move a node"""
+
+    def __init__(self, blueprint):
+        self.reset()
+        self.set_active_blueprint(blueprint)
+
+    @build_phase("component build")
+    def build_components(self):
+        controller = self.get_active_controller()
+        node = RecordingNode("arm_L0_construct_arm")
+        controller.set_node_position(node, 0)
+        controller.set_node_position(node, 1)
+        self.populate_parents()
+
+    @build_phase("parenting")
+    def populate_parents(self):
+        pass
+
+    @build_phase("layout")
+    def group_components(self):
+        raise RuntimeError("Layout failed")
+
+
+def _get_call_names(blueprint):
+    return [call[0] for call in blueprint.calls]
+
+
+def test_blueprint_is_restored():
+    blueprint = RecordingBlueprint(auto_recompile=True)
+    manager = StandinManager(blueprint)
+
+    with BuildSession(manager, log_timings=False) as session:
+        assert manager.build_session is session
+        assert blueprint.suspended
+        assert not blueprint.auto_recompile
+        manager.build_components()
+        manager.populate_parents()
+
+    assert manager.build_session is None
+    assert session.succeeded
+    assert not blueprint.suspended
+    assert blueprint.auto_recompile
+
+    # The node is only moved once, inside the undo bracket of the build, and the blueprint compiles once
+    moves = [call for call in blueprint.calls if call[0] == "set_node_position"]
+    assert [call[2] for call in moves] == [1]
+    assert _get_call_names(blueprint) == ["set_auto_vm_recompile",
+                                          "suspend_notifications",
+                                          "open_undo_bracket",
+                                          "open_undo_bracket",
+                                          "set_node_position",
+                                          "close_undo_bracket",
+                                          "close_undo_bracket",
+                                          "suspend_notifications",
+                                          "set_auto_vm_recompile",
+                                          "recompile_vm"]
+
+    # The parenting that runs inside the component build is recorded by the component build
+    assert list(session.timings.keys()) == ["component build", "parenting", "compile"]
+    assert session.operation_counts["set_node_position"] == {"requested": 2, "executed": 1}
+    assert session.duration >= sum(session.timings.values())
+
+
+def test_failed_build_is_reverted():
+    blueprint = RecordingBlueprint(auto_recompile=False)
+    manager = StandinManager(blueprint)
+
+    try:
+        with BuildSession(manager, log_timings=False) as session:
+            manager.build_components()
+            manager.group_components()
+    except RuntimeError as error:
+        assert str(error) == "Layout failed"
+    else:
+        raise AssertionError("Expected the build error to be raised")
+
+    assert manager.build_session is None
+    assert not session.succeeded
+    assert not blueprint.suspended
+    assert not blueprint.auto_recompile
+
+    # The recorded node move is dropped, and nothing is compiled
+    assert _get_call_names(blueprint) == ["set_auto_vm_recompile",
+                                          "suspend_notifications",
+                                          "open_undo_bracket",
+                                          "cancel_undo_bracket",
+                                          "suspend_notifications",
+                                          "set_auto_vm_recompile"]
+    assert list(session.timings.keys()) == ["component build", "layout"]
+
+
+def test_failed_flush_is_reverted():
+    blueprint = RecordingBlueprint(auto_recompile=True)
+    blueprint.controller = FailingController(blueprint.calls)
+    manager = StandinManager(blueprint)
+
+    try:
+        with BuildSession(manager, log_timings=False) as session:
+            manager.build_components()
+    except RuntimeError as error:
+        assert str(error) == "Flush failed"
+    else:
+        raise AssertionError("Expected the flush error to be raised")
+
+    assert manager.build_session is None
+    assert manager.get_query_cache() is None
+    assert not session.succeeded
+    assert not blueprint.suspended
+    assert blueprint.auto_recompile
+
+    # The undo bracket of the flush is closed, and the bracket of the build is cancelled
+    assert _get_call_names(blueprint) == ["set_auto_vm_recompile",
+                                          "suspend_notifications",
+                                          "open_undo_bracket",
+                                          "open_undo_bracket",
+                                          "set_node_position",
+                                          "close_undo_bracket",
+                                          "cancel_undo_bracket",
+                                          "suspend_notifications",
+                                          "set_auto_vm_recompile"]
+
+
+def test_phases_without_session():
+    blueprint = RecordingBlueprint()
+    manager = StandinManager(blueprint)
+
+    manager.build_components()
+    assert _get_call_names(blueprint) == ["set_node_position", "set_node_position"]
+
+    with BuildSession(manager, log_timings=False):
+        try:
+            with BuildSession(manager, log_timings=False):
+                pass
+        except RuntimeError:
+            pass
+        else:
+            raise AssertionError("Expected nested build sessions to be refused")
+
+
+if __name__ == "__main__":
+    for test in [test_blueprint_is_restored,
+                 test_failed_build_is_reverted,
+                 test_failed_flush_is_reverted,
+                 test_phases_without_session]:
+        test()
+        print(f"Test: {test.__name__}: Successful")
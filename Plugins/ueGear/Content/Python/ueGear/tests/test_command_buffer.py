@@ -0,0 +1,187 @@
+"""
+Tests the RigVMController command buffer against a controller that records its calls, this runs outside of the
+editor as well.
+"""
+
+from ueGear.tests import unreal_standin
+
+unreal_standin.install()
+
+import unreal  # noqa: E402
+
+from ueGear.controlrig.components import EPIC_control_01  # noqa: E402
+from ueGear.controlrig.helpers.command_buffer import ControllerCommandBuffer  # noqa: E402
+from ueGear.controlrig.helpers.component_plan import ComponentPlan  # noqa: E402
+from ueGear.controlrig.mgear import mgComponent  # noqa: E402
+
+
+class RecordingNode:
+    def __init__(self, name):
+        self.name = name
+
+    def get_name(self):
+        return self.name
+
+
+class RecordingController:
+    """Stores every call, in the order they are made"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, name):
+        def call(*args, **kwargs):
+            self.calls.append((name,) + args)
+            if name.startswith("add_") and "_node" in name:
+                return RecordingNode(args[-1])
+            return True
+
+        return call
+
+    def get_operations(self):
+        return [call for call in self.calls if call[0] not in ("open_undo_bracket", "close_undo_bracket")]
+
+
+class RejectingController(RecordingController):
+    """Fails every pin default value write"""
+
+    def set_pin_default_value(self, pin_path, *args, **kwargs):
+        self.calls.append(("set_pin_default_value", pin_path) + args)
+        return False
+
+
+def _populate_failing_bones(controller):
+    """Populates the joint pin of a control component, returns the errors that were logged"""
+    component = EPIC_control_01.Component()
+    component.name = "control_C0"
+    component.metadata = mgComponent()
+    component.metadata.joints = ["joint_C0"]
+
+    plan = ComponentPlan(component.name)
+    component.create_planner().plan_bones(plan)
+
+    errors = []
+    log_error = unreal.log_error
+    unreal.log_error = errors.append
+    try:
+        plan.apply(controller, component)
+        if isinstance(controller, ControllerCommandBuffer):
+            controller.flush()
+    finally:
+        unreal.log_error = log_error
+    return errors
+
+
+def test_failed_pin_writes_are_logged_once():
+    # Without a command buffer the plan logs the failure
+    pin_paths = ["control_C0_construct_FK_singleton.joint",
+                 "control_C0_forward_FK_singleton.joint",
+                 "control_C0_backwards_FK_singleton.joint"]
+
+    errors = _populate_failing_bones(RejectingController())
+    assert len(errors) == len(pin_paths) and all(pin_path in error for pin_path, error in zip(pin_paths, errors))
+
+    # The command buffer logs the failure when it is flushed
+    errors = _populate_failing_bones(ControllerCommandBuffer(RejectingController()))
+    assert len(errors) == len(pin_paths) and all(pin_path in error for pin_path, error in zip(pin_paths, errors))
+
+
+def test_node_layout_is_coalesced():
+    controller = RecordingController()
+    command_buffer = ControllerCommandBuffer(controller)
+
+    comment = RecordingNode("comment")
+    nodes = [RecordingNode(f"node_{i}") for i in range(3)]
+
+    # Matches the layout loop of `UEGearManager.group_components`
+    for i, node in enumerate(nodes):
+        command_buffer.set_node_position(node, i)
+        command_buffer.set_node_position(comment, -1)
+    command_buffer.set_node_size(comment, 10)
+
+    assert controller.calls == []
+    assert command_buffer.pending_count == 5
+
+    command_buffer.flush()
+
+    assert controller.calls[0] == ("open_undo_bracket", command_buffer.undo_title)
+    assert controller.calls[-1] == ("close_undo_bracket",)
+    assert sorted(controller.get_operations(), key=str) == sorted([("set_node_position", nodes[0], 0),
+                                                                   ("set_node_position", nodes[1], 1),
+                                                                   ("set_node_position", nodes[2], 2),
+                                                                   ("set_node_position", comment, -1),
+                                                                   ("set_node_size", comment, 10)], key=str)
+
+    counts = command_buffer.get_operation_counts()
+    assert counts["set_node_position"] == {"requested": 6, "executed": 4}
+    assert counts["set_node_size"] == {"requested": 1, "executed": 1}
+
+
+def test_pin_defaults_are_merged():
+    controller = RecordingController()
+    command_buffer = ControllerCommandBuffer(controller)
+
+    command_buffer.set_pin_default_value("node.control_names", "(a,b)", True)
+    command_buffer.set_pin_default_value("node.scale", "1", False)
+    command_buffer.set_pin_default_value("node.control_names", "(a,b,c)", True)
+    command_buffer.set_pin_default_value("node.scale", "2", False)
+    command_buffer.flush()
+
+    assert controller.get_operations() == [("set_pin_default_value", "node.control_names", "(a,b,c)", True),
+                                           ("set_pin_default_value", "node.scale", "2", False)]
+    assert command_buffer.get_operation_counts()["set_pin_default_value"] == {"requested": 4, "executed": 2}
+
+
+def test_sub_pin_order_is_kept():
+    controller = RecordingController()
+    command_buffer = ControllerCommandBuffer(controller)
+
+    # The sub pin only exists once the array has been resized, so the second resize can not move in front of it
+    command_buffer.set_pin_default_value("node.colours", "((R=0),(R=0))", True)
+    command_buffer.set_pin_default_value("node.colours.1.R", "1", False)
+    command_buffer.set_pin_default_value("node.colours", "((R=0),(R=0),(R=0))", True)
+    command_buffer.set_pin_default_value("node.colours.1.R", "0.5", False)
+    command_buffer.flush()
+
+    assert [call[1:3] for call in controller.get_operations()] == [("node.colours", "((R=0),(R=0))"),
+                                                                  ("node.colours.1.R", "1"),
+                                                                  ("node.colours", "((R=0),(R=0),(R=0))"),
+                                                                  ("node.colours.1.R", "0.5")]
+
+
+def test_forwarded_calls_flush_referenced_nodes():
+    controller = RecordingController()
+    command_buffer = ControllerCommandBuffer(controller)
+
+    command_buffer.set_pin_default_value("array.Values.0", "1", False)
+    command_buffer.set_pin_default_value("other.Value", "2", False)
+
+    node = command_buffer.add_unit_node_from_struct_path("/Script/ControlRig.RigUnit_ItemArray", "Execute", None,
+                                                         "new_node")
+    assert node.get_name() == "new_node"
+    assert len(controller.calls) == 1
+
+    command_buffer.insert_array_pin("array.Values", -1, "")
+
+    assert controller.calls[1:] == [("set_pin_default_value", "array.Values.0", "1", False),
+                                    ("insert_array_pin", "array.Values", -1, "")]
+    assert command_buffer.pending_count == 1
+
+    command_buffer.add_link("new_node.Items", "other.Value")
+    assert controller.calls[3:] == [("set_pin_default_value", "other.Value", "2", False),
+                                    ("add_link", "new_node.Items", "other.Value")]
+    assert command_buffer.pending_count == 0
+
+    counts = command_buffer.get_operation_counts()
+    assert counts["add_link"] == {"requested": 1, "executed": 1}
+    assert counts["insert_array_pin"] == {"requested": 1, "executed": 1}
+
+
+if __name__ == "__main__":
+    for test in [test_node_layout_is_coalesced,
+                 test_pin_defaults_are_merged,
+                 test_sub_pin_order_is_kept,
+                 test_forwarded_calls_flush_referenced_nodes,
+                 test_failed_pin_writes_are_logged_once]:
+        test()
+        print(f"Test: {test.__name__}: Successful")
@@ -0,0 +1,70 @@
+"""
+Tests the lookup of the ueGear component classes, this runs outside of the editor as well.
+"""
+
+from ueGear.tests import unreal_standin
+
+unreal_standin.install()
+
+import sys  # noqa: E402
+
+from ueGear.controlrig import components  # noqa: E402
+from ueGear.controlrig.components.base_component import UEComponent  # noqa: E402
+
+
+def test_lookup_imports_only_the_component_module():
+    module_name = f"{components.__name__}.EPIC_neck_02"
+    if module_name in sys.modules:
+        # Another test imported every component
+        return
+
+    component_classes = components.lookup_mgear_component("EPIC_neck_02")
+    assert module_name in sys.modules
+
+    assert [cls.__name__ for cls in component_classes] == ["Component", "ManualComponent"]
+    assert all(cls.mgear_component == "EPIC_neck_02" for cls in component_classes)
+
+
+def test_repeated_lookups_return_the_same_classes():
+    first = components.lookup_mgear_component("EPIC_arm_02")
+    second = components.lookup_mgear_component("EPIC_arm_02")
+    assert first == second
+    assert first is not second
+
+    # Changing the returned list does not change the registry
+    second.clear()
+    assert components.lookup_mgear_component("EPIC_arm_02") == first
+
+
+def test_unknown_component():
+    assert components.lookup_mgear_component("EPIC_unknown_01") == []
+
+
+def test_manifest_matches_modules():
+    assert components.generate_component_manifest() == components.COMPONENT_MANIFEST
+
+    for mgear_component, component_classes in components.load_all_components().items():
+        assert len(component_classes) == 2
+        assert all(issubclass(cls, UEComponent) for cls in component_classes)
+        assert all(cls.mgear_component == mgear_component for cls in component_classes)
+
+
+def test_register_component():
+    class Component(UEComponent):
+        mgear_component = "studio_prop_01"
+
+    components.register_component("studio_prop_01", Component)
+    try:
+        assert components.lookup_mgear_component("studio_prop_01") == [Component]
+    finally:
+        components._registered_components.pop("studio_prop_01")
+
+
+if __name__ == "__main__":
+    for test in [test_lookup_imports_only_the_component_module,
+                 test_repeated_lookups_return_the_same_classes,
+                 test_unknown_component,
+                 test_manifest_matches_modules,
+                 test_register_component]:
+        test()
+        print(f"Test: {test.__name__}: Successful")
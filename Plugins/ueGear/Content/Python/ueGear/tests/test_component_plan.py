@@ -0,0 +1,259 @@
+"""
+Tests the precompute phase of the components, the plans are computed from the butcher build file without a
+controller, then applied on a controller that records its calls. This runs outside of the editor as well.
+
+The parallel planning spawns worker processes, so this script must be run as the main module.
+"""
+
+from ueGear.tests import unreal_standin
+
+unreal_standin.install()
+
+import json  # noqa: E402
+import os  # noqa: E402
+import pickle  # noqa: E402
+import subprocess  # noqa: E402
+import sys  # noqa: E402
+import tempfile  # noqa: E402
+
+from ueGear.controlrig import components, mgear  # noqa: E402
+from ueGear.controlrig.helpers import component_plan  # noqa: E402
+from ueGear.controlrig.manager import UEGearManager  # noqa: E402
+
+TEST_BUILD_JSON = os.path.join(os.path.dirname(__file__), "butcher_data.gnx")
+
+
+class StandinNode:
+    def __init__(self, name):
+        self.name = name
+
+    def get_name(self):
+        return self.name
+
+
+class StandinGraph:
+    def __init__(self):
+        self.nodes = {}
+
+    def find_node_by_name(self, name):
+        return self.nodes.get(name)
+
+
+class RecordingController:
+    """Records the calls that a plan makes"""
+
+    def __init__(self):
+        self.graph = StandinGraph()
+        self.calls = []
+
+    def get_graph(self):
+        return self.graph
+
+    def _add_node(self, call_name, node_name):
+        self.calls.append((call_name, node_name))
+        node = self.graph.nodes[node_name] = StandinNode(node_name)
+        return node
+
+    def add_comment_node(self, comment_text, node_name):
+        return self._add_node("add_comment_node", node_name)
+
+    def add_external_function_reference_node(self, path, function_name, position, node_name):
+        return self._add_node("add_external_function_reference_node", node_name)
+
+    def add_unit_node_from_struct_path(self, struct_path, method_name, position, node_name):
+        return self._add_node("add_unit_node_from_struct_path", node_name)
+
+    def add_template_node(self, notation, position, node_name):
+        return self._add_node("add_template_node", node_name)
+
+    def set_pin_default_value(self, pin_path, default_value, resize_arrays=True, **kwargs):
+        self.calls.append(("set_pin_default_value", pin_path))
+        return True
+
+    def add_link(self, output_pin_path, input_pin_path):
+        self.calls.append(("add_link", output_pin_path, input_pin_path))
+
+
+class BuildController(RecordingController):
+    """Creates the nodes, and records every other call"""
+
+    def __getattr__(self, name):
+        def call(*args, **kwargs):
+            self.calls.append((name,) + args)
+            return True
+
+        return call
+
+
+class StandinBone:
+    def __init__(self, key):
+        self.key = key
+
+
+class StandinHierarchy:
+    def find_bone(self, key):
+        return StandinBone(key)
+
+
+class StandinBlueprint:
+    def __init__(self):
+        self.controller = BuildController()
+        self.hierarchy = StandinHierarchy()
+
+    def get_controller_by_name(self, name):
+        return self.controller
+
+
+class StandinManager(UEGearManager):
+    def __init__(self, blueprint):
+        self.reset()
+        self.set_active_blueprint(blueprint)
+        self.mg_rig = mgear.convert_json_to_mg_rig(TEST_BUILD_JSON, use_cache=False)
+
+
+def _create_components(manual=False):
+    rig = mgear.convert_json_to_mg_rig(TEST_BUILD_JSON, use_cache=False)
+
+    ue_components = []
+    for mg_component in rig.components.values():
+        component_classes = components.lookup_mgear_component(mg_component.comp_type)
+        if not component_classes:
+            continue
+        ue_component = component_classes[1 if manual else 0]()
+        ue_component.metadata = mg_component
+        ue_component.name = mg_component.fullname
+        ue_components.append(ue_component)
+    return ue_components
+
+
+def _create_planners(manual=False):
+    return [ue_component.create_planner() for ue_component in _create_components(manual)]
+
+
+def test_plans_are_computed_without_a_controller():
+    plans = component_plan.plan_components(_create_planners())
+
+    arm_plan = plans["arm_L0"]
+    pin_paths = [args[0] for operation, args in arm_plan.operations
+                 if operation == component_plan.SET_PIN_DEFAULT_VALUE]
+    assert "arm_L0_construct_IK_arm.fk_control_transforms" in pin_paths
+    assert "arm_L0_construct_IK_arm.control_colours" in pin_paths
+    assert all(isinstance(args[1], str) for operation, args in arm_plan.operations
+               if operation == component_plan.SET_PIN_DEFAULT_VALUE)
+
+    # The function nodes, the bone array and the links are part of the plan
+    node_names = [args[0] for node_type, args in arm_plan.nodes]
+    assert "arm_L0_construct_IK_arm" in node_names
+    assert "arm_L0_bones_RigUnit_ItemArray" in node_names
+    assert ("arm_L0_bones_RigUnit_ItemArray.Items", "arm_L0_construct_IK_arm.fk_joints") in \
+           [args for operation, args in arm_plan.operations if operation == component_plan.ADD_LINK]
+
+
+def test_plan_round_trip():
+    for plan in component_plan.plan_components(_create_planners()).values():
+        data = json.loads(json.dumps(plan.to_dict()))
+        assert component_plan.ComponentPlan.from_dict(data) == plan
+        assert pickle.loads(pickle.dumps(plan)) == plan
+
+
+def test_apply_replays_the_plan():
+    ue_component = next(comp for comp in _create_components() if comp.name == "spine_C0")
+    plan = ue_component.create_plan()
+    assert plan.array_nodes
+
+    controller = RecordingController()
+    plan.apply(controller, ue_component)
+
+    # The nodes are created first, the array nodes are grouped with the component
+    node_count = len(plan.nodes)
+    assert all(call[0].startswith("add_") for call in controller.calls[:node_count])
+    assert ue_component.comment_node.get_name() == ue_component.name
+    assert [node.get_name() for node in ue_component.nodes["construction_functions"]] == \
+           [f"{ue_component.name}_{cr_func}" for cr_func in ue_component.functions["construction_functions"]]
+    assert {f"{name}_arrayNode" for name in plan.array_nodes} <= \
+           {node.get_name() for node in ue_component.get_misc_functions()}
+    assert len(controller.calls) == len(plan)
+
+
+def test_build_component_applies_the_plan():
+    blueprint = StandinBlueprint()
+    manager = StandinManager(blueprint)
+    plans = dict(manager.plan_components())
+    assert plans
+
+    for name, plan in plans.items():
+        manager.build_component(name)
+
+        # The precomputed plan is consumed by the build, and every planned pin reaches the controller
+        assert name not in manager.component_plans
+        pin_paths = {call[1] for call in blueprint.controller.calls if call[0] == "set_pin_default_value"}
+        assert all(args[0] in pin_paths for operation, args in plan.operations
+                   if operation == component_plan.SET_PIN_DEFAULT_VALUE)
+
+    assert set(manager.uegear_components) == set(plans)
+    assert not any(ue_component.is_manual for ue_component in manager.uegear_components.values())
+
+
+def test_manual_components_do_not_plan_control_data():
+    plans = component_plan.plan_components(_create_planners(manual=True))
+    assert plans
+
+    for plan in plans.values():
+        pin_paths = [args[0] for operation, args in plan.operations
+                     if operation == component_plan.SET_PIN_DEFAULT_VALUE]
+        assert not plan.array_nodes
+        assert not any(pin_path.endswith(("_transforms", "_colours", "control_colour")) for pin_path in pin_paths)
+
+
+def test_parallel_matches_serial():
+    manager = StandinManager(StandinBlueprint())
+    expected_plans = dict(manager.plan_components())
+    parallel_plans = manager.plan_components(parallel=True, max_workers=2)
+
+    assert list(parallel_plans) == list(expected_plans)
+    assert parallel_plans == expected_plans
+
+
+def test_plans_without_unreal():
+    planners = _create_planners()
+    expected_plans = component_plan.plan_components(planners)
+
+    temp_dir = tempfile.mkdtemp(prefix="ueGear_plan_")
+    planners_path = os.path.join(temp_dir, "planners.pkl")
+    plans_path = os.path.join(temp_dir, "plans.pkl")
+    try:
+        with open(planners_path, 'wb') as file:
+            pickle.dump([planner.detached_copy() for planner in planners], file)
+
+        # A plain interpreter, where the `unreal` module is never installed
+        script = ("import pickle, sys\n"
+                  "from ueGear import mgear_worker\n"
+                  f"planners = pickle.load(open({planners_path!r}, 'rb'))\n"
+                  "plans = [mgear_worker.plan_component(planner) for planner in planners]\n"
+                  "assert 'unreal' not in sys.modules\n"
+                  f"pickle.dump(plans, open({plans_path!r}, 'wb'))\n")
+        python_path = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        subprocess.run([sys.executable, "-c", script], check=True, cwd=temp_dir,
+                       env=dict(os.environ, PYTHONPATH=python_path))
+
+        with open(plans_path, 'rb') as file:
+            plans = pickle.load(file)
+    finally:
+        for path in [planners_path, plans_path]:
+            if os.path.exists(path):
+                os.remove(path)
+        os.rmdir(temp_dir)
+
+    assert {plan.component_name: plan for plan in plans} == expected_plans
+
+
+if __name__ == "__main__":
+    for test in [test_plans_are_computed_without_a_controller,
+                 test_plan_round_trip,
+                 test_apply_replays_the_plan,
+                 test_build_component_applies_the_plan,
+                 test_manual_components_do_not_plan_control_data,
+                 test_parallel_matches_serial,
+                 test_plans_without_unreal]:
+        test()
+        print(f"Test: {test.__name__}: Successful")
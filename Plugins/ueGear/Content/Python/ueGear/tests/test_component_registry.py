@@ -0,0 +1,75 @@
+"""
+Tests the indexed component registry of the mGear rig, this runs outside of the editor as well.
+"""
+
+from ueGear.tests import unreal_standin
+
+unreal_standin.install()
+
+from ueGear.controlrig import mgear  # noqa: E402
+from ueGear.controlrig.mgear.registry import ComponentRegistry  # noqa: E402
+from ueGear.tests import synthetic_build  # noqa: E402
+
+
+def _create_component(fullname, comp_type="EPIC_control_01", side="C", parent_fullname=None):
+    component = mgear.mgComponent()
+    component.fullname = fullname
+    component.comp_type = comp_type
+    component.side = side
+    component.parent_fullname = parent_fullname
+    return component
+
+
+def test_indexes_match_linear_scan():
+    rig = mgear.mgRig()
+    for data_component in synthetic_build.iter_components(component_count=60, seed=5):
+        rig.add_component(new_component=mgear._convert_component(data_component, control_table=rig.control_table))
+
+    components = list(rig.components.values())
+    assert len(rig.components) == 60
+
+    for comp_type in {comp.comp_type for comp in components}:
+        assert rig.get_component_by_type(comp_type) == [comp for comp in components if comp.comp_type == comp_type]
+
+    for side in {comp.side for comp in components}:
+        assert rig.get_component_by_side(side) == [comp for comp in components if comp.side == side]
+
+    for component in components:
+        children = [comp for comp in components if comp.parent_fullname == component.fullname]
+        assert rig.get_component_children(component.fullname) == children
+
+        parent = rig.components.get_parent(component.fullname)
+        assert parent is rig.components.get(component.parent_fullname, None)
+
+
+def test_replace_and_remove():
+    registry = ComponentRegistry()
+    registry.add(_create_component("root_C0"))
+    registry.add(_create_component("arm_L0", "EPIC_arm_01", "L", "root_C0"))
+    registry.add(_create_component("arm_R0", "EPIC_arm_01", "R", "root_C0"))
+
+    assert [comp.fullname for comp in registry.get_children("root_C0")] == ["arm_L0", "arm_R0"]
+    assert registry.get_first_of_type("EPIC_arm_01").fullname == "arm_L0"
+
+    # Replacing a component moves it out of its old indexes
+    registry.add(_create_component("arm_L0", "EPIC_arm_02", "L", None))
+    assert [comp.fullname for comp in registry.get_by_type("EPIC_arm_01")] == ["arm_R0"]
+    assert [comp.fullname for comp in registry.get_children(None)] == ["root_C0", "arm_L0"]
+
+    # Changes to the component data are picked up once it is reindexed
+    registry["arm_R0"].side = "C"
+    registry.reindex("arm_R0")
+    assert [comp.fullname for comp in registry.get_by_side("C")] == ["root_C0", "arm_R0"]
+    assert registry.get_by_side("R") == []
+
+    del registry["root_C0"]
+    assert "root_C0" not in registry
+    assert registry.get_parent("arm_R0") is None
+    assert list(registry) == ["arm_L0", "arm_R0"]
+
+
+if __name__ == "__main__":
+    for test in [test_indexes_match_linear_scan,
+                 test_replace_and_remove]:
+        test()
+        print(f"Test: {test.__name__}: Successful")
@@ -0,0 +1,309 @@
+"""
+Tests the bulk creation of the manual controls. The controls of the butcher build file are described, then created
+on a hierarchy controller that records its calls. This runs outside of the editor as well.
+"""
+
+from ueGear.tests import unreal_standin
+
+unreal_standin.install()
+
+import os  # noqa: E402
+
+import unreal  # noqa: E402
+
+from ueGear import transforms  # noqa: E402
+from ueGear.controlrig import components, mgear  # noqa: E402
+from ueGear.controlrig.helpers import controls  # noqa: E402
+from ueGear.controlrig.manager import UEGearManager  # noqa: E402
+
+TEST_BUILD_JSON = os.path.join(os.path.dirname(__file__), "butcher_data.gnx")
+
+
+class RecordingHierarchy:
+    """Records the calls made on the hierarchy, the existing elements are given by name"""
+
+    def __init__(self, calls, existing=None):
+        self.calls = calls
+        self.existing = existing or {}
+
+    def get_all_keys(self):
+        self.calls.append(("get_all_keys",))
+        return [key for key, transform in self.existing.values()]
+
+    def get_global_transform(self, key, initial=False):
+        self.calls.append(("get_global_transform", key.name))
+        return self.existing[key.name][1]
+
+    def set_global_transform(self, key, transform, initial=False, affect_children=True):
+        self.calls.append(("set_global_transform", key.name, transform))
+
+    def set_local_transform(self, key, transform, initial=False, affect_children=True):
+        self.calls.append(("set_local_transform", key.name, transform))
+
+    def set_control_offset_transform(self, key, transform, initial=False, affect_children=True):
+        self.calls.append(("set_control_offset_transform", key.name, transform))
+
+    def set_control_shape_transform(self, key, transform, initial=False):
+        self.calls.append(("set_control_shape_transform", key.name, transform))
+
+
+class RecordingHierarchyController:
+    def __init__(self, existing=None):
+        self.calls = []
+        self.hierarchy = RecordingHierarchy(self.calls, existing)
+
+    def get_hierarchy(self):
+        return self.hierarchy
+
+    def add_control(self, name, parent, settings, value):
+        self.calls.append(("add_control", name, _parent_name(parent)))
+        return unreal.RigElementKey(unreal.RigElementType.CONTROL, name)
+
+    def add_null(self, name, parent, transform, transform_in_global=True):
+        self.calls.append(("add_null", name, _parent_name(parent), transform))
+        return unreal.RigElementKey(unreal.RigElementType.NULL, name)
+
+    def set_parent(self, child, parent, maintain_global_transform=True):
+        self.calls.append(("set_parent", child.name, parent.name, maintain_global_transform))
+
+
+class StandinManager(UEGearManager):
+    def __init__(self, hierarchy_controller):
+        self.reset()
+        self.hierarchy_controller = hierarchy_controller
+
+    def get_hierarchy_controller(self):
+        return self.hierarchy_controller
+
+
+def _parent_name(parent):
+    return parent if isinstance(parent, str) else parent.name
+
+
+def _describe_components():
+    rig = mgear.convert_json_to_mg_rig(TEST_BUILD_JSON, use_cache=False)
+
+    ue_components = []
+    for mg_component in rig.components.values():
+        component_classes = components.lookup_mgear_component(mg_component.comp_type)
+        if not component_classes:
+            continue
+        ue_component = component_classes[1]()
+        ue_component.metadata = mg_component
+        ue_component.name = mg_component.fullname
+        ue_component.describe_manual_controls()
+        ue_component.describe_hierarchy()
+        ue_components.append(ue_component)
+    return ue_components
+
+
+def _assert_matrices_equal(a: unreal.Matrix, b: unreal.Matrix, tolerance=1e-6):
+    for row_a, row_b in zip(a._rows, b._rows):
+        assert all(abs(value_a - value_b) <= tolerance for value_a, value_b in zip(row_a, row_b)), (row_a, row_b)
+
+
+def test_controls_are_created_parents_first():
+    control_list = [control for ue_component in _describe_components()
+                    for control in ue_component.control_by_role.values()]
+    null_count = len([control for control in control_list if control.ctrl_type == unreal.RigElementType.NULL])
+    assert null_count
+
+    hierarchy_controller = RecordingHierarchyController()
+    # Children are listed before their parents
+    assert controls.build_control_hierarchy(hierarchy_controller, list(reversed(control_list))) == len(control_list)
+
+    created = {""}
+    for call in hierarchy_controller.calls:
+        if call[0] in ("add_control", "add_null"):
+            assert call[2] in created, f"{call[1]} was created before its parent {call[2]}"
+            created.add(call[1])
+
+    operations = [call[0] for call in hierarchy_controller.calls]
+    assert operations.count("get_all_keys") == 1
+    assert operations.count("add_null") == null_count
+    assert operations.count("add_control") == len(control_list) - null_count
+    assert operations.count("set_control_offset_transform") == len(control_list) - null_count
+    assert operations.count("set_control_shape_transform") == len(control_list) - null_count
+    # All the parents are described, so nothing is read back
+    assert len(operations) == 1 + len(control_list) + 2 * (len(control_list) - null_count)
+
+
+def test_offsets_compose_to_the_initial_transforms():
+    ue_components = _describe_components()
+    control_by_name = {control.name: control for ue_component in ue_components
+                       for control in ue_component.control_by_role.values()}
+
+    hierarchy_controller = RecordingHierarchyController()
+    controls.build_control_hierarchy(hierarchy_controller, list(control_by_name.values()))
+
+    parented_count = 0
+    for call in hierarchy_controller.calls:
+        if call[0] == "add_null":
+            assert call[3] is control_by_name[call[1]].initial_transform
+        if call[0] != "set_control_offset_transform":
+            continue
+
+        control = control_by_name[call[1]]
+        parent_global = unreal.Transform()
+        if control.parent_key is not None:
+            parent_global = control_by_name[control.parent_key.name].initial_transform
+            parented_count += 1
+
+        _assert_matrices_equal(call[2].to_matrix() * parent_global.to_matrix(), control.initial_transform.to_matrix())
+
+    assert parented_count
+
+
+def test_shape_transforms():
+    spine = next(ue_component for ue_component in _describe_components() if ue_component.name == "spine_C0")
+    control = spine.control_by_role["ik0"]
+
+    shape_transform = control.get_shape_transform()
+    assert (shape_transform.translation.x, shape_transform.translation.y, shape_transform.translation.z) == \
+        tuple(control.shape_pos)
+    assert (shape_transform.scale3d.x, shape_transform.scale3d.y, shape_transform.scale3d.z) == \
+        tuple(control.shape_scale)
+
+    # Unset attributes keep the values of a new control
+    control.shape_pos = None
+    assert control.get_shape_transform().translation.x == 0.0
+
+
+def test_existing_elements_and_external_parents():
+    world_key = unreal.RigElementKey(unreal.RigElementType.CONTROL, "world_ctl")
+    world_transform = unreal.Transform(location=[0.0, 0.0, 10.0])
+    existing_key = unreal.RigElementKey(unreal.RigElementType.CONTROL, "root_C0_ctl")
+
+    hierarchy_controller = RecordingHierarchyController({"world_ctl": (world_key, world_transform),
+                                                         "root_C0_ctl": (existing_key, unreal.Transform())})
+
+    control_list = []
+    for name in ["root_C0_ctl", "body_C0_ctl"]:
+        control = controls.CR_Control(name=name)
+        control.describe(transform=unreal.Transform(location=[0.0, 0.0, 25.0]))
+        control.parent_key = world_key
+        control_list.append(control)
+
+    assert controls.build_control_hierarchy(hierarchy_controller, control_list) == 1
+
+    calls = hierarchy_controller.calls
+    # The global transform of the parent is read once
+    assert [call for call in calls if call[0] == "get_global_transform"] == [("get_global_transform", "world_ctl")]
+    # The existing control is moved under its parent instead of being added again
+    assert ("set_parent", "root_C0_ctl", "world_ctl", False) in calls
+    assert [call[1] for call in calls if call[0] == "add_control"] == ["body_C0_ctl"]
+
+    offsets = [call[2] for call in calls if call[0] == "set_control_offset_transform"]
+    assert [offset.translation.z for offset in offsets] == [15.0, 15.0]
+
+
+def test_offset_solve_without_numpy():
+    control_list = controls.sort_parents_first([control for ue_component in _describe_components()
+                                                for control in ue_component.control_by_role.values()])
+    offsets = controls.solve_offset_transforms(control_list)
+
+    numpy_available = transforms.NUMPY_AVAILABLE
+    transforms.NUMPY_AVAILABLE = False
+    try:
+        fallback_offsets = controls.solve_offset_transforms(control_list)
+    finally:
+        transforms.NUMPY_AVAILABLE = numpy_available
+
+    assert len(offsets) == len(fallback_offsets) == len(control_list)
+    for offset, fallback_offset in zip(offsets, fallback_offsets):
+        _assert_matrices_equal(offset.to_matrix(), fallback_offset.to_matrix())
+
+
+def _create_manager(bulk):
+    manager = StandinManager(RecordingHierarchyController())
+    manager._buildManualControlsInBulk = bulk
+    for ue_component in _describe_components():
+        manager.uegear_components[ue_component.name] = ue_component
+    return manager
+
+
+def test_bulk_parenting_across_components():
+    manager = _create_manager(bulk=True)
+    manager.populate_parents()
+
+    calls = manager.get_hierarchy_controller().calls
+    parents = {call[1]: call[2] for call in calls if call[0] in ("add_control", "add_null")}
+    assert parents["arm_L0_fk0_ctl"] == "shoulder_L0_orbit_ctl"
+    assert not [call for call in calls if call[0] in ("set_parent", "get_global_transform")]
+
+
+def test_manual_transforms_are_written_once():
+    bulk_manager = _create_manager(bulk=True)
+    bulk_manager.populate_parents()
+    bulk_offsets = {call[1]: call[2] for call in bulk_manager.get_hierarchy_controller().calls
+                    if call[0] == "set_control_offset_transform"}
+
+    # The controls were created one at a time, only the parenting and the transform update are recorded
+    manager = _create_manager(bulk=False)
+    manager.populate_parents()
+
+    calls = manager.get_hierarchy_controller().calls
+    root_parents = manager.get_manual_root_parents()
+    assert [call[0] for call in calls[:len(root_parents)]] == ["set_parent"] * len(root_parents)
+    # The local transforms of the controls stay identity, so only the nulls keep their global transform
+    assert [call[3] for call in calls[:len(root_parents)]] == \
+        [not control.is_placed_by_offset() for control, parent_key in root_parents]
+
+    offset_calls = [call for call in calls if call[0] == "set_control_offset_transform"]
+    # Every control is written once, and nothing is read back
+    assert sorted(call[1] for call in offset_calls) == sorted(bulk_offsets)
+    assert len(calls) == len(root_parents) + len(offset_calls)
+
+    for call in offset_calls:
+        _assert_matrices_equal(call[2].to_matrix(), bulk_offsets[call[1]].to_matrix())
+
+
+def test_controls_without_a_transform_keep_their_position():
+    parent_key = unreal.RigElementKey(unreal.RigElementType.CONTROL, "spine_C0_fk0_ctl")
+    parent_transform = unreal.Transform(location=[0.0, 0.0, 40.0])
+    hierarchy_controller = RecordingHierarchyController({"spine_C0_fk0_ctl": (parent_key, parent_transform)})
+
+    parent = controls.CR_Control(name="spine_C0_fk0_ctl")
+    child = controls.CR_Control(name="spine_C0_fk1_ctl")
+    child.describe(transform=unreal.Transform(location=[0.0, 0.0, 50.0]))
+    child.parent_key = parent_key
+    assert not parent.is_placed_by_offset()
+    assert child.is_placed_by_offset()
+
+    offsets = controls.solve_offset_transforms([parent, child], hierarchy_controller.get_hierarchy())
+    # The control is not solved, and the global transform of its child is read from the hierarchy
+    assert offsets[0] is None
+    assert offsets[1].translation.z == 10.0
+    assert ("get_global_transform", "spine_C0_fk0_ctl") in hierarchy_controller.calls
+
+    # The root parents are found once the components are parented
+    parented_manager = _create_manager(bulk=False)
+    parented_manager.populate_parents()
+    name, parent_name = next((control.name, parent_key.name)
+                             for control, parent_key in parented_manager.get_manual_root_parents()
+                             if control.is_placed_by_offset())
+
+    manager = _create_manager(bulk=False)
+    undescribed = next(control for ue_component in manager.uegear_components.values()
+                       for control in ue_component.control_by_role.values() if control.name == name)
+    undescribed.initial_transform = None
+    manager.get_hierarchy_controller().hierarchy.existing[undescribed.name] = (undescribed.rig_key,
+                                                                               unreal.Transform())
+    manager.populate_parents()
+
+    calls = manager.get_hierarchy_controller().calls
+    assert ("set_parent", name, parent_name, True) in calls
+    assert not [call for call in calls if call[0] == "set_control_offset_transform" and call[1] == undescribed.name]
+
+
+if __name__ == "__main__":
+    for test in [test_controls_are_created_parents_first,
+                 test_offsets_compose_to_the_initial_transforms,
+                 test_shape_transforms,
+                 test_existing_elements_and_external_parents,
+                 test_offset_solve_without_numpy,
+                 test_bulk_parenting_across_components,
+                 test_manual_transforms_are_written_once,
+                 test_controls_without_a_transform_keep_their_position]:
+        test()
+        print(f"Test: {test.__name__}: Successful")
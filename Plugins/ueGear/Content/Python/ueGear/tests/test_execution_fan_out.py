@@ -0,0 +1,192 @@
+"""
+Tests the execution wiring of the ueGear manager, against a controller that records its links. This runs outside
+of the editor as well.
+"""
+
+from ueGear.tests import unreal_standin
+
+unreal_standin.install()
+
+from ueGear.controlrig.components.base_component import UEComponent  # noqa: E402
+from ueGear.controlrig.manager import UEGearManager  # noqa: E402
+from ueGear.controlrig.mgear import mgComponent  # noqa: E402
+
+
+class ExecutePin:
+    def __init__(self, node):
+        self.node = node
+        self.targets = []
+        self.query_count = 0
+
+    def get_linked_target_pins(self):
+        self.query_count += 1
+        return list(self.targets)
+
+    def get_node(self):
+        return self.node
+
+
+class ExecutionNode:
+    def __init__(self, name, title=None):
+        self.name = name
+        self.title = title or name
+        self.execute_pin = ExecutePin(self)
+
+    def get_name(self):
+        return self.name
+
+    def get_node_title(self):
+        return self.title
+
+    def find_pin(self, pin_name):
+        return self.execute_pin if pin_name == "ExecuteContext" else None
+
+    def get_pins(self):
+        return [self.execute_pin]
+
+
+class LinkController:
+    """Keeps the execution links between the nodes, and stores every call"""
+
+    def __init__(self, nodes):
+        self.nodes = nodes
+        self.calls = []
+        self.pin_counts = {}
+
+    def add_unit_node_from_struct_path(self, struct_path, method, position, node_name):
+        self.calls.append(("add_unit_node_from_struct_path", node_name))
+        node = self.nodes[node_name] = ExecutionNode(node_name, "Sequence")
+        self.pin_counts[node_name] = 2
+        return node
+
+    def add_aggregate_pin(self, node_name, pin_name, default_value):
+        self.calls.append(("add_aggregate_pin", node_name))
+        pin_path = f"{node_name}.{'ABCDEFGHIJKLMNOP'[self.pin_counts[node_name]]}"
+        self.pin_counts[node_name] += 1
+        return pin_path
+
+    def add_link(self, source_path, target_path):
+        self.calls.append(("add_link", source_path, target_path))
+        source_name, source_pin = source_path.split(".")
+        target_node = self.nodes[target_path.split(".")[0]]
+        # An execution output drives a single node
+        if source_pin == "ExecuteContext":
+            self.nodes[source_name].execute_pin.targets = [target_node.execute_pin]
+
+
+class StandinManager(UEGearManager):
+    """Manager without a Control Rig Blueprint, the solve event nodes are created with the manager"""
+
+    def __init__(self):
+        self.reset()
+        self.graph_nodes = {}
+        self.controller = LinkController(self.graph_nodes)
+        for name in ["PrepareForExecution", "BeginExecution", "InverseExecution"]:
+            self.graph_nodes[name] = ExecutionNode(name)
+
+    def get_active_controller(self, name: str = "RigVMModel"):
+        return self.controller
+
+    def get_construction_node(self):
+        return self.graph_nodes["PrepareForExecution"]
+
+    def get_forward_node(self):
+        return self.graph_nodes["BeginExecution"]
+
+    def get_backwards_node(self):
+        return self.graph_nodes["InverseExecution"]
+
+
+def _add_component(manager, name, parent=None):
+    component = UEComponent()
+    component.name = name
+    component.metadata = mgComponent()
+    component.metadata.fullname = name
+
+    node = manager.graph_nodes[f"{name}_construct"] = ExecutionNode(f"{name}_construct")
+    component.nodes['construction_functions'].append(node)
+
+    if parent is not None:
+        component.set_parent(manager.uegear_components[parent])
+
+    manager.uegear_components[name] = component
+    return component
+
+
+def _get_calls(manager, call_name):
+    return [call for call in manager.controller.calls if call[0] == call_name]
+
+
+def test_sequence_is_created_once():
+    manager = StandinManager()
+    _add_component(manager, "root_C0")
+    for i in range(5):
+        _add_component(manager, f"arm_{i}", "root_C0")
+    _add_component(manager, "hand_C0", "arm_0")
+
+    manager.connect_execution()
+
+    seq_node_name = "root_C0_construct_RigVMFunction_Sequence"
+    assert _get_calls(manager, "add_unit_node_from_struct_path") == [("add_unit_node_from_struct_path",
+                                                                      seq_node_name)]
+    assert len(_get_calls(manager, "add_aggregate_pin")) == 3
+
+    # Every link is made once, the parent is never relinked
+    assert _get_calls(manager, "add_link") == [
+        ("add_link", "PrepareForExecution.ExecuteContext", "root_C0_construct.ExecuteContext"),
+        ("add_link", "root_C0_construct.ExecuteContext", f"{seq_node_name}.ExecuteContext"),
+        ("add_link", f"{seq_node_name}.A", "arm_0_construct.ExecuteContext"),
+        ("add_link", f"{seq_node_name}.B", "arm_1_construct.ExecuteContext"),
+        ("add_link", f"{seq_node_name}.C", "arm_2_construct.ExecuteContext"),
+        ("add_link", f"{seq_node_name}.D", "arm_3_construct.ExecuteContext"),
+        ("add_link", f"{seq_node_name}.E", "arm_4_construct.ExecuteContext"),
+        ("add_link", "arm_0_construct.ExecuteContext", "hand_C0_construct.ExecuteContext")]
+
+    # The links of each parent are only queried once
+    assert manager.graph_nodes["root_C0_construct"].execute_pin.query_count == 1
+
+
+def test_connected_parent_keeps_its_node():
+    manager = StandinManager()
+    event_node = manager.graph_nodes["PrepareForExecution"]
+    existing_node = manager.graph_nodes["existing"] = ExecutionNode("existing")
+    event_node.execute_pin.targets = [existing_node.execute_pin]
+
+    _add_component(manager, "root_C0")
+    _add_component(manager, "root_C1")
+
+    manager.connect_execution()
+
+    seq_node_name = "PrepareForExecution_RigVMFunction_Sequence"
+    assert len(_get_calls(manager, "add_aggregate_pin")) == 1
+    assert _get_calls(manager, "add_link") == [
+        ("add_link", "PrepareForExecution.ExecuteContext", f"{seq_node_name}.ExecuteContext"),
+        ("add_link", f"{seq_node_name}.A", "existing.ExecuteContext"),
+        ("add_link", f"{seq_node_name}.B", "root_C0_construct.ExecuteContext"),
+        ("add_link", f"{seq_node_name}.C", "root_C1_construct.ExecuteContext")]
+
+
+def test_existing_sequence_is_extended():
+    manager = StandinManager()
+    event_node = manager.graph_nodes["PrepareForExecution"]
+    sequence_node = manager.controller.add_unit_node_from_struct_path("", "", None, "existing_sequence")
+    event_node.execute_pin.targets = [sequence_node.execute_pin]
+    manager.controller.calls = []
+
+    _add_component(manager, "root_C0")
+    _add_component(manager, "root_C1")
+
+    manager.connect_execution()
+
+    assert _get_calls(manager, "add_unit_node_from_struct_path") == []
+    assert _get_calls(manager, "add_link") == [
+        ("add_link", "existing_sequence.C", "root_C0_construct.ExecuteContext"),
+        ("add_link", "existing_sequence.D", "root_C1_construct.ExecuteContext")]
+
+
+if __name__ == "__main__":
+    for test in [test_sequence_is_created_once,
+                 test_connected_parent_keeps_its_node,
+                 test_existing_sequence_is_extended]:
+        test()
+        print(f"Test: {test.__name__}: Successful")
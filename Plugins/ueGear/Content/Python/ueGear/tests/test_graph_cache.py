@@ -0,0 +1,179 @@
+"""
+Tests the graph query cache of the command buffer, against a graph that counts its queries. This runs outside of
+the editor as well.
+"""
+
+from ueGear.tests import unreal_standin
+
+unreal_standin.install()
+
+import unreal  # noqa: E402
+from ueGear.controlrig import manager  # noqa: E402
+from ueGear.controlrig.helpers import graph_cache  # noqa: E402
+from ueGear.controlrig.helpers.command_buffer import ControllerCommandBuffer  # noqa: E402
+
+
+class CountingPin:
+    def __init__(self, node, name, direction, sub_pin_count=0):
+        self.node = node
+        self.name = name
+        self.direction = direction
+        self.sub_pin_count = sub_pin_count
+
+    def get_name(self):
+        return self.name
+
+    def get_display_name(self):
+        return self.name
+
+    def get_direction(self):
+        return self.direction
+
+    def get_sub_pins(self):
+        return [None] * self.sub_pin_count
+
+    def get_node(self):
+        return self.node
+
+
+class CountingNode:
+    def __init__(self, graph, name):
+        self.graph = graph
+        self.name = name
+        self.pins = [CountingPin(self, "Values", unreal.RigVMPinDirection.INPUT),
+                     CountingPin(self, "Array", unreal.RigVMPinDirection.OUTPUT)]
+
+    def get_name(self):
+        return self.name
+
+    def get_node_title(self):
+        return self.name
+
+    def get_pins(self):
+        self.graph.pin_reads += 1
+        return list(self.pins)
+
+
+class CountingGraph:
+    def __init__(self):
+        self.nodes = {}
+        self.lookups = 0
+        self.pin_reads = 0
+
+    def find_node_by_name(self, name):
+        self.lookups += 1
+        return self.nodes.get(name, None)
+
+
+class GraphController:
+    """Applies the node and pin operations of the build to the counting graph"""
+
+    def __init__(self):
+        self.graph = CountingGraph()
+        self.calls = []
+
+    def get_graph(self):
+        return self.graph
+
+    def add_template_node(self, notation, position, node_name):
+        self.calls.append("add_template_node")
+        node = self.graph.nodes[node_name] = CountingNode(self.graph, node_name)
+        return node
+
+    def remove_node_by_name(self, node_name):
+        self.calls.append("remove_node_by_name")
+        return self.graph.nodes.pop(node_name, None) is not None
+
+    def insert_array_pin(self, array_pin_path, index, default_value):
+        self.calls.append("insert_array_pin")
+        node_name, pin_name = array_pin_path.split(".")
+        node = self.graph.nodes[node_name]
+        next(pin for pin in node.pins if pin.name == pin_name).sub_pin_count += 1
+        return f"{array_pin_path}.{index}"
+
+    def set_pin_default_value(self, pin_path, value, resize_arrays):
+        self.calls.append("set_pin_default_value")
+        node_name, pin_name = pin_path.split(".")
+        node = self.graph.nodes[node_name]
+        next(pin for pin in node.pins if pin.name == pin_name).sub_pin_count = value.count(",") + 1
+        return True
+
+    def set_node_position(self, node, position):
+        self.calls.append("set_node_position")
+        return True
+
+
+def test_node_lookups_are_cached():
+    controller = GraphController()
+    command_buffer = ControllerCommandBuffer(controller)
+    graph = command_buffer.get_graph()
+
+    assert graph.find_node_by_name("arm_L0_arrayNode") is None
+    assert graph.find_node_by_name("arm_L0_arrayNode") is None
+    assert controller.graph.lookups == 1
+
+    # Adding a node forgets the lookups that found nothing
+    node = command_buffer.add_template_node("ArrayMake", None, "arm_L0_arrayNode")
+    assert graph.find_node_by_name("arm_L0_arrayNode") is node
+    assert graph.find_node_by_name("arm_L0_arrayNode") is node
+    assert controller.graph.lookups == 2
+
+    command_buffer.remove_node_by_name("arm_L0_arrayNode")
+    assert graph.find_node_by_name("arm_L0_arrayNode") is None
+    assert controller.graph.lookups == 3
+
+    assert command_buffer.get_query_counts() == {"hits": 2, "misses": 3}
+
+
+def test_pins_are_cached():
+    controller = GraphController()
+    command_buffer = ControllerCommandBuffer(controller)
+    node = command_buffer.add_template_node("ArrayMake", None, "arm_L0_arrayNode")
+
+    for _ in range(3):
+        assert manager.array_node_has_pins("arm_L0_arrayNode", command_buffer, minimum_pins=0) is False
+        assert graph_cache.find_pin(node, "Array", command_buffer.query_cache).direction == \
+            unreal.RigVMPinDirection.OUTPUT
+    assert controller.graph.pin_reads == 1
+
+    # Inserting an array element changes the pins of the node
+    command_buffer.insert_array_pin("arm_L0_arrayNode.Values", 0, "")
+    assert manager.array_node_has_pins("arm_L0_arrayNode", command_buffer, minimum_pins=0) is True
+    assert controller.graph.pin_reads == 2
+
+
+def test_pin_writes_are_flushed_before_reading_pins():
+    controller = GraphController()
+    command_buffer = ControllerCommandBuffer(controller)
+    node = command_buffer.add_template_node("ArrayMake", None, "arm_L0_arrayNode")
+    query_cache = command_buffer.query_cache
+
+    assert query_cache.get_pins(node)[0].sub_pin_count == 0
+
+    command_buffer.set_node_position(node, unreal.Vector2D(0, 0))
+    command_buffer.set_pin_default_value("arm_L0_arrayNode.Values", "(A,B,C)", True)
+    assert controller.calls == ["add_template_node"]
+
+    # The array is resized by the default value, the position of the node stays recorded
+    assert query_cache.get_pins(node)[0].sub_pin_count == 3
+    assert controller.calls == ["add_template_node", "set_pin_default_value"]
+    assert command_buffer.pending_count == 1
+
+
+def test_manager_queries_without_cache():
+    controller = GraphController()
+    node = controller.add_template_node("ArrayMake", None, "arm_L0_arrayNode")
+
+    assert graph_cache.get_query_cache(controller) is None
+    assert manager.array_node_has_pins("arm_L0_arrayNode", controller, minimum_pins=0) is False
+    assert graph_cache.find_pin(node, "Missing") is None
+    assert manager.calculate_node_size(node) == manager.calculate_node_size(node, graph_cache.GraphQueryCache(None))
+
+
+if __name__ == "__main__":
+    for test in [test_node_lookups_are_cached,
+                 test_pins_are_cached,
+                 test_pin_writes_are_flushed_before_reading_pins,
+                 test_manager_queries_without_cache]:
+        test()
+        print(f"Test: {test.__name__}: Successful")
@@ -0,0 +1,357 @@
+"""
+Tests the component hashes and the node ownership, that the incremental build relies on, and rebuilds changed
+components on a graph controller that keeps its links. This runs outside of the editor as well.
+"""
+
+import copy
+import json
+import os
+import shutil
+import tempfile
+
+from ueGear.tests import unreal_standin
+
+unreal_standin.install()
+
+import unreal  # noqa: E402
+
+from ueGear.controlrig import manager  # noqa: E402
+from ueGear.controlrig import mgear  # noqa: E402
+from ueGear.controlrig.components.base_component import UEComponent  # noqa: E402
+from ueGear.controlrig.mgear import diff  # noqa: E402
+from ueGear.tests import synthetic_build  # noqa: E402
+
+SEQUENCE_PINS = "ABCDEFGHIJKLMNOP"
+
+
+class GraphPin:
+    def __init__(self, node, name, direction):
+        self.node = node
+        self.name = name
+        self.direction = direction
+        self.sources = []
+        self.targets = []
+
+    def get_node(self):
+        return self.node
+
+    def get_name(self):
+        return self.name
+
+    def get_display_name(self):
+        return self.name
+
+    def get_direction(self):
+        return self.direction
+
+    def get_sub_pins(self):
+        return []
+
+    def get_pin_path(self):
+        return f"{self.node.name}.{self.name}"
+
+    def get_linked_source_pins(self):
+        return list(self.sources)
+
+    def get_linked_target_pins(self):
+        return list(self.targets)
+
+
+class GraphNode:
+    def __init__(self, name, title, inputs=(), outputs=()):
+        self.name = name
+        self.title = title
+        self.pins = {}
+        for pin_name in inputs:
+            self.add_pin(pin_name, unreal.RigVMPinDirection.INPUT)
+        for pin_name in outputs:
+            self.add_pin(pin_name, unreal.RigVMPinDirection.OUTPUT)
+
+    def add_pin(self, pin_name, direction):
+        pin = self.pins[pin_name] = GraphPin(self, pin_name, direction)
+        return pin
+
+    def get_name(self):
+        return self.name
+
+    def get_node_title(self):
+        return self.title
+
+    def find_pin(self, pin_name):
+        return self.pins.get(pin_name)
+
+    def get_pins(self):
+        return list(self.pins.values())
+
+
+class GraphController:
+    """Keeps the nodes, pins and links of a graph, every other call is ignored"""
+
+    def __init__(self):
+        self.nodes = {}
+        for name in ["PrepareForExecution", "BeginExecution", "InverseExecution"]:
+            self.add_node(name, name, outputs=["ExecuteContext"])
+
+    def __getattr__(self, name):
+        def call(*args, **kwargs):
+            return True
+
+        return call
+
+    def add_node(self, name, title, inputs=(), outputs=()):
+        node = self.nodes[name] = GraphNode(name, title, inputs, outputs)
+        return node
+
+    def get_graph(self):
+        return self
+
+    def get_nodes(self):
+        return list(self.nodes.values())
+
+    def find_node_by_name(self, name):
+        return self.nodes.get(name)
+
+    def _find_pin(self, pin_path):
+        node_name, pin_name = pin_path.split(".")
+        return self.nodes[node_name].pins[pin_name]
+
+    def add_link(self, output_pin_path, input_pin_path):
+        source_pin = self._find_pin(output_pin_path)
+        target_pin = self._find_pin(input_pin_path)
+        source_pin.targets.append(target_pin)
+        target_pin.sources.append(source_pin)
+        return True
+
+    def add_unit_node_from_struct_path(self, struct_path, method, position, node_name):
+        return self.add_node(node_name, "Sequence", ["ExecuteContext"], SEQUENCE_PINS[:2])
+
+    def add_aggregate_pin(self, node_name, pin_name, default_value):
+        node = self.nodes[node_name]
+        pin_name = next(name for name in SEQUENCE_PINS if name not in node.pins)
+        return node.add_pin(pin_name, unreal.RigVMPinDirection.OUTPUT).get_pin_path()
+
+    def remove_aggregate_pin(self, pin_path):
+        self._unlink(self._find_pin(pin_path))
+        node_name, pin_name = pin_path.split(".")
+        del self.nodes[node_name].pins[pin_name]
+
+    def remove_node_by_name(self, node_name):
+        for pin in self.nodes.pop(node_name).get_pins():
+            self._unlink(pin)
+
+    @staticmethod
+    def _unlink(pin):
+        for source_pin in pin.sources:
+            source_pin.targets.remove(pin)
+        for target_pin in pin.targets:
+            target_pin.sources.remove(pin)
+        pin.sources = []
+        pin.targets = []
+
+    def get_links(self):
+        """Returns the links between the nodes, the Sequence pins are replaced by the name of the Sequence node,
+        as their order depends on the build order"""
+        links = []
+        for node in self.nodes.values():
+            for pin in node.get_pins():
+                source = node.name if node.title == "Sequence" else pin.get_pin_path()
+                links.extend((source, target_pin.get_pin_path()) for target_pin in pin.targets)
+        return sorted(links)
+
+    def get_sequence_pin_counts(self):
+        return {node.name: len(node.pins) - 1 for node in self.nodes.values() if node.title == "Sequence"}
+
+
+class LinkedComponent(UEComponent):
+    """Construction and forward functions, the forward function is linked to the forward function of the parent"""
+
+    def __init__(self):
+        super().__init__()
+        self.functions = {'construction_functions': ['construct'],
+                          'forward_functions': ['forward'],
+                          'backwards_functions': [],
+                          }
+
+    def create_functions(self, controller):
+        self.nodes['construction_functions'].append(
+            controller.add_node(f"{self.name}_construct", "construct", ["ExecuteContext", "parent"],
+                                ["ExecuteContext", "root"]))
+        self.nodes['forward_functions'].append(
+            controller.add_node(f"{self.name}_forward", "forward", ["ExecuteContext", "ik_active"],
+                                ["ExecuteContext", "ik_active_out"]))
+
+    def forward_solve_connect(self, controller):
+        if self.parent_node is None:
+            return
+        controller.add_link(f"{self.parent_node.name}_forward.ik_active_out", f"{self.name}_forward.ik_active")
+
+
+class StandinManager(manager.UEGearManager):
+    """Builds the linked components of the rig on the graph controller"""
+
+    def __init__(self, rig, controller):
+        self.reset()
+        self.mg_rig = rig
+        self.controller = controller
+
+    def get_active_controller(self, name: str = "RigVMModel"):
+        return self.controller
+
+    def get_graph(self):
+        return self.controller
+
+    def build_component(self, name, manual_component=False):
+        component = self._create_component(name)
+        component.create_functions(self.controller)
+        self.uegear_components[name] = component
+
+    def attach_component(self, name):
+        component = self._create_component(name)
+        if not self._attach_component_nodes(component):
+            return None
+        self.uegear_components[name] = component
+        return component
+
+    def _create_component(self, name):
+        component = LinkedComponent()
+        component.metadata = self.mg_rig.components[name]
+        component.name = name
+        return component
+
+    def group_components(self, component_names=None):
+        pass
+
+
+def _create_linked_rig():
+    rig = mgear.mgRig()
+    rig.settings = {"worldCtl": False}
+    for name, parent_name in [("global_C0", None), ("spine_C0", "global_C0"), ("arm_L0", "spine_C0"),
+                              ("arm_R0", "spine_C0"), ("neck_C0", "spine_C0"), ("hand_L0", "arm_L0")]:
+        component = mgear.mgComponent()
+        component.fullname = name
+        component.comp_type = "EPIC_control_01"
+        component.parent_fullname = parent_name
+        component.parent_localname = "root" if parent_name else None
+        rig.add_component(new_component=component)
+    return rig
+
+
+def _build(rig, controller):
+    build_manager = StandinManager(rig, controller)
+    build_manager.build_components()
+    build_manager.populate_parents()
+    build_manager.connect_components()
+
+
+def _parse(temp_dir, data, file_name="synthetic_build.scd", **kwargs):
+    build_file = os.path.join(temp_dir, file_name)
+    with open(build_file, 'w') as file:
+        json.dump(data, file)
+    return mgear.convert_json_to_mg_rig(build_file, **kwargs)
+
+
+def test_unchanged_rig_has_no_changes():
+    data = synthetic_build.generate_build_data(component_count=30, seed=6)
+
+    temp_dir = tempfile.mkdtemp(prefix="ueGear_incremental_")
+    try:
+        hashes = diff.get_component_hashes(_parse(temp_dir, data))
+
+        # The hashes do not depend on how the build file was parsed
+        streamed_hashes = diff.get_component_hashes(_parse(temp_dir, data, "streamed.scd", streaming=True))
+        assert streamed_hashes == hashes
+
+        build_diff = diff.diff_component_hashes(hashes, streamed_hashes)
+        assert not build_diff.has_changes
+        assert build_diff.unchanged == list(hashes.keys())
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+def test_changed_components_are_found():
+    data = synthetic_build.generate_build_data(component_count=30, seed=6)
+    changed_data = copy.deepcopy(data)
+
+    components = changed_data["Components"]
+    moved = components[5]
+    moved["Controls"][0]["WorldPosition"]["x"] += 1.0
+    recoloured = components[8]
+    recoloured["Settings"]["ctlSize"] = 2.5
+    removed = components.pop(12)
+    added = copy.deepcopy(components[20])
+    added["FullName"] = "extra_C0"
+    added["Name"] = "extra"
+    for ctrl in added["Controls"]:
+        ctrl["Name"] = "extra_" + ctrl["Name"]
+    components.append(added)
+
+    temp_dir = tempfile.mkdtemp(prefix="ueGear_incremental_")
+    try:
+        hashes = diff.get_component_hashes(_parse(temp_dir, data))
+        changed_hashes = diff.get_component_hashes(_parse(temp_dir, changed_data, "changed.scd"))
+    finally:
+        shutil.rmtree(temp_dir)
+
+    build_diff = diff.diff_component_hashes(hashes, changed_hashes)
+    assert build_diff.changed == [moved["FullName"], recoloured["FullName"]]
+    assert build_diff.added == ["extra_C0"]
+    assert build_diff.removed == [removed["FullName"]]
+    assert build_diff.rebuilt == [moved["FullName"], recoloured["FullName"], "extra_C0"]
+    assert len(build_diff.unchanged) == len(components) - 3
+
+
+def test_float_noise_is_ignored():
+    component = mgear.mgComponent()
+    component.fullname = "arm_L0"
+    component.controls = ["arm_L0_fk0_ctl"]
+    component.controls_aabb = {"arm_L0_fk0_ctl": [[0.0, 1.0, 2.0], [3.0, 4.0, 5.0]]}
+    component_hash = diff.hash_component(component)
+
+    component.controls_aabb = {"arm_L0_fk0_ctl": [[-0.0, 1.0 + 1e-12, 2.0], [3.0, 4.0, 5.0 - 1e-12]]}
+    assert diff.hash_component(component) == component_hash
+
+    component.controls_aabb = {"arm_L0_fk0_ctl": [[0.0, 1.001, 2.0], [3.0, 4.0, 5.0]]}
+    assert diff.hash_component(component) != component_hash
+
+
+def test_incremental_build_matches_a_clean_build():
+    rig = _create_linked_rig()
+    clean_controller = GraphController()
+    _build(rig, clean_controller)
+    assert clean_controller.get_sequence_pin_counts() == {"spine_C0_construct_RigVMFunction_Sequence": 3,
+                                                          "spine_C0_forward_RigVMFunction_Sequence": 3}
+
+    # Changes a component with siblings, and a component whose children have children
+    for changed in ["arm_L0", "spine_C0"]:
+        controller = GraphController()
+        _build(rig, controller)
+
+        build_diff = diff.RigDiff()
+        build_diff.changed = [changed]
+        build_diff.unchanged = [name for name in rig.components.keys() if name != changed]
+
+        assert StandinManager(rig, controller).build_incremental(build_diff) == {changed}
+        assert controller.get_links() == clean_controller.get_links(), changed
+        assert controller.get_sequence_pin_counts() == clean_controller.get_sequence_pin_counts(), changed
+
+
+def test_node_owner():
+    names = {"arm_L0", "arm_L0_twist_C0", "world_ctl", "spine_C0"}
+
+    assert manager._get_node_owner("arm_L0", names) == "arm_L0"
+    assert manager._get_node_owner("arm_L0_construct_arm", names) == "arm_L0"
+    assert manager._get_node_owner("arm_L0_twist_C0_construct_control", names) == "arm_L0_twist_C0"
+    assert manager._get_node_owner("spine_C0_RigUnit_ItemArray", names) == "spine_C0"
+    assert manager._get_node_owner("world_ctl_construct_control_RigVMFunction_Sequence", names) == "world_ctl"
+    assert manager._get_node_owner("PrepareForExecution", names) is None
+    assert manager._get_node_owner("arm_L01_construct_arm", names) is None
+
+
+if __name__ == "__main__":
+    for test in [test_unchanged_rig_has_no_changes,
+                 test_changed_components_are_found,
+                 test_float_noise_is_ignored,
+                 test_incremental_build_matches_a_clean_build,
+                 test_node_owner]:
+        test()
+        print(f"Test: {test.__name__}: Successful")
@@ -0,0 +1,192 @@
+"""
+Tests the graph layout of the ueGear components, this runs outside of the editor as well.
+"""
+
+from ueGear.tests import unreal_standin
+
+unreal_standin.install()
+
+import unreal  # noqa: E402
+from ueGear.controlrig.components.base_component import UEComponent  # noqa: E402
+from ueGear.controlrig.helpers import layout  # noqa: E402
+from ueGear.controlrig.manager import UEGearManager  # noqa: E402
+from ueGear.controlrig.mgear import mgComponent  # noqa: E402
+
+
+class LayoutPin:
+    def __init__(self, name, direction):
+        self.name = name
+        self.direction = direction
+
+    def get_name(self):
+        return self.name
+
+    def get_display_name(self):
+        return self.name
+
+    def get_direction(self):
+        return self.direction
+
+    def get_sub_pins(self):
+        return []
+
+
+class LayoutNode:
+    def __init__(self, name, inputs=(), outputs=()):
+        self.name = name
+        self.pins = ([LayoutPin("ExecuteContext", unreal.RigVMPinDirection.IO)] +
+                     [LayoutPin(pin, unreal.RigVMPinDirection.INPUT) for pin in inputs] +
+                     [LayoutPin(pin, unreal.RigVMPinDirection.OUTPUT) for pin in outputs])
+        self.position = unreal.Vector2D(0, 0)
+
+    def get_name(self):
+        return self.name
+
+    def get_node_title(self):
+        return self.name
+
+    def get_pins(self):
+        return self.pins
+
+    def get_position(self):
+        return self.position
+
+
+class LayoutController:
+    """Stores the last position and size of every node, and the number of calls"""
+
+    def __init__(self):
+        self.positions = {}
+        self.sizes = {}
+        self.call_count = 0
+
+    def set_node_position(self, node, position):
+        self.call_count += 1
+        node.position = position
+        self.positions[node.name] = (position.x, position.y)
+
+    def set_node_size(self, node, size):
+        self.call_count += 1
+        self.sizes[node.name] = (size.x, size.y)
+
+
+class StandinManager(UEGearManager):
+    def __init__(self, controller):
+        self.reset()
+        self.controller = controller
+
+    def get_active_controller(self, name: str = "RigVMModel"):
+        return self.controller
+
+
+def _add_component(manager, name, parent=None, node_count=2):
+    component = UEComponent()
+    component.name = name
+    component.metadata = mgComponent()
+    component.metadata.fullname = name
+    component.comment_node = LayoutNode(name)
+
+    for i in range(node_count):
+        inputs = [f"input_{j}" for j in range(i + 2)]
+        component.nodes['construction_functions'].append(LayoutNode(f"{name}_construct_{i}", inputs, ["result"]))
+    component.add_misc_function(LayoutNode(f"{name}_RigUnit_ItemArray", outputs=["Items"]))
+
+    if parent is not None:
+        component.set_parent(manager.uegear_components[parent])
+
+    manager.uegear_components[name] = component
+    return component
+
+
+def _overlaps(a, b):
+    (ax, ay), (aw, ah) = a
+    (bx, by), (bw, bh) = b
+    return ax < bx + bw and bx < ax + aw and ay < by + bh and by < ay + ah
+
+
+def test_measure_node():
+    small = layout.measure_node(LayoutNode("a", ["x"], ["y"]))
+    assert small == (layout.MIN_NODE_WIDTH, layout.NODE_TITLE_HEIGHT + 2 * layout.PIN_ROW_HEIGHT)
+
+    wide = layout.measure_node(LayoutNode("a_very_long_function_node_name_for_the_arm", ["x"], ["y"]))
+    assert wide[0] > small[0]
+    assert wide[1] == small[1]
+
+
+def test_components_follow_hierarchy():
+    controller = LayoutController()
+    manager = StandinManager(controller)
+
+    _add_component(manager, "root_C0")
+    _add_component(manager, "spine_C0", "root_C0", node_count=4)
+    _add_component(manager, "arm_L0", "spine_C0")
+    _add_component(manager, "arm_R0", "spine_C0")
+    _add_component(manager, "leg_L0", "root_C0")
+    _add_component(manager, "hand_L0", "arm_L0")
+
+    manager.group_components()
+
+    # Every node is positioned once, and every comment is positioned and sized once
+    node_count = sum(len(component.get_layout_nodes()) for component in manager.uegear_components.values())
+    assert controller.call_count == node_count + 2 * len(manager.uegear_components)
+
+    comments = {name: (controller.positions[name], controller.sizes[name]) for name in manager.uegear_components}
+
+    # Children are placed to the right of their parent, and the comment boxes do not overlap
+    for component in manager.uegear_components.values():
+        if component.parent_node is not None:
+            (parent_x, _), (parent_width, _) = comments[component.parent_node.name]
+            assert comments[component.name][0][0] > parent_x + parent_width
+
+    names = list(comments)
+    for i, name in enumerate(names):
+        for other in names[i + 1:]:
+            assert not _overlaps(comments[name], comments[other]), (name, other)
+
+    # Every node is inside the comment box of its component
+    for component in manager.uegear_components.values():
+        (x, y), (width, height) = comments[component.name]
+        for node in component.get_layout_nodes():
+            node_x, node_y = controller.positions[node.name]
+            node_width, node_height = layout.measure_node(node)
+            assert x < node_x and node_x + node_width < x + width
+            assert y < node_y and node_y + node_height < y + height
+
+
+def test_partial_layout_matches_full_layout():
+    full_controller = LayoutController()
+    full_manager = StandinManager(full_controller)
+    partial_controller = LayoutController()
+    partial_manager = StandinManager(partial_controller)
+
+    for manager in [full_manager, partial_manager]:
+        _add_component(manager, "root_C0")
+        for i in range(20):
+            _add_component(manager, f"chain_{i}", "root_C0" if i % 4 == 0 else f"chain_{i - 1}", node_count=i % 3)
+
+    full_manager.group_components()
+    partial_manager.group_components(component_names={"chain_5"})
+
+    assert set(partial_controller.sizes) == {"chain_5"}
+    for name, position in partial_controller.positions.items():
+        assert full_controller.positions[name] == position
+
+
+def test_cycles_are_laid_out():
+    blocks = [layout.ComponentBlock("a", "b"), layout.ComponentBlock("b", "a"), layout.ComponentBlock("c", None)]
+    for block in blocks:
+        layout.stack_nodes(block, [LayoutNode(block.name)])
+
+    layout.layout_blocks(blocks)
+    assert blocks[2].x == 0.0 and blocks[2].y == 0.0
+    assert blocks[1].x > blocks[0].x
+    assert blocks[0].y > blocks[2].y
+
+
+if __name__ == "__main__":
+    for test in [test_measure_node,
+                 test_components_follow_hierarchy,
+                 test_partial_layout_matches_full_layout,
+                 test_cycles_are_laid_out]:
+        test()
+        print(f"Test: {test.__name__}: Successful")
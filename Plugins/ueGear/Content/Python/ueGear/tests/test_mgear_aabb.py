@@ -0,0 +1,91 @@
+"""
+Parity tests between the NumPy bounding box engine and the per point bounding box calculation.
+"""
+
+import json
+import math
+import os
+
+from ueGear.tests import unreal_standin
+
+unreal_standin.install()
+
+from ueGear.controlrig import mgear  # noqa: E402
+from ueGear.controlrig.mgear import aabb  # noqa: E402
+
+TEST_BUILD_JSON = os.path.join(os.path.dirname(__file__), "butcher_data.gnx")
+
+
+def _make_control(name, points_per_shape):
+    """Creates the raw control data, with one curve and a shape per list of points"""
+    shapes = {f"{name}Shape{i}": {"points": points} for i, points in enumerate(points_per_shape)}
+    return {"Name": name,
+            "Shape": {"curves_names": [name],
+                      name: {"crv_color": 17, "shapes": shapes}}}
+
+
+def _assert_aabb_equal(result, expected, label):
+    for values, expected_values in zip(result, expected):
+        for value, expected_value in zip(values, expected_values):
+            if math.isnan(expected_value):
+                assert math.isnan(value), label
+            else:
+                assert value == expected_value, f"{label}: {result} != {expected}"
+
+
+def test_aabb_parity_build_file():
+    with open(TEST_BUILD_JSON, 'r') as file:
+        data = json.load(file)
+
+    control_count = 0
+    for data_component in data["Components"]:
+        controls = data_component["Controls"]
+
+        stacked_results = aabb.calculate_controls_aabb(controls)
+
+        for ctrl, stacked_result in zip(controls, stacked_results):
+            expected = mgear._calculate_bounding_box(ctrl)
+            _assert_aabb_equal(aabb.calculate_control_aabb(ctrl), expected, ctrl["Name"])
+            _assert_aabb_equal(stacked_result, expected, ctrl["Name"])
+            control_count += 1
+
+    assert control_count > 0
+
+
+def test_aabb_parity_multiple_shapes():
+    control = _make_control("multi_ctl", [[[1.23456, -2.0, 3.5], [-4.0, 5.55555, -6.0]],
+                                          [[10.00004, 0.12345, -0.99999]]])
+
+    _assert_aabb_equal(aabb.calculate_control_aabb(control),
+                       mgear._calculate_bounding_box(control),
+                       "multi_ctl")
+
+
+def test_aabb_offset_clamp():
+    # A flat control, has no size on the Maya Y axis
+    control = _make_control("flat_ctl", [[[-2.0, 0.0, -2.0], [2.0, 0.0, 2.0], [2.0, 0.0, -2.0]]])
+
+    center, offset = aabb.calculate_control_aabb(control)
+
+    assert offset == [2.0, 2.0, 0.01]
+    assert center == [0.0, 0.0, 0.0]
+    _assert_aabb_equal((center, offset), mgear._calculate_bounding_box(control), "flat_ctl")
+
+
+def test_aabb_empty_control():
+    empty_control = _make_control("empty_ctl", [])
+    filled_control = _make_control("filled_ctl", [[[1.0, 2.0, 3.0], [-1.0, -2.0, -3.0]]])
+
+    results = aabb.calculate_controls_aabb([empty_control, filled_control])
+
+    _assert_aabb_equal(results[0], mgear._calculate_bounding_box(empty_control), "empty_ctl")
+    _assert_aabb_equal(results[1], mgear._calculate_bounding_box(filled_control), "filled_ctl")
+
+
+if __name__ == "__main__":
+    for test in [test_aabb_parity_build_file,
+                 test_aabb_parity_multiple_shapes,
+                 test_aabb_offset_clamp,
+                 test_aabb_empty_control]:
+        test()
+        print(f"Test: {test.__name__}: Successful")
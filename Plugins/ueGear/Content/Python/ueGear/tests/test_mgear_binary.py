@@ -0,0 +1,117 @@
+"""
+Tests that the binary build data format loads into the same rig as the JSON build file.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+
+from ueGear.tests import unreal_standin
+
+unreal_standin.install()
+
+from ueGear.controlrig import mgear  # noqa: E402
+from ueGear.controlrig.mgear import binary  # noqa: E402
+from ueGear.controlrig.mgear import cache  # noqa: E402
+
+TEST_BUILD_JSON = os.path.join(os.path.dirname(__file__), "butcher_data.gnx")
+
+
+def _assert_rigs_equal(rig, expected_rig):
+    assert list(rig.components.keys()) == list(expected_rig.components.keys())
+    assert json.dumps(cache.rig_to_data(rig)) == json.dumps(cache.rig_to_data(expected_rig))
+
+
+def test_binary_round_trip():
+    temp_dir = tempfile.mkdtemp(prefix="ueGear_binary_")
+    try:
+        build_data_path = binary.convert_build_file(TEST_BUILD_JSON, os.path.join(temp_dir, "butcher_data.scdb"))
+        assert binary.is_build_data_file(build_data_path)
+        assert not binary.is_build_data_file(TEST_BUILD_JSON)
+
+        expected_rig = mgear.convert_json_to_mg_rig(TEST_BUILD_JSON)
+        binary_rig = mgear.convert_json_to_mg_rig(build_data_path)
+        _assert_rigs_equal(binary_rig, expected_rig)
+
+        # The transforms are converted when requested, like a parsed rig
+        expected_rig.control_table.resolve_transforms()
+        binary_rig.control_table.resolve_transforms()
+        _assert_rigs_equal(binary_rig, expected_rig)
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+def test_blocks():
+    with open(TEST_BUILD_JSON, 'r') as file:
+        data = json.load(file)
+
+    temp_dir = tempfile.mkdtemp(prefix="ueGear_binary_")
+    try:
+        build_data_path = binary.convert_build_file(TEST_BUILD_JSON, os.path.join(temp_dir, "butcher_data.scdb"))
+
+        with binary.BuildDataFile(build_data_path) as build_data:
+            controls = [ctrl for comp in data["Components"] for ctrl in comp["Controls"]]
+            point_counts = build_data.get_block(binary.SHAPE_POINT_COUNTS_BLOCK).tolist()
+            assert len(point_counts) == len(controls)
+
+            first_shape = controls[0]["Shape"]
+            first_curve = first_shape[first_shape["curves_names"][0]]
+            first_points = next(iter(first_curve["shapes"].values()))["points"]
+            points = build_data.get_block(binary.SHAPE_POINTS_BLOCK).tolist()
+            assert points[:len(first_points)] == first_points
+
+            guide_matrices = build_data.get_block(binary.GUIDE_MATRICES_BLOCK).tolist()
+            first_guides = next(comp["guideTransforms"] for comp in data["Components"] if comp.get("guideTransforms"))
+            assert guide_matrices[0] == next(iter(first_guides.values()))
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+def test_sidecar():
+    temp_dir = tempfile.mkdtemp(prefix="ueGear_binary_")
+    try:
+        build_file = os.path.join(temp_dir, "rig.scd")
+        shutil.copy(TEST_BUILD_JSON, build_file)
+
+        sidecar_path = binary.get_sidecar_path(build_file)
+        assert not binary.is_sidecar_current(sidecar_path, build_file)
+
+        assert binary.convert_build_file(build_file) == sidecar_path
+        assert binary.is_sidecar_current(sidecar_path, build_file)
+
+        expected_rig = mgear.convert_json_to_mg_rig(build_file)
+        _assert_rigs_equal(mgear.convert_json_to_mg_rig(build_file, use_sidecar=True), expected_rig)
+
+        # Editing the build file makes the sidecar stale, so the build file is parsed instead
+        with open(build_file, 'a') as file:
+            file.write("\n")
+        assert not binary.is_sidecar_current(sidecar_path, build_file)
+        _assert_rigs_equal(mgear.convert_json_to_mg_rig(build_file, use_sidecar=True), expected_rig)
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+def test_invalid_file():
+    temp_dir = tempfile.mkdtemp(prefix="ueGear_binary_")
+    try:
+        invalid_path = os.path.join(temp_dir, "invalid.scdb")
+        with open(invalid_path, 'wb') as file:
+            file.write(b"not build data")
+
+        try:
+            binary.BuildDataFile(invalid_path)
+            raise AssertionError("Invalid build data file was opened")
+        except ValueError:
+            pass
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    for test in [test_binary_round_trip,
+                 test_blocks,
+                 test_sidecar,
+                 test_invalid_file]:
+        test()
+        print(f"Test: {test.__name__}: Successful")
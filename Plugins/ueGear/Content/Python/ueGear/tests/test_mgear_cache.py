@@ -0,0 +1,115 @@
+"""
+Tests for the on-disk cache of parsed mGear rigs.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+
+from ueGear.tests import unreal_standin
+
+unreal_standin.install()
+
+from ueGear.controlrig import mgear  # noqa: E402
+from ueGear.controlrig.mgear import cache  # noqa: E402
+
+TEST_BUILD_JSON = os.path.join(os.path.dirname(__file__), "butcher_data.gnx")
+
+
+def _assert_rigs_equal(rig, expected_rig):
+    assert list(rig.components.keys()) == list(expected_rig.components.keys())
+
+    # The serialised data contains every parsed value, including the transforms and matrices. It is compared
+    # as text, as controls without shapes have NaN bounding boxes
+    assert json.dumps(cache.rig_to_data(rig)) == json.dumps(cache.rig_to_data(expected_rig))
+
+
+def test_cache_round_trip():
+    cache_dir = tempfile.mkdtemp(prefix="ueGear_cache_")
+    try:
+        expected_rig = mgear.convert_json_to_mg_rig(TEST_BUILD_JSON)
+
+        # First call parses and stores the rig, the second call loads it from the cache
+        parsed_rig = mgear.convert_json_to_mg_rig(TEST_BUILD_JSON, use_cache=True, cache_dir=cache_dir)
+        assert len(os.listdir(cache_dir)) == 1
+        cached_rig = mgear.convert_json_to_mg_rig(TEST_BUILD_JSON, use_cache=True, cache_dir=cache_dir)
+
+        _assert_rigs_equal(parsed_rig, expected_rig)
+        _assert_rigs_equal(cached_rig, expected_rig)
+    finally:
+        shutil.rmtree(cache_dir)
+
+
+def test_cache_key_changes_with_content():
+    temp_dir = tempfile.mkdtemp(prefix="ueGear_cache_")
+    try:
+        build_file = os.path.join(temp_dir, "build.scd")
+        shutil.copyfile(TEST_BUILD_JSON, build_file)
+        key = cache.get_cache_key(build_file)
+
+        assert key.endswith(f".v{cache.PARSER_VERSION}")
+        assert cache.get_cache_key(build_file) == key
+
+        with open(build_file, 'a') as file:
+            file.write(" ")
+        assert cache.get_cache_key(build_file) != key
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+def test_cache_invalid_entry():
+    cache_dir = tempfile.mkdtemp(prefix="ueGear_cache_")
+    try:
+        entry_path = os.path.join(cache_dir, "broken" + cache.CACHE_FILE_EXT)
+        with open(entry_path, 'w') as file:
+            file.write("{not json")
+
+        assert cache.load("broken", cache_dir) is None
+        assert not os.path.exists(entry_path)
+    finally:
+        shutil.rmtree(cache_dir)
+
+
+def test_cache_eviction():
+    cache_dir = tempfile.mkdtemp(prefix="ueGear_cache_")
+    try:
+        rig = mgear.convert_json_to_mg_rig(TEST_BUILD_JSON)
+        for index in range(3):
+            cache.save(f"entry{index}", rig, cache_dir)
+            os.utime(os.path.join(cache_dir, f"entry{index}" + cache.CACHE_FILE_EXT), (index, index))
+        entry_size = os.path.getsize(os.path.join(cache_dir, "entry0" + cache.CACHE_FILE_EXT))
+
+        # Loading the oldest entry marks it as recently used
+        assert cache.load("entry0", cache_dir) is not None
+
+        assert cache.evict(cache_dir, max_size=entry_size * 2) == 1
+        assert sorted(os.listdir(cache_dir)) == ["entry0.json", "entry2.json"]
+
+        cache.clear(cache_dir)
+        assert os.listdir(cache_dir) == []
+    finally:
+        shutil.rmtree(cache_dir)
+
+
+def test_failed_save_leaves_no_files():
+    cache_dir = tempfile.mkdtemp(prefix="ueGear_cache_")
+    try:
+        rig = mgear.convert_json_to_mg_rig(TEST_BUILD_JSON)
+        # Sets can not be written as JSON, so the write fails part way through the file
+        rig.settings = dict(rig.settings, unsupported={1, 2})
+
+        cache.save("unsupported", rig, cache_dir)
+        assert os.listdir(cache_dir) == []
+    finally:
+        shutil.rmtree(cache_dir)
+
+
+if __name__ == "__main__":
+    for test in [test_cache_round_trip,
+                 test_cache_key_changes_with_content,
+                 test_cache_invalid_entry,
+                 test_cache_eviction,
+                 test_failed_save_leaves_no_files]:
+        test()
+        print(f"Test: {test.__name__}: Successful")
@@ -0,0 +1,71 @@
+"""
+Tests that the parallel mGear build file parser creates the same rig as the serial parser.
+
+The worker processes are spawned, so this script must be run as the main module.
+"""
+
+import json
+import os
+import tempfile
+
+from ueGear.tests import unreal_standin
+
+unreal_standin.install()
+
+from ueGear.controlrig import mgear  # noqa: E402
+from ueGear.controlrig.mgear import cache  # noqa: E402
+from ueGear.controlrig.mgear import stream  # noqa: E402
+
+TEST_BUILD_JSON = os.path.join(os.path.dirname(__file__), "butcher_data.gnx")
+
+
+def test_raw_components():
+    with open(TEST_BUILD_JSON, 'r') as file:
+        expected = json.load(file)["Components"]
+
+    # Small chunks split the component text at every possible position
+    for chunk_size in [7, 64, 1024 * 1024]:
+        raw_components = [value for key, value in stream.iter_build_data(TEST_BUILD_JSON, chunk_size=chunk_size,
+                                                                         raw=True)
+                          if key == "Components"]
+        assert all(isinstance(value, str) for value in raw_components)
+        assert [json.loads(value) for value in raw_components] == expected
+
+
+def test_raw_strings_with_brackets():
+    data = {"MainSettings": {"rig_name": "rig"},
+            "Components": [{"Name": 'a"}]{[', "Points": [[1, [2]], {"b": "]"}]},
+                           {"Name": "\\"},
+                           [[1], "{", {"c": "}"}]]}
+
+    build_file = os.path.join(tempfile.mkdtemp(prefix="ueGear_stream_"), "brackets.scd")
+    try:
+        with open(build_file, 'w') as file:
+            json.dump(data, file)
+
+        for chunk_size in range(1, 12):
+            values = [json.loads(value) if key == "Components" else value
+                      for key, value in stream.iter_build_data(build_file, chunk_size=chunk_size, raw=True)]
+            assert values == [data["MainSettings"]] + data["Components"]
+    finally:
+        os.remove(build_file)
+        os.rmdir(os.path.dirname(build_file))
+
+
+def test_parallel_matches_serial():
+    expected_rig = mgear.convert_json_to_mg_rig(TEST_BUILD_JSON)
+    parallel_rig = mgear.convert_json_to_mg_rig(TEST_BUILD_JSON, parallel=True, max_workers=2)
+
+    assert list(parallel_rig.components.keys()) == list(expected_rig.components.keys())
+
+    # The workers convert the transforms up front, the serial rig converts them when requested
+    expected_rig.control_table.resolve_transforms()
+    assert json.dumps(cache.rig_to_data(parallel_rig)) == json.dumps(cache.rig_to_data(expected_rig))
+
+
+if __name__ == "__main__":
+    for test in [test_raw_components,
+                 test_raw_strings_with_brackets,
+                 test_parallel_matches_serial]:
+        test()
+        print(f"Test: {test.__name__}: Successful")
@@ -0,0 +1,98 @@
+"""
+Tests the mGear parser against synthetic build files, this runs outside of the editor as well.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+
+from ueGear.tests import unreal_standin
+
+unreal_standin.install()
+
+from ueGear.controlrig import mgear  # noqa: E402
+from ueGear.controlrig.mgear import binary  # noqa: E402
+from ueGear.controlrig.mgear import cache  # noqa: E402
+from ueGear.tests import synthetic_build  # noqa: E402
+
+
+def _write_build_file(temp_dir, **kwargs):
+    build_file = os.path.join(temp_dir, "synthetic_build.scd")
+    synthetic_build.write_build_file(build_file, **kwargs)
+    return build_file
+
+
+def test_generator_is_deterministic():
+    data = synthetic_build.generate_build_data(component_count=20, seed=3)
+    assert data == synthetic_build.generate_build_data(component_count=20, seed=3)
+    assert data != synthetic_build.generate_build_data(component_count=20, seed=4)
+
+    temp_dir = tempfile.mkdtemp(prefix="ueGear_synthetic_")
+    try:
+        build_file = _write_build_file(temp_dir, component_count=20, seed=3)
+        with open(build_file, 'r') as file:
+            assert json.load(file) == data
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+def test_parse_synthetic_rig():
+    component_count = len(synthetic_build.COMPONENT_TEMPLATES) + 1
+
+    temp_dir = tempfile.mkdtemp(prefix="ueGear_synthetic_")
+    try:
+        build_file = _write_build_file(temp_dir, component_count=component_count, curves_per_control=2,
+                                       points_per_shape=8)
+        rig = mgear.convert_json_to_mg_rig(build_file)
+    finally:
+        shutil.rmtree(temp_dir)
+
+    assert len(rig.components) == component_count
+    assert {comp.comp_type for comp in rig.components.values()} == set(synthetic_build.COMPONENT_TEMPLATES)
+
+    for component in rig.components.values():
+        template = synthetic_build.COMPONENT_TEMPLATES[component.comp_type]
+        assert len(component.controls) == len(template["roles"])
+        assert set(component.controls_role.values()) == set(template["roles"])
+        assert list(component.guide_transforms.keys()) == template["guides"]
+        assert set(component.data_contracts.keys()) == set(template["contracts"].keys())
+
+        # Every parent exists, apart from the global control
+        if component.parent_fullname is not None:
+            assert component.parent_fullname in rig.components
+
+
+def test_controls_per_component():
+    temp_dir = tempfile.mkdtemp(prefix="ueGear_synthetic_")
+    try:
+        build_file = _write_build_file(temp_dir, component_count=12, controls_per_component=25)
+        rig = mgear.convert_json_to_mg_rig(build_file)
+    finally:
+        shutil.rmtree(temp_dir)
+
+    assert all(len(comp.controls) == 25 for comp in rig.components.values())
+
+
+def test_parse_modes_match():
+    temp_dir = tempfile.mkdtemp(prefix="ueGear_synthetic_")
+    try:
+        build_file = _write_build_file(temp_dir, component_count=40, points_per_shape=32)
+        expected = json.dumps(cache.rig_to_data(mgear.convert_json_to_mg_rig(build_file)))
+
+        streamed_rig = mgear.convert_json_to_mg_rig(build_file, streaming=True)
+        binary_rig = mgear.convert_json_to_mg_rig(binary.convert_build_file(build_file))
+
+        assert json.dumps(cache.rig_to_data(streamed_rig)) == expected
+        assert json.dumps(cache.rig_to_data(binary_rig)) == expected
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    for test in [test_generator_is_deterministic,
+                 test_parse_synthetic_rig,
+                 test_controls_per_component,
+                 test_parse_modes_match]:
+        test()
+        print(f"Test: {test.__name__}: Successful")
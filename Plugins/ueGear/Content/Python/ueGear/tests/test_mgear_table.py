@@ -0,0 +1,161 @@
+"""
+Tests that the control table views behave like the lists and dictionaries they replace.
+"""
+
+import math
+import os
+
+from ueGear.tests import unreal_standin
+
+unreal_standin.install()
+
+import unreal  # noqa: E402
+
+from ueGear.controlrig import mgear  # noqa: E402
+from ueGear.controlrig.mgear import table  # noqa: E402
+
+TEST_BUILD_JSON = os.path.join(os.path.dirname(__file__), "butcher_data.gnx")
+
+
+def _build_table():
+    control_table = table.ControlTable()
+    control_table.add_control("other_ctl", "root", None, ([0.0, 0.0, 0.0], [1.0, 1.0, 1.0]), None)
+    control_table.add_control("fk0_ctl", "fk0",
+                              [1.0, 2.0, 3.0, 0.0, 0.0, 0.0, 1.0, 1.0, 1.0, 1.0],
+                              ([0.5, 0.5, 0.5], [2.0, 3.0, 4.0]),
+                              [1.0, 0.0, 0.0])
+    control_table.add_control("fk1_ctl", "fk1",
+                              [4.0, 5.0, 6.0, 0.0, 0.0, 0.0, 1.0, 2.0, 2.0, 2.0],
+                              ([math.inf] * 3, [-math.inf] * 3),
+                              None)
+    return control_table
+
+
+def test_component_views():
+    control_table = _build_table()
+    component = mgear.mgComponent()
+    component.bind_controls(control_table, 1, 3)
+
+    assert component.controls == ["fk0_ctl", "fk1_ctl"]
+    assert list(component.controls) == ["fk0_ctl", "fk1_ctl"]
+    assert component.controls[0] == "fk0_ctl"
+    assert component.controls[-1] == "fk1_ctl"
+    assert component.controls[1:] == ["fk1_ctl"]
+    assert len(component.controls) == 2
+
+    # Indices outside of the components rows do not reach the other controls of the table
+    for index in [2, -3]:
+        try:
+            component.controls[index]
+            raise AssertionError(f"Index {index} should be out of range")
+        except IndexError:
+            pass
+
+    assert dict(component.controls_role) == {"fk0_ctl": "fk0", "fk1_ctl": "fk1"}
+    assert list(component.control_transforms.keys()) == ["fk0_ctl", "fk1_ctl"]
+    assert component.controls_aabb["fk0_ctl"] == ([0.5, 0.5, 0.5], [2.0, 3.0, 4.0])
+    assert component.controls_aabb["fk1_ctl"][0] == [math.inf] * 3
+    assert component.controls_colour["fk0_ctl"] == [1.0, 0.0, 0.0]
+    assert component.controls_colour["fk1_ctl"] is None
+
+    # Controls outside of the components rows are not visible
+    assert "other_ctl" not in component.controls_role
+    try:
+        component.controls_aabb["other_ctl"]
+        raise AssertionError("other_ctl should not be found")
+    except KeyError:
+        pass
+
+    transform = component.control_transforms["fk1_ctl"]
+    assert [transform.translation.x, transform.translation.y, transform.translation.z] == [4.0, 5.0, 6.0]
+    assert [transform.scale3d.x, transform.scale3d.y, transform.scale3d.z] == [2.0, 2.0, 2.0]
+
+
+def test_transform_changes_are_kept():
+    component = mgear.mgComponent()
+    component.bind_controls(_build_table(), 1, 3)
+
+    # Components modify the stored transform, and read it back later in the build
+    component.control_transforms["fk0_ctl"].set_editor_property("scale3d", unreal.Vector(5, 5, 5))
+
+    assert component.control_transforms["fk0_ctl"].scale3d.x == 5.0
+
+
+def test_assigned_control_attributes():
+    component = mgear.mgComponent()
+    assert component.controls is None
+    assert component.controls_aabb is None
+
+    component.controls = ["world_ctl"]
+    component.controls_aabb = dict()
+    component.controls_aabb["world_ctl"] = [[0, 0, 0], [120.0, 120.0, 120.0]]
+
+    assert component.controls == ["world_ctl"]
+    assert component.controls_aabb["world_ctl"] == [[0, 0, 0], [120.0, 120.0, 120.0]]
+    assert component.controls_role is None
+
+
+def test_rig_shares_control_table():
+    rig = mgear.convert_json_to_mg_rig(TEST_BUILD_JSON)
+
+    control_count = 0
+    for component in rig.components.values():
+        if component.controls is None:
+            continue
+        assert component.control_table is rig.control_table
+        start, stop = component.control_range
+        assert list(component.controls) == rig.control_table.names[start:stop]
+        control_count += len(component.controls)
+
+    assert control_count == len(rig.control_table)
+
+
+def test_lazy_transforms():
+    rig = mgear.convert_json_to_mg_rig(TEST_BUILD_JSON)
+    control_table = rig.control_table
+
+    # Nothing is converted while parsing
+    assert all(state == table.TRANSFORM_PENDING for state in control_table.transform_state)
+
+    component = next(comp for comp in rig.components.values() if comp.controls and len(comp.controls) > 1)
+    start, stop = component.control_range
+    expected = mgear.convert_maya_transform_values(_maya_values(control_table, start, stop))
+
+    # Requesting one transform converts the whole component, and only that component
+    transform = component.control_transforms[component.controls[0]]
+    assert all(state == table.TRANSFORM_RESOLVED for state in control_table.transform_state[start:stop])
+    assert table.TRANSFORM_PENDING in control_table.transform_state
+    assert table.transform_to_values(transform) == expected[0]
+    for row, values in zip(range(start, stop), expected):
+        assert control_table.get_transform_values(row) == values
+
+
+def test_lazy_guide_transforms():
+    rig = mgear.convert_json_to_mg_rig(TEST_BUILD_JSON)
+    component = next(comp for comp in rig.components.values() if comp.get_guide_transform_data())
+
+    guide_data = component.get_guide_transform_data()
+    guide_transforms = component.guide_transforms
+
+    assert list(guide_transforms.keys()) == list(guide_data.keys())
+    for name, mtx in guide_transforms.items():
+        assert table.matrix_to_values(mtx) == guide_data[name]
+
+    # The matrices are created once, and kept
+    assert component.guide_transforms is guide_transforms
+
+
+def _maya_values(control_table, start, stop):
+    width = table.MAYA_TRANSFORM_WIDTH
+    return [control_table.maya_transforms[row * width: (row + 1) * width].tolist() for row in range(start, stop)]
+
+
+if __name__ == "__main__":
+    for test in [test_component_views,
+                 test_transform_changes_are_kept,
+                 test_assigned_control_attributes,
+                 test_rig_shares_control_table,
+                 test_lazy_transforms,
+                 test_lazy_guide_transforms]:
+        test()
+        print(f"Test: {test.__name__}: Successful")
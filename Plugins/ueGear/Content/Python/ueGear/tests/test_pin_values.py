@@ -0,0 +1,89 @@
+"""
+Tests the text values of RigVM pins, every encoded value is decoded back to the value it was written from. This
+runs outside of the editor as well.
+"""
+
+from ueGear.tests import unreal_standin
+
+unreal_standin.install()
+
+import unreal  # noqa: E402
+
+from ueGear.controlrig.helpers import pin_values  # noqa: E402
+
+
+def test_vectors_round_trip():
+    values = [(0.0, -9.97, 4.5523), (1e-05, 123456.789, -0.1), unreal.Vector(1.5, 2.0, -3.25)]
+    text = pin_values.encode_vectors(values)
+
+    assert text.startswith("((X=0.0,Y=-9.97,Z=4.5523),")
+    assert pin_values.decode_vectors(text) == [(0.0, -9.97, 4.5523), (1e-05, 123456.789, -0.1), (1.5, 2.0, -3.25)]
+    assert pin_values.decode_vectors(pin_values.encode_vectors([])) == []
+
+
+def test_colours_round_trip():
+    colours = [(1.0, 1.0, 0.0), (0.961, 0.185, 0.5, 0.25)]
+    text = pin_values.encode_colours(colours)
+
+    assert pin_values.decode_colours(text) == [(1.0, 1.0, 0.0, 1.0), (0.961, 0.185, 0.5, 0.25)]
+
+
+def test_transforms_round_trip():
+    transforms = [unreal.Transform(location=[72.34, -1.5, 90.0],
+                                   rotation=unreal.Quat(0.6536003519218913, 0.131, 0.7307, -0.1471874203135154),
+                                   scale=[2.0, 2.0, 2.0]),
+                  unreal.Transform()]
+    text = pin_values.encode_transforms(transforms)
+
+    # The controls are created unscaled
+    assert pin_values.decode_transforms(text) == [
+        ((0.6536003519218913, 0.131, 0.7307, -0.1471874203135154), (72.34, -1.5, 90.0), (1.0, 1.0, 1.0)),
+        ((0.0, 0.0, 0.0, 1.0), (0.0, 0.0, 0.0), (1.0, 1.0, 1.0))]
+
+
+def test_names_round_trip():
+    names = ["spine_C0_ik0_ctl", "arm_L0_fk0_ctl", "with space", 'a,"quoted"(name)', ""]
+    text = pin_values.encode_names(names)
+
+    assert text.startswith("(spine_C0_ik0_ctl,arm_L0_fk0_ctl,")
+    assert pin_values.decode_names(text) == names
+
+
+def test_element_keys_round_trip():
+    text = pin_values.encode_element_keys(["pelvis", "spine_01"])
+    assert text == '((Type=Bone,Name="pelvis"),(Type=Bone,Name="spine_01"))'
+    assert pin_values.decode_element_keys(text) == [("Bone", "pelvis"), ("Bone", "spine_01")]
+
+    rig_keys = [unreal.RigElementKey(unreal.RigElementType.CONTROL, "arm_L0_fk0_ctl"),
+                unreal.RigElementKey(unreal.RigElementType.NULL, "arm_L0_fk0_null")]
+    assert pin_values.decode_element_keys(pin_values.encode_rig_keys(rig_keys)) == [("Control", "arm_L0_fk0_ctl"),
+                                                                                   ("Null", "arm_L0_fk0_null")]
+    assert pin_values.decode(pin_values.encode_rig_key(rig_keys[0])) == {"Type": "Control",
+                                                                         "Name": "arm_L0_fk0_ctl"}
+
+
+def test_decode_spaced_text():
+    # Text written with spaces after the separators, as the editor accepts
+    text = '((Type=Bone, Name="pelvis"), (Type=Control, Name="root_ctl"))'
+    assert pin_values.decode_element_keys(text) == [("Bone", "pelvis"), ("Control", "root_ctl")]
+
+
+def test_decode_errors():
+    for text in ["((X=1.0,Y=2.0)", "(X=1.0,2.0)", "(1.0,Y=2.0)", '("name)', "(a,b))"]:
+        try:
+            pin_values.decode(text)
+        except pin_values.PinValueError:
+            continue
+        raise AssertionError(f"Expected a PinValueError for {text}")
+
+
+if __name__ == "__main__":
+    for test in [test_vectors_round_trip,
+                 test_colours_round_trip,
+                 test_transforms_round_trip,
+                 test_names_round_trip,
+                 test_element_keys_round_trip,
+                 test_decode_spaced_text,
+                 test_decode_errors]:
+        test()
+        print(f"Test: {test.__name__}: Successful")
@@ -0,0 +1,156 @@
+"""
+Tests the build profiler with a blueprint that records its calls, this runs outside of the editor as well.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+
+from ueGear.tests import unreal_standin
+
+unreal_standin.install()
+
+from ueGear.controlrig.components.base_component import UEComponent  # noqa: E402
+from ueGear.controlrig.manager import UEGearManager  # noqa: E402
+from ueGear.controlrig.profiling import BuildTracer  # noqa: E402
+from ueGear.controlrig.session import BuildSession  # noqa: E402
+
+
+class RecordingNode:
+    def __init__(self, name):
+        self.name = name
+
+    def get_name(self):
+        return self.name
+
+
+class RecordingController:
+    """Stores every call, in the order they are made"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, name):
+        def call(*args, **kwargs):
+            self.calls.append((name,) + args)
+            if name == "get_hierarchy":
+                return RecordingController()
+            return True
+
+        return call
+
+
+class RecordingBlueprint:
+    def __init__(self):
+        self.controller = RecordingController()
+        self.hierarchy_controller = RecordingController()
+
+    def get_controller_by_name(self, name):
+        return self.controller
+
+    def get_hierarchy_controller(self):
+        return self.hierarchy_controller
+
+    def get_auto_vm_recompile(self):
+        return False
+
+    def set_auto_vm_recompile(self, active):
+        pass
+
+    def suspend_notifications(self, suspend):
+        pass
+
+    def recompile_vm(self):
+        pass
+
+
+class StandinManager(UEGearManager):
+    def __init__(self, blueprint):
+        self.reset()
+        self.set_active_blueprint(blueprint)
+
+
+class TracedComponent(UEComponent):
+    name = "arm_L0"
+
+    def create_functions(self, controller):
+        node = RecordingNode(f"{self.name}_construct")
+        controller.add_link("a", "b")
+        controller.set_node_position(node, 0)
+        controller.set_node_position(node, 1)
+
+    def generate_manual_controls(self, hierarchy_controller):
+        hierarchy = hierarchy_controller.get_hierarchy()
+        hierarchy.find_control("arm_L0_fk0_ctl")
+        hierarchy.find_control("arm_L0_fk1_ctl")
+
+
+def test_spans_and_calls_are_recorded():
+    manager = StandinManager(RecordingBlueprint())
+    component = TracedComponent()
+    original_method = TracedComponent.create_functions
+
+    with BuildTracer(log_summary=False) as tracer, BuildSession(manager, log_timings=False):
+        with tracer.span("build"):
+            manager.populate_parents()
+            component.create_functions(manager.get_active_controller())
+            component.generate_manual_controls(manager.get_hierarchy_controller())
+
+    # Nothing stays instrumented
+    assert TracedComponent.create_functions is original_method
+    assert "get_active_controller" not in StandinManager.__dict__
+
+    events = {event["name"]: event for event in tracer.events}
+    assert set(events) == {"build", "populate_parents", "build_manual_controls", "TracedComponent.create_functions",
+                           "TracedComponent.generate_manual_controls"}
+
+    create_functions = events["TracedComponent.create_functions"]
+    assert create_functions["args"]["component"] == "arm_L0"
+    # The layout writes are recorded by the command buffer, only the link reached the controller
+    assert create_functions["args"]["controller_calls"] == 1
+
+    manual_controls = events["TracedComponent.generate_manual_controls"]
+    assert manual_controls["args"] == {"component": "arm_L0", "hierarchy_controller_calls": 1,
+                                       "hierarchy_calls": 2}
+
+    build = events["build"]
+    assert build["ts"] <= create_functions["ts"]
+    assert build["dur"] >= create_functions["dur"] + manual_controls["dur"]
+    assert build["self_dur"] <= build["dur"] - create_functions["dur"]
+
+    assert tracer.call_counts["hierarchy"] == {"find_control": 2}
+    # The command buffer flushes the position of the node once, when the session ends
+    assert tracer.call_counts["controller"]["set_node_position"] == 1
+
+    summary = tracer.get_summary()
+    assert summary[0]["name"] == "build"
+    assert "TracedComponent.create_functions" in tracer.format_summary()
+
+
+def test_trace_file():
+    temp_dir = tempfile.mkdtemp(prefix="ueGear_trace_")
+    try:
+        trace_path = os.path.join(temp_dir, "trace.json")
+        with BuildTracer(trace_path, log_summary=False) as tracer:
+            with tracer.span("outer", value=1):
+                with tracer.span("inner"):
+                    pass
+
+        with open(trace_path) as file:
+            trace = json.load(file)
+    finally:
+        shutil.rmtree(temp_dir)
+
+    assert [event["name"] for event in trace["traceEvents"]] == ["outer", "inner"]
+    for event in trace["traceEvents"]:
+        assert event["ph"] == "X"
+        assert set(event) == {"name", "cat", "ph", "ts", "dur", "pid", "tid", "args"}
+    assert trace["traceEvents"][0]["args"] == {"value": 1}
+
+
+if __name__ == "__main__":
+    for test in [test_spans_and_calls_are_recorded,
+                 test_trace_file]:
+        test()
+        print(f"Test: {test.__name__}: Successful")
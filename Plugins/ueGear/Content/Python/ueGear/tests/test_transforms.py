@@ -0,0 +1,141 @@
+"""
+Parity tests between the batched NumPy transform kernel and the per transform Unreal conversions.
+"""
+
+import json
+import os
+import random
+
+from ueGear.tests import unreal_standin
+
+unreal_standin.install()
+
+import unreal  # noqa: E402
+
+from ueGear import helpers, mayaio, transforms  # noqa: E402
+from ueGear.controlrig import mgear  # noqa: E402
+from ueGear.controlrig.mgear import extract  # noqa: E402
+from ueGear.controlrig.mgear import table  # noqa: E402
+
+TEST_BUILD_JSON = os.path.join(os.path.dirname(__file__), "butcher_data.gnx")
+
+TOLERANCE = 1e-6
+
+
+def _assert_close(values, expected_values, label):
+    for value, expected_value in zip(values, expected_values):
+        assert abs(value - expected_value) <= TOLERANCE, f"{label}: {values} != {expected_values}"
+
+
+def _assert_transforms_close(result, expected, label):
+    for attr in ["translation", "scale3d"]:
+        result_vector = getattr(result, attr)
+        expected_vector = getattr(expected, attr)
+        _assert_close([result_vector.x, result_vector.y, result_vector.z],
+                      [expected_vector.x, expected_vector.y, expected_vector.z], label)
+
+    # Compares the rotations as matrices, as q and -q are the same rotation
+    result_mtx = result.to_matrix()
+    expected_mtx = expected.to_matrix()
+    for plane in ["x_plane", "y_plane", "z_plane"]:
+        result_plane = getattr(result_mtx, plane)
+        expected_plane = getattr(expected_mtx, plane)
+        _assert_close([result_plane.x, result_plane.y, result_plane.z],
+                      [expected_plane.x, expected_plane.y, expected_plane.z], label)
+
+
+def _random_maya_transforms(count, seed=0):
+    rand = random.Random(seed)
+    maya_transforms = []
+    for _ in range(count):
+        maya_transforms.append(unreal.Transform(
+            location=[rand.uniform(-100, 100) for _ in range(3)],
+            rotation=[rand.uniform(-180, 180) for _ in range(3)],
+            scale=[rand.uniform(0.1, 3.0) for _ in range(3)]))
+    return maya_transforms
+
+
+def test_control_transforms_parity_build_file():
+    with open(TEST_BUILD_JSON, 'r') as file:
+        data = json.load(file)
+
+    control_count = 0
+    for data_component in data["Components"]:
+        controls = data_component["Controls"]
+        maya_values = extract.get_maya_transform_values(controls)
+
+        for ctrl, maya_value, values in zip(controls, maya_values, mgear.convert_maya_transform_values(maya_values)):
+            _assert_transforms_close(table.values_to_transform(values),
+                                     mgear._convert_maya_transform_value(maya_value),
+                                     ctrl["Name"])
+            control_count += 1
+
+    assert control_count > 0
+
+
+def test_world_up_transforms_parity():
+    for world_up in ["y", "z"]:
+        results = mayaio.convert_transforms_maya_to_unreal(_random_maya_transforms(100), world_up)
+
+        # The per transform conversion modifies the rotation of the given transform, so it gets its own copies
+        for maya_transform, result in zip(_random_maya_transforms(100), results):
+            _assert_transforms_close(result,
+                                     mayaio.convert_transform_maya_to_unreal(maya_transform, world_up),
+                                     f"world up {world_up}")
+
+
+def test_layout_transforms_parity():
+    rand = random.Random(1)
+    translations = [[rand.uniform(-100, 100) for _ in range(3)] for _ in range(100)]
+    rotations = [[rand.uniform(-180, 180) for _ in range(3)] for _ in range(100)]
+    scales = [[rand.uniform(0.1, 3.0) for _ in range(3)] for _ in range(100)]
+
+    results = helpers.convert_maya_transforms_into_unreal_transforms_batch(translations, rotations, scales)
+
+    for translation, rotation, scale, result in zip(translations, rotations, scales, results):
+        expected = helpers.convert_maya_transforms_into_unreal_transforms(translation, rotation, scale)
+        _assert_close([result[0].x, result[0].y, result[0].z],
+                      [expected[0].x, expected[0].y, expected[0].z], "layout translation")
+        _assert_close([result[1].roll, result[1].pitch, result[1].yaw],
+                      [expected[1].roll, expected[1].pitch, expected[1].yaw], "layout rotation")
+        _assert_close([result[2].x, result[2].y, result[2].z],
+                      [expected[2].x, expected[2].y, expected[2].z], "layout scale")
+
+
+def test_relative_transforms_parity():
+    rand = random.Random(2)
+
+    def random_transform(negative_scale):
+        rotation = unreal.Quat(*[rand.uniform(-1.0, 1.0) for _ in range(4)])
+        rotation.normalize()
+        scale = [rand.uniform(0.5, 2.0) for _ in range(3)]
+        if negative_scale:
+            scale[0] *= -1.0
+        return unreal.Transform(location=[rand.uniform(-100, 100) for _ in range(3)], rotation=rotation,
+                                scale=scale)
+
+    # Uniformly scaled children of positively scaled parents, and mirrored transforms as the mGear controls are
+    children = []
+    parents = []
+    for i in range(100):
+        negative_scale = i % 2 == 1
+        child = random_transform(negative_scale)
+        if not negative_scale:
+            child.scale3d = unreal.Vector(1.5, 1.5, 1.5)
+        children.append(child)
+        parents.append(random_transform(negative_scale))
+
+    results = transforms.to_unreal_transforms(*transforms.relative_transforms(
+        *transforms.from_unreal_transforms(children), *transforms.from_unreal_transforms(parents)))
+
+    for child, parent, result in zip(children, parents, results):
+        _assert_transforms_close(result, child.make_relative(parent), "relative transform")
+
+
+if __name__ == "__main__":
+    for test in [test_control_transforms_parity_build_file,
+                 test_world_up_transforms_parity,
+                 test_layout_transforms_parity,
+                 test_relative_transforms_parity]:
+        test()
+        print(f"Test: {test.__name__}: Successful")
@@ -0,0 +1,460 @@
+"""
+Lightweight stand-in for the Unreal `unreal` Python module.
+
+Only the math types that the mGear parser relies on are implemented, following the Unreal Engine C++
+implementations. Every other attribute resolves to an inert placeholder class, so the ueGear packages can be
+imported outside of the editor. This allows the parser tests and benchmarks to run on a plain Python install.
+
+Call `install()` before importing any ueGear module, it does nothing when the real module is available.
+"""
+
+import math
+import sys
+
+_SMALL_NUMBER = 1.e-8
+_KINDA_SMALL_NUMBER = 1.e-4
+_SINGULARITY_THRESHOLD = 0.4999995
+
+
+def install() -> bool:
+    """
+    Registers this module as `unreal`, unless the real module can be imported.
+
+    :return: True if the stand-in is used.
+    :rtype: bool
+    """
+    module = sys.modules.get("unreal", None)
+    if module is not None:
+        return module is sys.modules[__name__]
+
+    try:
+        import unreal  # noqa: F401
+        return False
+    except ImportError:
+        sys.modules["unreal"] = sys.modules[__name__]
+        return True
+
+
+def log(msg):
+    pass
+
+
+def log_warning(msg):
+    pass
+
+
+def log_error(msg):
+    pass
+
+
+class Vector:
+    def __init__(self, x=0.0, y=0.0, z=0.0):
+        self.x = float(x)
+        self.y = float(y)
+        self.z = float(z)
+
+    def __add__(self, other):
+        return Vector(self.x + other.x, self.y + other.y, self.z + other.z)
+
+    def __sub__(self, other):
+        return Vector(self.x - other.x, self.y - other.y, self.z - other.z)
+
+    def __repr__(self):
+        return f"Vector(x={self.x}, y={self.y}, z={self.z})"
+
+
+class Vector2D:
+    def __init__(self, x=0.0, y=0.0):
+        self.x = float(x)
+        self.y = float(y)
+
+    def __add__(self, other):
+        return Vector2D(self.x + other.x, self.y + other.y)
+
+    def __sub__(self, other):
+        return Vector2D(self.x - other.x, self.y - other.y)
+
+
+class Plane:
+    def __init__(self, x=0.0, y=0.0, z=0.0, w=0.0):
+        self.x = float(x)
+        self.y = float(y)
+        self.z = float(z)
+        self.w = float(w)
+
+
+def _as_vector(value):
+    if isinstance(value, Vector):
+        return Vector(value.x, value.y, value.z)
+    return Vector(*value)
+
+
+class Rotator:
+    def __init__(self, roll=0.0, pitch=0.0, yaw=0.0):
+        self.roll = float(roll)
+        self.pitch = float(pitch)
+        self.yaw = float(yaw)
+
+    def quaternion(self):
+        # FRotator::Quaternion, including the winding removal of the SIMD path
+        half = math.pi / 360.0
+        pitch = math.fmod(self.pitch, 360.0) * half
+        yaw = math.fmod(self.yaw, 360.0) * half
+        roll = math.fmod(self.roll, 360.0) * half
+        sp, cp = math.sin(pitch), math.cos(pitch)
+        sy, cy = math.sin(yaw), math.cos(yaw)
+        sr, cr = math.sin(roll), math.cos(roll)
+        return Quat(cr * sp * sy - sr * cp * cy,
+                    -cr * sp * cy - sr * cp * sy,
+                    cr * cp * sy - sr * sp * cy,
+                    cr * cp * cy + sr * sp * sy)
+
+
+class Quat:
+    def __init__(self, x=0.0, y=0.0, z=0.0, w=1.0):
+        self.x = float(x)
+        self.y = float(y)
+        self.z = float(z)
+        self.w = float(w)
+
+    def normalize(self, tolerance=_SMALL_NUMBER):
+        square_sum = self.x * self.x + self.y * self.y + self.z * self.z + self.w * self.w
+        if square_sum >= tolerance:
+            scale = 1.0 / math.sqrt(square_sum)
+            self.x *= scale
+            self.y *= scale
+            self.z *= scale
+            self.w *= scale
+        else:
+            self.x, self.y, self.z, self.w = 0.0, 0.0, 0.0, 1.0
+
+    def rotator(self):
+        # FQuat::Rotator
+        x, y, z, w = self.x, self.y, self.z, self.w
+        singularity_test = z * x - w * y
+        yaw_y = 2.0 * (w * z + x * y)
+        yaw_x = 1.0 - 2.0 * (y * y + z * z)
+        rad_to_deg = 180.0 / math.pi
+
+        if singularity_test < -_SINGULARITY_THRESHOLD:
+            pitch = -90.0
+            yaw = math.atan2(yaw_y, yaw_x) * rad_to_deg
+            roll = _normalize_axis(-yaw - (2.0 * math.atan2(x, w) * rad_to_deg))
+        elif singularity_test > _SINGULARITY_THRESHOLD:
+            pitch = 90.0
+            yaw = math.atan2(yaw_y, yaw_x) * rad_to_deg
+            roll = _normalize_axis(yaw - (2.0 * math.atan2(x, w) * rad_to_deg))
+        else:
+            pitch = math.asin(2.0 * singularity_test) * rad_to_deg
+            yaw = math.atan2(yaw_y, yaw_x) * rad_to_deg
+            roll = math.atan2(-2.0 * (w * x + y * z), 1.0 - 2.0 * (x * x + y * y)) * rad_to_deg
+
+        return Rotator(roll, pitch, yaw)
+
+    def euler(self):
+        rot = self.rotator()
+        return Vector(rot.roll, rot.pitch, rot.yaw)
+
+    def set_from_euler(self, euler):
+        euler = _as_vector(euler)
+        quat = Rotator(euler.x, euler.y, euler.z).quaternion()
+        self.x, self.y, self.z, self.w = quat.x, quat.y, quat.z, quat.w
+
+    def __mul__(self, other):
+        # FQuat::operator*, the result applies the other rotation first
+        return Quat(self.w * other.x + self.x * other.w + self.y * other.z - self.z * other.y,
+                    self.w * other.y - self.x * other.z + self.y * other.w + self.z * other.x,
+                    self.w * other.z + self.x * other.y - self.y * other.x + self.z * other.w,
+                    self.w * other.w - self.x * other.x - self.y * other.y - self.z * other.z)
+
+    def inverse(self):
+        return Quat(-self.x, -self.y, -self.z, self.w)
+
+    def rotate_vector(self, vector):
+        # FQuat::RotateVector
+        q = Vector(self.x, self.y, self.z)
+        t = _cross(q, vector)
+        t = Vector(t.x * 2.0, t.y * 2.0, t.z * 2.0)
+        qt = _cross(q, t)
+        return Vector(vector.x + self.w * t.x + qt.x,
+                      vector.y + self.w * t.y + qt.y,
+                      vector.z + self.w * t.z + qt.z)
+
+
+def _cross(a, b):
+    return Vector(a.y * b.z - a.z * b.y, a.z * b.x - a.x * b.z, a.x * b.y - a.y * b.x)
+
+
+def _safe_reciprocal(value):
+    return 1.0 / value if abs(value) > _SMALL_NUMBER else 0.0
+
+
+def _normalize_axis(angle):
+    angle = math.fmod(angle, 360.0)
+    if angle < 0.0:
+        angle += 360.0
+    if angle > 180.0:
+        angle -= 360.0
+    return angle
+
+
+def _quat_from_rows(m):
+    # FQuat(const FMatrix&)
+    for axis in range(3):
+        if all(abs(v) <= _KINDA_SMALL_NUMBER for v in m[axis][:3]):
+            return Quat()
+
+    tr = m[0][0] + m[1][1] + m[2][2]
+    if tr > 0.0:
+        inv_s = 1.0 / math.sqrt(tr + 1.0)
+        s = 0.5 * inv_s
+        return Quat((m[1][2] - m[2][1]) * s,
+                    (m[2][0] - m[0][2]) * s,
+                    (m[0][1] - m[1][0]) * s,
+                    0.5 * (1.0 / inv_s))
+
+    i = 0
+    if m[1][1] > m[0][0]:
+        i = 1
+    if m[2][2] > m[i][i]:
+        i = 2
+    nxt = (1, 2, 0)
+    j = nxt[i]
+    k = nxt[j]
+    s = m[i][i] - m[j][j] - m[k][k] + 1.0
+    inv_s = 1.0 / math.sqrt(s)
+    qt = [0.0, 0.0, 0.0, 0.0]
+    qt[i] = 0.5 * (1.0 / inv_s)
+    s = 0.5 * inv_s
+    qt[3] = (m[j][k] - m[k][j]) * s
+    qt[j] = (m[i][j] + m[j][i]) * s
+    qt[k] = (m[i][k] + m[k][i]) * s
+    return Quat(*qt)
+
+
+class Matrix:
+    def __init__(self, x_plane=None, y_plane=None, z_plane=None, w_plane=None):
+        self._rows = [[1.0, 0.0, 0.0, 0.0],
+                      [0.0, 1.0, 0.0, 0.0],
+                      [0.0, 0.0, 1.0, 0.0],
+                      [0.0, 0.0, 0.0, 1.0]]
+        for index, plane in enumerate([x_plane, y_plane, z_plane, w_plane]):
+            if plane is not None:
+                self._set_row(index, plane)
+
+    def _set_row(self, index, plane):
+        if isinstance(plane, Plane):
+            plane = [plane.x, plane.y, plane.z, plane.w]
+        self._rows[index] = [float(v) for v in plane]
+
+    def _get_row(self, index):
+        return Plane(*self._rows[index])
+
+    x_plane = property(lambda self: self._get_row(0), lambda self, p: self._set_row(0, p))
+    y_plane = property(lambda self: self._get_row(1), lambda self, p: self._set_row(1, p))
+    z_plane = property(lambda self: self._get_row(2), lambda self, p: self._set_row(2, p))
+    w_plane = property(lambda self: self._get_row(3), lambda self, p: self._set_row(3, p))
+
+    def __mul__(self, other):
+        a = self._rows
+        b = other._rows
+        result = Matrix()
+        result._rows = [[a[i][0] * b[0][j] + a[i][1] * b[1][j] + a[i][2] * b[2][j] + a[i][3] * b[3][j]
+                         for j in range(4)] for i in range(4)]
+        return result
+
+    def determinant(self):
+        m = self._rows
+        return (m[0][0] * (m[1][1] * m[2][2] - m[1][2] * m[2][1]) -
+                m[1][0] * (m[0][1] * m[2][2] - m[0][2] * m[2][1]) +
+                m[2][0] * (m[0][1] * m[1][2] - m[0][2] * m[1][1]))
+
+    def to_quat(self):
+        return _quat_from_rows(self._rows)
+
+    def inverse(self):
+        # Inverse of an affine matrix, the translation lives in the last row
+        m = self._rows
+        determinant = self.determinant()
+        if abs(determinant) <= _SMALL_NUMBER:
+            return Matrix()
+
+        inv = [[(m[(j + 1) % 3][(i + 1) % 3] * m[(j + 2) % 3][(i + 2) % 3] -
+                 m[(j + 1) % 3][(i + 2) % 3] * m[(j + 2) % 3][(i + 1) % 3]) / determinant
+                for j in range(3)] for i in range(3)]
+        translation = [-sum(m[3][k] * inv[k][j] for k in range(3)) for j in range(3)]
+
+        result = Matrix()
+        result._rows = [inv[0] + [0.0], inv[1] + [0.0], inv[2] + [0.0], translation + [1.0]]
+        return result
+
+    def transform(self):
+        # FTransform::SetFromMatrix
+        rows = [list(row) for row in self._rows]
+        scale = [0.0, 0.0, 0.0]
+        for i in range(3):
+            square_sum = rows[i][0] ** 2 + rows[i][1] ** 2 + rows[i][2] ** 2
+            if square_sum > _SMALL_NUMBER:
+                length = math.sqrt(square_sum)
+                scale[i] = length
+                rows[i] = [rows[i][0] / length, rows[i][1] / length, rows[i][2] / length, rows[i][3]]
+            else:
+                rows[i] = [0.0, 0.0, 0.0, rows[i][3]]
+
+        if self.determinant() < 0.0:
+            scale[0] *= -1.0
+            rows[0] = [-rows[0][0], -rows[0][1], -rows[0][2], rows[0][3]]
+
+        trans = Transform()
+        trans.rotation = _quat_from_rows(rows)
+        trans.rotation.normalize()
+        trans.translation = Vector(*self._rows[3][:3])
+        trans.scale3d = Vector(*scale)
+        return trans
+
+
+Matrix.IDENTITY = Matrix()
+Quat.IDENTITY = Quat()
+
+
+class Transform:
+    def __init__(self, location=None, rotation=None, scale=None):
+        self.translation = _as_vector(location) if location is not None else Vector()
+        if rotation is None:
+            self.rotation = Quat()
+        elif isinstance(rotation, Quat):
+            self.rotation = rotation
+        else:
+            rotation = rotation if isinstance(rotation, Rotator) else Rotator(*rotation)
+            self.rotation = rotation.quaternion()
+        self.scale3d = _as_vector(scale) if scale is not None else Vector(1.0, 1.0, 1.0)
+
+    def set_editor_property(self, name, value):
+        # The property names are not case sensitive
+        name = name.lower()
+        if name in ("translation", "scale3d"):
+            value = _as_vector(value)
+        setattr(self, name, value)
+
+    def get_editor_property(self, name):
+        return getattr(self, name)
+
+    def make_relative(self, other):
+        # FTransform::GetRelativeTransform
+        recip_scale = Vector(_safe_reciprocal(other.scale3d.x),
+                             _safe_reciprocal(other.scale3d.y),
+                             _safe_reciprocal(other.scale3d.z))
+
+        result = Transform()
+        result.scale3d = Vector(self.scale3d.x * recip_scale.x,
+                                self.scale3d.y * recip_scale.y,
+                                self.scale3d.z * recip_scale.z)
+
+        scales = [self.scale3d.x, self.scale3d.y, self.scale3d.z, other.scale3d.x, other.scale3d.y, other.scale3d.z]
+        if min(scales) < 0.0:
+            # GetRelativeTransformUsingMatrixWithScale, the rotation is taken from the relative matrix
+            rows = (self.to_matrix() * other.to_matrix().inverse())._rows
+            signs = [1.0 if value >= 0.0 else -1.0
+                     for value in (result.scale3d.x, result.scale3d.y, result.scale3d.z)]
+            axes = []
+            for i in range(3):
+                square_sum = rows[i][0] ** 2 + rows[i][1] ** 2 + rows[i][2] ** 2
+                scale = 1.0 / math.sqrt(square_sum) if square_sum > _SMALL_NUMBER else 1.0
+                axes.append([rows[i][0] * scale * signs[i], rows[i][1] * scale * signs[i],
+                             rows[i][2] * scale * signs[i], 0.0])
+            result.rotation = _quat_from_rows(axes)
+            result.rotation.normalize()
+            result.translation = Vector(*rows[3][:3])
+            return result
+
+        inverse = other.rotation.inverse()
+        translation = inverse.rotate_vector(self.translation - other.translation)
+        result.rotation = inverse * self.rotation
+        result.translation = Vector(translation.x * recip_scale.x,
+                                    translation.y * recip_scale.y,
+                                    translation.z * recip_scale.z)
+        return result
+
+    def to_matrix(self):
+        # FTransform::ToMatrixWithScale
+        q = self.rotation
+        s = self.scale3d
+        x2, y2, z2 = q.x + q.x, q.y + q.y, q.z + q.z
+        xx, xy, xz = q.x * x2, q.x * y2, q.x * z2
+        yy, yz, zz = q.y * y2, q.y * z2, q.z * z2
+        wx, wy, wz = q.w * x2, q.w * y2, q.w * z2
+
+        mtx = Matrix()
+        mtx._rows = [[(1.0 - (yy + zz)) * s.x, (xy + wz) * s.x, (xz - wy) * s.x, 0.0],
+                     [(xy - wz) * s.y, (1.0 - (xx + zz)) * s.y, (yz + wx) * s.y, 0.0],
+                     [(xz + wy) * s.z, (yz - wx) * s.z, (1.0 - (xx + yy)) * s.z, 0.0],
+                     [self.translation.x, self.translation.y, self.translation.z, 1.0]]
+        return mtx
+
+
+class LinearColor:
+    def __init__(self, r=0.0, g=0.0, b=0.0, a=1.0):
+        self.r = r
+        self.g = g
+        self.b = b
+        self.a = a
+
+
+class RigVMPinDirection:
+    INVALID = "Invalid"
+    INPUT = "Input"
+    OUTPUT = "Output"
+    IO = "IO"
+    VISIBLE = "Visible"
+    HIDDEN = "Hidden"
+
+
+class RigElementType:
+    BONE = "Bone"
+    NULL = "Null"
+    CONTROL = "Control"
+    CURVE = "Curve"
+
+
+class RigElementKey:
+    def __init__(self, type=RigElementType.BONE, name=""):
+        self.type = type
+        self.name = name
+
+
+class SystemLibrary:
+    @staticmethod
+    def get_engine_version():
+        return "5.3.0"
+
+
+class _PlaceholderType(type):
+    """Resolves the class attributes of the placeholders, such as enum values and static methods"""
+
+    def __getattr__(cls, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return type(name, (_Placeholder,), {})
+
+
+class _Placeholder(metaclass=_PlaceholderType):
+    """Accepts any construction or call, so engine decorators and property declarations can be evaluated"""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __call__(self, *args, **kwargs):
+        return args[0] if args else self
+
+    @classmethod
+    def __class_getitem__(cls, item):
+        return cls
+
+
+def __getattr__(name):
+    """Any engine type that is not implemented resolves to an inert placeholder class"""
+    if name.startswith("__"):
+        raise AttributeError(name)
+    placeholder = type(name, (_Placeholder,), {})
+    globals()[name] = placeholder
+    return placeholder
@@ -0,0 +1,462 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains batched Maya to Unreal transform conversions.
+
+All the conversions work on NumPy arrays holding N transforms at once (positions, quaternions, euler rotations
+and 4x4 matrices), and mirror the math that Unreal performs for `unreal.Matrix`, `unreal.Quat` and
+`unreal.Transform`. Matrices use Unreal's row vector convention, the translation lives in the last row.
+
+Only the final results are materialised as Unreal objects, using `to_unreal_transforms`, which keeps the
+math testable outside the editor.
+
+NumPy is optional, when it cannot be imported `NUMPY_AVAILABLE` is False and callers should fall back to their
+per object implementation.
+"""
+
+from __future__ import print_function, division, absolute_import
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+SMALL_NUMBER = 1.e-8
+KINDA_SMALL_NUMBER = 1.e-4
+SINGULARITY_THRESHOLD = 0.4999995
+
+MAYA_TO_UNREAL_AXES = ((1.0, 0.0, 0.0, 0.0),
+                       (0.0, 0.0, -1.0, 0.0),
+                       (0.0, 1.0, 0.0, 0.0),
+                       (0.0, 0.0, 0.0, 1.0))
+"""Reorient matrix, used to turn the left hand rule into the right hand rule"""
+
+MAYA_TO_UNREAL_SHAPE_AXES = ((1.0, 0.0, 0.0, 0.0),
+                             (0.0, 0.0, 1.0, 0.0),
+                             (0.0, 1.0, 0.0, 0.0),
+                             (0.0, 0.0, 0.0, 1.0))
+"""Reorient matrix used for control shapes, which swaps the Y and Z axis"""
+
+FLIP_Z_AXIS = ((1.0, 0.0, 0.0, 0.0),
+               (0.0, 1.0, 0.0, 0.0),
+               (0.0, 0.0, -1.0, 0.0),
+               (0.0, 0.0, 0.0, 1.0))
+"""Scale matrix that mirrors the Z axis"""
+
+
+# ======================================================================================================================
+# Core math
+# ======================================================================================================================
+
+def as_array(values, width: int):
+    """
+    Converts a list of values into a (N, width) float64 array.
+
+    :param values: list of lists, or an array like object.
+    :param int width: amount of values per element.
+    :rtype: numpy.ndarray
+    """
+    return np.asarray(values, dtype=np.float64).reshape(-1, width)
+
+
+def compose_matrices(translations, quaternions, scales=None):
+    """
+    Generates the 4x4 matrices for the transforms. Matches `unreal.Transform.to_matrix()`.
+
+    :param translations: (N, 3) array of translations.
+    :param quaternions: (N, 4) array of quaternions, stored as X, Y, Z, W.
+    :param scales: (N, 3) array of scales, defaults to a unit scale.
+    :return: (N, 4, 4) array of matrices.
+    """
+    translations = as_array(translations, 3)
+    quaternions = as_array(quaternions, 4)
+    scales = np.ones_like(translations) if scales is None else as_array(scales, 3)
+
+    x, y, z, w = quaternions.T
+    x2, y2, z2 = x + x, y + y, z + z
+    xx, xy, xz = x * x2, x * y2, x * z2
+    yy, yz, zz = y * y2, y * z2, z * z2
+    wx, wy, wz = w * x2, w * y2, w * z2
+
+    matrices = np.zeros((len(quaternions), 4, 4), dtype=np.float64)
+    matrices[:, 0, 0] = (1.0 - (yy + zz)) * scales[:, 0]
+    matrices[:, 0, 1] = (xy + wz) * scales[:, 0]
+    matrices[:, 0, 2] = (xz - wy) * scales[:, 0]
+    matrices[:, 1, 0] = (xy - wz) * scales[:, 1]
+    matrices[:, 1, 1] = (1.0 - (xx + zz)) * scales[:, 1]
+    matrices[:, 1, 2] = (yz + wx) * scales[:, 1]
+    matrices[:, 2, 0] = (xz + wy) * scales[:, 2]
+    matrices[:, 2, 1] = (yz - wx) * scales[:, 2]
+    matrices[:, 2, 2] = (1.0 - (xx + yy)) * scales[:, 2]
+    matrices[:, 3, :3] = translations
+    matrices[:, 3, 3] = 1.0
+
+    return matrices
+
+
+def matrices_to_quats(matrices):
+    """
+    Extracts the rotation of the matrices as quaternions. Matches `unreal.Matrix.to_quat()`, the matrices
+    are expected to not contain any scale.
+
+    :param matrices: (N, 3, 3) or (N, 4, 4) array of matrices.
+    :return: (N, 4) array of quaternions, stored as X, Y, Z, W.
+    """
+    m = np.asarray(matrices, dtype=np.float64)[:, :3, :3]
+    quats = np.zeros((len(m), 4), dtype=np.float64)
+    quats[:, 3] = 1.0
+
+    # A matrix with a zero axis cannot be converted, and results in an identity quaternion
+    valid = ~np.any(np.all(np.abs(m) <= KINDA_SMALL_NUMBER, axis=2), axis=1)
+
+    trace = m[:, 0, 0] + m[:, 1, 1] + m[:, 2, 2]
+    positive = valid & (trace > 0.0)
+    if np.any(positive):
+        mp = m[positive]
+        inv_s = 1.0 / np.sqrt(trace[positive] + 1.0)
+        s = 0.5 * inv_s
+        quats[positive, 0] = (mp[:, 1, 2] - mp[:, 2, 1]) * s
+        quats[positive, 1] = (mp[:, 2, 0] - mp[:, 0, 2]) * s
+        quats[positive, 2] = (mp[:, 0, 1] - mp[:, 1, 0]) * s
+        quats[positive, 3] = 0.5 * (1.0 / inv_s)
+
+    # The diagonal is negative, build the quaternion from the largest diagonal element
+    negative = np.flatnonzero(valid & ~(trace > 0.0))
+    if len(negative):
+        mn = m[negative]
+        diagonal = np.stack([mn[:, 0, 0], mn[:, 1, 1], mn[:, 2, 2]], axis=1)
+        i = np.where(diagonal[:, 1] > diagonal[:, 0], 1, 0)
+        i = np.where(diagonal[:, 2] > diagonal[np.arange(len(i)), i], 2, i)
+        j = (i + 1) % 3
+        k = (j + 1) % 3
+        rows = np.arange(len(i))
+
+        s = mn[rows, i, i] - mn[rows, j, j] - mn[rows, k, k] + 1.0
+        inv_s = 1.0 / np.sqrt(s)
+        s = 0.5 * inv_s
+
+        qt = np.zeros((len(i), 4), dtype=np.float64)
+        qt[rows, i] = 0.5 * (1.0 / inv_s)
+        qt[rows, 3] = (mn[rows, j, k] - mn[rows, k, j]) * s
+        qt[rows, j] = (mn[rows, i, j] + mn[rows, j, i]) * s
+        qt[rows, k] = (mn[rows, i, k] + mn[rows, k, i]) * s
+        quats[negative] = qt
+
+    return quats
+
+
+def normalize_quats(quaternions):
+    """
+    Normalizes the quaternions, quaternions that are too small to be normalized become the identity.
+
+    :param quaternions: (N, 4) array of quaternions.
+    :return: (N, 4) array of normalized quaternions.
+    """
+    quaternions = as_array(quaternions, 4)
+    square_sum = np.sum(quaternions * quaternions, axis=1)
+    valid = square_sum >= SMALL_NUMBER
+
+    result = np.zeros_like(quaternions)
+    result[:, 3] = 1.0
+    result[valid] = quaternions[valid] / np.sqrt(square_sum[valid])[:, None]
+    return result
+
+
+def decompose_matrices(matrices):
+    """
+    Splits the matrices into translation, rotation and scale. Matches `unreal.Matrix.transform()`, including
+    the handling of negative scaling, which is applied to the X axis.
+
+    :param matrices: (N, 4, 4) array of matrices.
+    :return: (N, 3) translations, (N, 4) quaternions and (N, 3) scales.
+    """
+    matrices = np.asarray(matrices, dtype=np.float64)
+    axes = matrices[:, :3, :3].copy()
+
+    square_sums = np.sum(axes * axes, axis=2)
+    has_scale = square_sums > SMALL_NUMBER
+    scales = np.where(has_scale, np.sqrt(np.where(has_scale, square_sums, 1.0)), 0.0)
+    axes = np.where(has_scale[:, :, None], axes / np.where(has_scale, scales, 1.0)[:, :, None], 0.0)
+
+    # Negative scaling is assumed to be along the X axis
+    negative = np.linalg.det(matrices[:, :3, :3]) < 0.0
+    scales[negative, 0] *= -1.0
+    axes[negative, 0] *= -1.0
+
+    quaternions = normalize_quats(matrices_to_quats(axes))
+    translations = matrices[:, 3, :3].copy()
+
+    return translations, quaternions, scales
+
+
+def quats_to_eulers(quaternions):
+    """
+    Converts the quaternions into euler rotations. Matches `unreal.Quat.euler()`.
+
+    :param quaternions: (N, 4) array of quaternions, stored as X, Y, Z, W.
+    :return: (N, 3) array of euler rotations in degrees, stored as Roll(X), Pitch(Y), Yaw(Z).
+    """
+    x, y, z, w = as_array(quaternions, 4).T
+    rad_to_deg = 180.0 / np.pi
+
+    singularity_test = z * x - w * y
+    yaw = np.arctan2(2.0 * (w * z + x * y), 1.0 - 2.0 * (y * y + z * z)) * rad_to_deg
+    pitch = np.arcsin(np.clip(2.0 * singularity_test, -1.0, 1.0)) * rad_to_deg
+    roll = np.arctan2(-2.0 * (w * x + y * z), 1.0 - 2.0 * (x * x + y * y)) * rad_to_deg
+
+    # Gimbal lock, the roll is derived from the yaw
+    south = singularity_test < -SINGULARITY_THRESHOLD
+    north = singularity_test > SINGULARITY_THRESHOLD
+    twist = 2.0 * np.arctan2(x, w) * rad_to_deg
+
+    pitch = np.where(south, -90.0, np.where(north, 90.0, pitch))
+    roll = np.where(south, normalize_axis(-yaw - twist), np.where(north, normalize_axis(yaw - twist), roll))
+
+    return np.stack([roll, pitch, yaw], axis=1)
+
+
+def eulers_to_quats(eulers):
+    """
+    Converts euler rotations into quaternions. Matches `unreal.Quat.set_from_euler()`.
+
+    :param eulers: (N, 3) array of euler rotations in degrees, stored as Roll(X), Pitch(Y), Yaw(Z).
+    :return: (N, 4) array of quaternions, stored as X, Y, Z, W.
+    """
+    eulers = np.fmod(as_array(eulers, 3), 360.0) * (np.pi / 360.0)
+    sr, sp, sy = np.sin(eulers).T
+    cr, cp, cy = np.cos(eulers).T
+
+    return np.stack([cr * sp * sy - sr * cp * cy,
+                     -cr * sp * cy - sr * cp * sy,
+                     cr * cp * sy - sr * sp * cy,
+                     cr * cp * cy + sr * sp * sy], axis=1)
+
+
+def normalize_axis(angles):
+    """Wraps the angles into the -180 to 180 degree range"""
+    angles = np.fmod(angles, 360.0)
+    angles = np.where(angles < 0.0, angles + 360.0, angles)
+    return np.where(angles > 180.0, angles - 360.0, angles)
+
+
+def multiply_quats(a, b):
+    """
+    Multiplies the quaternions pairwise. Matches `unreal.Quat.multiply()`, the result applies the rotation of b
+    first.
+
+    :param a: (N, 4) array of quaternions, stored as X, Y, Z, W.
+    :param b: (N, 4) array of quaternions, stored as X, Y, Z, W.
+    :return: (N, 4) array of quaternions.
+    """
+    ax, ay, az, aw = as_array(a, 4).T
+    bx, by, bz, bw = as_array(b, 4).T
+
+    return np.stack([aw * bx + ax * bw + ay * bz - az * by,
+                     aw * by - ax * bz + ay * bw + az * bx,
+                     aw * bz + ax * by - ay * bx + az * bw,
+                     aw * bw - ax * bx - ay * by - az * bz], axis=1)
+
+
+def rotate_vectors(quaternions, vectors):
+    """
+    Rotates the vectors by the quaternions pairwise. Matches `unreal.Quat.rotate_vector()`.
+
+    :param quaternions: (N, 4) array of quaternions, stored as X, Y, Z, W.
+    :param vectors: (N, 3) array of vectors.
+    :return: (N, 3) array of rotated vectors.
+    """
+    quaternions = as_array(quaternions, 4)
+    vectors = as_array(vectors, 3)
+
+    q = quaternions[:, :3]
+    t = 2.0 * np.cross(q, vectors)
+    return vectors + quaternions[:, 3:] * t + np.cross(q, t)
+
+
+def relative_transforms(translations, quaternions, scales, parent_translations, parent_quaternions, parent_scales):
+    """
+    Computes the transforms relative to their parent transforms, so that composing a result with its parent
+    gives back the transform. Matches `unreal.Transform.make_relative()`, including the matrix based solve that
+    Unreal uses when either transform has a negative scale.
+
+    :param translations: (N, 3) array of translations.
+    :param quaternions: (N, 4) array of quaternions, stored as X, Y, Z, W.
+    :param scales: (N, 3) array of scales.
+    :param parent_translations: (N, 3) array of the parent translations.
+    :param parent_quaternions: (N, 4) array of the parent quaternions, expected to be normalized.
+    :param parent_scales: (N, 3) array of the parent scales.
+    :return: (N, 3) translations, (N, 4) quaternions and (N, 3) scales.
+    """
+    translations = as_array(translations, 3)
+    quaternions = as_array(quaternions, 4)
+    scales = as_array(scales, 3)
+    parent_translations = as_array(parent_translations, 3)
+    parent_quaternions = as_array(parent_quaternions, 4)
+    parent_scales = as_array(parent_scales, 3)
+
+    has_scale = np.abs(parent_scales) > SMALL_NUMBER
+    recip_scales = np.where(has_scale, 1.0 / np.where(has_scale, parent_scales, 1.0), 0.0)
+    out_scales = scales * recip_scales
+
+    # Inverse of the normalized parent rotation
+    inverse_quats = parent_quaternions * np.array([-1.0, -1.0, -1.0, 1.0])
+    out_quats = multiply_quats(inverse_quats, quaternions)
+    out_translations = rotate_vectors(inverse_quats, translations - parent_translations) * recip_scales
+
+    negative = np.any(scales < 0.0, axis=1) | np.any(parent_scales < 0.0, axis=1)
+    if np.any(negative):
+        # The rotation is taken from the relative matrix, with the sign of the scale applied back onto its axes
+        parent_matrices = compose_matrices(parent_translations[negative], parent_quaternions[negative],
+                                           parent_scales[negative])
+        singular = np.abs(np.linalg.det(parent_matrices)) <= SMALL_NUMBER
+        parent_matrices[singular] = np.eye(4)
+
+        matrices = compose_matrices(translations[negative], quaternions[negative], scales[negative]) @ \
+            np.linalg.inv(parent_matrices)
+
+        axes = matrices[:, :3, :3]
+        square_sums = np.sum(axes * axes, axis=2)
+        axis_scales = np.where(square_sums > SMALL_NUMBER, 1.0 / np.sqrt(np.where(square_sums > 0.0, square_sums, 1.0)),
+                               1.0)
+        signs = np.where(out_scales[negative] >= 0.0, 1.0, -1.0)
+        axes = axes * (axis_scales * signs)[:, :, None]
+
+        out_quats[negative] = normalize_quats(matrices_to_quats(axes))
+        out_translations[negative] = matrices[:, 3, :3]
+
+    return out_translations, out_quats, out_scales
+
+
+# ======================================================================================================================
+# Maya to Unreal conversions
+# ======================================================================================================================
+
+def convert_maya_control_transforms(positions, quaternions):
+    """
+    Converts mGear control world transforms from Maya space into Unreal space.
+
+    Batched version of `ueGear.controlrig.mgear._convert_maya_matrix`.
+
+    :param positions: (N, 3) array of Maya world positions.
+    :param quaternions: (N, 4) array of Maya world quaternions, stored as X, Y, Z, W.
+    :return: (N, 3) translations, (N, 4) quaternions and (N, 3) scales in Unreal space.
+    """
+    conversion_mtx = np.asarray(MAYA_TO_UNREAL_AXES) @ np.asarray(FLIP_Z_AXIS)
+    return decompose_matrices(compose_matrices(positions, quaternions) @ conversion_mtx)
+
+
+def convert_maya_transforms_to_unreal(translations, quaternions, scales, world_up):
+    """
+    Converts Maya world transforms into Unreal transforms, for a Y up or a Z up Maya world.
+
+    Batched version of `ueGear.mayaio.convert_transform_maya_to_unreal`.
+
+    :param translations: (N, 3) array of Maya translations.
+    :param quaternions: (N, 4) array of Maya rotations, stored as X, Y, Z, W.
+    :param scales: (N, 3) array of Maya scales.
+    :param str world_up: Mayas world up setting, 'y' or 'z'.
+    :return: (N, 3) translations, (N, 4) quaternions and (N, 3) scales in Unreal space.
+    """
+    translations = as_array(translations, 3)
+    quaternions = as_array(quaternions, 4)
+    scales = as_array(scales, 3)
+    conversion_mtx = np.asarray(MAYA_TO_UNREAL_AXES)
+    eulers = quats_to_eulers(quaternions)
+
+    if world_up == 'y':
+        # Calculates the correct converted position in world space, without the rotation
+        identity_quats = np.zeros_like(quaternions)
+        identity_quats[:, 3] = 1.0
+        corrected = conversion_mtx @ compose_matrices(translations, identity_quats, scales)
+        out_translations, _, out_scales = decompose_matrices(corrected)
+
+        out_quats = eulers_to_quats(np.stack([eulers[:, 0] + 90.0, eulers[:, 1], -eulers[:, 2]], axis=1))
+
+    elif world_up == 'z':
+        corrected = compose_matrices(translations, quaternions, scales) @ conversion_mtx
+        out_translations, _, out_scales = decompose_matrices(corrected)
+
+        out_quats = eulers_to_quats(np.stack([eulers[:, 0], -eulers[:, 2], eulers[:, 1]], axis=1))
+
+        # Update Position, swapping Y and Z
+        out_translations = out_translations[:, [0, 2, 1]]
+
+    else:
+        raise ValueError(f"Invalid world up axis: {world_up}")
+
+    return out_translations, out_quats, out_scales
+
+
+def convert_maya_layout_transforms(translations, rotations, scales):
+    """
+    Converts Maya layout translations, euler rotations and scales into Unreal values.
+
+    Batched version of `ueGear.helpers.convert_maya_transforms_into_unreal_transforms`.
+
+    :param translations: (N, 3) array of Maya translations.
+    :param rotations: (N, 3) array of Maya euler rotations.
+    :param scales: (N, 3) array of Maya scales.
+    :return: (N, 3) translations, (N, 3) rotator values and (N, 3) scales, in the order that
+        `unreal.Vector` and `unreal.Rotator` expect them.
+    """
+    translations = as_array(translations, 3)
+    rotations = as_array(rotations, 3)
+    scales = as_array(scales, 3)
+
+    out_translations = translations[:, [0, 2, 1]]
+    out_rotations = np.stack([rotations[:, 0] + 90.0, rotations[:, 2], rotations[:, 1] * -1], axis=1)
+
+    return out_translations, out_rotations, scales.copy()
+
+
+# ======================================================================================================================
+# Unreal materialisation
+# ======================================================================================================================
+
+def to_unreal_transforms(translations, quaternions, scales) -> list:
+    """
+    Materialises the transform arrays as Unreal transforms.
+
+    :param translations: (N, 3) array of translations.
+    :param quaternions: (N, 4) array of quaternions, stored as X, Y, Z, W.
+    :param scales: (N, 3) array of scales.
+    :rtype: list(unreal.Transform)
+    """
+    import unreal
+
+    transforms = []
+    for pos, quat, scale in zip(as_array(translations, 3).tolist(),
+                                as_array(quaternions, 4).tolist(),
+                                as_array(scales, 3).tolist()):
+        trans = unreal.Transform()
+        trans.translation = unreal.Vector(pos[0], pos[1], pos[2])
+        trans.rotation = unreal.Quat(quat[0], quat[1], quat[2], quat[3])
+        trans.scale3d = unreal.Vector(scale[0], scale[1], scale[2])
+        transforms.append(trans)
+
+    return transforms
+
+
+def from_unreal_transforms(transforms: list):
+    """
+    Converts Unreal transforms into arrays.
+
+    :param list(unreal.Transform) transforms: transforms to convert.
+    :return: (N, 3) translations, (N, 4) quaternions and (N, 3) scales.
+    """
+    translations = []
+    quaternions = []
+    scales = []
+    for trans in transforms:
+        pos = trans.translation
+        quat = trans.rotation
+        scale = trans.scale3d
+        translations.append([pos.x, pos.y, pos.z])
+        quaternions.append([quat.x, quat.y, quat.z, quat.w])
+        scales.append([scale.x, scale.y, scale.z])
+
+    return as_array(translations, 3), as_array(quaternions, 4), as_array(scales, 3)